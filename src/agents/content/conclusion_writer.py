@@ -16,6 +16,7 @@ from ..base import (
     IngestionStateManager, build_section_prompt_enhancement,
     get_section_heading, is_section_enabled, logger
 )
+from src.utils.section_memo import fingerprint, get_section_memo, template_version
 
 
 class ConclusionWriterAgent(SelfCorrectingAgent, Agent):
@@ -120,19 +121,55 @@ class ConclusionWriterAgent(SelfCorrectingAgent, Agent):
 
                     )
 
+                # Reuse the conclusion of an earlier run when its inputs are unchanged
+
+                memo = None if event.data.get("force_regenerate") else get_section_memo(self.config)
+
+                fp_inputs = dict(outline_entry=topic, template=template_version(prompt_template), prompt=user_prompt)
+
+                fp = fingerprint(
+
+                    "conclusion",
+
+                    model=self.llm_service.resolve_model(self.config.ollama_content_model),
+
+                    **fp_inputs
+
+                ) if memo is not None else None
+
+                conclusion = memo.get(fp) if memo is not None else None
+
                 try:
 
-                    conclusion = self.llm_service.generate(
+                    if conclusion is not None:
 
-                        prompt=user_prompt,
+                        logger.info(f"Reused memoized conclusion (fingerprint={fp[:12]})")
 
-                        system_prompt=prompt_template["system"],
+                    else:
 
-                        json_mode=False,
+                        conclusion = self.llm_service.generate(
 
-                        model=self.config.ollama_content_model
+                            prompt=user_prompt,
 
-                    )
+                            system_prompt=prompt_template["system"],
+
+                            json_mode=False,
+
+                            model=self.config.ollama_content_model
+
+                        )
+
+                        if memo is not None:
+
+                            # Key the entry on the provider model that actually wrote it
+
+                            served = self.llm_service.served_model()
+
+                            if served is not None:
+
+                                fp = fingerprint("conclusion", model=served, **fp_inputs)
+
+                            memo.put(fp, conclusion.strip(), kind="conclusion")
 
                 except Exception as e:
 
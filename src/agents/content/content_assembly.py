@@ -16,6 +16,7 @@ from ..base import (
     IngestionStateManager, build_section_prompt_enhancement,
     get_section_heading, is_section_enabled, logger
 )
+from src.utils.section_memo import get_section_memo
 
 
 class ContentAssemblyAgent(SelfCorrectingAgent, Agent):
@@ -121,6 +122,8 @@ class ContentAssemblyAgent(SelfCorrectingAgent, Agent):
 
             sections = []
 
+        sections = self._splice_memoized(sections, event.correlation_id)
+
         # 3) Use template-driven assembly based on blog_templates.yaml
 
         blog_template = self._get_blog_template()
@@ -153,6 +156,42 @@ class ContentAssemblyAgent(SelfCorrectingAgent, Agent):
 
         )
 
+    def _splice_memoized(self, sections: List[Dict], correlation_id: str) -> List[Dict]:
+
+        """Fill sections that arrive with only a fingerprint from the section memo."""
+
+        reused = sum(1 for s in sections if isinstance(s, dict) and s.get("memoized"))
+
+        missing = [s for s in sections if isinstance(s, dict) and s.get("fingerprint") and not s.get("content")]
+
+        memo = get_section_memo(self.config) if missing else None
+
+        spliced = []
+
+        for section in sections:
+
+            if memo is not None and section in missing:
+
+                cached = memo.get(section["fingerprint"])
+
+                if cached is None:
+
+                    logger.warning(f"Memoized section '{section.get('title')}' not found, skipping (cid={correlation_id})")
+
+                    continue
+
+                section = dict(section, content=cached, memoized=True)
+
+                reused += 1
+
+            spliced.append(section)
+
+        if reused:
+
+            logger.info(f"Assembling with {reused}/{len(spliced)} memoized sections (cid={correlation_id})")
+
+        return spliced
+
     def _synthesize_intro(self, topic: str, outline: Dict, sections: List[Dict], meta: Dict) -> str:
 
         """Synthesize introduction from available context when missing."""
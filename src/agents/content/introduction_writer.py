@@ -2,6 +2,7 @@
 
 from typing import Optional, Dict, List, Any
 from pathlib import Path
+import json
 import logging
 
 from ..base import (
@@ -16,6 +17,7 @@ from ..base import (
     IngestionStateManager, build_section_prompt_enhancement,
     get_section_heading, is_section_enabled, logger
 )
+from src.utils.section_memo import fingerprint, get_section_memo, template_version
 
 
 class IntroductionWriterAgent(SelfCorrectingAgent, Agent):
@@ -76,19 +78,55 @@ class IntroductionWriterAgent(SelfCorrectingAgent, Agent):
 
             )
 
-        intro = self.llm_service.generate(
+        # Reuse the introduction of an earlier run when its inputs are unchanged
 
-            prompt=user_prompt,
+        memo = None if event.data.get("force_regenerate") else get_section_memo(self.config)
 
-            system_prompt=prompt_template["system"],
+        fp_inputs = dict(outline_entry=outline, template=template_version(prompt_template), prompt=user_prompt)
 
-            json_mode=False,
+        fp = fingerprint(
 
-            model=self.config.ollama_content_model
+            "introduction",
 
-        )
+            model=self.llm_service.resolve_model(self.config.ollama_content_model),
+
+            **fp_inputs
+
+        ) if memo is not None else None
+
+        intro = memo.get(fp) if memo is not None else None
+
+        if intro is not None:
+
+            logger.info(f"Reused memoized introduction (fingerprint={fp[:12]})")
+
+        else:
+
+            intro = self.llm_service.generate(
+
+                prompt=user_prompt,
+
+                system_prompt=prompt_template["system"],
+
+                json_mode=False,
+
+                model=self.config.ollama_content_model
+
+            )
+
+            if memo is not None:
+
+                # Key the entry on the provider model that actually wrote it
+
+                served = self.llm_service.served_model()
+
+                if served is not None:
+
+                    fp = fingerprint("introduction", model=served, **fp_inputs)
+
+                memo.put(fp, intro.strip(), kind="introduction")
 
-        logger.info("Generated introduction with tone configuration")
+            logger.info("Generated introduction with tone configuration")
 
         return AgentEvent(
 
@@ -2,6 +2,7 @@
 
 from typing import Optional, Dict, List, Any
 from pathlib import Path
+import json
 import logging
 
 from ..base import (
@@ -62,19 +63,33 @@ class OutlineCreationAgent(SelfCorrectingAgent, Agent):
 
             raise ValueError("ValidationFail: Both context_kb and context_blog are missing")
 
-        # Combine context
+        prompt_template = PROMPTS.get("OUTLINE_CREATION", {"system": "You are a technical writing specialist.", "user": "Create outline for topic"})
 
-        combined_context = "\n\n".join(context_kb[:3] + context_blog[:2])
+        topic_json = json.dumps(topic)
 
-        prompt_template = PROMPTS.get("OUTLINE_CREATION", {"system": "You are a technical writing specialist.", "user": "Create outline for topic"})
+        json_schema = json.dumps(SCHEMAS.get("outline", {"type": "object"}), indent=2)
+
+        # Combine context within the agent's token budget, most relevant to the topic first
+
+        packed = self.pack_context(
+
+            list(context_kb) + list(context_blog),
+
+            query=f"{topic.get('title', '')} {topic.get('rationale', '')}" if isinstance(topic, dict) else str(topic),
+
+            reserved_text=prompt_template["system"] + prompt_template["user"] + topic_json + json_schema
+
+        )
+
+        logger.info(f"Outline context: {packed.tokens}/{packed.budget} tokens from {len(packed.chunks)}/{packed.candidates} chunks")
 
         user_prompt = prompt_template["user"].format(
 
-            topic=json.dumps(topic),
+            topic=topic_json,
 
-            context=combined_context[:3000],
+            context=packed.text,
 
-            json_schema=json.dumps(SCHEMAS.get("outline", {"type": "object"}), indent=2)
+            json_schema=json_schema
 
         )
 
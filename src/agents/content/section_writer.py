@@ -2,7 +2,9 @@
 
 from typing import Optional, Dict, List, Any
 from pathlib import Path
+import json
 import logging
+import re
 
 from ..base import (
     Agent, EventBus, AgentEvent, AgentContract, SelfCorrectingAgent,
@@ -16,6 +18,12 @@ from ..base import (
     IngestionStateManager, build_section_prompt_enhancement,
     get_section_heading, is_section_enabled, logger
 )
+from src.utils.cancellation import check_cancelled
+from src.utils.context_packer import normalize_whitespace, trim_to_tokens
+from src.utils.section_memo import fingerprint, get_section_memo, template_version
+
+# Tokens of the introduction quoted in each section prompt
+INTRO_EXCERPT_TOKENS = 150
 
 
 class SectionWriterAgent(SelfCorrectingAgent, Agent):
@@ -63,6 +71,11 @@ class SectionWriterAgent(SelfCorrectingAgent, Agent):
 
         section_list = outline.get("sections", [])
 
+        # Sections whose inputs are unchanged since an earlier run are reused, not regenerated
+        memo = None if event.data.get("force_regenerate") else get_section_memo(self.config)
+
+        reused = 0
+
         logger.info(
 
             f"SECTION_WRITER_START | section_count={len(section_list)} | "
@@ -77,6 +90,9 @@ class SectionWriterAgent(SelfCorrectingAgent, Agent):
 
         for i, section in enumerate(section_list, 1):
 
+            # Stop between sections once the step is cancelled or out of time
+            check_cancelled()
+
             logger.info(
 
                 f"SECTION_GEN_START | section={i}/{len(section_list)} | "
@@ -89,13 +105,40 @@ class SectionWriterAgent(SelfCorrectingAgent, Agent):
 
             prompt_template = PROMPTS.get("SECTION_WRITER", {"system": "You are a technical writing specialist.", "user": "Write section content"})
 
+            section_outline = json.dumps(section, indent=2)
+
+            intro_excerpt = trim_to_tokens(normalize_whitespace(intro), INTRO_EXCERPT_TOKENS)
+
+            # Fill the rest of the token budget with the context most relevant to this section
+            packed = self.pack_context(
+
+                context,
+
+                query=f"{section.get('title', '')} {section_outline}",
+
+                reserved_text=prompt_template["system"] + prompt_template["user"] + section_outline + intro_excerpt
+
+            )
+
             user_prompt = prompt_template["user"].format(
 
-                section_outline=json.dumps(section, indent=2),
+                section_outline=section_outline,
 
-                context="\n\n".join(context[:3]),
+                context=packed.text,
 
-                intro=intro[:500]
+                intro=intro_excerpt
+
+            )
+
+            logger.info(
+
+                f"SECTION_CONTEXT | section={i}/{len(section_list)} | "
+
+                f"context_tokens={packed.tokens}/{packed.budget} | "
+
+                f"chunks={len(packed.chunks)}/{packed.candidates} | "
+
+                f"cid={event.correlation_id}"
 
             )
 
@@ -113,6 +156,50 @@ class SectionWriterAgent(SelfCorrectingAgent, Agent):
 
                 )
 
+            fp = None
+
+            if memo is not None:
+
+                fp_inputs = dict(
+
+                    outline_entry=section,
+
+                    context=[context[chunk.index] for chunk in packed.chunks],
+
+                    template=template_version(prompt_template, getattr(self.config, 'active_blog_template', None)),
+
+                    prompt=user_prompt
+
+                )
+
+                fp = fingerprint(
+
+                    "section",
+
+                    model=self.llm_service.resolve_model(self.config.ollama_content_model),
+
+                    **fp_inputs
+
+                )
+
+                cached = memo.get(fp)
+
+                if cached is not None:
+
+                    logger.info(
+
+                        f"SECTION_MEMO_HIT | section={i}/{len(section_list)} | "
+
+                        f"fingerprint={fp[:12]} | cid={event.correlation_id}"
+
+                    )
+
+                    reused += 1
+
+                    sections.append({"title": section["title"], "content": cached, "fingerprint": fp, "memoized": True})
+
+                    continue
+
             try:
 
                 section_content = self.llm_service.generate(
@@ -189,10 +276,19 @@ class SectionWriterAgent(SelfCorrectingAgent, Agent):
                 "title": section["title"],
                 "content": cleaned_content.strip()
             })
+            if fp is not None:
+                # Key the entry on the provider model that actually wrote it
+                served = self.llm_service.served_model()
+                if served is not None:
+                    fp = fingerprint("section", model=served, **fp_inputs)
+                memo.put(fp, sections[-1]["content"], kind="section", title=section["title"])
+                sections[-1].update(fingerprint=fp, memoized=False)
 
         logger.info(
 
-            f"SECTION_WRITER_COMPLETE | generated={len(sections)} sections | "
+            f"SECTION_WRITER_COMPLETE | generated={len(sections) - reused} sections | "
+
+            f"reused={reused} | "
 
             f"cid={event.correlation_id}"
 
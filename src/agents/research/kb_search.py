@@ -62,21 +62,19 @@ class KBSearchAgent(SelfCorrectingAgent, Agent):
 
             query = event.data.get("query", "")
 
-        # Search KB
+        # Search KB (BM25 first; the embedding query only runs when lexical hits are not confident)
 
-        results = self.database_service.query(
-
-            "kb",
+        results = self.database_service.search(
 
             query,
 
-            top_k=self.config.rag_top_k
+            k=getattr(self.config, "rag_top_k", 5)
 
         )
 
         # Extract documents
 
-        context = results.get("documents", [[]])[0] if results.get("documents") else []
+        context = [result["content"] for result in results]
 
         # Deduplicate
 
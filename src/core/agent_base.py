@@ -9,6 +9,7 @@ from abc import ABC, abstractmethod
 
 from .contracts import AgentEvent, AgentContract
 from .event_bus import EventBus
+from src.utils.context_packer import ContextPacker, PackedContext, count_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -115,6 +116,29 @@ class Agent(ABC):
             'max_context_size': 16000
         }.get(limit_type, 0))
     
+    def pack_context(self, chunks: List[Any], query: Optional[str] = None, reserved_text: str = "",
+                     **kwargs) -> PackedContext:
+        """Pack context chunks into this agent's prompt token budget.
+
+        Args:
+            chunks: Context chunks in retrieval order (or (text, score) pairs)
+            query: Text the context should be relevant to
+            reserved_text: The rest of the prompt, whose tokens come out of the budget
+            **kwargs: Passed to ContextPacker
+
+        Returns:
+            Packed context with token usage
+        """
+        limits = {
+            'max_tokens_per_agent': self.get_limit('max_tokens_per_agent'),
+            'max_context_size': self.get_limit('max_context_size'),
+            'context_budgets': self.perf_config.get('limits', {}).get('context_budgets', {}),
+        }
+        packer = ContextPacker.for_limits(
+            limits, self.agent_id, reserved_tokens=count_tokens(reserved_text), **kwargs
+        )
+        return packer.pack(chunks, query=query)
+
     def get_tone_setting(self, section: str, setting: str, default: Any = None) -> Any:
         """Get tone configuration setting for a specific section."""
         section_controls = self.tone_config.get('section_controls', {})
@@ -4,21 +4,41 @@ Combines configuration from v5_1, v5_2, and v-ucop.
 """
 
 import os
+import sys
 import json
+import shutil
 from typing import Dict, Any, Optional
 from pathlib import Path
 from dataclasses import dataclass, field
 import logging
 
+from src.utils.lazy_import import LazyModule, module_available
+
 logger = logging.getLogger(__name__)
 
-# CUDA detection
-try:
-    import torch
-    TORCH_AVAILABLE = True
-except ImportError:
-    TORCH_AVAILABLE = False
-    torch = None
+# CUDA detection (torch is only imported if a device check actually needs it)
+TORCH_AVAILABLE = module_available("torch")
+torch = LazyModule("torch") if TORCH_AVAILABLE.installed else None
+
+
+def _cuda_available() -> bool:
+    """Check for a usable CUDA device, importing torch only when one may exist."""
+    if os.getenv("CUDA_VISIBLE_DEVICES", None) in ("", "-1"):
+        return False
+    # Without an NVIDIA driver torch cannot see a GPU; skip the import entirely
+    # unless something else has already paid for it
+    driver_present = os.path.exists("/proc/driver/nvidia/version") or shutil.which("nvidia-smi")
+    if not driver_present and "torch" not in sys.modules:
+        return False
+    # Imports torch; False if it is missing or fails to import
+    if not TORCH_AVAILABLE:
+        return False
+    try:
+        return bool(torch.cuda.is_available())
+    except Exception as e:
+        logger.debug(f"CUDA detection failed: {e}")
+        return False
+
 
 # Optional YAML import (lazy-fallback to avoid hard dependency at import time)
 try:
@@ -42,6 +62,8 @@ class DatabaseConfig:
     chroma_db_path: str = "./chroma_db"
     embedding_model: str = "all-MiniLM-L6-v2"
     collection_name: str = "blog_knowledge"
+    lexical_index: bool = True  # BM25 index kept alongside the collections for hybrid search
+    lexical_min_coverage: float = 0.8  # Skip the embedding pass when lexical hits cover this much of the query
 
 
 @dataclass
@@ -107,6 +129,12 @@ class Config:
     # Device settings - CUDA auto-detection (overrideable by RUNTIME_DEVICE env var)
     device: str = field(default="auto")  # Will be resolved in post_init
     embedding_batch_size: int = 32
+    # Embedding runtime (see src/services/embedding_runtime.py)
+    embedding_backend: str = "torch"  # torch | onnx | openvino | torch-int8
+    embedding_model_file: Optional[str] = None  # Exported file for onnx/openvino, e.g. onnx/model_qint8_avx512.onnx
+    embedding_token_budget: int = 8192  # Padded tokens per encode batch; batch size follows text length
+    embedding_preload: bool = True  # Load and warm the model at startup
+    embedding_compat_tolerance: float = 0.99  # Min cosine to the full model before an optimized backend is used
 
     # Sub-configurations
     llm: LLMConfig = field(default_factory=LLMConfig)
@@ -119,6 +147,17 @@ class Config:
     gemini_api_key: Optional[str] = None
     openai_api_key: Optional[str] = None
     gemini_rpm_limit: int = 15
+    gemini_tpm_limit: Optional[int] = None
+    llm_max_concurrency: Optional[int] = None
+    # Per-model overrides, e.g. {"gpt-4o": {"rpm": 30, "tpm": 30000, "max_concurrency": 4}}
+    model_rate_limits: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    llm_hedging: bool = True  # Duplicate requests slower than the provider's p95 to the next provider
+    # Record/replay of provider calls for offline load testing (see src/services/llm_recording.py)
+    llm_record_path: Optional[str] = None
+    llm_replay_path: Optional[str] = None
+    llm_replay_latency: str = "recorded"  # none | recorded | sampled
+    llm_replay_speed: float = 1.0  # Divides replayed latencies; 10.0 runs ten times faster
+    llm_replay_strict: bool = False  # Fail on prompts that were never recorded
     
     # Model Configuration
     gemini_model: str = "models/gemini-2.0-flash"
@@ -133,6 +172,13 @@ class Config:
     llm_temperature: float = 0.7
     deterministic: bool = False
     cache_ttl: int = 86400  # 24 hours
+    # Second-level cache shared by worker processes, consulted after each
+    # in-process cache (see src/optimization/shared_cache.py)
+    shared_cache: str = "none"  # none | sqlite | redis
+    shared_cache_url: Optional[str] = None  # e.g. redis://localhost:6379/0 for "redis"
+    shared_cache_ttl: int = 86400
+    shared_cache_max_mb: int = 256
+    shared_cache_max_entries: int = 100000
     
     # Ollama Model Router settings
     enable_smart_routing: bool = True  # Enable intelligent model selection
@@ -145,8 +191,17 @@ class Config:
     enable_mesh: bool = False
     enable_orchestration: bool = False
     enable_caching: bool = True
+    section_memoization: bool = True  # Reuse generated sections whose inputs are unchanged (src/utils/section_memo.py)
+    section_memo_max_age_days: float = 30.0
+    section_memo_max_entries: int = 5000
     enable_learning: bool = True
 
+    # Job queue: "local" (in-process scheduler) or "shared" (SQLite leases in the
+    # jobs directory, drained by every process using it; see src/orchestration/job_lease_queue.py)
+    job_queue: str = "local"
+    job_lease_seconds: float = 30.0
+    job_max_attempts: int = 3  # Expired leases before a shared-queue job is failed
+
     # Performance
     request_timeout: int = 300
     max_retries: int = 3
@@ -181,7 +236,7 @@ class Config:
                 self.device = env_device
             else:
                 # Auto-detect CUDA
-                self.device = "cuda" if (TORCH_AVAILABLE and torch.cuda.is_available()) else "cpu"
+                self.device = "cuda" if _cuda_available() else "cpu"
 
     def load_from_env(self):
         """Load configuration from environment variables with smart defaults."""
@@ -207,6 +262,16 @@ class Config:
         self.gemini_model = os.getenv("GEMINI_MODEL", self.gemini_model)
         self.openai_model = os.getenv("OPENAI_MODEL", self.openai_model)
         self.gemini_rpm_limit = int(os.getenv("GEMINI_RPM_LIMIT", str(self.gemini_rpm_limit)))
+        if os.getenv("GEMINI_TPM_LIMIT"):
+            self.gemini_tpm_limit = int(os.getenv("GEMINI_TPM_LIMIT"))
+        if os.getenv("LLM_MAX_CONCURRENCY"):
+            self.llm_max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY"))
+        self.llm_hedging = os.getenv("LLM_HEDGING", "true").lower() == "true"
+        self.llm_record_path = os.getenv("LLM_RECORD_PATH", self.llm_record_path)
+        self.llm_replay_path = os.getenv("LLM_REPLAY_PATH", self.llm_replay_path)
+        self.llm_replay_latency = os.getenv("LLM_REPLAY_LATENCY", self.llm_replay_latency).lower()
+        self.llm_replay_speed = float(os.getenv("LLM_REPLAY_SPEED", str(self.llm_replay_speed)))
+        self.llm_replay_strict = os.getenv("LLM_REPLAY_STRICT", "false").lower() == "true"
         
         # Ollama Models
         self.ollama_base_url = os.getenv("OLLAMA_BASE_URL", self.ollama_base_url)
@@ -217,10 +282,18 @@ class Config:
         # Performance Settings
         self.llm_temperature = float(os.getenv("LLM_TEMPERATURE", str(self.llm_temperature)))
         self.cache_ttl = int(os.getenv("CACHE_TTL", str(self.cache_ttl)))
+        self.shared_cache = os.getenv("SHARED_CACHE", self.shared_cache).lower()
+        self.shared_cache_url = os.getenv("SHARED_CACHE_URL", self.shared_cache_url)
+        self.shared_cache_ttl = int(os.getenv("SHARED_CACHE_TTL", str(self.shared_cache_ttl)))
+        self.shared_cache_max_mb = int(os.getenv("SHARED_CACHE_MAX_MB", str(self.shared_cache_max_mb)))
         self.enable_smart_routing = os.getenv("ENABLE_SMART_ROUTING", "true").lower() == "true"
         
         # Database
         self.database.chroma_db_path = os.getenv("CHROMA_DB_PATH", self.database.chroma_db_path)
+        self.embedding_backend = os.getenv("EMBEDDING_BACKEND", self.embedding_backend).lower()
+        self.embedding_model_file = os.getenv("EMBEDDING_MODEL_FILE", self.embedding_model_file)
+        self.embedding_token_budget = int(os.getenv("EMBEDDING_TOKEN_BUDGET", str(self.embedding_token_budget)))
+        self.embedding_preload = os.getenv("EMBEDDING_PRELOAD", "true").lower() == "true"
 
         # Feature Flags
         self.mesh.enabled = os.getenv("MESH_ENABLED", "false").lower() == "true"
@@ -230,6 +303,12 @@ class Config:
         self.enable_orchestration = self.orchestration.enabled
         
         self.enable_caching = os.getenv("ENABLE_CACHING", "true").lower() == "true"
+        self.section_memoization = os.getenv("SECTION_MEMOIZATION", "true").lower() == "true"
+        self.section_memo_max_age_days = float(os.getenv("SECTION_MEMO_MAX_AGE_DAYS", str(self.section_memo_max_age_days)))
+        self.section_memo_max_entries = int(os.getenv("SECTION_MEMO_MAX_ENTRIES", str(self.section_memo_max_entries)))
+        self.job_queue = os.getenv("JOB_QUEUE", self.job_queue).lower()
+        self.job_lease_seconds = float(os.getenv("JOB_LEASE_SECONDS", str(self.job_lease_seconds)))
+        self.job_max_attempts = int(os.getenv("JOB_MAX_ATTEMPTS", str(self.job_max_attempts)))
 
         # Logging
         self.log_level = os.getenv("LOG_LEVEL", self.log_level)
@@ -1,79 +1,264 @@
 """Unified Event Bus
 
 Combines EventBus from v5_1 with optional mesh-aware hooks.
+
+Publishing is lock-free on the read side: subscriber lists are immutable
+tuples replaced copy-on-write by subscribe/unsubscribe, and history is a
+bounded ring buffer. Subscribers are called inline by default; slow consumers
+(websockets, monitors) can subscribe with ``dispatch="queued"`` to get a
+private bounded queue and worker thread so they never stall the publisher.
 """
 
+import asyncio
+import inspect
 import logging
+import queue
 import threading
-from typing import Dict, List, Callable, Any, Optional
-from collections import defaultdict
+import time
+from collections import deque
+from typing import Dict, List, Callable, Any, Optional, Tuple
 
 from .contracts import AgentEvent
 
 logger = logging.getLogger(__name__)
 
+DISPATCH_SYNC = "sync"
+DISPATCH_QUEUED = "queued"
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+
+_STOP = object()
+
+
+class _Subscription:
+    """A subscriber callback plus its optional private delivery queue."""
+
+    def __init__(
+        self,
+        event_type: str,
+        callback: Callable[[AgentEvent], Any],
+        dispatch: str = DISPATCH_SYNC,
+        queue_size: int = 1000,
+        drop_policy: str = DROP_OLDEST,
+        block_timeout: float = 1.0,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
+        if dispatch not in (DISPATCH_SYNC, DISPATCH_QUEUED):
+            raise ValueError(f"Unknown dispatch mode: {dispatch}")
+        if drop_policy not in (DROP_OLDEST, DROP_NEWEST, BLOCK):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+
+        self.event_type = event_type
+        self.callback = callback
+        self.dispatch = dispatch
+        self.drop_policy = drop_policy
+        self.block_timeout = block_timeout
+        self.loop = loop
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self._queue: Optional[queue.Queue] = None
+        self._worker: Optional[threading.Thread] = None
+
+        if dispatch == DISPATCH_QUEUED:
+            self._queue = queue.Queue(maxsize=queue_size)
+            name = getattr(callback, '__qualname__', repr(callback))
+            self._worker = threading.Thread(
+                target=self._run,
+                name=f"eventbus-{event_type}-{name}",
+                daemon=True
+            )
+            self._worker.start()
+
+    def deliver(self, event: AgentEvent) -> None:
+        """Deliver inline (sync) or enqueue according to the drop policy (queued)."""
+        if self._queue is None:
+            self._invoke(event)
+            return
+
+        try:
+            if self.drop_policy == BLOCK:
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+            return
+        except queue.Full:
+            pass
+
+        if self.drop_policy == DROP_OLDEST:
+            try:
+                self._queue.get_nowait()
+                self.dropped += 1
+                self._queue.put_nowait(event)
+                return
+            except (queue.Empty, queue.Full):
+                pass
+        self.dropped += 1
+
+    def _invoke(self, event: AgentEvent) -> None:
+        try:
+            result = self.callback(event)
+            if self.loop is not None and inspect.isawaitable(result):
+                asyncio.run_coroutine_threadsafe(result, self.loop)
+            self.delivered += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Error in event handler for {event.event_type}: {e}")
+
+    def _run(self) -> None:
+        while True:
+            event = self._queue.get()
+            if event is _STOP:
+                return
+            self._invoke(event)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def close(self) -> None:
+        """Stop the worker after it drains events already queued."""
+        if self._queue is None:
+            return
+        while True:
+            try:
+                self._queue.put(_STOP, timeout=0.1)
+                return
+            except queue.Full:
+                # Make room for the sentinel; the subscriber is going away anyway
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'event_type': self.event_type,
+            'callback': getattr(self.callback, '__qualname__', repr(self.callback)),
+            'dispatch': self.dispatch,
+            'drop_policy': self.drop_policy if self._queue is not None else None,
+            'queue_depth': self.queue_depth,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'errors': self.errors,
+        }
+
 
 class EventBus:
     """Thread-safe event bus for agent communication."""
 
-    def __init__(self, enable_mesh: bool = False):
-        self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
+    def __init__(self, enable_mesh: bool = False, max_history: int = 1000):
+        # event_type -> immutable tuple of subscriptions (copy-on-write)
+        self._subscribers: Dict[str, Tuple[_Subscription, ...]] = {}
         self._lock = threading.RLock()
-        self._event_history: List[AgentEvent] = []
-        self._max_history = 1000
+        self._event_history: deque = deque(maxlen=max_history)
         self.enable_mesh = enable_mesh
 
         # Optional mesh integration
         self._capability_registry = None
         self._mesh_observer = None
 
-    def subscribe(self, event_type: str, callback: Callable[[AgentEvent], Any]):
+        # Publish metrics
+        self._metrics_lock = threading.Lock()
+        self._published = 0
+        self._publish_time_total = 0.0
+        self._publish_time_max = 0.0
+        self._recent_latencies: deque = deque(maxlen=1024)
+        self._recent_publishes: deque = deque(maxlen=1024)
+
+    @property
+    def _max_history(self) -> int:
+        return self._event_history.maxlen
+
+    @_max_history.setter
+    def _max_history(self, value: int):
+        with self._lock:
+            self._event_history = deque(self._event_history, maxlen=value)
+
+    def subscribe(
+        self,
+        event_type: str,
+        callback: Callable[[AgentEvent], Any],
+        dispatch: str = DISPATCH_SYNC,
+        queue_size: int = 1000,
+        drop_policy: str = DROP_OLDEST,
+        block_timeout: float = 1.0,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
+        """Subscribe a callback to an event type.
+
+        Args:
+            event_type: Event type to receive
+            callback: Handler called with each AgentEvent
+            dispatch: "sync" to call on the publishing thread, "queued" to
+                deliver through a private bounded queue and worker thread
+            queue_size: Queue capacity for queued dispatch
+            drop_policy: What to do when the queue is full: "drop_oldest",
+                "drop_newest", or "block" (wait up to block_timeout, then drop)
+            block_timeout: Maximum publisher wait for the "block" policy
+            loop: Event loop on which to schedule coroutine results
+        """
         with self._lock:
-            if callback not in self._subscribers[event_type]:
-                self._subscribers[event_type].append(callback)
+            current = self._subscribers.get(event_type, ())
+            if any(sub.callback == callback for sub in current):
+                return
+            subscription = _Subscription(
+                event_type, callback, dispatch, queue_size, drop_policy, block_timeout, loop
+            )
+            self._subscribers[event_type] = current + (subscription,)
 
     def unsubscribe(self, event_type: str, callback: Callable[[AgentEvent], Any]):
         with self._lock:
-            if callback in self._subscribers[event_type]:
-                self._subscribers[event_type].remove(callback)
+            current = self._subscribers.get(event_type, ())
+            remaining = tuple(sub for sub in current if sub.callback != callback)
+            if len(remaining) == len(current):
+                return
+            for sub in current:
+                if sub.callback == callback:
+                    sub.close()
+            if remaining:
+                self._subscribers[event_type] = remaining
+            else:
+                del self._subscribers[event_type]
 
     def publish(self, event: AgentEvent):
         """Publish an event to all subscribers with full error handling."""
-        with self._lock:
-            # Add to history
-            self._event_history.append(event)
-            if len(self._event_history) > self._max_history:
-                self._event_history.pop(0)
-            
-            # Get subscribers
-            subscribers = self._subscribers.get(event.event_type, [])
-            
-            if not subscribers:
-                logger.debug(f"No subscribers for {event.event_type}")
-                return
-            
+        start = time.perf_counter()
+
+        # deque.append with maxlen is atomic; no lock on the hot path
+        self._event_history.append(event)
+        subscribers = self._subscribers.get(event.event_type, ())
+
+        if not subscribers:
+            logger.debug(f"No subscribers for {event.event_type}")
+        else:
             logger.debug(f"Publishing {event.event_type} to {len(subscribers)} subscribers")
-        
-        # Call subscribers (outside lock to prevent deadlock)
-        for callback in subscribers:
-            try:
-                callback(event)
-            except Exception as e:
-                logger.error(f"Error in event handler for {event.event_type}: {e}")
-                # Continue with other subscribers - don't break the chain
-                continue
-                
+            # A failing handler is logged by deliver() and never breaks the chain
+            for subscription in subscribers:
+                subscription.deliver(event)
+
+        elapsed = time.perf_counter() - start
+        with self._metrics_lock:
+            self._published += 1
+            self._publish_time_total += elapsed
+            if elapsed > self._publish_time_max:
+                self._publish_time_max = elapsed
+            self._recent_latencies.append(elapsed)
+            self._recent_publishes.append(start)
+
     def get_history(self, event_type: Optional[str] = None, limit: int = 100):
-        with self._lock:
-            if event_type:
-                events = [e for e in self._event_history if e.event_type == event_type]
-            else:
-                events = list(self._event_history)
-            return events[-limit:]
+        """Get recent events, most recent first."""
+        events = list(self._event_history)
+        events.reverse()
+        if event_type:
+            events = [e for e in events if e.event_type == event_type]
+        return events[:limit]
 
     def clear_history(self):
-        with self._lock:
-            self._event_history.clear()
+        self._event_history.clear()
 
     def set_mesh_integration(self, capability_registry, mesh_observer):
         self._capability_registry = capability_registry
@@ -82,9 +267,50 @@ class EventBus:
         logger.info("Mesh integration enabled")
 
     def get_subscriber_count(self, event_type: str) -> int:
+        return len(self._subscribers.get(event_type, ()))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get publish latency/throughput and per-subscriber delivery stats."""
+        with self._metrics_lock:
+            latencies = sorted(self._recent_latencies)
+            publishes = list(self._recent_publishes)
+            published = self._published
+            total = self._publish_time_total
+            worst = self._publish_time_max
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+        window = publishes[-1] - publishes[0] if len(publishes) > 1 else 0.0
+        subscribers: List[Dict[str, Any]] = [
+            sub.stats()
+            for subs in list(self._subscribers.values())
+            for sub in subs
+        ]
+        return {
+            'published': published,
+            'history_size': len(self._event_history),
+            'publish_latency_ms': {
+                'mean': (total / published * 1000) if published else 0.0,
+                'p50': percentile(0.50),
+                'p95': percentile(0.95),
+                'p99': percentile(0.99),
+                'max': worst * 1000,
+            },
+            'throughput_per_sec': ((len(publishes) - 1) / window) if window > 0 else 0.0,
+            'dropped': sum(s['dropped'] for s in subscribers),
+            'subscribers': subscribers,
+        }
+
+    def close(self):
+        """Stop all queued-dispatch workers."""
         with self._lock:
-            return len(self._subscribers.get(event_type, []))
+            for subs in self._subscribers.values():
+                for sub in subs:
+                    sub.close()
 
 
 __all__ = ['EventBus']
-# DOCGEN:LLM-FIRST@v4
\ No newline at end of file
+# DOCGEN:LLM-FIRST@v4
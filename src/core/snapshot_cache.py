@@ -0,0 +1,321 @@
+"""Snapshot Cache - parsed templates, workflows, agents and tone config held in memory.
+
+Read endpoints used to rebuild ``TemplateRegistry`` or ``yaml.safe_load`` the
+same files on every request. ``SnapshotCache`` parses them once into an
+immutable ``ContentSnapshot`` versioned by a content hash of its source files,
+and swaps in a new snapshot atomically when those files change (detected by a
+throttled stat check, or immediately when ``HotReloadMonitor`` publishes
+``config.reloaded``).
+
+Key Features:
+- One parse per content version, shared by all web and MCP routes
+- Per-section content hashes for ETag / If-None-Match handling
+- Memoized derived payloads (e.g. response bodies) per snapshot
+- Lock-free reads; rebuilds serialized behind a lock
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+from ..utils.path_utils import get_repo_root
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ("templates", "workflows", "agents", "tone")
+
+
+def _read_yaml(path: Path) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@dataclass(frozen=True)
+class ContentSnapshot:
+    """Immutable parsed view of the template and config files.
+
+    Payloads are shared between requests and must be treated as read-only;
+    callers that need to modify one should copy it first.
+
+    Attributes:
+        version: Hash over all section hashes
+        section_hashes: Content hash per section (see ``SECTIONS``)
+        template_registry: Loaded TemplateRegistry, or None if templates failed to load
+        workflows_document: Full parsed templates/workflows.yaml
+        agents_document: Full parsed config/agents.yaml
+        tone: Parsed config/tone.json
+        built_at: Epoch seconds when the snapshot was built
+    """
+    version: str
+    section_hashes: Dict[str, str]
+    template_registry: Any = None
+    workflows_document: Dict[str, Any] = field(default_factory=dict)
+    agents_document: Dict[str, Any] = field(default_factory=dict)
+    tone: Dict[str, Any] = field(default_factory=dict)
+    built_at: float = field(default_factory=time.time)
+    _memo: Dict[Any, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def workflows(self) -> Dict[str, Any]:
+        return self.workflows_document.get("workflows", {}) or {}
+
+    @property
+    def agents(self) -> Dict[str, Any]:
+        return self.agents_document.get("agents", {}) or {}
+
+    @property
+    def templates(self) -> Dict[str, Any]:
+        if self.template_registry is None:
+            return {}
+        return self.template_registry.templates
+
+    def etag(self, *sections: str) -> str:
+        """Strong ETag for a response built from the given sections.
+
+        Args:
+            sections: Section names; all sections if omitted
+
+        Returns:
+            Quoted ETag value
+        """
+        names = sections or SECTIONS
+        digest = hashlib.sha256(
+            "|".join(f"{name}:{self.section_hashes.get(name, '')}" for name in names).encode()
+        ).hexdigest()[:20]
+        return f'"{digest}"'
+
+    def memo(self, key: Any, builder: Callable[[], Any]) -> Any:
+        """Compute a derived value once per snapshot.
+
+        Args:
+            key: Hashable cache key (e.g. endpoint name and arguments)
+            builder: Zero-argument function producing the value
+
+        Returns:
+            Cached or freshly built value
+        """
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = builder()
+            return self._memo.setdefault(key, value)
+
+
+class SnapshotCache:
+    """Process-wide holder of the current ContentSnapshot."""
+
+    def __init__(
+        self,
+        templates_dir: Path = Path("templates"),
+        config_dir: Path = Path("config"),
+        check_interval: float = 2.0
+    ):
+        """Initialize cache (the first snapshot is built lazily).
+
+        Args:
+            templates_dir: Directory with *_templates.yaml and workflows.yaml
+            config_dir: Directory with agents.yaml and tone.json
+            check_interval: Minimum seconds between file change checks on read
+        """
+        self.templates_dir = Path(templates_dir)
+        self.config_dir = Path(config_dir)
+        self.check_interval = check_interval
+
+        self._snapshot: Optional[ContentSnapshot] = None
+        self._signature: Optional[Tuple] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self._builds = 0
+
+    # ------------------------------------------------------------------ sources
+
+    def _registry_dir(self) -> Path:
+        # Same resolution rule as TemplateRegistry: relative to the repo root
+        if self.templates_dir.is_absolute():
+            return self.templates_dir
+        try:
+            return get_repo_root() / self.templates_dir
+        except FileNotFoundError:
+            return Path.cwd() / self.templates_dir
+
+    def _section_files(self) -> Dict[str, List[Path]]:
+        registry_dir = self._registry_dir()
+        return {
+            "templates": sorted(registry_dir.glob("*_templates.yaml")) if registry_dir.exists() else [],
+            "workflows": [self.templates_dir / "workflows.yaml"],
+            "agents": [self.config_dir / "agents.yaml"],
+            "tone": [self.config_dir / "tone.json"],
+        }
+
+    @staticmethod
+    def _stat_signature(files: Dict[str, List[Path]]) -> Tuple:
+        signature = []
+        for section in SECTIONS:
+            for path in files[section]:
+                try:
+                    st = path.stat()
+                    signature.append((str(path), st.st_mtime_ns, st.st_size))
+                except OSError:
+                    signature.append((str(path), None, None))
+        return tuple(signature)
+
+    @staticmethod
+    def _hash_files(paths: List[Path]) -> str:
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(str(path.name).encode())
+            try:
+                digest.update(path.read_bytes())
+            except OSError:
+                digest.update(b"<missing>")
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------------ build
+
+    def _build(self, files: Dict[str, List[Path]], section_hashes: Dict[str, str]) -> ContentSnapshot:
+        previous = self._snapshot
+
+        def reuse(section: str) -> bool:
+            return previous is not None and previous.section_hashes.get(section) == section_hashes[section]
+
+        if reuse("templates"):
+            registry = previous.template_registry
+        else:
+            registry = None
+            try:
+                from .template_registry import TemplateRegistry
+                registry = TemplateRegistry(self._registry_dir())
+            except Exception as e:
+                logger.warning(f"Failed to load templates for snapshot: {e}")
+
+        loaded = {}
+        for section, attr, loader in (
+            ("workflows", "workflows_document", _read_yaml),
+            ("agents", "agents_document", _read_yaml),
+            ("tone", "tone", _read_json),
+        ):
+            if reuse(section):
+                loaded[attr] = getattr(previous, attr)
+                continue
+            path = files[section][0]
+            try:
+                loaded[attr] = loader(path) if path.exists() else {}
+            except Exception as e:
+                logger.error(f"Error loading {path} for snapshot: {e}")
+                loaded[attr] = {}
+
+        version = hashlib.sha256(
+            "|".join(section_hashes[s] for s in SECTIONS).encode()
+        ).hexdigest()[:16]
+        self._builds += 1
+        return ContentSnapshot(
+            version=version,
+            section_hashes=dict(section_hashes),
+            template_registry=registry,
+            **loaded
+        )
+
+    def refresh(self, force: bool = False) -> ContentSnapshot:
+        """Rebuild the snapshot if any source file changed.
+
+        Args:
+            force: Re-hash file contents even if stat info is unchanged
+
+        Returns:
+            Current snapshot (new or unchanged)
+        """
+        with self._lock:
+            files = self._section_files()
+            signature = self._stat_signature(files)
+            self._last_check = time.monotonic()
+            if not force and self._snapshot is not None and signature == self._signature:
+                return self._snapshot
+
+            section_hashes = {section: self._hash_files(files[section]) for section in SECTIONS}
+            current = self._snapshot
+            if current is None or current.section_hashes != section_hashes:
+                # Single reference assignment: readers see old or new, never partial
+                self._snapshot = self._build(files, section_hashes)
+                if current is not None:
+                    logger.info(f"Content snapshot updated {current.version} -> {self._snapshot.version}")
+            self._signature = signature
+            return self._snapshot
+
+    def get(self) -> ContentSnapshot:
+        """Get the current snapshot, checking for file changes at most every check_interval."""
+        snapshot = self._snapshot
+        if snapshot is None or time.monotonic() - self._last_check >= self.check_interval:
+            return self.refresh()
+        return snapshot
+
+    def handle_reload(self, event: Any = None) -> None:
+        """Reload hook for HotReloadMonitor callbacks and ``config.reloaded`` events."""
+        try:
+            self.refresh(force=True)
+        except Exception as e:
+            logger.error(f"Failed to refresh content snapshot: {e}", exc_info=True)
+
+    def attach(self, event_bus: Any) -> None:
+        """Refresh whenever HotReloadMonitor publishes on this event bus.
+
+        Args:
+            event_bus: EventBus receiving ``config.reloaded`` events
+        """
+        event_bus.subscribe("config.reloaded", self.handle_reload)
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "built_at": snapshot.built_at if snapshot else None,
+            "builds": self._builds,
+            "section_hashes": dict(snapshot.section_hashes) if snapshot else {},
+        }
+
+
+# Global instance
+_snapshot_cache: Optional[SnapshotCache] = None
+_snapshot_cache_lock = threading.Lock()
+
+
+def get_snapshot_cache() -> SnapshotCache:
+    """Get the process-wide SnapshotCache."""
+    global _snapshot_cache
+    if _snapshot_cache is None:
+        with _snapshot_cache_lock:
+            if _snapshot_cache is None:
+                _snapshot_cache = SnapshotCache()
+    return _snapshot_cache
+
+
+def get_content_snapshot() -> ContentSnapshot:
+    """Get the current ContentSnapshot from the process-wide cache."""
+    return get_snapshot_cache().get()
+
+
+def set_snapshot_cache(cache: Optional[SnapshotCache]) -> None:
+    """Replace the process-wide SnapshotCache (tests, custom directories)."""
+    global _snapshot_cache
+    _snapshot_cache = cache
+
+
+__all__ = [
+    "ContentSnapshot",
+    "SnapshotCache",
+    "SECTIONS",
+    "get_snapshot_cache",
+    "get_content_snapshot",
+    "set_snapshot_cache",
+]
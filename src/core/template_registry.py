@@ -54,6 +54,98 @@ class TemplateSchema:
         return errors
 
 
+PLACEHOLDER_PATTERN = re.compile(r'\{\{(\w+)\}\}')
+
+
+class CompiledTemplate:
+    """Template content pre-split into literal text and placeholder slots.
+
+    Each entry is one template line (or a run of consecutive lines without
+    slots, merged into a single literal). A dynamic line alternates literal
+    and slot parts, ``literals[0] + value(keys[0]) + literals[1] + ...``, and
+    carries the optional keys whose absence removes the line. Rendering is a
+    single pass over the entries followed by one ``''.join``.
+
+    Placeholders that are not in the schema are kept as literal text, and a
+    key listed as both required and optional is treated as required.
+    """
+
+    __slots__ = ('entries', 'required', 'optional')
+
+    def __init__(self, content: str, required: List[str], optional: List[str]):
+        self.required = tuple(dict.fromkeys(required))
+        required_set = set(self.required)
+        self.optional = tuple(k for k in dict.fromkeys(optional) if k not in required_set)
+        optional_set = set(self.optional)
+
+        # (optional_keys, literals, keys); static runs have keys == ()
+        self.entries: List[tuple] = []
+        static_run: List[str] = []
+
+        for line in content.split('\n'):
+            literals: List[str] = []
+            keys: List[str] = []
+            line_optional: List[str] = []
+            pos = 0
+            if '{{' in line:
+                for match in PLACEHOLDER_PATTERN.finditer(line):
+                    key = match.group(1)
+                    if key in optional_set:
+                        line_optional.append(key)
+                    elif key not in required_set:
+                        continue
+                    literals.append(line[pos:match.start()])
+                    keys.append(key)
+                    pos = match.end()
+
+            if not keys:
+                static_run.append(line)
+                continue
+
+            if static_run:
+                self.entries.append(((), ('\n'.join(static_run),), ()))
+                static_run = []
+            literals.append(line[pos:])
+            self.entries.append((tuple(dict.fromkeys(line_optional)), tuple(literals), tuple(keys)))
+
+        if static_run:
+            self.entries.append(((), ('\n'.join(static_run),), ()))
+
+    def render(self, data: Dict[str, Any]) -> str:
+        """Substitute data in one pass.
+
+        Required slots render ``str(data.get(key, ""))``. A line containing an
+        optional slot whose value is falsy is dropped entirely.
+        """
+        values = {key: str(data.get(key, "")) for key in self.required}
+        missing = set()
+        for key in self.optional:
+            value = data.get(key, "")
+            if value:
+                values[key] = str(value)
+            else:
+                missing.add(key)
+
+        out: List[str] = []
+        append = out.append
+        first = True
+        for optional_keys, literals, keys in self.entries:
+            if optional_keys and missing and not missing.isdisjoint(optional_keys):
+                continue
+            if not first:
+                append('\n')
+            first = False
+            if not keys:
+                append(literals[0])
+                continue
+            for i, key in enumerate(keys):
+                append(literals[i])
+                append(values[key])
+            append(literals[-1])
+
+        return ''.join(out)
+
+
 @dataclass
 class Template:
     """Registered template with metadata and precompiled patterns."""
@@ -65,6 +157,8 @@ class Template:
     version: str = "1.0"
     _placeholder_pattern: Optional[re.Pattern] = field(default=None, init=False, repr=False)
     _compiled_placeholders: Optional[Set[str]] = field(default=None, init=False, repr=False)
+    _compiled: Optional[CompiledTemplate] = field(default=None, init=False, repr=False)
+    _compiled_key: Optional[tuple] = field(default=None, init=False, repr=False)
     
     def __post_init__(self):
         """Precompile regex patterns after initialization."""
@@ -73,9 +167,26 @@ class Template:
     def precompile(self):
         """Precompile template patterns for faster rendering."""
         if self._placeholder_pattern is None:
-            self._placeholder_pattern = re.compile(r'\{\{(\w+)\}\}')
+            self._placeholder_pattern = PLACEHOLDER_PATTERN
         if self._compiled_placeholders is None:
             self._compiled_placeholders = self.extract_placeholders()
+        self.compiled()
+    
+    def compiled(self) -> CompiledTemplate:
+        """Get the compiled segment list, recompiling if content or schema changed."""
+        key = (
+            self.template_content,
+            tuple(self.schema.required_placeholders),
+            tuple(self.schema.optional_placeholders)
+        )
+        if self._compiled is None or self._compiled_key != key:
+            self._compiled = CompiledTemplate(
+                self.template_content,
+                self.schema.required_placeholders,
+                self.schema.optional_placeholders
+            )
+            self._compiled_key = key
+        return self._compiled
     
     def extract_placeholders(self) -> Set[str]:
         """Extract all placeholders from template content (cached)."""
@@ -84,7 +195,7 @@ class Template:
         
         # Match {{placeholder}} pattern using precompiled regex
         if self._placeholder_pattern is None:
-            self._placeholder_pattern = re.compile(r'\{\{(\w+)\}\}')
+            self._placeholder_pattern = PLACEHOLDER_PATTERN
         
         matches = self._placeholder_pattern.findall(self.template_content)
         return set(matches)
@@ -146,30 +257,32 @@ class Template:
                     "\n".join(f"  - {e}" for e in errors)
                 )
         
-        # Render template
-        result = self.template_content
-        
-        # Replace required placeholders
-        for key in self.schema.required_placeholders:
-            placeholder = f"{{{{{key}}}}}"
-            value = data.get(key, "")
-            result = result.replace(placeholder, str(value))
-        
-        # Replace optional placeholders (remove if not provided)
-        for key in self.schema.optional_placeholders:
-            placeholder = f"{{{{{key}}}}}"
-            value = data.get(key, "")
-            if value:
-                result = result.replace(placeholder, str(value))
-            else:
-                # Remove line with empty optional placeholder
-                lines = result.split('\n')
-                result = '\n'.join(
-                    line for line in lines
-                    if placeholder not in line
-                )
+        return self.compiled().render(data)
 
-        return result
+    def render_many(self, data_list: List[Dict[str, Any]], strict: bool = True) -> List[str]:
+        """Render this template once per data dict.
+        
+        Args:
+            data_list: Data dicts to render
+            strict: If True, fail on the first dict that does not match the schema
+            
+        Returns:
+            Rendered strings, in input order
+            
+        Raises:
+            ValueError: If strict=True and any data dict fails validation
+        """
+        if strict:
+            for index, data in enumerate(data_list):
+                errors = self.schema.validate_data(data)
+                if errors:
+                    raise ValueError(
+                        f"Template data validation failed for '{self.name}' (item {index}):\n" +
+                        "\n".join(f"  - {e}" for e in errors)
+                    )
+        
+        compiled = self.compiled()
+        return [compiled.render(data) for data in data_list]
 
     def validate_output(self, output: str) -> List[str]:
         """Validate that rendered output contains required sections.
@@ -462,6 +575,7 @@ def list_templates(template_type: Optional[TemplateType] = None) -> List[Templat
 
 
 __all__ = [
+    "CompiledTemplate",
     "Template",
     "TemplateSchema",
     "TemplateType",
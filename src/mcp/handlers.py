@@ -244,33 +244,27 @@ async def handle_workflow_status(params: Dict[str, Any]) -> Dict[str, Any]:
     # Get job engine
     job_engine = get_job_engine()
     
-    # Get job details
-    if hasattr(job_engine, '_jobs'):
-        job = job_engine._jobs.get(job_id)
-        if not job:
-            raise ValueError(f"Job not found: {job_id}")
-        
-        # Convert job to dict
-        job_dict = job.to_dict() if hasattr(job, 'to_dict') else {
-            "id": job_id,
-            "status": getattr(job, 'status', 'unknown'),
-            "workflow_name": getattr(job, 'workflow_name', 'unknown'),
-        }
-        
-        return {
-            "job_id": job_id,
-            "status": job_dict.get("status", "unknown"),
-            "workflow_name": job_dict.get("workflow_name"),
-            "progress": job_dict.get("progress", 0),
-            "current_step": job_dict.get("current_step"),
-            "pipeline": job_dict.get("pipeline", []),
-            "started_at": job_dict.get("started_at"),
-            "completed_at": job_dict.get("completed_at"),
-            "error": job_dict.get("error"),
-            "uri": create_resource_uri(ResourceType.JOB, job_id)
-        }
+    # Get job details (from memory, or storage for jobs finished before a restart)
+    if not hasattr(job_engine, 'get_job_state'):
+        raise ValueError("Job engine not properly configured")
+    
+    job = job_engine.get_job_state(job_id)
+    if not job:
+        raise ValueError(f"Job not found: {job_id}")
     
-    raise ValueError("Job engine not properly configured")
+    metadata = job.metadata
+    return {
+        "job_id": job_id,
+        "status": metadata.status.value,
+        "workflow_name": metadata.workflow_id,
+        "progress": metadata.progress,
+        "current_step": metadata.current_step,
+        "pipeline": [step.to_dict() for step in job.steps.values()],
+        "started_at": metadata.started_at.isoformat() if metadata.started_at else None,
+        "completed_at": metadata.completed_at.isoformat() if metadata.completed_at else None,
+        "error": metadata.error_message,
+        "uri": create_resource_uri(ResourceType.JOB, job_id)
+    }
 
 
 async def handle_workflow_checkpoint_list(params: Dict[str, Any]) -> Dict[str, Any]:
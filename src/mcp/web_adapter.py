@@ -5,6 +5,7 @@ ensuring CLI and Web UI communicate through the same protocol.
 """
 
 import logging
+import threading
 from typing import Dict, Any, Optional, List, Union
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Request
@@ -314,20 +315,26 @@ async def handle_job_create(params: Dict[str, Any]) -> Dict[str, Any]:
 
 async def handle_jobs_list(params: Dict[str, Any]) -> Dict[str, Any]:
     """Handle job listing via MCP protocol."""
+    from src.orchestration.job_state import JobStatus
     executor = get_executor()
     
     try:
-        jobs_data = executor.job_engine._jobs
+        status = params.get("status")
+        # Served from the job catalog, so finished jobs are listed after a restart
+        metadata_list = executor.job_engine.list_jobs(
+            status=JobStatus(status) if status else None,
+            limit=params.get("limit"),
+            offset=params.get("offset", 0)
+        )
         
         jobs = []
-        for job_id, job in jobs_data.items():
-            job_dict = job.to_dict() if hasattr(job, 'to_dict') else job
+        for metadata in metadata_list:
             jobs.append({
-                "job_id": job_id,
-                "workflow_name": job_dict.get("workflow_name", "unknown"),
-                "status": job_dict.get("status", "unknown"),
-                "progress": job_dict.get("progress", 0),
-                "started_at": job_dict.get("started_at", ""),
+                "job_id": metadata.job_id,
+                "workflow_name": metadata.workflow_id,
+                "status": metadata.status.value,
+                "progress": metadata.progress,
+                "started_at": metadata.started_at.isoformat() if metadata.started_at else "",
             })
         
         return {"jobs": jobs}
@@ -336,6 +343,14 @@ async def handle_jobs_list(params: Dict[str, Any]) -> Dict[str, Any]:
         return {"jobs": []}
 
 
+def _require_job(executor, job_id: str):
+    """Job state from the engine (memory, then storage), or 404."""
+    job = executor.job_engine.get_job_state(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
 async def handle_job_get(params: Dict[str, Any]) -> Dict[str, Any]:
     """Handle job detail retrieval via MCP protocol."""
     executor = get_executor()
@@ -345,10 +360,7 @@ async def handle_job_get(params: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError("job_id is required")
     
     try:
-        job = executor.job_engine._jobs.get(job_id)
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-        
+        job = _require_job(executor, job_id)
         return job.to_dict() if hasattr(job, 'to_dict') else job
     except Exception as e:
         logger.error(f"Failed to get job {job_id}: {e}")
@@ -364,9 +376,7 @@ async def handle_job_pause(params: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError("job_id is required")
 
     # Check if job exists
-    job = executor.job_engine._jobs.get(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    _require_job(executor, job_id)
 
     try:
         executor.job_engine.pause_job(job_id)
@@ -385,9 +395,7 @@ async def handle_job_resume(params: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError("job_id is required")
 
     # Check if job exists
-    job = executor.job_engine._jobs.get(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    _require_job(executor, job_id)
 
     try:
         executor.job_engine.resume_job(job_id)
@@ -406,9 +414,7 @@ async def handle_job_cancel(params: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError("job_id is required")
 
     # Check if job exists
-    job = executor.job_engine._jobs.get(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    _require_job(executor, job_id)
 
     try:
         executor.job_engine.cancel_job(job_id)
@@ -517,11 +523,37 @@ async def handle_topics_discover_web(params: Dict[str, Any]) -> Dict[str, Any]:
     result = await handle_topics_discover(params)
     return result
 
+_workflow_visualizer = None
+_workflow_visualizer_hash: Optional[str] = None
+_workflow_visualizer_lock = threading.Lock()
+
+
+def _get_workflow_visualizer():
+    """Get the shared WorkflowVisualizer, kept in sync with the content snapshot.
+    
+    Workflow definitions come from the already-parsed snapshot instead of
+    re-reading workflows.yaml per request, and execution state now persists
+    between the metrics and reset handlers.
+    """
+    global _workflow_visualizer, _workflow_visualizer_hash
+    from src.core.snapshot_cache import get_content_snapshot
+    from src.visualization.workflow_visualizer import WorkflowVisualizer
+
+    snapshot = get_content_snapshot()
+    workflows_hash = snapshot.section_hashes.get("workflows")
+    with _workflow_visualizer_lock:
+        if _workflow_visualizer is None:
+            _workflow_visualizer = WorkflowVisualizer(workflows=snapshot.workflows_document)
+        elif _workflow_visualizer_hash != workflows_hash:
+            _workflow_visualizer.set_workflows(snapshot.workflows_document)
+        _workflow_visualizer_hash = workflows_hash
+        return _workflow_visualizer
+
+
 async def handle_workflow_profiles(params: Dict[str, Any]) -> Dict[str, Any]:
     """Handle workflow profiles listing."""
     try:
-        from src.visualization.workflow_visualizer import WorkflowVisualizer
-        visualizer = WorkflowVisualizer()
+        visualizer = _get_workflow_visualizer()
         profiles = visualizer.workflows.get('profiles', {})
         return {
             "profiles": [
@@ -546,8 +578,7 @@ async def handle_workflow_visual(params: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError("profile_name is required")
     
     try:
-        from src.visualization.workflow_visualizer import WorkflowVisualizer
-        visualizer = WorkflowVisualizer()
+        visualizer = _get_workflow_visualizer()
         graph = visualizer.create_visual_graph(profile_name)
         return graph
     except Exception as e:
@@ -562,8 +593,7 @@ async def handle_workflow_metrics(params: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError("profile_name is required")
     
     try:
-        from src.visualization.workflow_visualizer import WorkflowVisualizer
-        visualizer = WorkflowVisualizer()
+        visualizer = _get_workflow_visualizer()
         metrics = visualizer.get_execution_metrics(profile_name)
         return metrics
     except Exception as e:
@@ -578,8 +608,7 @@ async def handle_workflow_reset(params: Dict[str, Any]) -> Dict[str, Any]:
         raise ValueError("profile_name is required")
     
     try:
-        from src.visualization.workflow_visualizer import WorkflowVisualizer
-        visualizer = WorkflowVisualizer()
+        visualizer = _get_workflow_visualizer()
         visualizer.reset_execution_state(profile_name)
         return {"success": True, "profile": profile_name}
     except Exception as e:
@@ -2,17 +2,22 @@
 
 This module provides:
 - LRU caching with TTL and memory limits
+- A second-level cache shared by worker processes (SQLite or Redis)
 - Batch processing for LLM requests
 - Connection pooling for HTTP clients (sync and async)
 """
 
 from .cache import cached, LRUCache
+from .shared_cache import SharedCache, SQLiteCacheBackend, get_shared_cache
 from .batch import BatchProcessor, LLMBatchProcessor
 from .connection_pool import ConnectionPool, AsyncConnectionPool
 
 __all__ = [
     'cached',
     'LRUCache',
+    'SharedCache',
+    'SQLiteCacheBackend',
+    'get_shared_cache',
     'BatchProcessor',
     'LLMBatchProcessor',
     'ConnectionPool',
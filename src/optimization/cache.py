@@ -8,6 +8,8 @@ import pickle
 import sys
 from typing import Any, Callable, Optional, Tuple
 
+from .shared_cache import get_shared_cache
+
 class LRUCache:
     """Thread-safe LRU cache with TTL and memory management."""
     
@@ -129,13 +131,16 @@ class LRUCache:
             }
 
 
-def cached(ttl: int = 3600, max_size: int = 1000, max_memory_mb: int = 500):
+def cached(ttl: int = 3600, max_size: int = 1000, max_memory_mb: int = 500, shared: bool = False):
     """Decorator to cache function results with memory limits.
     
     Args:
         ttl: Time-to-live in seconds (default: 1 hour)
         max_size: Maximum cache entries (default: 1000)
         max_memory_mb: Maximum memory in MB (default: 500MB)
+        shared: Consult the process-wide shared cache tier (see
+            ``shared_cache.get_shared_cache``) after a local miss. Only
+            useful when arguments hash the same in every process.
         
     Returns:
         Decorated function with caching
@@ -181,9 +186,20 @@ def cached(ttl: int = 3600, max_size: int = 1000, max_memory_mb: int = 500):
             if result is not None:
                 return result
             
+            # Then the tier shared with other worker processes
+            tier = get_shared_cache() if shared else None
+            shared_key = f"fn:{func.__module__}.{key}"
+            if tier is not None:
+                result = tier.get(shared_key)
+                if result is not None:
+                    cache.set(key, result)
+                    return result
+            
             # Call function and cache result
             result = func(*args, **kwargs)
             cache.set(key, result)
+            if tier is not None and result is not None:
+                tier.set(shared_key, result, ttl=ttl)
             return result
         
         # Attach cache for inspection
@@ -5,12 +5,11 @@ from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, Any
 import asyncio
 
-try:
-    import aiohttp
-    AIOHTTP_AVAILABLE = True
-except ImportError:
-    AIOHTTP_AVAILABLE = False
-    aiohttp = None
+from src.utils.lazy_import import LazyModule, module_available
+
+# aiohttp is only needed by AsyncConnectionPool; defer its (slow) import
+AIOHTTP_AVAILABLE = module_available("aiohttp")
+aiohttp = LazyModule("aiohttp") if AIOHTTP_AVAILABLE.installed else None
 
 
 class ConnectionPool:
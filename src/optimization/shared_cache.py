@@ -0,0 +1,458 @@
+"""Second-level cache shared by every worker process.
+
+``LRUCache``, ``LLMService``'s response dict and ``EmbeddingService``'s
+vector cache live inside one process. With N uvicorn workers each process
+warms its own copy, so memory grows N-fold and hit rates drop by up to N.
+``SharedCache`` is a second tier consulted after the in-process cache; a
+hit is promoted into the caller's local cache.
+
+The tier talks to a backend through a small Redis-style interface
+(``get``/``mget`` returning bytes, ``set(key, value, ex=seconds)``,
+``delete``, ``exists``, ``ttl``, ``dbsize``, ``flushdb``):
+
+- ``SQLiteCacheBackend`` is the local stand-in. It keeps entries in one
+  SQLite file (``cache_dir/shared_cache.db``) that all processes on the
+  host open, and bounds it by entry count and total bytes, evicting the
+  least recently used entries. Triggers keep both totals in a one-row
+  ``usage`` table, so a write checks the limits without scanning entries.
+  A hit refreshes an entry's recency at most once per ``touch_interval``,
+  and skips the refresh rather than wait for another writer.
+- A ``redis.Redis`` client satisfies the same interface unchanged, for
+  deployments that already run Redis.
+
+Batches go through ``SharedCache.set_many``, which uses the SQLite
+backend's ``mset`` or a Redis pipeline.
+
+Values are pickled by ``SharedCache``; backends only see bytes. Backend
+errors are logged and counted as misses so that a broken shared tier never
+fails a request.
+"""
+
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, ContextManager, Dict, List, Optional, Sequence, Tuple, Union
+
+from src.utils.lazy_import import LazyModule, module_available
+from src.utils.sqlite_store import connect, enable_wal, ensure_schema, immediate_transaction
+
+REDIS_AVAILABLE = module_available("redis")
+redis = LazyModule("redis") if REDIS_AVAILABLE.installed else None
+
+logger = logging.getLogger(__name__)
+
+SHARED_CACHE_FILENAME = "shared_cache.db"
+SCHEMA_VERSION = 2
+
+
+class SQLiteCacheBackend:
+    """Redis-style byte store in a SQLite file, bounded by entries and bytes."""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        max_entries: int = 100000,
+        max_bytes: int = 256 * 1024 * 1024,
+        touch_interval: float = 60.0
+    ):
+        """Initialize backend, creating the database if needed.
+
+        Args:
+            db_path: Path to the SQLite file shared by all processes
+            max_entries: Maximum number of stored entries
+            max_bytes: Maximum total size of stored values
+            touch_interval: Seconds within which a hit does not refresh an
+                entry's recency again, so most reads never write
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _write(self) -> ContextManager[sqlite3.Connection]:
+        # Losing the last commits on power loss is acceptable for a cache
+        return immediate_transaction(self.db_path, synchronous="NORMAL")
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._write() as conn:
+            ensure_schema(conn, SCHEMA_VERSION, ["entries", "usage"], [
+                '''
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL,
+                    used_at REAL NOT NULL
+                )
+                ''',
+                'CREATE INDEX IF NOT EXISTS idx_entries_used ON entries(used_at)',
+                # Running totals kept by triggers, so limits are checked without scanning entries
+                'CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), '
+                'entries INTEGER NOT NULL, bytes INTEGER NOT NULL)',
+                'INSERT OR IGNORE INTO usage (id, entries, bytes) VALUES (0, 0, 0)',
+                '''
+                CREATE TRIGGER IF NOT EXISTS entries_added AFTER INSERT ON entries BEGIN
+                    UPDATE usage SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 0;
+                END
+                ''',
+                '''
+                CREATE TRIGGER IF NOT EXISTS entries_removed AFTER DELETE ON entries BEGIN
+                    UPDATE usage SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 0;
+                END
+                ''',
+                '''
+                CREATE TRIGGER IF NOT EXISTS entries_resized AFTER UPDATE OF size ON entries BEGIN
+                    UPDATE usage SET bytes = bytes + NEW.size - OLD.size WHERE id = 0;
+                END
+                ''',
+            ])
+        enable_wal(self.db_path)
+
+    # ------------------------------------------------------------------ reads
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored under ``key``, or None if missing or expired."""
+        return self.mget([key])[0]
+
+    def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        """Return values for ``keys`` in order; missing or expired keys give None."""
+        if not keys:
+            return []
+        now = time.time()
+        found: Dict[str, bytes] = {}
+        stale: List[str] = []
+        with connect(self.db_path) as conn:
+            for start in range(0, len(keys), 500):
+                chunk = list(keys[start:start + 500])
+                marks = ",".join("?" * len(chunk))
+                for key, value, used_at in conn.execute(
+                    f"SELECT key, value, used_at FROM entries WHERE key IN ({marks}) "
+                    "AND (expires_at IS NULL OR expires_at > ?)",
+                    chunk + [now]
+                ):
+                    found[key] = value
+                    if used_at <= now - self.touch_interval:
+                        stale.append(key)
+        if stale:
+            self._touch(stale, now)
+        return [found.get(key) for key in keys]
+
+    def _touch(self, keys: List[str], now: float) -> None:
+        """Refresh recency for LRU eviction, skipped if another process holds the write lock."""
+        try:
+            with connect(self.db_path, timeout=0) as conn:
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    marks = ",".join("?" * len(chunk))
+                    conn.execute(f"UPDATE entries SET used_at = ? WHERE key IN ({marks})", [now] + chunk)
+        except sqlite3.OperationalError:
+            pass
+
+    def exists(self, *keys: str) -> int:
+        """Number of ``keys`` that are stored and unexpired."""
+        return sum(value is not None for value in self.mget(keys))
+
+    def ttl(self, key: str) -> int:
+        """Seconds until ``key`` expires: -1 without expiry, -2 if missing."""
+        with connect(self.db_path) as conn:
+            row = conn.execute("SELECT expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return -2
+        if row[0] is None:
+            return -1
+        remaining = row[0] - time.time()
+        return int(remaining) if remaining > 0 else -2
+
+    def dbsize(self) -> int:
+        """Number of stored entries, including expired ones not yet purged."""
+        with connect(self.db_path) as conn:
+            return self._usage(conn)[0]
+
+    @staticmethod
+    def _usage(conn: sqlite3.Connection) -> Tuple[int, int]:
+        """Stored entry count and total bytes."""
+        return conn.execute("SELECT entries, bytes FROM usage WHERE id = 0").fetchone()
+
+    # ------------------------------------------------------------------ writes
+
+    def set(self, key: str, value: bytes, ex: Optional[float] = None) -> bool:
+        """Store ``value`` under ``key``, expiring after ``ex`` seconds if given.
+
+        Returns:
+            False if the value alone exceeds ``max_bytes`` and was not stored
+        """
+        return self.mset({key: value}, ex=ex) == 1
+
+    def mset(self, mapping: Dict[str, bytes], ex: Optional[float] = None) -> int:
+        """Store every value in ``mapping`` in one transaction.
+
+        Unlike Redis ``MSET`` this takes an expiry, applied to every value.
+
+        Returns:
+            Number of values stored; values larger than ``max_bytes`` are skipped
+        """
+        now = time.time()
+        expires_at = now + ex if ex else None
+        rows = [
+            (key, sqlite3.Binary(value), len(value), expires_at, now)
+            for key, value in mapping.items() if len(value) <= self.max_bytes
+        ]
+        if not rows:
+            return 0
+        with self._write() as conn:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete skips the usage triggers
+            conn.executemany(
+                "INSERT INTO entries (key, value, size, expires_at, used_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                "expires_at = excluded.expires_at, used_at = excluded.used_at",
+                rows
+            )
+            self._enforce_limits(conn, now)
+        return len(rows)
+
+    def _enforce_limits(self, conn: sqlite3.Connection, now: float) -> None:
+        """Purge expired entries, then least recently used ones, until within limits."""
+        count, total = self._usage(conn)
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        count, total = self._usage(conn)
+
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY used_at"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        with self._lock:
+            self.evictions += len(victims)
+
+    def delete(self, *keys: str) -> int:
+        """Remove ``keys``; returns how many existed."""
+        with self._write() as conn:
+            return sum(conn.execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount for key in keys)
+
+    def flushdb(self) -> bool:
+        """Remove every entry."""
+        with self._write() as conn:
+            conn.execute("DELETE FROM entries")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry count, stored bytes and evictions made by this process."""
+        with connect(self.db_path) as conn:
+            count, total = self._usage(conn)
+        return {
+            'backend': 'sqlite',
+            'path': str(self.db_path),
+            'entries': count,
+            'memory_mb': total / (1024 * 1024),
+            'max_entries': self.max_entries,
+            'max_mb': self.max_bytes / (1024 * 1024),
+            'evictions': self.evictions
+        }
+
+
+class SharedCache:
+    """Pickling, namespaced view over a shared backend with hit/miss metrics."""
+
+    def __init__(self, backend: Any, namespace: str = "blogcache", default_ttl: Optional[int] = 86400):
+        """Initialize cache tier.
+
+        Args:
+            backend: Object with the Redis-style interface (``SQLiteCacheBackend``
+                or a ``redis.Redis`` client)
+            namespace: Prefix for every key, so several apps can share a backend
+            default_ttl: Expiry in seconds for entries stored without a ttl (None: never)
+        """
+        self.backend = backend
+        self.namespace = namespace
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, or None on a miss or backend error."""
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """Get values for ``keys`` in one backend round trip."""
+        if not keys:
+            return []
+        try:
+            raw = self.backend.mget([self._key(key) for key in keys])
+            values = [pickle.loads(item) if item is not None else None for item in raw]
+        except Exception as e:
+            logger.warning(f"Shared cache read failed: {e}")
+            self._count(errors=1, misses=len(keys))
+            return [None] * len(keys)
+        hits = sum(value is not None for value in values)
+        self._count(hits=hits, misses=len(keys) - hits)
+        return values
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Store a value; ``ttl`` defaults to ``default_ttl``.
+
+        Returns:
+            True if the backend stored the value
+        """
+        ttl = ttl if ttl is not None else self.default_ttl
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            stored = self.backend.set(self._key(key), data, ex=ttl)
+        except Exception as e:
+            logger.warning(f"Shared cache write failed: {e}")
+            self._count(errors=1)
+            return False
+        self._count(sets=1)
+        return stored is not False
+
+    def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> int:
+        """Store several values in one backend round trip; ``ttl`` as for ``set``.
+
+        Returns:
+            Number of values the backend stored
+        """
+        if not items:
+            return 0
+        ttl = ttl if ttl is not None else self.default_ttl
+        try:
+            data = {self._key(key): pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                    for key, value in items.items()}
+            if isinstance(self.backend, SQLiteCacheBackend):
+                stored = self.backend.mset(data, ex=ttl)
+            else:
+                # Redis MSET takes no expiry; a non-transactional pipeline is still one round trip
+                pipe = self.backend.pipeline(transaction=False)
+                for key, value in data.items():
+                    pipe.set(key, value, ex=ttl)
+                stored = sum(result is not False for result in pipe.execute())
+        except Exception as e:
+            logger.warning(f"Shared cache write failed: {e}")
+            self._count(errors=1)
+            return 0
+        self._count(sets=len(data))
+        return stored
+
+    def delete(self, key: str) -> None:
+        """Remove a value."""
+        try:
+            self.backend.delete(self._key(key))
+        except Exception as e:
+            logger.warning(f"Shared cache delete failed: {e}")
+            self._count(errors=1)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hits, misses and hit rate seen by this process, plus backend usage."""
+        with self._lock:
+            total = self.hits + self.misses
+            stats = {
+                'hits': self.hits,
+                'misses': self.misses,
+                'sets': self.sets,
+                'errors': self.errors,
+                'hit_rate': self.hits / total if total > 0 else 0
+            }
+        if hasattr(self.backend, 'get_stats'):
+            try:
+                stats['backend'] = self.backend.get_stats()
+            except Exception as e:
+                logger.debug(f"Shared cache backend stats unavailable: {e}")
+        return stats
+
+
+_caches: Dict[str, SharedCache] = {}
+_default_cache: Optional[SharedCache] = None
+_registry_lock = threading.Lock()
+
+
+def _create_shared_cache(config: Any) -> Optional[SharedCache]:
+    kind = getattr(config, 'shared_cache', 'none')
+    ttl = getattr(config, 'shared_cache_ttl', 86400)
+    if kind == 'redis':
+        url = getattr(config, 'shared_cache_url', None)
+        if not REDIS_AVAILABLE or not url:
+            logger.warning("Shared cache 'redis' needs the redis package and SHARED_CACHE_URL; using sqlite")
+        else:
+            return SharedCache(redis.Redis.from_url(url), default_ttl=ttl)
+    elif kind != 'sqlite':
+        return None
+    backend = SQLiteCacheBackend(
+        Path(getattr(config, 'cache_dir', './cache')) / SHARED_CACHE_FILENAME,
+        max_entries=getattr(config, 'shared_cache_max_entries', 100000),
+        max_bytes=int(getattr(config, 'shared_cache_max_mb', 256) * 1024 * 1024)
+    )
+    return SharedCache(backend, default_ttl=ttl)
+
+
+def get_shared_cache(config: Any = None) -> Optional[SharedCache]:
+    """Get the shared cache tier, or None if it is disabled.
+
+    With a config, the tier it describes (``shared_cache``: none | sqlite |
+    redis) is created on first use and becomes the process default. Without
+    one, the process default is returned, which is what ``cached(shared=True)``
+    consults.
+    """
+    global _default_cache
+    if config is None:
+        return _default_cache
+    if getattr(config, 'shared_cache', 'none') not in ('sqlite', 'redis'):
+        return None
+    if getattr(config, 'enable_caching', True) is False:
+        return None
+
+    key = f"{getattr(config, 'shared_cache', '')}:{getattr(config, 'shared_cache_url', None)}:{getattr(config, 'cache_dir', '')}"
+    with _registry_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _create_shared_cache(config)
+            if cache is not None:
+                _caches[key] = cache
+        if cache is not None:
+            _default_cache = cache
+        return cache
+
+
+def set_shared_cache(cache: Optional[SharedCache]) -> None:
+    """Set the process default shared cache (None disables it)."""
+    global _default_cache
+    with _registry_lock:
+        _default_cache = cache
+
+
+def reset_shared_caches() -> None:
+    """Forget all shared cache tiers (for tests)."""
+    global _default_cache
+    with _registry_lock:
+        _caches.clear()
+        _default_cache = None
+
+
+__all__ = [
+    'SHARED_CACHE_FILENAME',
+    'SQLiteCacheBackend',
+    'SharedCache',
+    'get_shared_cache',
+    'set_shared_cache',
+    'reset_shared_caches',
+]
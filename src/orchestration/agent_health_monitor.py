@@ -11,6 +11,8 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from collections import deque, defaultdict
 
+from ..utils.metrics_store import MetricsStore, get_metrics_store, series_name
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,14 +32,17 @@ class ExecutionRecord:
 class AgentHealthMonitor:
     """Monitor agent health and track execution metrics."""
     
-    def __init__(self, window_size: int = 100):
+    def __init__(self, window_size: int = 100, metrics_store: Optional[MetricsStore] = None):
         """Initialize health monitor.
         
         Args:
             window_size: Number of recent executions to track per agent
+            metrics_store: Time-series store for long-range analytics
+                (defaults to the process-wide store)
         """
         self.window_size = window_size
         self._lock = threading.RLock()
+        self.metrics_store = metrics_store if metrics_store is not None else get_metrics_store()
         
         # Execution history per agent (sliding window)
         self.execution_history: Dict[str, deque] = defaultdict(
@@ -103,6 +108,8 @@ class AgentHealthMonitor:
             
             # Add to execution history
             self.execution_history[agent_id].append(record)
+            self.metrics_store.record(series_name("health", agent_id, "duration_ms"), duration_ms)
+            self.metrics_store.record(series_name("health", agent_id, "success"), 1.0 if success else 0.0)
             
             # Track failures separately
             if not success and error:
@@ -7,6 +7,8 @@ Provides pause/resume capabilities and state persistence for MCP-compliant agent
 import json
 import time
 import threading
+import zlib
+from collections import namedtuple
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
@@ -14,6 +16,7 @@ from pathlib import Path
 from enum import Enum
 import logging
 from src.core.contracts import AgentEvent
+from .checkpoint_store import CheckpointStore
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +85,11 @@ class WorkflowExecution:
         return execution
 
 
+CheckpointMeta = namedtuple(
+    'CheckpointMeta', ['checkpoint_id', 'job_id', 'step_name', 'timestamp', 'workflow_version']
+)
+
+
 class CheckpointManager:
     """Manages checkpoint execution and state persistence."""
 
@@ -101,6 +109,7 @@ class CheckpointManager:
         self._checkpoint_callbacks: Dict[str, Callable] = {}
         self._approval_callbacks: Dict[str, Callable] = {}
         self._lock = threading.RLock()
+        self._checkpoint_store: Optional[CheckpointStore] = None
         
         # Load persisted executions
         self._load_persisted_executions()
@@ -389,9 +398,47 @@ class CheckpointManager:
     # Simple Checkpoint API (for direct checkpoint management)
     # ========================================================================
 
+    @property
+    def checkpoint_store(self) -> CheckpointStore:
+        """Indexed, content-addressed store behind the simple checkpoint API."""
+        if self._checkpoint_store is None:
+            with self._lock:
+                if self._checkpoint_store is None:
+                    store = CheckpointStore(self.storage_dir)
+                    self._checkpoint_store = store
+                    if store.created:
+                        self._import_legacy_checkpoints()
+        return self._checkpoint_store
+
+    def _import_legacy_checkpoints(self) -> None:
+        """Move per-file checkpoints (``<job_id>/<checkpoint_id>.json``) into the store."""
+        imported = 0
+        for checkpoint_file in sorted(self.storage_dir.glob("*/*.json"), key=lambda p: p.stat().st_mtime):
+            try:
+                with open(checkpoint_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if 'state' not in data:
+                    continue
+                self._checkpoint_store.put(
+                    checkpoint_id=data.get('checkpoint_id', checkpoint_file.stem),
+                    job_id=data.get('job_id', checkpoint_file.parent.name),
+                    step_name=data.get('step_name'),
+                    state=data['state'],
+                    timestamp=data.get('timestamp'),
+                    workflow_version=data.get('workflow_version', '1.0')
+                )
+                checkpoint_file.unlink()
+                imported += 1
+            except Exception as e:
+                logger.warning(f"Failed to import legacy checkpoint {checkpoint_file}: {e}")
+        if imported:
+            logger.info(f"Imported {imported} legacy checkpoint files into the checkpoint store")
+
     def save(self, job_id: str, step_name: str, state: Dict[str, Any]) -> str:
         """Save a checkpoint for a job (simple API for tests/API routes).
 
+        Unchanged parts of the state are shared with earlier checkpoints.
+
         Args:
             job_id: Job identifier
             step_name: Step/checkpoint name
@@ -403,29 +450,20 @@ class CheckpointManager:
         import uuid
         checkpoint_id = f"{step_name}_{int(time.time())}_{uuid.uuid4().hex[:8]}"
 
-        # Create job-specific directory
-        job_dir = self.storage_dir / job_id
-        job_dir.mkdir(parents=True, exist_ok=True)
-
-        # Save checkpoint data
-        checkpoint_data = {
-            "checkpoint_id": checkpoint_id,
-            "job_id": job_id,
-            "step_name": step_name,
-            "state": state,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "workflow_version": "1.0"
-        }
-
-        checkpoint_file = job_dir / f"{checkpoint_id}.json"
-        with open(checkpoint_file, 'w', encoding='utf-8') as f:
-            json.dump(checkpoint_data, f, indent=2)
+        written = self.checkpoint_store.put(
+            checkpoint_id=checkpoint_id,
+            job_id=job_id,
+            step_name=step_name,
+            state=state,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            workflow_version="1.0"
+        )
 
-        logger.info(f"Saved checkpoint {checkpoint_id} for job {job_id}")
+        logger.info(f"Saved checkpoint {checkpoint_id} for job {job_id} ({written} new bytes)")
         return checkpoint_id
 
-    def list(self, job_id: str) -> List[Any]:
-        """List all checkpoints for a job.
+    def list(self, job_id: str) -> List[CheckpointMeta]:
+        """List all checkpoints for a job, oldest first.
 
         Args:
             job_id: Job identifier
@@ -433,34 +471,55 @@ class CheckpointManager:
         Returns:
             List of checkpoint metadata objects
         """
-        job_dir = self.storage_dir / job_id
-        if not job_dir.exists():
-            return []
+        return [
+            CheckpointMeta(
+                checkpoint_id=row['checkpoint_id'],
+                job_id=row['job_id'],
+                step_name=row['step_name'],
+                timestamp=row['timestamp'],
+                workflow_version=row['workflow_version'] or '1.0'
+            )
+            for row in self.checkpoint_store.list(job_id)
+        ]
 
-        checkpoints = []
-        for checkpoint_file in sorted(job_dir.glob("*.json")):
-            try:
-                with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+    def find_job(self, checkpoint_id: str) -> Optional[str]:
+        """Find the job a checkpoint belongs to.
 
-                # Create a simple object with attributes
-                from collections import namedtuple
-                CheckpointMeta = namedtuple('CheckpointMeta',
-                    ['checkpoint_id', 'job_id', 'step_name', 'timestamp', 'workflow_version'])
+        Args:
+            checkpoint_id: Checkpoint identifier
 
-                checkpoint = CheckpointMeta(
-                    checkpoint_id=data.get('checkpoint_id'),
-                    job_id=data.get('job_id', job_id),
-                    step_name=data.get('step_name'),
-                    timestamp=data.get('timestamp'),
-                    workflow_version=data.get('workflow_version', '1.0')
-                )
-                checkpoints.append(checkpoint)
-            except Exception as e:
-                logger.warning(f"Failed to load checkpoint {checkpoint_file}: {e}")
-                continue
+        Returns:
+            Job ID, or None if the checkpoint does not exist
+        """
+        meta = self.checkpoint_store.meta(checkpoint_id)
+        return meta['job_id'] if meta else None
+
+    def load(self, checkpoint_id: str, job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Load a full checkpoint record.
+
+        Args:
+            checkpoint_id: Checkpoint identifier
+            job_id: Optional job identifier the checkpoint must belong to
+
+        Returns:
+            Dict with checkpoint_id, job_id, step_name, state, timestamp and
+            workflow_version, or None if not found
+        """
+        record = self.checkpoint_store.get(checkpoint_id, job_id)
+        if record is None:
+            return None
+        return {
+            "checkpoint_id": record['checkpoint_id'],
+            "job_id": record['job_id'],
+            "step_name": record['step_name'],
+            "state": record['state'],
+            "timestamp": record['timestamp'],
+            "workflow_version": record['workflow_version'] or '1.0'
+        }
 
-        return checkpoints
+    def get_latest_checkpoint(self, job_id: str) -> Optional[str]:
+        """ID of the most recent checkpoint for a job, or None."""
+        return self.checkpoint_store.latest(job_id)
 
     def restore(self, job_id: str, checkpoint_id: str) -> Dict[str, Any]:
         """Restore state from a checkpoint.
@@ -476,24 +535,20 @@ class CheckpointManager:
             FileNotFoundError: If checkpoint not found
             ValueError: If checkpoint data is invalid
         """
-        checkpoint_file = self.storage_dir / job_id / f"{checkpoint_id}.json"
-
-        if not checkpoint_file.exists():
-            raise FileNotFoundError(f"Checkpoint {checkpoint_id} not found for job {job_id}")
-
         try:
-            with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            record = self.checkpoint_store.get(checkpoint_id, job_id)
+        except (OSError, ValueError, zlib.error) as e:
+            raise ValueError(f"Invalid checkpoint data: {e}")
 
-            state = data.get('state')
-            if state is None:
-                raise ValueError(f"Checkpoint {checkpoint_id} has no state data")
+        if record is None:
+            raise FileNotFoundError(f"Checkpoint {checkpoint_id} not found for job {job_id}")
 
-            logger.info(f"Restored checkpoint {checkpoint_id} for job {job_id}")
-            return state
+        state = record.get('state')
+        if state is None:
+            raise ValueError(f"Checkpoint {checkpoint_id} has no state data")
 
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid checkpoint data: {e}")
+        logger.info(f"Restored checkpoint {checkpoint_id} for job {job_id}")
+        return state
 
     def delete(self, job_id: str, checkpoint_id: str) -> bool:
         """Delete a specific checkpoint.
@@ -505,13 +560,11 @@ class CheckpointManager:
         Returns:
             True if deleted, False if not found
         """
-        checkpoint_file = self.storage_dir / job_id / f"{checkpoint_id}.json"
-
-        if not checkpoint_file.exists():
+        if self.checkpoint_store.meta(checkpoint_id, job_id) is None:
             return False
 
         try:
-            checkpoint_file.unlink()
+            self.checkpoint_store.delete([checkpoint_id])
             logger.info(f"Deleted checkpoint {checkpoint_id} for job {job_id}")
             return True
         except Exception as e:
@@ -528,31 +581,23 @@ class CheckpointManager:
         Returns:
             Number of checkpoints deleted
         """
-        job_dir = self.storage_dir / job_id
-        if not job_dir.exists():
-            return 0
-
-        # Get all checkpoint files sorted by modification time (newest first)
-        checkpoint_files = sorted(
-            job_dir.glob("*.json"),
-            key=lambda p: p.stat().st_mtime,
-            reverse=True
-        )
-
-        # Delete old checkpoints beyond keep_last
-        deleted_count = 0
-        for checkpoint_file in checkpoint_files[keep_last:]:
-            try:
-                checkpoint_file.unlink()
-                deleted_count += 1
-            except Exception as e:
-                logger.warning(f"Failed to delete {checkpoint_file}: {e}")
+        rows = self.checkpoint_store.list(job_id)
+        stale = [row['checkpoint_id'] for row in rows[:max(len(rows) - keep_last, 0)]]
 
+        deleted_count = self.checkpoint_store.delete(stale)
         if deleted_count > 0:
             logger.info(f"Cleaned up {deleted_count} old checkpoints for job {job_id}")
 
         return deleted_count
 
+    def cleanup_job(self, job_id: str) -> int:
+        """Delete all checkpoints for a job.
+
+        Returns:
+            Number of checkpoints deleted
+        """
+        return self.cleanup(job_id, keep_last=0)
+
     def cleanup_old_executions(self, max_age_days: int = 30):
         """Clean up old completed executions."""
         cutoff_time = time.time() - (max_age_days * 24 * 3600)
@@ -0,0 +1,336 @@
+"""Checkpoint Store - indexed, content-addressed storage for job checkpoints.
+
+Every checkpoint used to be a complete pretty-printed JSON copy of the job
+state, and listing a job's checkpoints parsed each of those files. The store
+splits the work in two:
+
+- An SQLite index (``checkpoints.db``) holds one row of metadata per
+  checkpoint, so listing, "latest" lookups and cleanup never read payloads.
+- State payloads are stored as a tree of zlib-compressed, content-addressed
+  blobs (``blobs/ab/abcdef....z``). Large dict values become their own blobs,
+  so consecutive checkpoints that differ in one agent's output share every
+  unchanged sub-tree. Blobs are reference-counted and removed with the last
+  checkpoint that uses them.
+
+Restoring a checkpoint is still a single call that returns the full state dict.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.utils.sqlite_store import connect, ensure_schema, immediate_transaction
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "checkpoints.db"
+BLOB_DIRNAME = "blobs"
+# The index references blobs on disk, so it is never dropped on a version change
+SCHEMA_VERSION = 1
+
+# Dict values whose JSON encoding is at least this large are stored as
+# separate blobs (and so deduplicated across checkpoints); smaller ones inline.
+SPLIT_THRESHOLD = 512
+MAX_SPLIT_DEPTH = 4
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class CheckpointStore:
+    """Checkpoint metadata index plus deduplicated blob store."""
+
+    def __init__(self, root: Path, compression_level: int = 6):
+        """Initialize store under root, creating the index if needed.
+
+        Args:
+            root: Directory holding the index database and blob directory
+            compression_level: zlib compression level for blobs
+        """
+        self.root = Path(root)
+        self.blob_dir = self.root / BLOB_DIRNAME
+        self.index_path = self.root / INDEX_FILENAME
+        self.compression_level = compression_level
+        self._lock = threading.RLock()
+
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.created = not self.index_path.exists()
+        self._init_db()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Recreate an empty index if the directory was removed underneath us
+        missing = not self.index_path.exists()
+        if missing:
+            self.blob_dir.mkdir(parents=True, exist_ok=True)
+        with connect(self.index_path, row_factory=sqlite3.Row) as conn:
+            if missing:
+                self._create_schema(conn)
+            yield conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction; BEGIN IMMEDIATE keeps refcounts and blob files consistent across processes."""
+        if not self.index_path.exists():
+            with self._connect():
+                pass
+        with immediate_transaction(self.index_path, row_factory=sqlite3.Row) as conn:
+            yield conn
+
+    def _init_db(self) -> None:
+        with self._lock, self._connect() as conn:
+            self._create_schema(conn)
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> None:
+        ensure_schema(conn, SCHEMA_VERSION, [], [
+            '''
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                checkpoint_id TEXT UNIQUE NOT NULL,
+                job_id TEXT NOT NULL,
+                step_name TEXT,
+                timestamp TEXT,
+                workflow_version TEXT,
+                root_hash TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+            ''',
+            '''
+            CREATE TABLE IF NOT EXISTS checkpoint_blobs (
+                checkpoint_id TEXT NOT NULL,
+                blob_hash TEXT NOT NULL,
+                PRIMARY KEY (checkpoint_id, blob_hash)
+            )
+            ''',
+            '''
+            CREATE TABLE IF NOT EXISTS blobs (
+                blob_hash TEXT PRIMARY KEY,
+                refcount INTEGER NOT NULL,
+                stored_bytes INTEGER NOT NULL
+            )
+            ''',
+            'CREATE INDEX IF NOT EXISTS idx_checkpoints_job ON checkpoints(job_id, seq)',
+        ])
+
+    # ------------------------------------------------------------------ blobs
+
+    def _blob_path(self, blob_hash: str) -> Path:
+        return self.blob_dir / blob_hash[:2] / f"{blob_hash}.z"
+
+    def _put_blob(self, node: Any, written: Dict[str, bytes]) -> str:
+        """Write node's blob unless it is on disk; ``written`` maps hash to encoded data."""
+        data = _encode(node)
+        blob_hash = hashlib.sha256(data).hexdigest()
+        if blob_hash not in written:
+            written[blob_hash] = data
+            self._write_blob(blob_hash, data)
+        return blob_hash
+
+    def _write_blob(self, blob_hash: str, data: bytes) -> int:
+        """Store encoded data under its hash if missing; returns the stored size."""
+        path = self._blob_path(blob_hash)
+        if path.exists():
+            return path.stat().st_size
+        path.parent.mkdir(parents=True, exist_ok=True)
+        compressed = zlib.compress(data, self.compression_level)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp, path)
+        return len(compressed)
+
+    def _get_blob(self, blob_hash: str) -> Any:
+        with open(self._blob_path(blob_hash), 'rb') as f:
+            return json.loads(zlib.decompress(f.read()))
+
+    def _put_tree(self, value: Any, depth: int, written: Dict[str, bytes]) -> Any:
+        """Store value; returns an inline node ``{"v": ...}`` or a reference ``{"h": hash}``."""
+        if isinstance(value, dict) and depth < MAX_SPLIT_DEPTH and len(_encode(value)) >= SPLIT_THRESHOLD:
+            children = {key: self._put_tree(child, depth + 1, written) for key, child in value.items()}
+            return {"h": self._put_blob({"d": children}, written)}
+        if depth > 0 and len(_encode(value)) >= SPLIT_THRESHOLD:
+            return {"h": self._put_blob({"v": value}, written)}
+        return {"v": value}
+
+    def _get_tree(self, node: Dict[str, Any]) -> Any:
+        if "v" in node:
+            return node["v"]
+        blob = self._get_blob(node["h"])
+        if "d" in blob:
+            return {key: self._get_tree(child) for key, child in blob["d"].items()}
+        return blob["v"]
+
+    # ------------------------------------------------------------------ checkpoints
+
+    def put(
+        self,
+        checkpoint_id: str,
+        job_id: str,
+        step_name: str,
+        state: Dict[str, Any],
+        timestamp: str,
+        workflow_version: str = "1.0"
+    ) -> int:
+        """Store a checkpoint.
+
+        Args:
+            checkpoint_id: Unique checkpoint identifier
+            job_id: Job identifier
+            step_name: Step/checkpoint name
+            state: State payload (JSON-serializable)
+            timestamp: ISO timestamp recorded with the checkpoint
+            workflow_version: Workflow version recorded with the checkpoint
+
+        Returns:
+            Bytes newly written to the blob store (0 if fully deduplicated)
+        """
+        # Blobs are content-addressed, so they are written before taking the
+        # write lock. A delete committed in between may have unlinked one that
+        # was not indexed yet; those are rewritten inside the transaction,
+        # where indexed blobs are safe until it commits.
+        written: Dict[str, bytes] = {}
+        root = self._put_blob({"root": self._put_tree(state, 0, written)}, written)
+        with self._lock, self._transaction() as conn:
+            sizes = self._known_blobs(conn, list(written))
+            new = {h: self._write_blob(h, data) for h, data in written.items() if h not in sizes}
+            conn.execute(
+                'INSERT INTO checkpoints (checkpoint_id, job_id, step_name, timestamp, workflow_version,'
+                ' root_hash, size_bytes, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (checkpoint_id, job_id, step_name, timestamp, workflow_version,
+                 root, sum(sizes.values()) + sum(new.values()), time.time())
+            )
+            conn.executemany(
+                'INSERT INTO checkpoint_blobs (checkpoint_id, blob_hash) VALUES (?, ?)',
+                [(checkpoint_id, h) for h in written]
+            )
+            conn.executemany(
+                'UPDATE blobs SET refcount = refcount + 1 WHERE blob_hash = ?',
+                [(h,) for h in sizes]
+            )
+            conn.executemany(
+                'INSERT INTO blobs (blob_hash, refcount, stored_bytes) VALUES (?, 1, ?)',
+                list(new.items())
+            )
+            return sum(new.values())
+
+    @staticmethod
+    def _known_blobs(conn: sqlite3.Connection, hashes: List[str]) -> Dict[str, int]:
+        """Stored sizes of the given blobs that are already indexed."""
+        known: Dict[str, int] = {}
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            known.update(
+                (row["blob_hash"], row["stored_bytes"]) for row in conn.execute(
+                    f"SELECT blob_hash, stored_bytes FROM blobs WHERE blob_hash IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+            )
+        return known
+
+    def get(self, checkpoint_id: str, job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Full checkpoint record (metadata plus restored ``state``), or None if unknown."""
+        meta = self.meta(checkpoint_id, job_id)
+        if meta is None:
+            return None
+        root = self._get_blob(meta.pop("root_hash"))["root"]
+        meta["state"] = self._get_tree(root)
+        return meta
+
+    def meta(self, checkpoint_id: str, job_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Index row for a checkpoint, or None if unknown."""
+        sql = 'SELECT * FROM checkpoints WHERE checkpoint_id = ?'
+        params: List[Any] = [checkpoint_id]
+        if job_id is not None:
+            sql += ' AND job_id = ?'
+            params.append(job_id)
+        with self._connect() as conn:
+            row = conn.execute(sql, params).fetchone()
+        if row is None:
+            return None
+        meta = dict(row)
+        meta.pop("seq")
+        return meta
+
+    def list(self, job_id: str) -> List[Dict[str, Any]]:
+        """Index rows for a job's checkpoints, oldest first."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT checkpoint_id, job_id, step_name, timestamp, workflow_version, size_bytes, created_at'
+                ' FROM checkpoints WHERE job_id = ? ORDER BY seq', (job_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def latest(self, job_id: str) -> Optional[str]:
+        """ID of the most recent checkpoint of a job."""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT checkpoint_id FROM checkpoints WHERE job_id = ? ORDER BY seq DESC LIMIT 1', (job_id,)
+            ).fetchone()
+        return row["checkpoint_id"] if row else None
+
+    def delete(self, checkpoint_ids: List[str]) -> int:
+        """Delete checkpoints and any blobs no longer referenced.
+
+        Returns:
+            Number of checkpoints deleted
+        """
+        if not checkpoint_ids:
+            return 0
+        marks = ','.join('?' * len(checkpoint_ids))
+        # Orphaned blobs are unlinked before commit, so a concurrent put cannot
+        # reference one between its refcount dropping to zero and the unlink
+        with self._lock, self._transaction() as conn:
+            hashes = [
+                row["blob_hash"] for row in conn.execute(
+                    f'SELECT blob_hash FROM checkpoint_blobs WHERE checkpoint_id IN ({marks})', checkpoint_ids
+                )
+            ]
+            deleted = conn.execute(
+                f'DELETE FROM checkpoints WHERE checkpoint_id IN ({marks})', checkpoint_ids
+            ).rowcount
+            conn.execute(f'DELETE FROM checkpoint_blobs WHERE checkpoint_id IN ({marks})', checkpoint_ids)
+            conn.executemany(
+                'UPDATE blobs SET refcount = refcount - 1 WHERE blob_hash = ?', [(h,) for h in hashes]
+            )
+            orphaned = [
+                row["blob_hash"] for row in conn.execute('SELECT blob_hash FROM blobs WHERE refcount <= 0')
+            ]
+            conn.execute('DELETE FROM blobs WHERE refcount <= 0')
+            for blob_hash in orphaned:
+                try:
+                    self._blob_path(blob_hash).unlink()
+                except FileNotFoundError:
+                    pass
+            return deleted
+
+    def job_ids(self) -> List[str]:
+        with self._connect() as conn:
+            return [row["job_id"] for row in conn.execute('SELECT DISTINCT job_id FROM checkpoints')]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Checkpoint counts and logical vs. stored size."""
+        with self._connect() as conn:
+            checkpoints, jobs = conn.execute(
+                'SELECT COUNT(*), COUNT(DISTINCT job_id) FROM checkpoints'
+            ).fetchone()
+            blobs, stored = conn.execute('SELECT COUNT(*), COALESCE(SUM(stored_bytes), 0) FROM blobs').fetchone()
+        return {
+            "checkpoints": checkpoints,
+            "jobs": jobs,
+            "blobs": blobs,
+            "stored_bytes": stored,
+        }
+
+
+__all__ = ["CheckpointStore", "INDEX_FILENAME", "BLOB_DIRNAME"]
@@ -240,39 +240,68 @@ class EnhancedAgentRegistry:
         logger.info("Enhanced registry started successfully")
     
     def discover_and_register_agents(self) -> List[str]:
-        """Discover agents using AST and register them with MCP contracts."""
+        """Discover agents using AST and register them with MCP contracts.
+
+        Agent modules are not imported here; the AST metadata is enough to
+        register them, and each module is imported on first use through
+        load_agent_class().
+        """
         with self._lock:
             discovered_agents = self.agent_discovery.discover_agents()
             registered_ids = []
             
             for agent_info in discovered_agents:
                 try:
-                    # Import and instantiate agent class
-                    agent_class = self._import_agent_class(agent_info)
-                    if agent_class:
-                        # Register with MCP compliance
-                        agent_id = agent_info['class_name']
-                        self._discovery_cache[agent_id] = agent_info
-                        
-                        # Update simple registry
-                        if agent_id not in self.agents:
-                            self.agents[agent_id] = {
-                                'id': agent_id,
-                                'name': agent_id.replace('_', ' ').title(),
-                                'type': 'discovered_agent',
-                                'status': 'available',
-                                'class': agent_info['class_name'],
-                                'module': agent_info['module_path']
-                            }
-                        
-                        registered_ids.append(agent_id)
-                        logger.info(f"Discovered and cached agent: {agent_id}")
+                    agent_id = agent_info['class_name']
+                    self._discovery_cache[agent_id] = agent_info
+                    
+                    # Update simple registry
+                    if agent_id not in self.agents:
+                        self.agents[agent_id] = {
+                            'id': agent_id,
+                            'name': agent_id.replace('_', ' ').title(),
+                            'type': 'discovered_agent',
+                            'status': 'available',
+                            'class': agent_info['class_name'],
+                            'module': agent_info['module_path']
+                        }
+                    
+                    registered_ids.append(agent_id)
+                    logger.debug(f"Discovered agent (lazy): {agent_id}")
                 
                 except Exception as e:
                     logger.error(f"Failed to process discovered agent {agent_info['class_name']}: {e}")
             
             self._last_discovery = datetime.now()
             return registered_ids
+
+    def load_agent_class(self, agent_id: str) -> Optional[Type[Agent]]:
+        """Import an agent's module on demand and return its class.
+
+        Args:
+            agent_id: Agent class name
+
+        Returns:
+            Agent class, or None if it cannot be located or imported
+        """
+        with self._lock:
+            agent_class = self._agent_classes.get(agent_id)
+            if agent_class is not None:
+                return agent_class
+
+            agent_info = self._discovery_cache.get(agent_id)
+            if agent_info is None:
+                # Fall back to a fresh AST pass (no imports) to find the module
+                for info in self.agent_discovery.discover_agents():
+                    self._discovery_cache.setdefault(info['class_name'], info)
+                agent_info = self._discovery_cache.get(agent_id)
+                if agent_info is None:
+                    return None
+
+            agent_class = self._import_agent_class(agent_info)
+            if agent_class is not None:
+                self._agent_classes[agent_id] = agent_class
+            return agent_class
     
     def register_agent_instance(self, agent: Agent, auto_enhance: bool = True) -> MCPContract:
         """Register a live agent instance with MCP compliance."""
@@ -513,8 +542,10 @@ class EnhancedAgentRegistry:
             if config is None or event_bus is None:
                 return None
 
-            # Get agent class
+            # Get agent class, importing its module on first use
             agent_class = self._agent_classes.get(name)
+            if agent_class is None:
+                agent_class = self.load_agent_class(name)
             if agent_class is None:
                 return None
 
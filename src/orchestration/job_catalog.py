@@ -0,0 +1,189 @@
+"""Job Catalog - SQLite index of job metadata maintained alongside job state files.
+
+Listing jobs used to open and parse every ``state.json`` (including all step
+outputs) just to read its metadata. ``JobCatalog`` keeps one row per job with
+the filterable fields plus the serialized ``JobMetadata``, updated on every
+save, so listing, filtering, pagination and counts never touch state files.
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.sqlite_store import connect, ensure_schema
+
+from .job_state import JobMetadata, JobStatus
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILENAME = "catalog.db"
+SCHEMA_VERSION = 1
+
+
+def _epoch(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value is not None else None
+
+
+class JobCatalog:
+    """Indexed job metadata for fast listing and startup recovery."""
+
+    def __init__(self, db_path: Path):
+        """Initialize catalog, creating the database if needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self.created = False
+        self._init_db()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, connect(self.db_path) as conn:
+            self.created = ensure_schema(conn, SCHEMA_VERSION, ["jobs"], [
+                '''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    workflow_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    archived INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL,
+                    archived_at REAL,
+                    metadata TEXT NOT NULL
+                )
+                ''',
+                'CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(archived, created_at DESC)',
+                'CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at DESC)',
+            ])
+
+    @staticmethod
+    def _row(metadata: JobMetadata, archived: bool) -> Tuple:
+        return (
+            metadata.job_id,
+            metadata.workflow_id,
+            metadata.status.value,
+            1 if archived else 0,
+            _epoch(metadata.created_at),
+            _epoch(metadata.updated_at),
+            _epoch(metadata.archived_at),
+            json.dumps(metadata.to_dict()),
+        )
+
+    def upsert(self, metadata: JobMetadata, archived: bool = False) -> None:
+        """Insert or replace the catalog entry for a job.
+
+        Args:
+            metadata: Current job metadata
+            archived: Whether the job lives in the archive directory
+        """
+        self.upsert_many([(metadata, archived)])
+
+    def upsert_many(self, entries: Iterable[Tuple[JobMetadata, bool]]) -> None:
+        """Insert or replace several entries in one transaction."""
+        rows = [self._row(metadata, archived) for metadata, archived in entries]
+        with self._lock, connect(self.db_path) as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows
+            )
+
+    def remove(self, job_id: str) -> None:
+        """Remove a job from the catalog."""
+        with self._lock, connect(self.db_path) as conn:
+            conn.execute('DELETE FROM jobs WHERE job_id = ?', (job_id,))
+
+    def clear(self) -> None:
+        with self._lock, connect(self.db_path) as conn:
+            conn.execute('DELETE FROM jobs')
+
+    @staticmethod
+    def _where(
+        status: Optional[JobStatus],
+        include_archived: bool,
+        workflow_id: Optional[str],
+        created_after: Optional[datetime],
+        created_before: Optional[datetime],
+        archived_before: Optional[datetime] = None
+    ) -> Tuple[str, List]:
+        clauses, params = [], []
+        if not include_archived:
+            clauses.append('archived = 0')
+        if status is not None:
+            clauses.append('status = ?')
+            params.append(status.value)
+        if workflow_id is not None:
+            clauses.append('workflow_id = ?')
+            params.append(workflow_id)
+        if created_after is not None:
+            clauses.append('created_at >= ?')
+            params.append(created_after.timestamp())
+        if created_before is not None:
+            clauses.append('created_at < ?')
+            params.append(created_before.timestamp())
+        if archived_before is not None:
+            clauses.append('archived = 1 AND archived_at IS NOT NULL AND archived_at < ?')
+            params.append(archived_before.timestamp())
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def query(
+        self,
+        status: Optional[JobStatus] = None,
+        include_archived: bool = False,
+        workflow_id: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[JobMetadata]:
+        """List job metadata, newest first.
+
+        Args:
+            status: Only jobs with this status
+            include_archived: Include jobs in the archive directory
+            workflow_id: Only jobs of this workflow
+            created_after: Only jobs created at or after this time
+            created_before: Only jobs created before this time
+            limit: Maximum number of results
+            offset: Number of results to skip
+
+        Returns:
+            List of job metadata
+        """
+        where, params = self._where(status, include_archived, workflow_id, created_after, created_before)
+        sql = f'SELECT metadata FROM jobs{where} ORDER BY created_at DESC'
+        if limit or offset:
+            sql += ' LIMIT ? OFFSET ?'
+            params += [limit if limit else -1, offset]
+        with connect(self.db_path) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [JobMetadata.from_dict(json.loads(row[0])) for row in rows]
+
+    def count(
+        self,
+        status: Optional[JobStatus] = None,
+        include_archived: bool = False,
+        workflow_id: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None
+    ) -> int:
+        """Count jobs matching the same filters as ``query``."""
+        where, params = self._where(status, include_archived, workflow_id, created_after, created_before)
+        with connect(self.db_path) as conn:
+            return conn.execute(f'SELECT COUNT(*) FROM jobs{where}', params).fetchone()[0]
+
+    def status_counts(self, include_archived: bool = True) -> Dict[str, int]:
+        """Number of jobs per status."""
+        where = '' if include_archived else ' WHERE archived = 0'
+        with connect(self.db_path) as conn:
+            rows = conn.execute(f'SELECT status, COUNT(*) FROM jobs{where} GROUP BY status').fetchall()
+        return {status: count for status, count in rows}
+
+    def archived_before(self, cutoff: datetime) -> List[str]:
+        """IDs of archived jobs archived before cutoff."""
+        where, params = self._where(None, True, None, None, None, archived_before=cutoff)
+        with connect(self.db_path) as conn:
+            return [row[0] for row in conn.execute(f'SELECT job_id FROM jobs{where}', params)]
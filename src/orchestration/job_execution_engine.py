@@ -1,22 +1,28 @@
 """Job Execution Engine - Manages job queue and execution lifecycle."""
 
 import logging
+import functools
+import json
 import queue
 import threading
 import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set, Union
 
 from src.core import EventBus, AgentEvent, Config
+from src.utils.cancellation import CancellationToken, OperationCancelledError
 
 from .workflow_compiler import WorkflowCompiler
 from .execution_plan import ExecutionPlan, ExecutionStep
-from .job_state import JobState, JobMetadata, JobStatus, StepStatus, StepExecution
+from .job_state import JobState, JobMetadata, JobStatus, JobPriority, StepStatus, StepExecution
 from .job_storage import JobStorage
 from .enhanced_registry import EnhancedAgentRegistry
 from .checkpoint_manager import CheckpointManager
+from .step_supervisor import StepSupervisor
+from .job_scheduler import JobScheduler
+from .job_lease_queue import QUEUE_FILENAME, SharedJobQueue
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +38,8 @@ class JobExecutionEngine:
         config: Optional[Config] = None,
         max_concurrent_jobs: int = 3,
         storage_dir: Optional[Path] = None,
-        checkpoint_config: Optional[Dict[str, Any]] = None
+        checkpoint_config: Optional[Dict[str, Any]] = None,
+        scheduler: Optional[Union[JobScheduler, SharedJobQueue]] = None
     ):
         """Initialize job execution engine.
         
@@ -44,6 +51,8 @@ class JobExecutionEngine:
             max_concurrent_jobs: Maximum number of concurrent job executions
             storage_dir: Directory for job persistence (default: .jobs/)
             checkpoint_config: Checkpoint configuration (or loaded from config/checkpoints.yaml)
+            scheduler: Job scheduler (default: built from config/perf.json tuning; a
+                ``SharedJobQueue`` in the jobs directory when ``config.job_queue`` is "shared")
         """
         self.compiler = compiler
         self.registry = registry
@@ -66,15 +75,40 @@ class JobExecutionEngine:
         self._jobs: Dict[str, JobState] = {}
         self._lock = threading.RLock()
         
-        # Job queue
-        self._job_queue: queue.Queue = queue.Queue()
+        # Job queue: priority classes, per-tenant fair share, per-workflow limits.
+        # The shared queue lets several processes drain one jobs directory.
+        if scheduler is None and getattr(self.config, 'job_queue', 'local') == 'shared':
+            scheduler = SharedJobQueue.from_perf_config(
+                self.storage.base_dir / QUEUE_FILENAME,
+                max_concurrent_jobs,
+                self._load_perf_tuning(),
+                lease_seconds=getattr(self.config, 'job_lease_seconds', 30.0),
+                max_attempts=getattr(self.config, 'job_max_attempts', 3)
+            )
+        self.scheduler = scheduler or JobScheduler.from_perf_config(
+            max_concurrent_jobs, self._load_perf_tuning()
+        )
+        self._shared_queue = isinstance(self.scheduler, SharedJobQueue)
+        if self._shared_queue:
+            self.scheduler.on_lease_lost = self._on_lease_lost
+            self.scheduler.on_attempts_exhausted = self._on_attempts_exhausted
         self._pending_jobs: Set[str] = set()
+        # Jobs whose lease another worker took over; this process stops running them
+        self._lost_leases: Set[str] = set()
         
         # Control flags
         self._pause_requested: Dict[str, bool] = {}
         self._cancel_requested: Dict[str, bool] = {}
         self._running = False
         
+        # Cancellation tokens of running jobs; pause/cancel interrupt the current step
+        self._job_tokens: Dict[str, CancellationToken] = {}
+        
+        # Agent calls run on supervised threads so step timeouts are enforced while
+        # the call is in flight. Two slots per job worker leave room for one
+        # abandoned call per worker while it winds down.
+        self.step_supervisor = StepSupervisor(max_workers=max(2, max_concurrent_jobs * 2))
+        
         # Worker threads
         self._worker_threads: List[threading.Thread] = []
         
@@ -94,21 +128,53 @@ class JobExecutionEngine:
                 logger.warning(f"Failed to load checkpoint config: {e}")
         return {}
     
+    def _load_perf_tuning(self) -> Dict[str, Any]:
+        """Load scheduler tuning (max_inflight, fairness_window_s, ...) from config/perf.json."""
+        config_file = Path(__file__).parent.parent.parent / 'config' / 'perf.json'
+        if config_file.exists():
+            try:
+                with open(config_file, 'r') as f:
+                    return json.load(f).get('tuning', {})
+            except Exception as e:
+                logger.warning(f"Failed to load perf tuning: {e}")
+        return {}
+    
+    def _enqueue(self, job_state: JobState) -> None:
+        """Hand a pending job to the scheduler."""
+        metadata = job_state.metadata
+        self.scheduler.put(
+            metadata.job_id,
+            metadata.workflow_id,
+            priority=metadata.priority,
+            tenant=metadata.tenant or metadata.correlation_id
+        )
+    
+    # Jobs whose full state is kept in memory from startup (they can still be
+    # paused, resumed or cancelled); finished jobs are loaded lazily on access
+    ACTIVE_STATUSES = (JobStatus.PENDING, JobStatus.RUNNING, JobStatus.PAUSED)
+    
     def _load_persisted_jobs(self) -> None:
-        """Load persisted jobs from storage on startup."""
+        """Load active persisted jobs from storage on startup."""
         try:
-            jobs = self.storage.list_jobs()
-            for metadata in jobs:
-                job_state = self.storage.load_job(metadata.job_id)
-                if job_state:
+            loaded = 0
+            for status in self.ACTIVE_STATUSES:
+                # Oldest first so pending jobs are re-queued in submission order
+                for metadata in reversed(self.storage.list_jobs(status=status)):
+                    job_state = self.storage.load_job(metadata.job_id)
+                    if not job_state:
+                        continue
                     self._jobs[metadata.job_id] = job_state
+                    loaded += 1
                     
                     # Re-queue pending jobs
                     if metadata.status == JobStatus.PENDING:
                         self._pending_jobs.add(metadata.job_id)
-                        self._job_queue.put(metadata.job_id)
+                        self._enqueue(job_state)
 
-            logger.info(f"Loaded {len(jobs)} persisted jobs")
+            logger.info(
+                f"Loaded {loaded} active persisted jobs "
+                f"({self.storage.count_jobs()} in catalog)"
+            )
 
         except Exception as e:
             logger.error(f"Failed to load persisted jobs: {e}")
@@ -147,6 +213,8 @@ class JobExecutionEngine:
             thread.join(timeout=timeout / len(self._worker_threads))
         
         self._worker_threads.clear()
+        if self._shared_queue:
+            self.scheduler.close()
         logger.info("Job execution engine stopped")
     
     def _worker_loop(self) -> None:
@@ -155,7 +223,7 @@ class JobExecutionEngine:
             try:
                 # Get job from queue with timeout
                 try:
-                    job_id = self._job_queue.get(timeout=1.0)
+                    job_id = self.scheduler.get(timeout=1.0)
                 except queue.Empty:
                     continue
                 
@@ -170,7 +238,7 @@ class JobExecutionEngine:
                     logger.error(f"Error executing job {job_id}: {e}", exc_info=True)
                     self._mark_job_failed(job_id, str(e))
                 finally:
-                    self._job_queue.task_done()
+                    self.scheduler.task_done(job_id)
                     
             except Exception as e:
                 logger.error(f"Worker error: {e}", exc_info=True)
@@ -179,7 +247,9 @@ class JobExecutionEngine:
         self,
         workflow_id: str,
         inputs: Dict[str, Any],
-        correlation_id: Optional[str] = None
+        correlation_id: Optional[str] = None,
+        priority: Union[JobPriority, str] = JobPriority.NORMAL,
+        tenant: Optional[str] = None
     ) -> str:
         """Submit a new job for execution.
         
@@ -187,11 +257,14 @@ class JobExecutionEngine:
             workflow_id: Workflow identifier to execute
             inputs: Input parameters for the workflow
             correlation_id: Optional correlation ID for tracking
+            priority: Scheduling class ("interactive", "normal" or "batch")
+            tenant: Fair-share key, e.g. a batch or user ID (default: correlation ID)
             
         Returns:
             Job ID (UUID)
         """
         job_id = str(uuid.uuid4())
+        priority = JobPriority(priority)
         
         # Compile workflow
         try:
@@ -207,7 +280,9 @@ class JobExecutionEngine:
             status=JobStatus.PENDING,
             created_at=datetime.now(),
             total_steps=len(plan.steps),
-            correlation_id=correlation_id or job_id
+            correlation_id=correlation_id or job_id,
+            priority=priority,
+            tenant=tenant
         )
         
         # Create job state
@@ -242,9 +317,9 @@ class JobExecutionEngine:
         ))
         
         # Queue for execution
-        self._job_queue.put(job_id)
+        self._enqueue(job_state)
         
-        logger.info(f"Submitted job {job_id} for workflow {workflow_id}")
+        logger.info(f"Submitted {priority.value} job {job_id} for workflow {workflow_id}")
         
         return job_id
     
@@ -254,7 +329,18 @@ class JobExecutionEngine:
         Args:
             job_id: Job identifier
         """
+        if self._shared_queue:
+            # Another process may have submitted, run or finished this job
+            job_state = self.storage.load_job(job_id)
+            if job_state is not None:
+                if job_state.metadata.status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED):
+                    logger.info(f"Skipping job {job_id}: already {job_state.metadata.status.value}")
+                    return
+                with self._lock:
+                    self._jobs[job_id] = job_state
+        
         with self._lock:
+            self._lost_leases.discard(job_id)
             job_state = self._jobs.get(job_id)
             if not job_state:
                 logger.error(f"Job {job_id} not found")
@@ -263,6 +349,7 @@ class JobExecutionEngine:
             # Mark as running
             job_state.metadata.status = JobStatus.RUNNING
             job_state.metadata.started_at = datetime.now()
+            self._job_tokens[job_id] = CancellationToken()
         
         # Save state
         self.storage.save_job(job_state)
@@ -289,6 +376,10 @@ class JobExecutionEngine:
             completed_steps = set()
             
             for step in plan.steps:
+                # Another worker reclaimed the job; leave its state to that worker
+                if self._check_lease_lost(job_id):
+                    return
+                
                 # Check for pause
                 if self._check_pause(job_id):
                     logger.info(f"Job {job_id} paused")
@@ -313,7 +404,21 @@ class JobExecutionEngine:
                     continue
                 
                 # Execute step
-                success = self._execute_step(job_id, job_state, step)
+                try:
+                    success = self._execute_step(job_id, job_state, step)
+                except OperationCancelledError as e:
+                    if self._check_lease_lost(job_id):
+                        return
+                    # Interrupted mid-step; the step runs again from scratch on resume
+                    job_state.steps[step.agent_id].status = StepStatus.PENDING
+                    if self._check_cancel(job_id):
+                        logger.info(f"Job {job_id} cancelled during step {step.agent_id}")
+                        self._mark_job_cancelled(job_id)
+                        return
+                    if self._check_pause(job_id):
+                        logger.info(f"Job {job_id} paused during step {step.agent_id}")
+                        return
+                    raise RuntimeError(f"Step {step.agent_id} interrupted: {e.reason}")
                 
                 if success:
                     completed_steps.add(step.agent_id)
@@ -333,12 +438,18 @@ class JobExecutionEngine:
                 # Save state after each step
                 self.storage.save_job(job_state)
             
+            if self._check_lease_lost(job_id):
+                return
+            
             # Mark job as completed
             self._mark_job_completed(job_id)
             
         except Exception as e:
             logger.error(f"Job {job_id} execution failed: {e}", exc_info=True)
             self._mark_job_failed(job_id, str(e))
+        finally:
+            with self._lock:
+                self._job_tokens.pop(job_id, None)
     
     def _execute_step(
         self,
@@ -388,24 +499,24 @@ class JobExecutionEngine:
             # Prepare agent inputs
             agent_inputs = self._prepare_agent_inputs(job_state, step)
             
-            # Execute agent with timeout
+            if hasattr(agent, 'run'):
+                call = functools.partial(agent.run, **agent_inputs)
+            elif hasattr(agent, 'execute'):
+                call = functools.partial(agent.execute, **agent_inputs)
+            else:
+                raise AttributeError(f"Agent {agent_id} has no run() or execute() method")
+            
+            # Execute agent with timeout; the step token also carries job pause/cancel
+            with self._lock:
+                job_token = self._job_tokens.get(job_id) or CancellationToken()
+            step_token = job_token.child(timeout=step.timeout)
             start_time = time.time()
             
             try:
-                # Call agent
-                if hasattr(agent, 'run'):
-                    result = agent.run(**agent_inputs)
-                elif hasattr(agent, 'execute'):
-                    result = agent.execute(**agent_inputs)
-                else:
-                    raise AttributeError(f"Agent {agent_id} has no run() or execute() method")
+                result = self.step_supervisor.run(call, token=step_token, name=f"{job_id}:{agent_id}")
                 
                 elapsed = time.time() - start_time
                 
-                # Check timeout
-                if step.timeout > 0 and elapsed > step.timeout:
-                    raise TimeoutError(f"Step exceeded timeout of {step.timeout}s")
-                
                 # Store result in outputs
                 if isinstance(result, dict):
                     job_state.outputs.update(result)
@@ -423,7 +534,8 @@ class JobExecutionEngine:
                     data={
                         'job_id': job_id,
                         'agent_id': agent_id,
-                        'duration': elapsed
+                        'duration': elapsed,
+                        'progress': job_state.metadata.progress
                     }
                 ))
                 
@@ -433,9 +545,11 @@ class JobExecutionEngine:
                 
             except TimeoutError as e:
                 logger.error(f"Step {agent_id} timed out: {e}")
-                job_state.mark_step_failed(agent_id, str(e))
+                job_state.mark_step_failed(agent_id, f"Step exceeded timeout of {step.timeout}s")
                 return False
                 
+        except OperationCancelledError:
+            raise
         except Exception as e:
             logger.error(f"Step {agent_id} failed: {e}", exc_info=True)
             job_state.mark_step_failed(agent_id, str(e))
@@ -621,7 +735,7 @@ class JobExecutionEngine:
             self.storage.save_job(job_state)
             
             # Queue for execution
-            self._job_queue.put(job_id)
+            self._enqueue(job_state)
             
             logger.info(f"Job {job_id} restored from checkpoint {checkpoint_id}")
             
@@ -668,6 +782,40 @@ class JobExecutionEngine:
                 return True
         return False
     
+    def _on_lease_lost(self, job_id: str) -> None:
+        """Stop running a job whose queue lease was reclaimed by another worker."""
+        with self._lock:
+            self._lost_leases.add(job_id)
+            token = self._job_tokens.get(job_id)
+        if token is not None:
+            token.cancel("lease lost")
+    
+    def _on_attempts_exhausted(self, job_id: str, attempts: int) -> None:
+        """Fail a job whose queue lease expired on every attempt."""
+        job_state = self._current_state(job_id)
+        if job_state is None or job_state.metadata.status in (
+            JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED
+        ):
+            return
+        with self._lock:
+            self._pending_jobs.discard(job_id)
+        self._mark_job_failed(job_id, f"Worker lease expired on all {attempts} attempts")
+
+    def _check_lease_lost(self, job_id: str) -> bool:
+        """Check whether another worker took over the job.
+        
+        Args:
+            job_id: Job identifier
+            
+        Returns:
+            True if this process no longer holds the job's lease
+        """
+        with self._lock:
+            lost = job_id in self._lost_leases
+        if lost:
+            logger.warning(f"Job {job_id} abandoned: lease taken over by another worker")
+        return lost
+    
     def _check_cancel(self, job_id: str) -> bool:
         """Check if job cancellation is requested.
         
@@ -799,28 +947,48 @@ class JobExecutionEngine:
         
         logger.info(f"Job {job_id} cancelled")
     
-    def get_job_status(self, job_id: str) -> Optional[JobMetadata]:
-        """Get current status of a job.
+    def _current_state(self, job_id: str) -> Optional[JobState]:
+        """Current state of a job, caching jobs loaded from storage.
+
+        With the shared queue another worker may run or finish a job this
+        process submitted, so the in-memory copy is only trusted while this
+        process runs the job; otherwise the stored state is reloaded.
         
         Args:
             job_id: Job identifier
             
         Returns:
-            JobMetadata if found, None otherwise
+            JobState if found, None otherwise
         """
         with self._lock:
             job_state = self._jobs.get(job_id)
-            if job_state:
-                return job_state.metadata
+            if job_state and (not self._shared_queue or job_id in self._job_tokens):
+                return job_state
         
         # Try loading from storage
-        job_state = self.storage.load_job(job_id)
-        if job_state:
-            with self._lock:
-                self._jobs[job_id] = job_state
-            return job_state.metadata
+        stored = self.storage.load_job(job_id)
+        if stored is None:
+            return job_state
+        with self._lock:
+            if job_id in self._job_tokens:
+                # Started in this process meanwhile
+                return self._jobs.get(job_id, stored)
+            self._jobs[job_id] = stored
+            if stored.metadata.status != JobStatus.PENDING:
+                self._pending_jobs.discard(job_id)
+        return stored
+
+    def get_job_status(self, job_id: str) -> Optional[JobMetadata]:
+        """Get current status of a job.
         
-        return None
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            JobMetadata if found, None otherwise
+        """
+        job_state = self._current_state(job_id)
+        return job_state.metadata if job_state else None
     
     def get_job_state(self, job_id: str) -> Optional[JobState]:
         """Get complete job state.
@@ -831,13 +999,7 @@ class JobExecutionEngine:
         Returns:
             JobState if found, None otherwise
         """
-        with self._lock:
-            job_state = self._jobs.get(job_id)
-            if job_state:
-                return job_state
-        
-        # Try loading from storage
-        return self.storage.load_job(job_id)
+        return self._current_state(job_id)
     
     def pause_job(self, job_id: str) -> bool:
         """Pause a running job.
@@ -848,6 +1010,7 @@ class JobExecutionEngine:
         Returns:
             True if pause requested, False if job not found or already completed
         """
+        self._current_state(job_id)  # refresh jobs another worker may have advanced
         with self._lock:
             job_state = self._jobs.get(job_id)
             if not job_state:
@@ -859,7 +1022,10 @@ class JobExecutionEngine:
                 return False
             
             self._pause_requested[job_id] = True
+            token = self._job_tokens.get(job_id)
         
+        if token is not None:
+            token.cancel("paused")
         logger.info(f"Pause requested for job {job_id}")
         return True
     
@@ -872,6 +1038,7 @@ class JobExecutionEngine:
         Returns:
             True if resumed, False if job not found or not paused
         """
+        self._current_state(job_id)  # refresh jobs another worker may have advanced
         with self._lock:
             job_state = self._jobs.get(job_id)
             if not job_state:
@@ -893,7 +1060,7 @@ class JobExecutionEngine:
         self.storage.save_job(job_state)
         
         # Re-queue for execution
-        self._job_queue.put(job_id)
+        self._enqueue(job_state)
         
         logger.info(f"Resumed job {job_id}")
         return True
@@ -907,6 +1074,7 @@ class JobExecutionEngine:
         Returns:
             True if cancellation requested, False if job not found or already completed
         """
+        self._current_state(job_id)  # refresh jobs another worker may have advanced
         with self._lock:
             job_state = self._jobs.get(job_id)
             if not job_state:
@@ -920,29 +1088,39 @@ class JobExecutionEngine:
             if job_state.metadata.status == JobStatus.PENDING:
                 # Remove from queue if not started
                 self._pending_jobs.discard(job_id)
+                self.scheduler.discard(job_id)
                 self._mark_job_cancelled(job_id)
                 return True
             
             self._cancel_requested[job_id] = True
+            token = self._job_tokens.get(job_id)
         
+        if token is not None:
+            token.cancel("cancelled")
         logger.info(f"Cancellation requested for job {job_id}")
         return True
     
     def list_jobs(
         self,
         status: Optional[JobStatus] = None,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[JobMetadata]:
-        """List jobs, optionally filtered by status.
+        """List jobs from the job catalog, newest first.
         
         Args:
             status: Optional status filter
             limit: Optional limit on results
+            offset: Number of results to skip
             
         Returns:
             List of job metadata
         """
-        return self.storage.list_jobs(status=status, limit=limit)
+        return self.storage.list_jobs(status=status, limit=limit, offset=offset)
+    
+    def count_jobs(self, status: Optional[JobStatus] = None) -> int:
+        """Count jobs in the job catalog, optionally filtered by status."""
+        return self.storage.count_jobs(status=status)
     
     def delete_job(self, job_id: str) -> bool:
         """Delete a job from storage.
@@ -957,6 +1135,7 @@ class JobExecutionEngine:
             # Remove from memory
             self._jobs.pop(job_id, None)
             self._pending_jobs.discard(job_id)
+            self.scheduler.discard(job_id)
             self._pause_requested.pop(job_id, None)
             self._cancel_requested.pop(job_id, None)
         
@@ -993,6 +1172,8 @@ class JobExecutionEngine:
             'pending_jobs': pending_count,
             'running_jobs': running_count,
             'paused_jobs': paused_count,
-            'queue_size': self._job_queue.qsize(),
+            'queue_size': self.scheduler.qsize(),
+            'scheduler': self.scheduler.get_stats(),
+            'step_supervisor': self.step_supervisor.get_stats(),
             'storage': storage_stats
         }
@@ -0,0 +1,476 @@
+"""Shared Job Queue - SQLite-backed job queue with worker leases.
+
+``JobScheduler`` lives in one process, so only one server could run jobs
+against a jobs directory. ``SharedJobQueue`` keeps the queue in a SQLite
+file next to the job catalog (``queue.db``). Several processes (uvicorn
+workers, or hosts on a shared volume) can then drain the same backlog:
+
+- A worker claims a job inside a ``BEGIN IMMEDIATE`` transaction, which
+  writes a lease (owner and expiry) on the job's row. A job is leased to
+  at most one worker at a time.
+- A heartbeat thread renews the leases of the jobs this process runs.
+  It reports a job whose lease was taken over through ``on_lease_lost``.
+- Leases that expire, for example because their worker died, are reclaimed
+  on the next claim by any worker, and the job is queued again. A job
+  whose lease has expired ``max_attempts`` times is not re-queued; it is
+  marked failed and reported through ``on_attempts_exhausted``, so a job
+  that kills its worker cannot cycle forever.
+- Idle workers poll with a read-only query and only take the write lock
+  when a job is claimable.
+
+Selection follows ``JobScheduler``:
+
+- priority classes
+- per-tenant fair share, by tenants' running jobs and last dispatch
+- a per-workflow in-flight cap, counted across all workers
+- reserved interactive capacity, counted per process
+
+``get``/``task_done``/``discard``/``qsize``/``get_stats`` mirror
+``JobScheduler`` so the engine can use either one.
+
+SQLite locking on network filesystems is only as reliable as the
+filesystem's ``fcntl`` locks. Use a local or lock-capable shared volume.
+"""
+
+import logging
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Union
+
+from ..utils.metrics_store import MetricsStore, get_metrics_store, series_name
+from ..utils.sqlite_store import connect, enable_wal, ensure_schema, immediate_transaction
+from .job_scheduler import PRIORITY_ORDER
+from .job_state import JobPriority
+
+logger = logging.getLogger(__name__)
+
+QUEUE_FILENAME = "queue.db"
+SCHEMA_VERSION = 1
+
+_RANK = {priority: rank for rank, priority in enumerate(PRIORITY_ORDER)}
+
+
+def default_worker_id() -> str:
+    """Identifier unique to this process: host, pid and a random suffix."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class SharedJobQueue:
+    """Job queue shared by processes through a SQLite file, with leased dispatch."""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        max_workers: int = 3,
+        max_inflight_per_workflow: Optional[int] = None,
+        reserved_workers: int = 1,
+        lease_seconds: float = 30.0,
+        poll_interval: float = 0.5,
+        worker_id: Optional[str] = None,
+        metrics_store: Optional[MetricsStore] = None,
+        max_attempts: int = 3
+    ):
+        """Initialize queue, creating the database if needed.
+
+        Args:
+            db_path: Path to the shared SQLite database file
+            max_workers: Number of workers in this process pulling from the queue
+            max_inflight_per_workflow: Maximum leased jobs per workflow across all workers
+            reserved_workers: Workers in this process kept free of non-interactive jobs
+            lease_seconds: Lease duration; a job is reclaimed this long after its last heartbeat
+            poll_interval: Seconds between claim attempts while the queue is empty
+            worker_id: Lease owner name (default: host:pid:random)
+            metrics_store: Time-series store for queue metrics
+            max_attempts: Leases a job may be given before an expired one fails it
+        """
+        self.db_path = Path(db_path)
+        self.max_workers = max_workers
+        self.max_inflight_per_workflow = max_inflight_per_workflow
+        self.reserved_workers = reserved_workers
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or default_worker_id()
+        self.max_attempts = max_attempts
+        self.metrics_store = metrics_store if metrics_store is not None else get_metrics_store()
+
+        # Called with the job ID when another worker took over a job this process runs
+        self.on_lease_lost: Optional[Callable[[str], None]] = None
+        # Called with the job ID and attempt count when this process fails a job
+        # whose lease expired max_attempts times
+        self.on_attempts_exhausted: Optional[Callable[[str, int], None]] = None
+
+        self._cond = threading.Condition()
+        self._held: Dict[str, JobPriority] = {}
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self.reclaimed = 0
+        self.lost = 0
+        self.exhausted = 0
+        self._init_db()
+
+    @classmethod
+    def from_perf_config(
+        cls,
+        db_path: Union[str, Path],
+        max_workers: int,
+        tuning: Dict[str, Any],
+        lease_seconds: float = 30.0,
+        max_attempts: int = 3
+    ) -> 'SharedJobQueue':
+        """Build a queue from perf.json ``tuning`` settings."""
+        return cls(
+            db_path,
+            max_workers=max_workers,
+            max_inflight_per_workflow=tuning.get('max_inflight'),
+            reserved_workers=tuning.get('reserved_interactive_workers', 1),
+            lease_seconds=lease_seconds,
+            max_attempts=max_attempts
+        )
+
+    @property
+    def shared_capacity(self) -> int:
+        """Workers in this process non-interactive jobs may occupy."""
+        return max(1, self.max_workers - self.reserved_workers)
+
+    # ------------------------------------------------------------------ storage
+
+    def _transaction(self) -> ContextManager[sqlite3.Connection]:
+        """Write transaction; BEGIN IMMEDIATE serializes claims across processes."""
+        return immediate_transaction(self.db_path)
+
+    def _read(self) -> ContextManager[sqlite3.Connection]:
+        """Read-only connection; WAL readers do not block or wait for writers."""
+        return connect(self.db_path)
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._transaction() as conn:
+            ensure_schema(conn, SCHEMA_VERSION, ["queue", "tenants", "workers"], [
+                '''
+                CREATE TABLE IF NOT EXISTS queue (
+                    job_id TEXT PRIMARY KEY,
+                    workflow_id TEXT NOT NULL,
+                    priority INTEGER NOT NULL,
+                    tenant TEXT NOT NULL,
+                    enqueued_at REAL NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'queued',
+                    owner TEXT,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0
+                )
+                ''',
+                'CREATE INDEX IF NOT EXISTS idx_queue_state ON queue(state, priority, enqueued_at)',
+                'CREATE TABLE IF NOT EXISTS tenants (tenant TEXT PRIMARY KEY, dispatched_at REAL)',
+                'CREATE TABLE IF NOT EXISTS workers (worker_id TEXT PRIMARY KEY, heartbeat_at REAL)',
+            ])
+        enable_wal(self.db_path)
+
+    # ------------------------------------------------------------------ queue API
+
+    def put(
+        self,
+        job_id: str,
+        workflow_id: str,
+        priority: JobPriority = JobPriority.NORMAL,
+        tenant: Optional[str] = None
+    ) -> None:
+        """Queue a job. Re-queuing a job that is queued or leased is a no-op;
+        a job failed after ``max_attempts`` is queued again with fresh attempts.
+
+        Args:
+            job_id: Job identifier
+            workflow_id: Workflow the job runs (for in-flight limits)
+            priority: Scheduling class
+            tenant: Fair-share key; defaults to the job ID
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO queue (job_id, workflow_id, priority, tenant, enqueued_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET state = 'queued', owner = NULL, lease_expires = NULL, "
+                "attempts = 0, enqueued_at = excluded.enqueued_at WHERE queue.state = 'failed'",
+                (job_id, workflow_id, _RANK[JobPriority(priority)], tenant or job_id, time.time())
+            )
+            depth = conn.execute("SELECT COUNT(*) FROM queue WHERE state = 'queued'").fetchone()[0]
+        with self._cond:
+            self._cond.notify_all()
+        self.metrics_store.record("scheduler.queue_depth", depth)
+
+    def get(self, timeout: Optional[float] = None) -> str:
+        """Lease the next job to run, waiting until one is eligible.
+
+        Jobs queued by this process wake waiters immediately; jobs queued by
+        other processes are picked up within ``poll_interval``.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            Job ID
+
+        Raises:
+            queue.Empty: If no job became eligible within timeout
+        """
+        self.start()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            claimed = self._claim()
+            if claimed is not None:
+                job_id, priority, enqueued_at = claimed
+                wait_ms = max(0.0, time.time() - enqueued_at) * 1000.0
+                self.metrics_store.record(series_name("scheduler", priority.value, "wait_ms"), wait_ms)
+                return job_id
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                raise queue.Empty
+            with self._cond:
+                self._cond.wait(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+
+    def task_done(self, job_id: str) -> None:
+        """Release the lease of a job this process ran."""
+        with self._cond:
+            held = self._held.pop(job_id, None)
+        if held is None:
+            return
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM queue WHERE job_id = ? AND owner = ?", (job_id, self.worker_id))
+        with self._cond:
+            self._cond.notify_all()
+
+    def discard(self, job_id: str) -> bool:
+        """Remove a queued or failed (not leased) job.
+
+        Returns:
+            True if the job was queued or failed
+        """
+        with self._transaction() as conn:
+            return conn.execute(
+                "DELETE FROM queue WHERE job_id = ? AND state IN ('queued', 'failed')", (job_id,)
+            ).rowcount > 0
+
+    def qsize(self) -> int:
+        with self._read() as conn:
+            return conn.execute("SELECT COUNT(*) FROM queue WHERE state = 'queued'").fetchone()[0]
+
+    # ------------------------------------------------------------------ leases
+
+    def _claim(self):
+        with self._cond:
+            shared_inflight = sum(1 for p in self._held.values() if p != JobPriority.INTERACTIVE)
+        ranks = [_RANK[p] for p in PRIORITY_ORDER
+                 if p == JobPriority.INTERACTIVE or shared_inflight < self.shared_capacity]
+
+        now = time.time()
+        marks = ",".join("?" * len(ranks))
+        # Idle polls stay read-only; the write lock is only taken when there is work
+        with self._read() as conn:
+            claimable = conn.execute(
+                f"SELECT 1 FROM queue WHERE (state = 'queued' AND priority IN ({marks})) "
+                "OR (state = 'leased' AND lease_expires < ?) LIMIT 1",
+                ranks + [now]
+            ).fetchone()
+        if claimable is None:
+            return None
+
+        exhausted: List[tuple] = []
+        with self._transaction() as conn:
+            exhausted = self._reclaim(conn, now)
+            rows = conn.execute(
+                f"SELECT q.job_id, q.workflow_id, q.priority, q.tenant, q.enqueued_at, "
+                f"COALESCE(t.dispatched_at, 0) FROM queue q LEFT JOIN tenants t ON t.tenant = q.tenant "
+                f"WHERE q.state = 'queued' AND q.priority IN ({marks})",
+                ranks
+            ).fetchall()
+            leased_by_tenant = dict(conn.execute(
+                "SELECT tenant, COUNT(*) FROM queue WHERE state = 'leased' GROUP BY tenant"
+            ).fetchall())
+            rows.sort(key=lambda row: (row[2], leased_by_tenant.get(row[3], 0), row[5], row[4]))
+
+            inflight: Dict[str, int] = {}
+            if self.max_inflight_per_workflow:
+                inflight = dict(conn.execute(
+                    "SELECT workflow_id, COUNT(*) FROM queue WHERE state = 'leased' GROUP BY workflow_id"
+                ).fetchall())
+            choice = next(
+                (row for row in rows
+                 if not self.max_inflight_per_workflow
+                 or inflight.get(row[1], 0) < self.max_inflight_per_workflow),
+                None
+            )
+            if choice is not None:
+                job_id, _, rank, tenant, enqueued_at, _ = choice
+                conn.execute(
+                    "UPDATE queue SET state = 'leased', owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                    "WHERE job_id = ?",
+                    (self.worker_id, now + self.lease_seconds, job_id)
+                )
+                conn.execute("INSERT OR REPLACE INTO tenants (tenant, dispatched_at) VALUES (?, ?)", (tenant, now))
+
+        self._report_exhausted(exhausted)
+        if choice is None:
+            return None
+        priority = PRIORITY_ORDER[rank]
+        with self._cond:
+            self._held[job_id] = priority
+        return job_id, priority, enqueued_at
+
+    def _reclaim(self, conn: sqlite3.Connection, now: float) -> List[tuple]:
+        """Re-queue expired leases; returns ``(job_id, attempts)`` of jobs failed instead."""
+        exhausted = conn.execute(
+            "SELECT job_id, attempts FROM queue WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, self.max_attempts)
+        ).fetchall()
+        if exhausted:
+            conn.executemany(
+                "UPDATE queue SET state = 'failed', owner = NULL, lease_expires = NULL WHERE job_id = ?",
+                [(job_id,) for job_id, _ in exhausted]
+            )
+        reclaimed = conn.execute(
+            "UPDATE queue SET state = 'queued', owner = NULL, lease_expires = NULL "
+            "WHERE state = 'leased' AND lease_expires < ?",
+            (now,)
+        ).rowcount
+        if reclaimed:
+            self.reclaimed += reclaimed
+            logger.warning(f"Reclaimed {reclaimed} job(s) from expired worker leases")
+        return exhausted
+
+    def _report_exhausted(self, exhausted: List[tuple]) -> None:
+        """Report jobs failed by ``_reclaim`` (outside the transaction)."""
+        for job_id, attempts in exhausted:
+            self.exhausted += 1
+            logger.error(f"Job {job_id} failed: lease expired on all {attempts} attempts")
+            if self.on_attempts_exhausted is not None:
+                try:
+                    self.on_attempts_exhausted(job_id, attempts)
+                except Exception as e:
+                    logger.error(f"Attempts-exhausted handler failed for {job_id}: {e}")
+
+    def reclaim_expired(self) -> int:
+        """Re-queue jobs whose lease expired; returns how many were re-queued or failed."""
+        reclaimed = self.reclaimed
+        with self._transaction() as conn:
+            exhausted = self._reclaim(conn, time.time())
+        self._report_exhausted(exhausted)
+        return self.reclaimed - reclaimed + len(exhausted)
+
+    def heartbeat(self) -> List[str]:
+        """Renew the leases of jobs this process runs.
+
+        Returns:
+            Job IDs whose lease was lost (reclaimed by another worker)
+        """
+        with self._cond:
+            held = list(self._held)
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO workers (worker_id, heartbeat_at) VALUES (?, ?)",
+                         (self.worker_id, now))
+            lost = [
+                job_id for job_id in held
+                if conn.execute(
+                    "UPDATE queue SET lease_expires = ? WHERE job_id = ? AND owner = ? AND state = 'leased'",
+                    (now + self.lease_seconds, job_id, self.worker_id)
+                ).rowcount == 0
+            ]
+        for job_id in lost:
+            with self._cond:
+                self._held.pop(job_id, None)
+            self.lost += 1
+            logger.error(f"Lease on job {job_id} lost; another worker may be running it")
+            if self.on_lease_lost is not None:
+                try:
+                    self.on_lease_lost(job_id)
+                except Exception as e:
+                    logger.error(f"Lease-lost handler failed for {job_id}: {e}")
+        return lost
+
+    def _heartbeat_loop(self) -> None:
+        interval = max(0.05, self.lease_seconds / 3)
+        while not self._heartbeat_stop.wait(interval):
+            try:
+                self.heartbeat()
+            except sqlite3.Error as e:
+                logger.warning(f"Queue heartbeat failed: {e}")
+
+    def start(self) -> None:
+        """Start the heartbeat thread (idempotent; called by the first ``get``)."""
+        with self._cond:
+            if self._heartbeat_thread is not None:
+                return
+            self._heartbeat_stop.clear()
+            self._heartbeat_thread = threading.Thread(
+                target=self._heartbeat_loop, name=f"JobQueueHeartbeat-{self.worker_id}", daemon=True
+            )
+            self._heartbeat_thread.start()
+        self.heartbeat()
+
+    def close(self) -> None:
+        """Stop heartbeats and deregister; held leases expire and are reclaimed."""
+        with self._cond:
+            thread, self._heartbeat_thread = self._heartbeat_thread, None
+        if thread is None:
+            return
+        self._heartbeat_stop.set()
+        thread.join(timeout=5)
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM workers WHERE worker_id = ?", (self.worker_id,))
+
+    # ------------------------------------------------------------------ metrics
+
+    def get_stats(self, window_seconds: float = 3600.0) -> Dict[str, Any]:
+        """Queue depth and leases across all workers, plus this process's share."""
+        now = time.time()
+        with self._read() as conn:
+            counts = conn.execute("SELECT state, priority, COUNT(*) FROM queue GROUP BY state, priority").fetchall()
+            by_workflow = dict(conn.execute(
+                "SELECT workflow_id, COUNT(*) FROM queue WHERE state = 'leased' GROUP BY workflow_id"
+            ).fetchall())
+            workers = conn.execute(
+                "SELECT COUNT(*) FROM workers WHERE heartbeat_at >= ?", (now - self.lease_seconds,)
+            ).fetchone()[0]
+        queued = {p.value: 0 for p in PRIORITY_ORDER}
+        inflight = {p.value: 0 for p in PRIORITY_ORDER}
+        failed = 0
+        for state, rank, count in counts:
+            if state == 'failed':
+                failed += count
+            else:
+                (queued if state == 'queued' else inflight)[PRIORITY_ORDER[rank].value] += count
+        with self._cond:
+            held = len(self._held)
+
+        wait_ms: Dict[str, Dict[str, float]] = {}
+        for priority in PRIORITY_ORDER:
+            summary = self.metrics_store.summary(
+                series_name("scheduler", priority.value, "wait_ms"), window_seconds=window_seconds
+            )
+            wait_ms[priority.value] = {k: summary[k] for k in ("count", "mean", "p50", "p95", "max")}
+
+        return {
+            "backend": "shared",
+            "worker_id": self.worker_id,
+            "queue_depth": sum(queued.values()),
+            "queued": queued,
+            "inflight": inflight,
+            "inflight_by_workflow": by_workflow,
+            "held": held,
+            "live_workers": workers,
+            "reclaimed": self.reclaimed,
+            "lost_leases": self.lost,
+            "failed": failed,
+            "max_attempts": self.max_attempts,
+            "lease_seconds": self.lease_seconds,
+            "wait_ms": wait_ms,
+            "max_workers": self.max_workers,
+            "shared_capacity": self.shared_capacity,
+            "max_inflight_per_workflow": self.max_inflight_per_workflow,
+        }
+
+
+__all__ = ["QUEUE_FILENAME", "SharedJobQueue", "default_worker_id"]
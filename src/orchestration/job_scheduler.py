@@ -0,0 +1,274 @@
+"""Job Scheduler - priority classes, fair sharing and in-flight limits.
+
+``JobExecutionEngine`` workers used to pull from a single FIFO queue, so a
+large batch submitted first occupied every worker until it drained. The
+scheduler replaces that queue with:
+
+- Priority classes (``JobPriority``): interactive before normal before batch.
+- Reserved capacity: non-interactive jobs may occupy at most
+  ``max_workers - reserved_workers`` workers, so an interactive job always
+  finds a free worker within one poll interval.
+- Fair sharing inside a class: each tenant (batch ID, user, or correlation
+  ID) has its own FIFO, and the tenant with the fewest running jobs and
+  dispatches in the last ``fairness_window_s`` seconds goes next.
+- A per-workflow cap on running jobs (``max_inflight`` in perf.json tuning).
+- Queue depth and wait-time metrics, recorded in the metrics store.
+
+``get``/``task_done``/``qsize`` mirror ``queue.Queue`` so workers poll it the same way.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+
+from ..utils.metrics_store import MetricsStore, get_metrics_store, series_name
+from .job_state import JobPriority
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_ORDER = (JobPriority.INTERACTIVE, JobPriority.NORMAL, JobPriority.BATCH)
+
+
+@dataclass
+class QueuedJob:
+    """A job waiting in (or dispatched from) the scheduler."""
+    job_id: str
+    workflow_id: str
+    priority: JobPriority
+    tenant: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class JobScheduler:
+    """Dispatches queued jobs to workers by priority, tenant share and workflow limits."""
+
+    def __init__(
+        self,
+        max_workers: int = 3,
+        max_inflight_per_workflow: Optional[int] = None,
+        fairness_window_s: float = 5.0,
+        reserved_workers: int = 1,
+        metrics_store: Optional[MetricsStore] = None
+    ):
+        """Initialize scheduler.
+
+        Args:
+            max_workers: Number of workers pulling from the scheduler
+            max_inflight_per_workflow: Maximum running jobs per workflow (None for no limit)
+            fairness_window_s: Window over which recent dispatches count against a tenant
+            reserved_workers: Workers kept free of non-interactive jobs
+            metrics_store: Time-series store for queue metrics
+        """
+        self.max_workers = max_workers
+        self.max_inflight_per_workflow = max_inflight_per_workflow
+        self.fairness_window_s = fairness_window_s
+        self.reserved_workers = reserved_workers
+        self.metrics_store = metrics_store if metrics_store is not None else get_metrics_store()
+
+        self._cond = threading.Condition()
+        # priority -> tenant -> FIFO of queued jobs (dicts keep tenant arrival order)
+        self._queues: Dict[JobPriority, Dict[str, Deque[QueuedJob]]] = {p: {} for p in PRIORITY_ORDER}
+        self._queued: Dict[str, QueuedJob] = {}
+        self._inflight: Dict[str, QueuedJob] = {}
+        self._inflight_by_workflow: Counter = Counter()
+        self._inflight_by_tenant: Counter = Counter()
+        self._inflight_by_priority: Counter = Counter()
+        self._recent: Dict[str, Deque[float]] = {}
+        self._dispatched: Counter = Counter()
+
+    @classmethod
+    def from_perf_config(cls, max_workers: int, tuning: Dict[str, Any]) -> 'JobScheduler':
+        """Build a scheduler from perf.json ``tuning`` settings."""
+        return cls(
+            max_workers=max_workers,
+            max_inflight_per_workflow=tuning.get('max_inflight'),
+            fairness_window_s=tuning.get('fairness_window_s', 5.0),
+            reserved_workers=tuning.get('reserved_interactive_workers', 1)
+        )
+
+    @property
+    def shared_capacity(self) -> int:
+        """Workers non-interactive jobs may occupy."""
+        return max(1, self.max_workers - self.reserved_workers)
+
+    # ------------------------------------------------------------------ queue API
+
+    def put(
+        self,
+        job_id: str,
+        workflow_id: str,
+        priority: JobPriority = JobPriority.NORMAL,
+        tenant: Optional[str] = None
+    ) -> None:
+        """Queue a job. Re-queuing a job that is already queued is a no-op.
+
+        Args:
+            job_id: Job identifier
+            workflow_id: Workflow the job runs (for in-flight limits)
+            priority: Scheduling class
+            tenant: Fair-share key; defaults to the job ID
+        """
+        entry = QueuedJob(job_id=job_id, workflow_id=workflow_id, priority=priority, tenant=tenant or job_id)
+        with self._cond:
+            if job_id in self._queued:
+                return
+            self._queued[job_id] = entry
+            self._queues[priority].setdefault(entry.tenant, deque()).append(entry)
+            depth = len(self._queued)
+            self._cond.notify_all()
+        self.metrics_store.record("scheduler.queue_depth", depth)
+
+    def get(self, timeout: Optional[float] = None) -> str:
+        """Take the next job to run, blocking until one is eligible.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            Job ID
+
+        Raises:
+            queue.Empty: If no job became eligible within timeout
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while True:
+                entry = self._select()
+                if entry is not None:
+                    self._dispatch(entry)
+                    break
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._cond.wait(remaining)
+            depth = len(self._queued)
+
+        wait_ms = (time.monotonic() - entry.enqueued_at) * 1000.0
+        self.metrics_store.record(series_name("scheduler", entry.priority.value, "wait_ms"), wait_ms)
+        self.metrics_store.record("scheduler.queue_depth", depth)
+        return entry.job_id
+
+    def task_done(self, job_id: str) -> None:
+        """Release the in-flight slot of a dispatched job."""
+        with self._cond:
+            entry = self._inflight.pop(job_id, None)
+            if entry is None:
+                return
+            self._inflight_by_workflow[entry.workflow_id] -= 1
+            self._inflight_by_tenant[entry.tenant] -= 1
+            self._inflight_by_priority[entry.priority] -= 1
+            self._cond.notify_all()
+
+    def discard(self, job_id: str) -> bool:
+        """Remove a queued job (e.g. cancelled before it started).
+
+        Returns:
+            True if the job was queued
+        """
+        with self._cond:
+            entry = self._queued.pop(job_id, None)
+            if entry is None:
+                return False
+            tenants = self._queues[entry.priority]
+            jobs = tenants[entry.tenant]
+            jobs.remove(entry)
+            if not jobs:
+                del tenants[entry.tenant]
+            return True
+
+    def qsize(self) -> int:
+        with self._cond:
+            return len(self._queued)
+
+    # ------------------------------------------------------------------ selection
+
+    def _eligible(self, entry: QueuedJob) -> bool:
+        limit = self.max_inflight_per_workflow
+        return not limit or self._inflight_by_workflow[entry.workflow_id] < limit
+
+    def _select(self) -> Optional[QueuedJob]:
+        now = time.monotonic()
+        shared_inflight = sum(
+            count for priority, count in self._inflight_by_priority.items()
+            if priority != JobPriority.INTERACTIVE
+        )
+        for priority in PRIORITY_ORDER:
+            if priority != JobPriority.INTERACTIVE and shared_inflight >= self.shared_capacity:
+                return None
+            best: Optional[QueuedJob] = None
+            best_key = None
+            for tenant, jobs in self._queues[priority].items():
+                entry = next((job for job in jobs if self._eligible(job)), None)
+                if entry is None:
+                    continue
+                key = (self._inflight_by_tenant[tenant] + self._recent_count(tenant, now), entry.enqueued_at)
+                if best_key is None or key < best_key:
+                    best, best_key = entry, key
+            if best is not None:
+                return best
+        return None
+
+    def _recent_count(self, tenant: str, now: float) -> int:
+        recent = self._recent.get(tenant)
+        if not recent:
+            return 0
+        cutoff = now - self.fairness_window_s
+        while recent and recent[0] < cutoff:
+            recent.popleft()
+        return len(recent)
+
+    def _dispatch(self, entry: QueuedJob) -> None:
+        del self._queued[entry.job_id]
+        tenants = self._queues[entry.priority]
+        jobs = tenants[entry.tenant]
+        jobs.remove(entry)
+        if not jobs:
+            del tenants[entry.tenant]
+
+        self._inflight[entry.job_id] = entry
+        self._inflight_by_workflow[entry.workflow_id] += 1
+        self._inflight_by_tenant[entry.tenant] += 1
+        self._inflight_by_priority[entry.priority] += 1
+        self._recent.setdefault(entry.tenant, deque()).append(time.monotonic())
+        self._dispatched[entry.priority] += 1
+        # Drop idle tenants so the recent-dispatch map stays bounded
+        for tenant in [t for t, times in self._recent.items() if not times and t != entry.tenant]:
+            del self._recent[tenant]
+
+    # ------------------------------------------------------------------ metrics
+
+    def get_stats(self, window_seconds: float = 3600.0) -> Dict[str, Any]:
+        """Queue depth, in-flight counts and wait-time percentiles per priority class."""
+        with self._cond:
+            queued = {p.value: sum(len(jobs) for jobs in self._queues[p].values()) for p in PRIORITY_ORDER}
+            tenants = {p.value: len(self._queues[p]) for p in PRIORITY_ORDER}
+            inflight = {p.value: self._inflight_by_priority[p] for p in PRIORITY_ORDER}
+            by_workflow = {wf: n for wf, n in self._inflight_by_workflow.items() if n > 0}
+            dispatched = {p.value: self._dispatched[p] for p in PRIORITY_ORDER}
+
+        wait_ms: Dict[str, Dict[str, float]] = {}
+        for priority in PRIORITY_ORDER:
+            summary = self.metrics_store.summary(
+                series_name("scheduler", priority.value, "wait_ms"), window_seconds=window_seconds
+            )
+            wait_ms[priority.value] = {k: summary[k] for k in ("count", "mean", "p50", "p95", "max")}
+
+        return {
+            "queue_depth": sum(queued.values()),
+            "queued": queued,
+            "tenants": tenants,
+            "inflight": inflight,
+            "inflight_by_workflow": by_workflow,
+            "dispatched": dispatched,
+            "wait_ms": wait_ms,
+            "max_workers": self.max_workers,
+            "shared_capacity": self.shared_capacity,
+            "max_inflight_per_workflow": self.max_inflight_per_workflow,
+        }
+
+
+__all__ = ["JobScheduler", "QueuedJob", "PRIORITY_ORDER"]
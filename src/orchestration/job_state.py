@@ -19,6 +19,13 @@ class JobStatus(Enum):
     ARCHIVED = "archived"
 
 
+class JobPriority(Enum):
+    """Scheduling class of a job (interactive jobs are dispatched first)."""
+    INTERACTIVE = "interactive"
+    NORMAL = "normal"
+    BATCH = "batch"
+
+
 class StepStatus(Enum):
     """Step execution status."""
     PENDING = "pending"
@@ -88,6 +95,8 @@ class JobMetadata:
     retry_count: int = 0
     max_retries: int = 3
     archived_at: Optional[datetime] = None
+    priority: JobPriority = JobPriority.NORMAL
+    tenant: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -108,7 +117,9 @@ class JobMetadata:
             'correlation_id': self.correlation_id,
             'retry_count': self.retry_count,
             'max_retries': self.max_retries,
-            'archived_at': self.archived_at.isoformat() if self.archived_at else None
+            'archived_at': self.archived_at.isoformat() if self.archived_at else None,
+            'priority': self.priority.value,
+            'tenant': self.tenant
         }
     
     @classmethod
@@ -131,7 +142,9 @@ class JobMetadata:
             correlation_id=data.get('correlation_id'),
             retry_count=data.get('retry_count', 0),
             max_retries=data.get('max_retries', 3),
-            archived_at=datetime.fromisoformat(data['archived_at']) if data.get('archived_at') else None
+            archived_at=datetime.fromisoformat(data['archived_at']) if data.get('archived_at') else None,
+            priority=JobPriority(data.get('priority', JobPriority.NORMAL.value)),
+            tenant=data.get('tenant')
         )
 
 
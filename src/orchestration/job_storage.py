@@ -1,12 +1,18 @@
-"""Job Storage - Persist jobs to disk."""
+"""Job Storage - Persist jobs to disk.
+
+Full job states live in ``<job_id>/state.json``; a ``JobCatalog`` index of job
+metadata is updated on every save so listing and counting never open state files.
+"""
 
 import json
 import logging
 import shutil
+import sqlite3
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
+from .job_catalog import CATALOG_FILENAME, JobCatalog
 from .job_state import JobState, JobMetadata, JobStatus
 
 logger = logging.getLogger(__name__)
@@ -27,6 +33,66 @@ class JobStorage:
         
         self.archive_dir = archive_dir or (self.base_dir / "archive")
         self.archive_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.catalog = JobCatalog(self.base_dir / CATALOG_FILENAME)
+        self._catalog_stale = False
+        if self.catalog.created:
+            self.rebuild_catalog()
+    
+    def _scan_metadata(self, archived: bool):
+        """Yield metadata parsed from state files (used only to rebuild the catalog)."""
+        base = self.archive_dir if archived else self.base_dir
+        for job_dir in base.iterdir():
+            if not job_dir.is_dir() or (not archived and job_dir.name == "archive"):
+                continue
+            
+            state_file = job_dir / "state.json"
+            if not state_file.exists():
+                continue
+            
+            try:
+                with open(state_file, 'r') as f:
+                    data = json.load(f)
+                yield JobMetadata.from_dict(data['metadata'])
+            except Exception as e:
+                logger.warning(f"Failed to load job metadata from {job_dir}: {e}")
+    
+    def rebuild_catalog(self) -> int:
+        """Rebuild the job catalog by scanning all state files.
+        
+        Runs automatically when the catalog is first created (e.g. for job
+        directories written before the catalog existed).
+        
+        Returns:
+            Number of jobs indexed
+        """
+        entries = [(m, False) for m in self._scan_metadata(archived=False)]
+        entries += [(m, True) for m in self._scan_metadata(archived=True)]
+        self.catalog.clear()
+        self.catalog.upsert_many(entries)
+        self._catalog_stale = False
+        logger.info(f"Rebuilt job catalog with {len(entries)} jobs")
+        return len(entries)
+    
+    def _update_catalog(self, job_id: str, update, *args, **kwargs) -> None:
+        """Apply a catalog update; on failure mark the catalog for rebuild.
+        
+        State files are the source of truth, so a failed index write must not
+        fail the save or delete that already happened on disk.
+        """
+        try:
+            update(*args, **kwargs)
+        except sqlite3.Error as e:
+            logger.warning(f"Job catalog update failed for {job_id}, will rebuild: {e}")
+            self._catalog_stale = True
+    
+    def _ensure_catalog(self) -> None:
+        """Rebuild the catalog before a read if an earlier update failed."""
+        if self._catalog_stale:
+            try:
+                self.rebuild_catalog()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to rebuild job catalog: {e}")
     
     def get_job_dir(self, job_id: str, archived: bool = False) -> Path:
         """Get directory path for a specific job.
@@ -61,6 +127,10 @@ class JobStorage:
             with open(state_file, 'w') as f:
                 json.dump(job_state.to_dict(), f, indent=2)
             
+            self._update_catalog(
+                job_state.metadata.job_id, self.catalog.upsert, job_state.metadata, archived=archived
+            )
+            
             logger.debug(f"Saved job state: {job_state.metadata.job_id}")
             
         except Exception as e:
@@ -119,6 +189,7 @@ class JobStorage:
             
             if job_dir.exists() and (job_dir / "state.json").exists():
                 shutil.rmtree(job_dir)
+                self._update_catalog(job_id, self.catalog.remove, job_id)
                 logger.info(f"Deleted job: {job_id}")
                 return True
             
@@ -128,6 +199,7 @@ class JobStorage:
                 
                 if job_dir.exists() and (job_dir / "state.json").exists():
                     shutil.rmtree(job_dir)
+                    self._update_catalog(job_id, self.catalog.remove, job_id)
                     logger.info(f"Deleted archived job: {job_id}")
                     return True
             
@@ -220,79 +292,67 @@ class JobStorage:
         self, 
         status: Optional[JobStatus] = None,
         limit: Optional[int] = None,
-        include_archived: bool = False
+        include_archived: bool = False,
+        offset: int = 0,
+        workflow_id: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None
     ) -> List[JobMetadata]:
-        """List all jobs, optionally filtered by status.
+        """List jobs from the catalog, newest first, optionally filtered.
         
         Args:
             status: Optional status filter
             limit: Optional limit on number of results
             include_archived: Whether to include archived jobs
+            offset: Number of results to skip (pagination)
+            workflow_id: Optional workflow filter
+            created_after: Only jobs created at or after this time
+            created_before: Only jobs created before this time
             
         Returns:
             List of job metadata
         """
-        jobs = []
-        
         try:
-            # Get jobs from main storage
-            for job_dir in self.base_dir.iterdir():
-                if not job_dir.is_dir() or job_dir.name == "archive":
-                    continue
-                
-                state_file = job_dir / "state.json"
-                if not state_file.exists():
-                    continue
-                
-                try:
-                    with open(state_file, 'r') as f:
-                        data = json.load(f)
-                    
-                    metadata = JobMetadata.from_dict(data['metadata'])
-                    
-                    # Apply status filter
-                    if status is None or metadata.status == status:
-                        jobs.append(metadata)
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to load job metadata from {job_dir}: {e}")
-            
-            # Get archived jobs if requested
-            if include_archived:
-                for job_dir in self.archive_dir.iterdir():
-                    if not job_dir.is_dir():
-                        continue
-                    
-                    state_file = job_dir / "state.json"
-                    if not state_file.exists():
-                        continue
-                    
-                    try:
-                        with open(state_file, 'r') as f:
-                            data = json.load(f)
-                        
-                        metadata = JobMetadata.from_dict(data['metadata'])
-                        
-                        # Apply status filter
-                        if status is None or metadata.status == status:
-                            jobs.append(metadata)
-                            
-                    except Exception as e:
-                        logger.warning(f"Failed to load archived job metadata from {job_dir}: {e}")
-            
-            # Sort by created_at descending
-            jobs.sort(key=lambda j: j.created_at, reverse=True)
-            
-            # Apply limit
-            if limit:
-                jobs = jobs[:limit]
-            
-            return jobs
-            
+            self._ensure_catalog()
+            return self.catalog.query(
+                status=status,
+                include_archived=include_archived,
+                workflow_id=workflow_id,
+                created_after=created_after,
+                created_before=created_before,
+                limit=limit,
+                offset=offset
+            )
         except Exception as e:
             logger.error(f"Failed to list jobs: {e}")
             return []
     
+    def count_jobs(
+        self,
+        status: Optional[JobStatus] = None,
+        include_archived: bool = False,
+        workflow_id: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None
+    ) -> int:
+        """Count jobs matching the same filters as ``list_jobs``.
+        
+        Returns:
+            Number of matching jobs
+        """
+        try:
+            self._ensure_catalog()
+            return self.catalog.count(
+                status=status,
+                include_archived=include_archived,
+                workflow_id=workflow_id,
+                created_after=created_after,
+                created_before=created_before
+            )
+        except Exception as e:
+            logger.error(f"Failed to count jobs: {e}")
+            return 0
+    
     def cleanup_old_archives(self, days: int = 30) -> int:
         """Delete archived jobs older than specified days.
         
@@ -306,27 +366,15 @@ class JobStorage:
             cutoff_date = datetime.now() - timedelta(days=days)
             deleted_count = 0
             
-            for job_dir in self.archive_dir.iterdir():
-                if not job_dir.is_dir():
-                    continue
-                
-                state_file = job_dir / "state.json"
-                if not state_file.exists():
-                    continue
-                
+            self._ensure_catalog()
+            for job_id in self.catalog.archived_before(cutoff_date):
+                job_dir = self.archive_dir / job_id
                 try:
-                    with open(state_file, 'r') as f:
-                        data = json.load(f)
-                    
-                    archived_at_str = data['metadata'].get('archived_at')
-                    if archived_at_str:
-                        archived_at = datetime.fromisoformat(archived_at_str)
-                        
-                        if archived_at < cutoff_date:
-                            shutil.rmtree(job_dir)
-                            deleted_count += 1
-                            logger.info(f"Deleted old archived job: {job_dir.name}")
-                            
+                    if job_dir.exists():
+                        shutil.rmtree(job_dir)
+                    self.catalog.remove(job_id)
+                    deleted_count += 1
+                    logger.info(f"Deleted old archived job: {job_id}")
                 except Exception as e:
                     logger.warning(f"Failed to process archived job {job_dir}: {e}")
             
@@ -415,7 +463,8 @@ class JobStorage:
             total_archived = 0
             total_size = 0
             archived_size = 0
-            status_counts = {}
+            self._ensure_catalog()
+            status_counts = self.catalog.status_counts(include_archived=True)
             
             # Count main storage
             for job_dir in self.base_dir.iterdir():
@@ -428,18 +477,6 @@ class JobStorage:
                 for file in job_dir.rglob('*'):
                     if file.is_file():
                         total_size += file.stat().st_size
-                
-                # Count by status
-                state_file = job_dir / "state.json"
-                if state_file.exists():
-                    try:
-                        with open(state_file, 'r') as f:
-                            data = json.load(f)
-                        
-                        status = data['metadata']['status']
-                        status_counts[status] = status_counts.get(status, 0) + 1
-                    except Exception:
-                        pass
             
             # Count archived storage
             for job_dir in self.archive_dir.iterdir():
@@ -452,8 +489,6 @@ class JobStorage:
                 for file in job_dir.rglob('*'):
                     if file.is_file():
                         archived_size += file.stat().st_size
-                
-                status_counts['archived'] = status_counts.get('archived', 0) + 1
             
             return {
                 'total_jobs': total_jobs,
@@ -0,0 +1,158 @@
+"""Step Supervisor - preemptive deadlines and cancellation for agent calls.
+
+``JobExecutionEngine`` used to call ``agent.run()`` on its own worker thread
+and only compared the elapsed time with ``step.timeout`` after the call
+returned, so a hung LLM request held a job worker indefinitely. The
+supervisor runs each call on a separate worker thread with the step's
+``CancellationToken`` installed as the current token, and returns control to
+the engine as soon as the call finishes, the deadline passes or the token is
+cancelled.
+
+Python threads cannot be killed, so a call that overruns is abandoned: its
+token is cancelled, which makes the next ``check_cancelled()`` /
+``clamp_timeout()`` inside it raise, and LLM request timeouts are already
+bounded by the deadline. Supervised threads are capped by ``max_workers``;
+abandoned calls keep their slot until they actually exit, so runaway work
+can never grow the thread count.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from src.utils.cancellation import (
+    CancellationToken, DeadlineExceededError, OperationCancelledError, use_token
+)
+
+logger = logging.getLogger(__name__)
+
+
+class StepSupervisor:
+    """Runs callables on bounded, supervised worker threads."""
+
+    def __init__(self, max_workers: int = 8):
+        """Initialize supervisor.
+
+        Args:
+            max_workers: Maximum number of supervised calls alive at once,
+                including abandoned calls that have not exited yet
+        """
+        self.max_workers = max_workers
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._abandoned = 0
+        self._completed = 0
+        self._timed_out = 0
+        self._cancelled = 0
+
+    def _acquire_slot(self, token: CancellationToken) -> None:
+        while not self._slots.acquire(timeout=0.1):
+            token.raise_if_cancelled()
+
+    def run(self, func: Callable[[], Any], token: CancellationToken, name: str = "step") -> Any:
+        """Run func under token's deadline and cancellation.
+
+        Args:
+            func: Zero-argument callable (use functools.partial for arguments)
+            token: Token bounding the call; it becomes the current token inside func
+            name: Name for the worker thread and log messages
+
+        Returns:
+            Whatever func returns
+
+        Raises:
+            DeadlineExceededError: If the deadline passed before func returned
+            OperationCancelledError: If token was cancelled before func returned
+            Exception: Whatever func raised
+        """
+        self._acquire_slot(token)
+
+        wake = threading.Event()
+        outcome: Dict[str, Any] = {}
+        state = {"abandoned": False}
+        context = contextvars.copy_context()
+
+        def call() -> Any:
+            with use_token(token):
+                return func()
+
+        def target() -> None:
+            try:
+                outcome["result"] = context.run(call)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    if state["abandoned"]:
+                        self._abandoned -= 1
+                self._slots.release()
+                wake.set()
+
+        def on_cancel(_token: CancellationToken) -> None:
+            wake.set()
+
+        with self._lock:
+            self._active += 1
+        worker = threading.Thread(target=target, name=f"supervised-{name}", daemon=True)
+        token.add_callback(on_cancel)
+        started = time.monotonic()
+        try:
+            worker.start()
+        except Exception:
+            with self._lock:
+                self._active -= 1
+            self._slots.release()
+            token.remove_callback(on_cancel)
+            raise
+
+        try:
+            while not wake.wait(token.remaining()):
+                if token.expired:
+                    break
+            with self._lock:
+                finished = "result" in outcome or "error" in outcome
+                if not finished:
+                    state["abandoned"] = True
+                    self._abandoned += 1
+        finally:
+            token.remove_callback(on_cancel)
+
+        if finished:
+            with self._lock:
+                self._completed += 1
+            if "error" in outcome:
+                raise outcome["error"]
+            return outcome["result"]
+
+        elapsed = time.monotonic() - started
+        if token.expired:
+            # Lets the abandoned call see the deadline through its token
+            token.cancel("deadline exceeded")
+        reason = token.reason or "cancelled"
+        with self._lock:
+            if reason == "deadline exceeded":
+                self._timed_out += 1
+            else:
+                self._cancelled += 1
+        logger.warning(f"Abandoned {name} after {elapsed:.2f}s ({reason})")
+        if reason == "deadline exceeded":
+            raise DeadlineExceededError(f"{name} exceeded its deadline after {elapsed:.2f}s")
+        raise OperationCancelledError(reason)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "active": self._active,
+                "abandoned": self._abandoned,
+                "completed": self._completed,
+                "timed_out": self._timed_out,
+                "cancelled": self._cancelled,
+            }
+
+
+__all__ = ["StepSupervisor"]
@@ -0,0 +1,390 @@
+"""Embedding Runtime - warm, optionally quantized sentence-transformers model.
+
+Before this module, ``EmbeddingService`` and ``VectorStore`` each loaded
+their own full-precision model and encoded with a fixed batch size of 8 on
+CPU. That made the first ingestion slow and kept CPU throughput low.
+``EmbeddingRuntime`` changes this as follows:
+
+- It loads one model per (model, device, backend), shared by both services.
+  The model can be preloaded in the background at startup
+  (``preload_embedding_runtime``) and is warmed up with one encode.
+- It can run a CPU-optimized form of the same model:
+  - ``onnx`` / ``openvino``: sentence-transformers backends. Set
+    ``embedding_model_file`` to pick a quantized export such as
+    ``onnx/model_qint8_avx512.onnx``.
+  - ``torch-int8``: dynamic int8 quantization of the Linear layers.
+- It plans batches by text length (``plan_batches``), so short texts go in
+  large batches and long ones in small batches under a token budget.
+- It reports embeddings/sec.
+
+Vectors from a non-torch backend are compared with the full model on probe
+texts at load time (``check_compatibility``). If they drift below
+``embedding_compat_tolerance`` cosine similarity, the runtime falls back to
+the full model, so existing collections stay searchable.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.utils.lazy_import import LazyAttribute, module_available
+
+SENTENCE_TRANSFORMERS_AVAILABLE = module_available("sentence_transformers")
+SentenceTransformer = (
+    LazyAttribute("sentence_transformers", "SentenceTransformer")
+    if SENTENCE_TRANSFORMERS_AVAILABLE.installed else None
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+BACKENDS = ("torch", "onnx", "openvino", "torch-int8")
+DEFAULT_COMPAT_TOLERANCE = 0.99
+
+# Texts covering prose, code identifiers and short queries
+PROBE_TEXTS = (
+    "How do I convert a Word document to PDF?",
+    "Document.Save(stream, SaveFormat.Pdf) writes the output to a stream.",
+    "ERR_FONT_NOT_FOUND: the font folder is not configured.",
+    "Load an existing workbook, update a cell value and save it back to disk in the same format.",
+    "pdf",
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough subword token count (about four characters per token)."""
+    return len(text) // 4 + 2
+
+
+def plan_batches(
+    texts: Sequence[str],
+    token_budget: int = 8192,
+    max_batch: int = 64,
+    max_seq_length: int = 256
+) -> List[List[int]]:
+    """Group text indices into batches sized by text length.
+
+    Texts are sorted by length so each batch pads to similar lengths, and a
+    batch grows until ``batch size * longest text`` would exceed the token
+    budget.
+
+    Args:
+        texts: Texts to encode
+        token_budget: Padded tokens allowed per batch
+        max_batch: Upper bound on texts per batch
+        max_seq_length: Model truncation length; longer texts count as this
+
+    Returns:
+        Batches of indices into ``texts``
+    """
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    batches: List[List[int]] = []
+    batch: List[int] = []
+    longest = 0
+    for i in order:
+        tokens = min(estimate_tokens(texts[i]), max_seq_length)
+        if batch and (len(batch) >= max_batch or (len(batch) + 1) * max(longest, tokens) > token_budget):
+            batches.append(batch)
+            batch, longest = [], 0
+        batch.append(i)
+        longest = max(longest, tokens)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def check_compatibility(
+    reference: Sequence[Sequence[float]],
+    candidate: Sequence[Sequence[float]],
+    tolerance: float = DEFAULT_COMPAT_TOLERANCE
+) -> Dict[str, Any]:
+    """Cosine similarity between two encodings of the same texts.
+
+    Args:
+        reference: Vectors from the model the collections were built with
+        candidate: Vectors from the optimized model
+        tolerance: Minimum per-text cosine similarity to be compatible
+
+    Returns:
+        Dictionary with ``min_cosine``, ``mean_cosine`` and ``compatible``
+    """
+    import numpy as np
+
+    ref = np.asarray(reference, dtype=np.float32)
+    cand = np.asarray(candidate, dtype=np.float32)
+    if ref.shape != cand.shape:
+        return {"min_cosine": 0.0, "mean_cosine": 0.0, "compatible": False,
+                "reason": f"shape {cand.shape} != {ref.shape}"}
+    norms = np.linalg.norm(ref, axis=1) * np.linalg.norm(cand, axis=1)
+    cosines = (ref * cand).sum(axis=1) / np.where(norms == 0, 1, norms)
+    min_cosine = float(cosines.min()) if len(cosines) else 1.0
+    return {
+        "min_cosine": min_cosine,
+        "mean_cosine": float(cosines.mean()) if len(cosines) else 1.0,
+        "compatible": min_cosine >= tolerance,
+    }
+
+
+class EmbeddingRuntime:
+    """One loaded embedding model with length-aware batching and throughput stats."""
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        device: str = "cpu",
+        backend: str = "torch",
+        model_file: Optional[str] = None,
+        token_budget: int = 8192,
+        max_batch: int = 64,
+        compat_tolerance: float = DEFAULT_COMPAT_TOLERANCE
+    ):
+        """Initialize runtime; the model is loaded by ``load()`` or on first encode.
+
+        Args:
+            model_name: sentence-transformers model name
+            device: "cpu" or "cuda"
+            backend: One of ``BACKENDS``
+            model_file: Exported model file for the onnx/openvino backends
+            token_budget: Padded tokens per batch (see ``plan_batches``)
+            max_batch: Upper bound on texts per batch
+            compat_tolerance: Minimum cosine similarity to the full model
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {backend} (expected one of {', '.join(BACKENDS)})")
+        self.model_name = model_name
+        self.device = device
+        self.backend = backend
+        self.model_file = model_file
+        self.token_budget = token_budget
+        self.max_batch = max_batch
+        self.compat_tolerance = compat_tolerance
+
+        self.model = None
+        self.active_backend: Optional[str] = None
+        self.compatibility: Optional[Dict[str, Any]] = None
+        self.load_seconds = 0.0
+        self._load_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._texts = 0
+        self._batches = 0
+        self._encode_seconds = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self.model is not None
+
+    def _create(self, backend: str):
+        if backend in ("onnx", "openvino"):
+            kwargs: Dict[str, Any] = {"backend": backend}
+            if self.model_file:
+                kwargs["model_kwargs"] = {"file_name": self.model_file}
+            return SentenceTransformer(self.model_name, device=self.device, **kwargs)
+
+        model = SentenceTransformer(self.model_name, device=self.device)
+        if backend == "torch-int8":
+            import torch
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+
+    def load(self) -> "EmbeddingRuntime":
+        """Load and warm up the model (idempotent, thread-safe)."""
+        if self.model is not None:
+            return self
+        with self._load_lock:
+            if self.model is not None:
+                return self
+            if not SENTENCE_TRANSFORMERS_AVAILABLE:
+                raise ImportError(
+                    "sentence-transformers not available. "
+                    "Install with: pip install sentence-transformers"
+                )
+            start = time.perf_counter()
+            model, backend = self._create_checked()
+            # Warm-up encode: first-call allocations and graph setup happen here, not in a job
+            model.encode(list(PROBE_TEXTS[:1]), show_progress_bar=False, convert_to_numpy=True)
+            self.load_seconds = time.perf_counter() - start
+            self.model, self.active_backend = model, backend
+            logger.info(f"Embedding model {self.model_name} ready ({backend} on {self.device}) "
+                        f"in {self.load_seconds:.1f}s")
+        return self
+
+    def _create_checked(self) -> Tuple[Any, str]:
+        """Create the configured backend, falling back to the full model if it fails or drifts."""
+        if self.backend == "torch":
+            return self._create("torch"), "torch"
+        try:
+            model = self._create(self.backend)
+        except Exception as e:
+            logger.warning(f"Embedding backend {self.backend} unavailable ({e}); using torch")
+            return self._create("torch"), "torch"
+
+        reference = self._create("torch")
+        probes = list(PROBE_TEXTS)
+        self.compatibility = check_compatibility(
+            reference.encode(probes, normalize_embeddings=True, show_progress_bar=False, convert_to_numpy=True),
+            model.encode(probes, normalize_embeddings=True, show_progress_bar=False, convert_to_numpy=True),
+            self.compat_tolerance
+        )
+        if not self.compatibility["compatible"]:
+            logger.warning(
+                f"Embedding backend {self.backend} drifts from {self.model_name} "
+                f"(min cosine {self.compatibility['min_cosine']:.4f} < {self.compat_tolerance}); using torch"
+            )
+            return reference, "torch"
+        return model, self.backend
+
+    def encode(
+        self,
+        texts: Sequence[str],
+        normalize: bool = False,
+        show_progress_bar: bool = False
+    ):
+        """Encode texts with length-planned batches.
+
+        Args:
+            texts: Texts to encode
+            normalize: Whether to L2-normalize embeddings
+            show_progress_bar: Whether to show per-batch progress
+
+        Returns:
+            numpy array of shape (len(texts), dimension), in input order
+        """
+        import numpy as np
+
+        self.load()
+        if not texts:
+            return np.zeros((0, self.get_dimension() or 0), dtype=np.float32)
+
+        max_seq_length = getattr(self.model, "max_seq_length", None)
+        if not isinstance(max_seq_length, int):
+            max_seq_length = 256
+        batches = plan_batches(texts, self.token_budget, self.max_batch, max_seq_length)
+
+        start = time.perf_counter()
+        out = None
+        for indices in batches:
+            vectors = np.asarray(self.model.encode(
+                [texts[i] for i in indices],
+                batch_size=len(indices),
+                normalize_embeddings=normalize,
+                show_progress_bar=show_progress_bar,
+                convert_to_numpy=True
+            ))
+            if out is None:
+                out = np.empty((len(texts), vectors.shape[1]), dtype=vectors.dtype)
+            out[indices] = vectors
+        elapsed = time.perf_counter() - start
+
+        with self._stats_lock:
+            self._texts += len(texts)
+            self._batches += len(batches)
+            self._encode_seconds += elapsed
+        return out
+
+    def get_dimension(self) -> Optional[int]:
+        self.load()
+        getter = getattr(self.model, "get_sentence_embedding_dimension", None)
+        dimension = getter() if callable(getter) else None
+        return dimension if isinstance(dimension, int) else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Throughput and load statistics."""
+        with self._stats_lock:
+            texts, batches, seconds = self._texts, self._batches, self._encode_seconds
+        return {
+            "model": self.model_name,
+            "device": self.device,
+            "backend": self.active_backend or self.backend,
+            "loaded": self.loaded,
+            "load_seconds": self.load_seconds,
+            "texts": texts,
+            "batches": batches,
+            "encode_seconds": seconds,
+            "embeddings_per_sec": texts / seconds if seconds > 0 else 0.0,
+            "compatibility": self.compatibility,
+        }
+
+
+_runtimes: Dict[tuple, EmbeddingRuntime] = {}
+_runtimes_lock = threading.Lock()
+
+
+def get_embedding_runtime(config: Any, model_name: Optional[str] = None) -> EmbeddingRuntime:
+    """Shared runtime for the config's model, device and backend (not loaded yet).
+
+    Args:
+        config: Config with the ``embedding_*`` settings
+        model_name: Model to use (default: ``config.database.embedding_model``)
+    """
+    if model_name is None:
+        database = getattr(config, "database", None)
+        model_name = getattr(database, "embedding_model", None) or DEFAULT_MODEL
+    if "/" not in model_name:
+        model_name = f"sentence-transformers/{model_name}"
+
+    device = getattr(config, "device", "cpu")
+    device = device if device in ("cpu", "cuda") else "cpu"
+    backend = getattr(config, "embedding_backend", "torch")
+    if device == "cuda":
+        backend = "torch"  # CPU-optimized forms only pay off without a GPU
+    model_file = getattr(config, "embedding_model_file", None)
+    key = (model_name, device, backend, model_file)
+
+    with _runtimes_lock:
+        runtime = _runtimes.get(key)
+        if runtime is None:
+            batch_size = getattr(config, "embedding_batch_size", 32)
+            runtime = EmbeddingRuntime(
+                model_name,
+                device=device,
+                backend=backend,
+                model_file=model_file,
+                token_budget=getattr(config, "embedding_token_budget", 8192),
+                max_batch=max(batch_size, 64) if device == "cpu" else batch_size,
+                compat_tolerance=getattr(config, "embedding_compat_tolerance", DEFAULT_COMPAT_TOLERANCE),
+            )
+            _runtimes[key] = runtime
+        return runtime
+
+
+def preload_embedding_runtime(config: Any) -> Optional[threading.Thread]:
+    """Load the shared runtime in a background thread so the first ingestion finds it warm.
+
+    Returns:
+        The loading thread, or None when preloading is disabled or unavailable
+    """
+    if getattr(config, "embedding_preload", False) is not True or not SENTENCE_TRANSFORMERS_AVAILABLE:
+        return None
+    runtime = get_embedding_runtime(config)
+    if runtime.loaded:
+        return None
+
+    def _load():
+        try:
+            runtime.load()
+        except Exception as e:
+            logger.warning(f"Embedding model preload failed: {e}")
+
+    thread = threading.Thread(target=_load, name="embedding-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def reset_embedding_runtimes() -> None:
+    """Drop shared runtimes (tests, config reloads)."""
+    with _runtimes_lock:
+        _runtimes.clear()
+
+
+__all__ = [
+    "BACKENDS",
+    "DEFAULT_COMPAT_TOLERANCE",
+    "EmbeddingRuntime",
+    "check_compatibility",
+    "estimate_tokens",
+    "get_embedding_runtime",
+    "plan_batches",
+    "preload_embedding_runtime",
+    "reset_embedding_runtimes",
+]
@@ -0,0 +1,319 @@
+"""Lexical Index - persisted BM25 inverted index kept alongside Chroma collections.
+
+KB search used to rely on Chroma embedding similarity alone. Every query
+paid for an embedding pass, and exact API names (``PdfSaveOptions``,
+``Document.Save``) and error strings often ranked below loosely related
+prose. ``LexicalIndex`` keeps a SQLite inverted index per collection,
+updated incrementally whenever documents are added or deleted:
+
+- ``docs``: one row per document (length, content, metadata)
+- ``postings``: one row per (term, document) with the term frequency
+
+``search()`` scores with BM25 and reports each hit's *coverage*, the
+IDF-weighted share of query terms it contains. ``hybrid_search()`` answers
+from the lexical hits alone when the top ``k`` all cover the query
+(``is_confident``), and otherwise fuses them with the vector results using
+reciprocal rank fusion.
+"""
+
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from src.utils.sqlite_store import connect, ensure_schema
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "lexical_index.db"
+SCHEMA_VERSION = 1
+RRF_K = 60
+
+_TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*|\d+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms; identifiers also yield their dotted, snake and camelCase parts.
+
+    ``Document.Save`` gives ``document.save``, ``document``, ``save``, so an
+    exact API name matches strongly (its full form is rare) and still
+    matches prose mentioning its parts.
+    """
+    terms: List[str] = []
+    for match in _TOKEN_RE.finditer(text or ""):
+        token = match.group(0)
+        terms.append(token.lower())
+        parts = [p for piece in re.split(r"[._]", token) for p in _CAMEL_RE.findall(piece)]
+        if len(parts) > 1:
+            terms.extend(p.lower() for p in parts)
+    return terms
+
+
+@dataclass
+class LexicalHit:
+    """One BM25 search result."""
+    id: str
+    score: float
+    coverage: float
+    content: str = ""
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class LexicalIndex:
+    """SQLite-backed BM25 index shared by all collections of one Chroma database."""
+
+    def __init__(self, db_path: Union[str, Path], k1: float = 1.5, b: float = 0.75):
+        """Initialize index, creating the database if needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+        """
+        self.db_path = Path(db_path)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, connect(self.db_path) as conn:
+            ensure_schema(conn, SCHEMA_VERSION, ["postings", "docs"], [
+                '''
+                CREATE TABLE IF NOT EXISTS docs (
+                    collection TEXT NOT NULL,
+                    doc_id TEXT NOT NULL,
+                    length INTEGER NOT NULL,
+                    content TEXT NOT NULL,
+                    metadata TEXT NOT NULL,
+                    PRIMARY KEY (collection, doc_id)
+                )
+                ''',
+                '''
+                CREATE TABLE IF NOT EXISTS postings (
+                    collection TEXT NOT NULL,
+                    term TEXT NOT NULL,
+                    doc_id TEXT NOT NULL,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (collection, term, doc_id)
+                )
+                ''',
+                'CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(collection, doc_id)',
+            ])
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, collection: str, ids: Sequence[str]) -> None:
+        for doc_id in ids:
+            conn.execute("DELETE FROM postings WHERE collection = ? AND doc_id = ?", (collection, doc_id))
+            conn.execute("DELETE FROM docs WHERE collection = ? AND doc_id = ?", (collection, doc_id))
+
+    def add(
+        self,
+        collection: str,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None
+    ) -> None:
+        """Index (or re-index) documents of a collection."""
+        metadatas = list(metadatas or [])
+        doc_rows, posting_rows = [], []
+        for i, (doc_id, content) in enumerate(zip(ids, documents)):
+            terms = tokenize(content)
+            metadata = metadatas[i] if i < len(metadatas) and metadatas[i] else {}
+            doc_rows.append((collection, doc_id, len(terms), content, json.dumps(metadata, default=str)))
+            posting_rows.extend((collection, term, doc_id, tf) for term, tf in Counter(terms).items())
+        with self._lock, connect(self.db_path) as conn:
+            self._delete(conn, collection, ids)
+            conn.executemany("INSERT INTO docs VALUES (?, ?, ?, ?, ?)", doc_rows)
+            conn.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)", posting_rows)
+
+    def delete(self, collection: str, ids: Sequence[str]) -> None:
+        """Remove documents from the index."""
+        with self._lock, connect(self.db_path) as conn:
+            self._delete(conn, collection, ids)
+
+    def clear(self, collection: str) -> None:
+        """Remove every document of a collection."""
+        with self._lock, connect(self.db_path) as conn:
+            conn.execute("DELETE FROM postings WHERE collection = ?", (collection,))
+            conn.execute("DELETE FROM docs WHERE collection = ?", (collection,))
+
+    def count(self, collection: str) -> int:
+        with self._lock, connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM docs WHERE collection = ?", (collection,)).fetchone()[0]
+
+    def search(
+        self,
+        collection: str,
+        query: str,
+        k: int = 5,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[LexicalHit]:
+        """BM25 top-k documents for query.
+
+        Args:
+            collection: Collection to search
+            query: Query text
+            k: Number of hits
+            where: Optional metadata equality filter (``{"source": "docs"}``)
+
+        Returns:
+            Hits ordered by descending score
+        """
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return []
+        placeholders = ",".join("?" * len(query_terms))
+        with self._lock, connect(self.db_path) as conn:
+            total, avg_length = conn.execute(
+                "SELECT COUNT(*), AVG(length) FROM docs WHERE collection = ?", (collection,)
+            ).fetchone()
+            if not total:
+                return []
+            rows = conn.execute(
+                f"SELECT p.term, p.doc_id, p.tf, d.length FROM postings p "
+                f"JOIN docs d ON d.collection = p.collection AND d.doc_id = p.doc_id "
+                f"WHERE p.collection = ? AND p.term IN ({placeholders})",
+                (collection, *query_terms)
+            ).fetchall()
+
+        doc_freq = Counter(term for term, _, _, _ in rows)
+        idf = {
+            term: math.log(1 + (total - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            for term in query_terms
+        }
+        total_idf = sum(idf.values())
+        scores: Dict[str, float] = {}
+        covered: Dict[str, float] = {}
+        for term, doc_id, tf, length in rows:
+            norm = tf + self.k1 * (1 - self.b + self.b * length / (avg_length or 1))
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf[term] * tf * (self.k1 + 1) / norm
+            covered[doc_id] = covered.get(doc_id, 0.0) + idf[term]
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        hits: List[LexicalHit] = []
+        with self._lock, connect(self.db_path) as conn:
+            for doc_id, score in ranked:
+                content, metadata = conn.execute(
+                    "SELECT content, metadata FROM docs WHERE collection = ? AND doc_id = ?", (collection, doc_id)
+                ).fetchone()
+                metadata = json.loads(metadata)
+                if where and any(metadata.get(key) != value for key, value in where.items()):
+                    continue
+                hits.append(LexicalHit(doc_id, score, covered[doc_id] / total_idf, content, metadata))
+                if len(hits) >= k:
+                    break
+        return hits
+
+
+def is_confident(hits: Sequence[LexicalHit], k: int, min_coverage: float = 0.8) -> bool:
+    """Whether lexical hits alone can answer a top-k query.
+
+    True when there are k hits and even the k-th covers ``min_coverage`` of
+    the query's IDF weight, so embedding the query would not change the
+    answer much.
+    """
+    return len(hits) >= k > 0 and hits[k - 1].coverage >= min_coverage
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], k: int = RRF_K) -> Dict[str, float]:
+    """Fused score per id: sum of 1 / (k + rank) over the rankings it appears in."""
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return fused
+
+
+def hybrid_search(
+    index: LexicalIndex,
+    collection: str,
+    query: str,
+    k: int,
+    vector_search: Callable[[], List[Dict[str, Any]]],
+    where: Optional[Dict[str, Any]] = None,
+    min_coverage: float = 0.8
+) -> List[Dict[str, Any]]:
+    """Lexical-first search, fused with vector results when needed.
+
+    Args:
+        index: Lexical index
+        collection: Collection name
+        query: Query text
+        k: Number of results
+        vector_search: Callable returning vector results (dicts with ``id``,
+            ``content``, ``metadata`` and ``score`` as a distance); only called
+            when the lexical hits are not confident
+        where: Optional metadata equality filter
+        min_coverage: Coverage the k-th lexical hit needs to skip the vector search
+
+    Returns:
+        Result dicts with ``id``, ``content``, ``metadata``, ``score`` (fused,
+        higher is better), ``lexical_score``, ``distance`` (None when the
+        vector search was skipped or did not return the document) and ``source``
+    """
+    try:
+        hits = index.search(collection, query, k=k * 2, where=where)
+    except sqlite3.Error as e:
+        logger.warning(f"Lexical search failed, using vector search only: {e}")
+        hits = []
+
+    if is_confident(hits, k, min_coverage):
+        logger.debug(f"Lexical hits confident for {query[:50]!r}, skipping embedding")
+        return [
+            {'id': hit.id, 'content': hit.content, 'metadata': hit.metadata, 'score': hit.score,
+             'lexical_score': hit.score, 'distance': None, 'source': 'lexical'}
+            for hit in hits[:k]
+        ]
+
+    vector = vector_search()
+    fused = reciprocal_rank_fusion([[hit.id for hit in hits], [result['id'] for result in vector]])
+    lexical_by_id = {hit.id: hit for hit in hits}
+    vector_by_id = {result['id']: result for result in vector}
+    results = []
+    for doc_id, score in sorted(fused.items(), key=lambda item: -item[1])[:k]:
+        hit, result = lexical_by_id.get(doc_id), vector_by_id.get(doc_id)
+        base = result or {'content': hit.content, 'metadata': hit.metadata}
+        results.append({
+            'id': doc_id,
+            'content': base.get('content', ''),
+            'metadata': base.get('metadata') or {},
+            'score': score,
+            'lexical_score': hit.score if hit else None,
+            'distance': result.get('score') if result else None,
+            'source': 'hybrid' if hit and result else ('lexical' if hit else 'vector'),
+        })
+    return results
+
+
+_indexes: Dict[Path, LexicalIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_lexical_index(directory: Union[str, Path]) -> LexicalIndex:
+    """Shared index for the Chroma database in directory."""
+    path = (Path(directory) / INDEX_FILENAME).resolve()
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = LexicalIndex(path)
+        return _indexes[path]
+
+
+__all__ = [
+    "INDEX_FILENAME",
+    "LexicalHit",
+    "LexicalIndex",
+    "tokenize",
+    "is_confident",
+    "reciprocal_rank_fusion",
+    "hybrid_search",
+    "get_lexical_index",
+]
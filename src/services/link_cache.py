@@ -0,0 +1,167 @@
+"""Persistent URL status cache for LinkChecker.
+
+Results are kept in memory and appended to a JSONL file so that repeated
+checks of the same URL (across posts, batches and process restarts) are
+served locally until they expire. Successful results use ``ttl``; failures
+are negatively cached with the shorter ``negative_ttl`` so that a transient
+outage is re-probed soon without hammering a dead host on every post.
+"""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LinkResult = Tuple[bool, int, str]
+
+
+class LinkStatusCache:
+    """Thread-safe URL → (is_valid, status_code, message) cache with TTL."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl: int = 86400,
+        negative_ttl: int = 3600,
+        max_entries: int = 50000
+    ):
+        """Initialize cache.
+
+        Args:
+            path: JSONL file for persistence (None keeps the cache in memory)
+            ttl: Lifetime in seconds of successful results
+            negative_ttl: Lifetime in seconds of failed results
+            max_entries: Upper bound on in-memory entries
+        """
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[LinkResult, float]] = {}
+        self._lock = threading.Lock()
+        self._appended = 0
+        self.hits = 0
+        self.misses = 0
+
+        if self.path is not None:
+            self._load()
+
+    def _expires_at(self, result: LinkResult, checked_at: float) -> float:
+        return checked_at + (self.ttl if result[0] else self.negative_ttl)
+
+    def _load(self) -> None:
+        """Load unexpired entries from disk; the last entry for a URL wins."""
+        if not self.path.exists():
+            return
+
+        now = time.time()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        result = (bool(entry['valid']), int(entry['status']), str(entry['message']))
+                        checked_at = float(entry['checked_at'])
+                    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                        continue
+                    if self._expires_at(result, checked_at) > now:
+                        self._entries[entry['url']] = (result, checked_at)
+                    else:
+                        self._entries.pop(entry['url'], None)
+            logger.debug(f"Loaded {len(self._entries)} cached link results from {self.path}")
+        except OSError as e:
+            logger.warning(f"Failed to load link cache {self.path}: {e}")
+            self._entries = {}
+
+    def get(self, url: str) -> Optional[LinkResult]:
+        """Return the cached result for ``url`` if it has not expired."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                self.misses += 1
+                return None
+            result, checked_at = entry
+            if self._expires_at(result, checked_at) <= time.time():
+                del self._entries[url]
+                self.misses += 1
+                return None
+            self.hits += 1
+            return result
+
+    def set(self, url: str, result: LinkResult) -> None:
+        """Store a result in memory and append it to the cache file."""
+        checked_at = time.time()
+        with self._lock:
+            if len(self._entries) >= self.max_entries and url not in self._entries:
+                # Drop the oldest check to stay bounded
+                oldest = min(self._entries, key=lambda k: self._entries[k][1])
+                del self._entries[oldest]
+            self._entries[url] = (result, checked_at)
+
+            if self.path is None:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({
+                        'url': url,
+                        'valid': result[0],
+                        'status': result[1],
+                        'message': result[2],
+                        'checked_at': checked_at
+                    }) + '\n')
+                self._appended += 1
+            except OSError as e:
+                logger.warning(f"Failed to write link cache: {e}")
+                return
+
+            # Rewrite the file once it is dominated by superseded/expired lines
+            if self._appended > max(1000, 2 * len(self._entries)):
+                self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        """Rewrite the cache file with only live entries. Caller holds the lock."""
+        now = time.time()
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for url, (result, checked_at) in self._entries.items():
+                    if self._expires_at(result, checked_at) <= now:
+                        continue
+                    f.write(json.dumps({
+                        'url': url,
+                        'valid': result[0],
+                        'status': result[1],
+                        'message': result[2],
+                        'checked_at': checked_at
+                    }) + '\n')
+            tmp_path.replace(self.path)
+            self._appended = 0
+        except OSError as e:
+            logger.warning(f"Failed to compact link cache: {e}")
+
+    def clear(self) -> None:
+        """Drop all entries, including the persisted file."""
+        with self._lock:
+            self._entries.clear()
+            self._appended = 0
+            if self.path is not None and self.path.exists():
+                try:
+                    self.path.unlink()
+                except OSError as e:
+                    logger.warning(f"Failed to remove link cache: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        """Get cache statistics."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total > 0 else 0
+            }
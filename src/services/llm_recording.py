@@ -0,0 +1,262 @@
+"""LLM Recording - record provider calls during a real run, replay them offline.
+
+Load testing SectionWriter, the job engines or the batch CLI used to need a
+live Ollama/Gemini/OpenAI backend. With ``llm_record_path`` set,
+``LLMService`` appends every successful provider call (prompt, response and
+observed latency) to a JSONL file. With ``llm_replay_path`` set, the service
+skips the real providers and answers from that file through a ``REPLAY``
+provider, so the same workload can be run offline and repeatably.
+
+Replay latency modes (``llm_replay_latency``):
+
+- ``none``: answer immediately
+- ``recorded``: sleep for the latency recorded with the matched response
+- ``sampled``: sleep for a latency drawn (seeded) from all recorded latencies
+
+``llm_replay_speed`` divides the latency, so 10.0 replays ten times faster
+with the same distribution shape.
+
+Prompts are matched on the same inputs as the response cache (prompt, model,
+temperature). A prompt that was recorded more than once replays its
+responses in turn. A prompt that was never recorded (for example a
+timestamped prompt or a retry with an enhanced prompt) gets a deterministic
+stand-in: a recorded response for the same content type or model. With
+``llm_replay_strict`` it raises ``ReplayMissError`` instead.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from src.utils import cancellation
+
+logger = logging.getLogger(__name__)
+
+REPLAY_PROVIDER = "REPLAY"
+LATENCY_MODES = ("none", "recorded", "sampled")
+
+
+class ReplayMissError(LookupError):
+    """Raised in strict replay mode when a prompt has no recording."""
+
+
+def request_key(prompt: str, model: Optional[str], temperature: Optional[float]) -> str:
+    """Stable key for one request, independent of the provider that served it."""
+    normalized = {'prompt': prompt, 'model': model or 'default', 'temperature': temperature}
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+
+
+class LLMRecorder:
+    """Appends provider calls to a JSONL recording."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize recorder.
+
+        Args:
+            path: JSONL file to append to (created with its parent directories)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def record(
+        self,
+        provider: str,
+        prompt: str,
+        response: str,
+        latency: float,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        content_type: Optional[str] = None
+    ) -> None:
+        """Append one successful call.
+
+        Args:
+            provider: Provider that answered
+            prompt: Prompt sent
+            response: Text returned
+            latency: Seconds the provider call took
+            model: Model override passed to ``generate`` (generic or provider-specific)
+            temperature: Effective temperature
+            content_type: Content type hint passed to ``generate``
+        """
+        entry = {
+            'key': request_key(prompt, model, temperature),
+            'provider': provider,
+            'model': model,
+            'temperature': temperature,
+            'content_type': content_type,
+            'prompt': prompt,
+            'response': response,
+            'latency_s': round(latency, 4),
+            'recorded_at': datetime.now(timezone.utc).isoformat(),
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        try:
+            with self._lock:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+                self.recorded += 1
+        except OSError as e:
+            # A failed recording must never fail the real call
+            logger.warning(f"Could not record LLM call to {self.path}: {e}")
+
+
+class ReplayProvider:
+    """Answers prompts from a recording made by ``LLMRecorder``."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        latency_mode: str = "recorded",
+        speed: float = 1.0,
+        strict: bool = False,
+        seed: int = 0
+    ):
+        """Initialize replay provider.
+
+        Args:
+            path: JSONL recording to replay
+            latency_mode: One of ``none``, ``recorded``, ``sampled``
+            speed: Divisor applied to replayed latencies
+            strict: Raise ``ReplayMissError`` for prompts without a recording
+            seed: Seed for latency sampling
+
+        Raises:
+            FileNotFoundError: If the recording does not exist
+            ValueError: If the recording is empty or latency_mode is unknown
+        """
+        if latency_mode not in LATENCY_MODES:
+            raise ValueError(f"Unknown replay latency mode {latency_mode!r}, expected one of {LATENCY_MODES}")
+        self.path = Path(path)
+        self.latency_mode = latency_mode
+        self.speed = speed if speed and speed > 0 else 1.0
+        self.strict = strict
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.entries: List[Dict[str, Any]] = []
+        self._by_key: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._by_group: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed line {line_no} in {self.path}")
+                    continue
+                if 'key' not in entry or 'response' not in entry:
+                    continue
+                self.entries.append(entry)
+                self._by_key[entry['key']].append(entry)
+                self._by_group[self._group(entry.get('content_type'), entry.get('model'))].append(entry)
+        if not self.entries:
+            raise ValueError(f"LLM recording {self.path} has no entries")
+        self._latencies = sorted(float(e.get('latency_s') or 0.0) for e in self.entries)
+        logger.info(f"Replaying {len(self.entries)} recorded LLM calls from {self.path} "
+                    f"(latency={self.latency_mode}, speed={self.speed}x)")
+
+    @staticmethod
+    def _group(content_type: Optional[str], model: Optional[str]) -> str:
+        return content_type or model or 'default'
+
+    def _next(self, cursor: str, candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        with self._lock:
+            index = self._cursor[cursor]
+            self._cursor[cursor] = index + 1
+        return candidates[index % len(candidates)]
+
+    def lookup(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        content_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Find the recorded entry that answers a request.
+
+        Raises:
+            ReplayMissError: In strict mode, if the request was never recorded
+        """
+        key = request_key(prompt, model, temperature)
+        recorded = self._by_key.get(key)
+        if recorded:
+            with self._lock:
+                self.hits += 1
+            return self._next(key, recorded)
+
+        with self._lock:
+            self.misses += 1
+        if self.strict:
+            raise ReplayMissError(f"No recorded response for prompt {prompt[:60]!r}")
+        # Deterministic stand-in: same prompt always gets the same recorded response
+        candidates = self._by_group.get(self._group(content_type, model)) or self.entries
+        index = int(key[:8], 16) % len(candidates)
+        return candidates[index]
+
+    def latency_for(self, entry: Dict[str, Any]) -> float:
+        """Seconds to wait before answering with entry."""
+        if self.latency_mode == "none":
+            return 0.0
+        if self.latency_mode == "sampled":
+            with self._lock:
+                seconds = self._rng.choice(self._latencies)
+        else:
+            seconds = float(entry.get('latency_s') or 0.0)
+        return seconds / self.speed
+
+    def generate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        content_type: Optional[str] = None
+    ) -> str:
+        """Return the recorded response for a request, after its replayed latency.
+
+        Raises:
+            ReplayMissError: In strict mode, if the request was never recorded
+        """
+        entry = self.lookup(prompt, model, temperature, content_type)
+        delay = self.latency_for(entry)
+        if delay > 0:
+            cancellation.sleep(delay)
+        return entry['response']
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Replay counters and the recorded latency distribution."""
+        latencies = self._latencies
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'latency_mode': self.latency_mode,
+            'speed': self.speed,
+            'latency_p50_s': latencies[len(latencies) // 2],
+            'latency_p95_s': latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        }
+
+
+__all__ = [
+    "REPLAY_PROVIDER",
+    "LATENCY_MODES",
+    "ReplayMissError",
+    "request_key",
+    "LLMRecorder",
+    "ReplayProvider",
+]
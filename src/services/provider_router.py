@@ -0,0 +1,240 @@
+"""Provider Router - latency- and health-aware ordering of LLM providers.
+
+``LLMService`` used to try its providers in a fixed order, so a slow or
+failing first provider added its full retry budget to every call. The
+router keeps live statistics per provider and per request class (content
+type or model), and provides three things:
+
+- ``rank()`` orders providers for a request. Providers with an open circuit
+  are skipped. Measured providers are sorted by expected latency
+  (p50 / success rate). A provider that has no recent samples keeps its
+  configured position, so it is probed again once its old samples expire.
+- ``hedge_delay()`` returns the p95 latency after which a still-running
+  request is duplicated to the next provider; ``start_hedge()`` caps hedges
+  to a fraction of those requests.
+- A ``CircuitBreaker`` per provider (from ``src.utils.resilience``) that opens
+  after consecutive failures and half-opens after ``recovery_timeout``.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from src.utils.resilience import CircuitBreaker, CircuitState
+
+logger = logging.getLogger(__name__)
+
+ANY_CLASS = "*"
+
+
+def _quantile(values: Sequence[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+@dataclass
+class ProviderStats:
+    """Recent outcomes of one provider for one request class."""
+    latencies: Deque[Tuple[float, float]] = field(default_factory=deque)  # (timestamp, seconds)
+    outcomes: Deque[Tuple[float, bool]] = field(default_factory=deque)    # (timestamp, success)
+
+    def prune(self, now: float, ttl: float, window: int) -> None:
+        for samples in (self.latencies, self.outcomes):
+            while samples and (now - samples[0][0] > ttl or len(samples) > window):
+                samples.popleft()
+
+    def success_rate(self) -> float:
+        if not self.outcomes:
+            return 1.0
+        return sum(1 for _, ok in self.outcomes if ok) / len(self.outcomes)
+
+    def latency(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        return _quantile([seconds for _, seconds in self.latencies], q)
+
+
+class ProviderRouter:
+    """Tracks provider health and latency and orders providers per request."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0,
+        window: int = 50,
+        min_samples: int = 5,
+        sample_ttl_s: float = 600.0,
+        hedge_quantile: float = 0.95,
+        hedging: bool = True,
+        max_hedge_fraction: float = 0.1
+    ):
+        """Initialize router.
+
+        Args:
+            failure_threshold: Consecutive failures that open a provider's circuit
+            recovery_timeout: Seconds an open circuit waits before half-opening
+            window: Samples kept per provider and request class
+            min_samples: Successful samples needed before latency is trusted
+            sample_ttl_s: Samples older than this are discarded
+            hedge_quantile: Latency quantile after which a request is hedged
+            hedging: Enable hedged requests
+            max_hedge_fraction: Largest share of hedgeable requests that may be hedged
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.window = window
+        self.min_samples = min_samples
+        self.sample_ttl_s = sample_ttl_s
+        self.hedge_quantile = hedge_quantile
+        self.hedging = hedging
+        self.max_hedge_fraction = max_hedge_fraction
+
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], ProviderStats] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._hedges = {"started": 0, "won": 0}
+        # Token bucket: each hedgeable request earns max_hedge_fraction, a hedge costs 1
+        self._hedge_budget = 1.0
+
+    def _clock(self) -> float:
+        return time.monotonic()
+
+    # ------------------------------------------------------------------ health
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(provider)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    f"llm-{provider.lower()}",
+                    failure_threshold=self.failure_threshold,
+                    timeout=self.recovery_timeout,
+                    half_open_attempts=1
+                )
+                self._breakers[provider] = breaker
+            return breaker
+
+    def is_available(self, provider: str) -> bool:
+        """Whether the provider's circuit lets a request through."""
+        return self.breaker(provider).allow_request()
+
+    def record(self, provider: str, request_class: Optional[str], latency: Optional[float], success: bool) -> None:
+        """Record the outcome of one provider call.
+
+        Args:
+            provider: Provider name
+            request_class: Request class (content type or model), or None
+            latency: Call duration in seconds (successful calls only)
+            success: Whether the call succeeded
+        """
+        now = self._clock()
+        with self._lock:
+            for key in {request_class or ANY_CLASS, ANY_CLASS}:
+                stats = self._stats.setdefault((provider, key), ProviderStats())
+                stats.outcomes.append((now, success))
+                if success and latency is not None:
+                    stats.latencies.append((now, latency))
+                stats.prune(now, self.sample_ttl_s, self.window)
+
+        breaker = self.breaker(provider)
+        if success:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+            if breaker.state == CircuitState.OPEN:
+                logger.warning(f"Provider {provider} circuit open, routing around it for {self.recovery_timeout:.0f}s")
+
+    def start_hedge(self) -> bool:
+        """Claim a hedge from the budget; False if too many requests were hedged lately."""
+        with self._lock:
+            if self._hedge_budget < 1.0:
+                return False
+            self._hedge_budget -= 1.0
+            self._hedges["started"] += 1
+            return True
+
+    def record_hedge(self, won: bool) -> None:
+        if won:
+            with self._lock:
+                self._hedges["won"] += 1
+
+    # ------------------------------------------------------------------ routing
+
+    def _measured(self, provider: str, request_class: Optional[str], now: float) -> Optional[ProviderStats]:
+        """Stats for the request class, else provider-wide, once enough samples exist."""
+        for key in (request_class or ANY_CLASS, ANY_CLASS):
+            stats = self._stats.get((provider, key))
+            if stats is None:
+                continue
+            stats.prune(now, self.sample_ttl_s, self.window)
+            if len(stats.latencies) >= self.min_samples:
+                return stats
+        return None
+
+    def rank(self, providers: Sequence[str], request_class: Optional[str] = None) -> List[str]:
+        """Order providers for a request, fastest healthy first.
+
+        Args:
+            providers: Configured providers in preference order
+            request_class: Request class (content type or model)
+
+        Returns:
+            Providers with a closed or half-open circuit, best first. If every
+            circuit is open, all providers in configured order (last resort).
+        """
+        healthy = [p for p in providers if self.is_available(p)]
+        if not healthy:
+            return list(providers)
+
+        now = self._clock()
+        with self._lock:
+            scores = {}
+            for provider in healthy:
+                stats = self._measured(provider, request_class, now)
+                if stats is not None:
+                    scores[provider] = stats.latency(0.5) / max(stats.success_rate(), 0.05)
+
+        # Measured providers swap among their own slots; unmeasured ones stay put
+        slots = [i for i, p in enumerate(healthy) if p in scores]
+        ordered = sorted((p for p in healthy if p in scores), key=lambda p: scores[p])
+        ranked = list(healthy)
+        for slot, provider in zip(slots, ordered):
+            ranked[slot] = provider
+        return ranked
+
+    def hedge_delay(self, provider: str, request_class: Optional[str] = None) -> Optional[float]:
+        """Seconds after which a call to provider should be hedged, or None if unknown.
+
+        Each request this returns a delay for adds to the hedge budget.
+        """
+        if not self.hedging:
+            return None
+        with self._lock:
+            stats = self._measured(provider, request_class, self._clock())
+            if stats is None:
+                return None
+            self._hedge_budget = min(1.0, self._hedge_budget + self.max_hedge_fraction)
+            return stats.latency(self.hedge_quantile)
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        with self._lock:
+            providers: Dict[str, Dict[str, Any]] = {}
+            for (provider, request_class), stats in self._stats.items():
+                stats.prune(now, self.sample_ttl_s, self.window)
+                providers.setdefault(provider, {})[request_class] = {
+                    "samples": len(stats.outcomes),
+                    "success_rate": round(stats.success_rate(), 3),
+                    "p50_s": stats.latency(0.5),
+                    "p95_s": stats.latency(0.95),
+                }
+            breakers = {p: b.state.value for p, b in self._breakers.items()}
+            hedges = dict(self._hedges)
+        return {"providers": providers, "circuits": breakers, "hedges": hedges}
+
+
+__all__ = ["ProviderRouter", "ProviderStats"]
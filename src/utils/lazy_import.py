@@ -0,0 +1,146 @@
+"""Deferred imports for heavy optional dependencies.
+
+torch, sentence-transformers, chromadb, pytrends and aiohttp each cost
+hundreds of milliseconds (and for torch, hundreds of MB) to import. Modules
+that only *may* need them bind a proxy at import time instead, and the real
+import happens on first attribute access or call.
+
+``*_AVAILABLE`` flags are ``ModuleAvailability`` objects. Defining one only
+locates the package with ``importlib.util.find_spec`` (``installed``), so
+proxies can be bound at import time for free. The first truth test of a
+flag, which happens where the dependency is about to be used, imports the
+package. An installed package that fails to import, such as torch with a
+broken native library, then reads as unavailable, and callers take the same
+fallback path as when it is missing.
+"""
+
+import importlib
+import importlib.util
+import logging
+import sys
+import threading
+import types
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+_import_results: Dict[str, bool] = {}
+_import_lock = threading.Lock()
+
+
+def _installed(name: str) -> bool:
+    if name in sys.modules:
+        return sys.modules[name] is not None
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _importable(name: str) -> bool:
+    """Import ``name`` once per process; False (logged) if the import fails."""
+    with _import_lock:
+        if name not in _import_results:
+            try:
+                importlib.import_module(name)
+                _import_results[name] = True
+            except Exception as e:  # broken native deps raise OSError, RuntimeError, ...
+                logger.warning(f"Optional dependency {name} is installed but failed to import: {e}")
+                _import_results[name] = False
+        return _import_results[name]
+
+
+class ModuleAvailability:
+    """Truth value of "optional module ``name`` can be used".
+
+    ``installed`` is known at construction without importing anything.
+    Truth testing imports the module on first use and is False if that fails.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.installed = _installed(name)
+
+    def __bool__(self) -> bool:
+        return self.installed and _importable(self.name)
+
+    def __repr__(self) -> str:
+        return f"<ModuleAvailability '{self.name}' installed={self.installed}>"
+
+
+def module_available(name: str) -> ModuleAvailability:
+    """Availability flag for the top-level package ``name``.
+
+    Args:
+        name: Top-level module name (e.g. ``"torch"``)
+
+    Returns:
+        A flag whose ``installed`` attribute says whether the package can be
+        located, and whose truth value says whether it actually imports
+    """
+    return ModuleAvailability(name)
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_name'] = name
+        self.__dict__['_lazy_module'] = None
+        self.__dict__['_lazy_lock'] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__dict__['_lazy_name'])
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the underlying module has been imported."""
+        return self.__dict__['_lazy_module'] is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module '{self.__dict__['_lazy_name']}' ({state})>"
+
+
+class LazyAttribute:
+    """Proxy for ``from module import name`` that resolves on first use.
+
+    Calling the proxy calls the real object, so a lazily bound class can be
+    instantiated exactly as before (``SentenceTransformer(model_name)``).
+    """
+
+    def __init__(self, module_name: str, attr: str):
+        self._module = LazyModule(module_name)
+        self._attr = attr
+        self._target = None
+
+    def resolve(self) -> Any:
+        """Import the module and return the real attribute."""
+        if self._target is None:
+            self._target = getattr(self._module, self._attr)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy attribute '{self._module.__dict__['_lazy_name']}.{self._attr}'>"
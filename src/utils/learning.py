@@ -18,6 +18,7 @@ from dataclasses import dataclass, field
 from src.core.contracts import AgentEvent
 from src.core.config import Config, FAILURE_STRATEGIES
 from src.core.agent_base import SelfCorrectingAgent
+from src.utils.metrics_store import MetricsStore, get_metrics_store, series_name
 
 logger = logging.getLogger(__name__)
 
@@ -34,11 +35,13 @@ class ExecutionRecord:
 class PerformanceTracker:
     """Thread-safe tracker for agent performance and failure patterns."""
 
-    def __init__(self, window_size: int = 20):
+    def __init__(self, window_size: int = 20, metrics_store: Optional[MetricsStore] = None):
         """Initialize performance tracker.
 
         Args:
             window_size: Size of rolling window for metrics
+            metrics_store: Time-series store for long-range analytics
+                (defaults to the process-wide store)
             
         Example:
             >>> tracker = PerformanceTracker(window_size=50)
@@ -50,6 +53,7 @@ class PerformanceTracker:
         )
         self.failure_counts: Dict[Tuple[str, str, str], int] = defaultdict(int)
         self._lock = threading.Lock()
+        self.metrics_store = metrics_store if metrics_store is not None else get_metrics_store()
 
     def record_execution(
         self,
@@ -88,6 +92,10 @@ class PerformanceTracker:
                 failure_key = (agent_id, capability, error_type)
                 self.failure_counts[failure_key] += 1
 
+        ts = record.timestamp.timestamp()
+        self.metrics_store.record(series_name("learning", agent_id, capability, "latency_ms"), latency_ms, ts)
+        self.metrics_store.record(series_name("learning", agent_id, capability, "success"), 1.0 if success else 0.0, ts)
+
         logger.debug(
             f"Recorded execution: {agent_id}/{capability} "
             f"success={success} error={error_type}"
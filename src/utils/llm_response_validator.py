@@ -24,6 +24,8 @@ import time
 from typing import List
 from dataclasses import dataclass
 
+from src.utils.markdown_structure import get_structure
+
 logger = logging.getLogger(__name__)
 
 # Compiled regex patterns (module-level for performance)
@@ -63,8 +65,7 @@ def validate_code_block_balance(content: str) -> tuple[bool, List[str]]:
         - is_valid: True if code fences are balanced
         - errors: List of error messages (empty if valid)
     """
-    fence_matches = CODE_FENCE_PATTERN.findall(content)
-    fence_count = len(fence_matches)
+    fence_count = get_structure(content).fence_count
 
     if fence_count % 2 != 0:
         error_msg = (
@@ -92,27 +93,7 @@ def validate_no_frontmatter(content: str) -> tuple[bool, List[str]]:
         - is_valid: True if no contaminated frontmatter found
         - errors: List of error messages (empty if valid)
     """
-    lines = content.split('\n')
-    fm_blocks = []
-    i = 0
-
-    while i < len(lines):
-        if lines[i].strip() == '---':
-            block_start = i
-            i += 1
-            has_yaml = False
-            while i < len(lines) and lines[i].strip() != '---':
-                if re.match(r'^[a-zA-Z_][a-zA-Z0-9_-]*:', lines[i].strip()):
-                    has_yaml = True
-                i += 1
-            if i < len(lines) and has_yaml:
-                fm_blocks.append(block_start)
-                i += 1
-            else:
-                if i < len(lines):
-                    i += 1
-        else:
-            i += 1
+    fm_blocks = get_structure(content).frontmatter_blocks()
 
     if len(fm_blocks) > 1:
         return False, [
@@ -0,0 +1,257 @@
+"""Markdown Structure - one-pass tokenizer shared by markdown validators and fixers.
+
+The Layer 1 (llm_response_validator) and Layer 2 (markdown_validator) checks
+all need the same facts about a document: where the code fences are, which
+lines are ``---`` delimiters, which lines look like YAML keys, which headings
+sit inside code blocks. Instead of every check re-splitting the document and
+re-running regexes line by line, the document is classified once into a
+``MarkdownStructure`` and the checks query it.
+
+Key Features:
+- Single line-classification pass with cheap substring pre-filters
+- Derived views (fences, frontmatter blocks, nested headings) computed once
+- Incremental edits: ``replace_lines`` re-classifies only the edited lines
+- Small content-keyed cache so repeated validation of the same text is free
+"""
+
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+# Compiled regex patterns (module-level for performance)
+FENCE_RE = re.compile(r'^\s*```(\w*)')
+BARE_FENCE_RE = re.compile(r'^\s*```\s*$')
+HEADING_RE = re.compile(r'^(\s*)(#{1,6})\s+(.+)$')
+YAML_KEY_RE = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_-]*:')
+
+# Bare words that are treated as a language specifier missing its ``` fence
+LANGUAGE_SPECIFIERS = frozenset([
+    'python', 'javascript', 'java', 'bash', 'sh', 'yaml', 'json', 'xml', 'sql',
+    'typescript', 'cpp', 'c', 'ruby', 'go', 'rust'
+])
+
+# Languages in which a single '#' line is a comment, not a markdown heading
+HASH_COMMENT_LANGUAGES = frozenset(['python', 'py', 'bash', 'sh', 'shell', 'ruby', 'perl', 'yaml'])
+
+_CACHE_SIZE = 32
+
+
+class LineInfo(NamedTuple):
+    """Classification of a single line."""
+    fence_language: Optional[str]   # Language after ``` ('' if none); None if not a fence
+    bare_fence: bool                # Line is only ``` (plus whitespace)
+    delimiter: bool                 # Stripped line is exactly '---'
+    yaml_key: bool                  # Stripped line starts with 'key:'
+    language_specifier: Optional[str]
+    heading: Optional[Tuple[int, str]]  # (level, stripped line) if heading-shaped
+    blank: bool
+
+
+def classify_line(line: str) -> LineInfo:
+    """Classify one line of markdown.
+
+    Args:
+        line: Line without trailing newline
+
+    Returns:
+        LineInfo for the line
+    """
+    stripped = line.strip()
+    if not stripped:
+        return LineInfo(None, False, False, False, None, None, True)
+
+    fence_language = None
+    bare_fence = False
+    if '```' in line:
+        match = FENCE_RE.match(line)
+        if match:
+            fence_language = match.group(1)
+            bare_fence = BARE_FENCE_RE.match(line) is not None
+
+    heading = None
+    if '#' in line:
+        match = HEADING_RE.match(line)
+        if match:
+            heading = (len(match.group(2)), stripped)
+
+    return LineInfo(
+        fence_language,
+        bare_fence,
+        stripped == '---',
+        ':' in stripped and YAML_KEY_RE.match(stripped) is not None,
+        stripped if stripped in LANGUAGE_SPECIFIERS else None,
+        heading,
+        False
+    )
+
+
+class MarkdownStructure:
+    """Classified view of a markdown document.
+
+    All line numbers returned by public attributes are 0-indexed; helpers that
+    mirror the validator APIs convert to 1-indexed where documented.
+
+    Attributes:
+        lines: Document lines (split on '\\n')
+        info: LineInfo per line
+        fences: Indices of lines that are code fences
+        delimiters: Indices of '---' lines
+        yaml_keys: Indices of lines that look like 'key: value'
+        language_specifiers: Indices of bare language-specifier lines
+        nested_headings: (index, stripped line) of markdown headings inside code blocks
+        leading_frontmatter: (open, close) indices of the frontmatter block at
+            document start (first non-blank line is '---'), close is None if unclosed
+    """
+
+    def __init__(self, lines: Sequence[str], info: Sequence[LineInfo], text: Optional[str] = None):
+        self.lines: List[str] = list(lines)
+        self.info: List[LineInfo] = list(info)
+        self._text = text
+
+        self.fences: List[int] = []
+        self.delimiters: List[int] = []
+        self.yaml_keys: List[int] = []
+        self.language_specifiers: List[int] = []
+        self.nested_headings: List[Tuple[int, str]] = []
+        first_non_blank = None
+
+        inside_code = False
+        code_language = None
+        for idx, li in enumerate(self.info):
+            if li.blank:
+                continue
+            if first_non_blank is None:
+                first_non_blank = idx
+            if li.fence_language is not None:
+                self.fences.append(idx)
+                if inside_code:
+                    inside_code = False
+                    code_language = None
+                else:
+                    inside_code = True
+                    code_language = li.fence_language or None
+                continue
+            if li.delimiter:
+                self.delimiters.append(idx)
+            elif li.yaml_key:
+                self.yaml_keys.append(idx)
+            if li.language_specifier is not None:
+                self.language_specifiers.append(idx)
+            if inside_code and li.heading is not None:
+                level, stripped = li.heading
+                if level == 1 and code_language in HASH_COMMENT_LANGUAGES:
+                    continue
+                if level >= 2:
+                    self.nested_headings.append((idx, stripped))
+
+        self.first_non_blank = first_non_blank
+        self.leading_frontmatter: Optional[Tuple[int, Optional[int]]] = None
+        if first_non_blank is not None and self.info[first_non_blank].delimiter:
+            pos = bisect_right(self.delimiters, first_non_blank)
+            close = self.delimiters[pos] if pos < len(self.delimiters) else None
+            self.leading_frontmatter = (first_non_blank, close)
+
+    @classmethod
+    def parse(cls, content: str) -> 'MarkdownStructure':
+        """Tokenize content into a MarkdownStructure (uncached)."""
+        lines = content.split('\n')
+        return cls(lines, [classify_line(line) for line in lines], text=content)
+
+    @property
+    def text(self) -> str:
+        """Document text (joined lazily after incremental edits)."""
+        if self._text is None:
+            self._text = '\n'.join(self.lines)
+        return self._text
+
+    # ------------------------------------------------------------------ queries
+
+    @property
+    def fence_count(self) -> int:
+        return len(self.fences)
+
+    def fence_line_numbers(self) -> List[int]:
+        """1-indexed line numbers of code fences."""
+        return [idx + 1 for idx in self.fences]
+
+    def is_fence(self, idx: int) -> bool:
+        return 0 <= idx < len(self.info) and self.info[idx].fence_language is not None
+
+    def has_yaml_key_between(self, start: int, stop: int) -> bool:
+        """Whether any line strictly between ``start`` and ``stop`` looks like YAML."""
+        pos = bisect_right(self.yaml_keys, start)
+        return pos < len(self.yaml_keys) and self.yaml_keys[pos] < stop
+
+    def duplicate_frontmatter_starts(self) -> List[int]:
+        """1-indexed '---' lines opening a YAML-like block after the leading frontmatter."""
+        start = 0
+        if self.leading_frontmatter is not None:
+            opening, closing = self.leading_frontmatter
+            start = len(self.lines) if closing is None else closing + 1
+
+        yaml_keys = set(self.yaml_keys)
+        return [
+            idx + 1
+            for idx in self.delimiters[bisect_left(self.delimiters, start):]
+            if idx + 1 in yaml_keys
+        ]
+
+    def frontmatter_blocks(self) -> List[int]:
+        """0-indexed starts of closed '---' blocks that contain at least one YAML key.
+
+        Delimiters pair up in document order; an unclosed trailing delimiter
+        does not form a block.
+        """
+        blocks = []
+        delimiters = self.delimiters
+        for k in range(0, len(delimiters) - 1, 2):
+            opening, closing = delimiters[k], delimiters[k + 1]
+            if self.has_yaml_key_between(opening, closing):
+                blocks.append(opening)
+        return blocks
+
+    # ------------------------------------------------------------------ edits
+
+    def replace_lines(self, start: int, stop: int, new_lines: Sequence[str]) -> 'MarkdownStructure':
+        """Return a new structure with ``lines[start:stop]`` replaced.
+
+        Only the inserted lines are re-classified; classification of all other
+        lines is reused.
+        """
+        lines = self.lines[:start] + list(new_lines) + self.lines[stop:]
+        info = self.info[:start] + [classify_line(line) for line in new_lines] + self.info[stop:]
+        return MarkdownStructure(lines, info)
+
+
+_cache: 'OrderedDict[str, MarkdownStructure]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def remember_structure(structure: MarkdownStructure) -> MarkdownStructure:
+    """Add an (incrementally built) structure to the parse cache."""
+    key = structure.text
+    with _cache_lock:
+        _cache[key] = structure
+        _cache.move_to_end(key)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return structure
+
+
+def get_structure(content: str) -> MarkdownStructure:
+    """Return the MarkdownStructure for content, parsing at most once per text.
+
+    Args:
+        content: Markdown content
+
+    Returns:
+        Cached or freshly parsed MarkdownStructure
+    """
+    with _cache_lock:
+        structure = _cache.get(content)
+        if structure is not None:
+            _cache.move_to_end(content)
+            return structure
+    return remember_structure(MarkdownStructure.parse(content))
@@ -13,12 +13,22 @@ Key Features:
 - Fails fast on ambiguous cases with clear error messages
 - Idempotent: can run multiple times safely
 - Non-destructive: preserves valid content structure
+
+All checks query a shared MarkdownStructure (see markdown_structure.py), so a
+document is tokenized once no matter how many validators or fix/revalidate
+rounds run over it.
 """
 
-import re
 import logging
+from bisect import bisect_right
 from typing import List, Tuple
 
+from src.utils.markdown_structure import (
+    MarkdownStructure,
+    get_structure,
+    remember_structure,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,15 +43,8 @@ def count_code_fences(content: str) -> Tuple[int, List[int]]:
         - total_count: Number of ``` markers found
         - line_numbers: List of 1-indexed line numbers where ``` appears
     """
-    lines = content.split('\n')
-    fence_lines = []
-
-    for i, line in enumerate(lines, start=1):
-        # Match ``` at start of line (allowing leading whitespace)
-        if re.match(r'^\s*```', line):
-            fence_lines.append(i)
-
-    return len(fence_lines), fence_lines
+    structure = get_structure(content)
+    return structure.fence_count, structure.fence_line_numbers()
 
 
 def validate_balanced_code_blocks(content: str) -> Tuple[bool, List[str]]:
@@ -55,7 +58,8 @@ def validate_balanced_code_blocks(content: str) -> Tuple[bool, List[str]]:
         - is_valid: True if code fences are balanced
         - errors: List of error messages (empty if valid)
     """
-    fence_count, fence_lines = count_code_fences(content)
+    structure = get_structure(content)
+    fence_count, fence_lines = structure.fence_count, structure.fence_line_numbers()
 
     if fence_count % 2 != 0:
         error_msg = (
@@ -67,27 +71,17 @@ def validate_balanced_code_blocks(content: str) -> Tuple[bool, List[str]]:
         return False, [error_msg]
 
     # Additional check: look for language specifiers without opening fence
-    lines = content.split('\n')
     errors = []
 
-    for i, line in enumerate(lines, start=1):
-        line_stripped = line.strip()
-        # Check for standalone language specifier
-        if line_stripped in ['python', 'javascript', 'java', 'bash', 'sh', 'yaml', 'json', 'xml', 'sql', 'typescript', 'cpp', 'c', 'ruby', 'go', 'rust']:
-            # Previous line should be a fence opening (```)
-            # Check if previous line is a fence
-            if i > 1:
-                prev_line = lines[i-2].strip()  # i is 1-indexed, lines is 0-indexed
-                # If previous line is NOT a fence opening, this is an error
-                if not re.match(r'^```', prev_line):
-                    error_msg = f"Language specifier '{line_stripped}' at line {i} is missing opening ``` fence"
-                    errors.append(error_msg)
-                    logger.warning(f"  ⚠ {error_msg}")
-            else:
-                # Language specifier at start of file without fence
-                error_msg = f"Language specifier '{line_stripped}' at line {i} is missing opening ``` fence"
-                errors.append(error_msg)
-                logger.warning(f"  ⚠ {error_msg}")
+    for idx in structure.language_specifiers:
+        # Previous line should be a fence opening (```)
+        if not structure.is_fence(idx - 1):
+            error_msg = (
+                f"Language specifier '{structure.info[idx].language_specifier}' at line {idx + 1} "
+                f"is missing opening ``` fence"
+            )
+            errors.append(error_msg)
+            logger.warning(f"  ⚠ {error_msg}")
 
     if errors:
         return False, errors
@@ -109,43 +103,10 @@ def detect_nested_code_blocks(content: str) -> List[Tuple[int, str]]:
     Returns:
         List of (line_number, heading_text) tuples for invalid headings
     """
-    lines = content.split('\n')
-    nested_headings = []
-    inside_code_block = False
-    code_block_language = None
-
-    for i, line in enumerate(lines, start=1):
-        # Toggle code block state and track language
-        fence_match = re.match(r'^\s*```(\w*)', line)
-        if fence_match:
-            if inside_code_block:
-                # Closing fence
-                inside_code_block = False
-                code_block_language = None
-            else:
-                # Opening fence
-                inside_code_block = True
-                code_block_language = fence_match.group(1) if fence_match.group(1) else None
-            continue
-
-        # Check for headings inside code blocks
-        if inside_code_block:
-            heading_match = re.match(r'^(\s*)(#{1,6})\s+(.+)$', line)
-            if heading_match:
-                indent = heading_match.group(1)
-                hashes = heading_match.group(2)
-                text = heading_match.group(3)
-
-                # If it's a single # in a python/shell/bash block with indent, likely a comment
-                if len(hashes) == 1 and code_block_language in ['python', 'py', 'bash', 'sh', 'shell', 'ruby', 'perl', 'yaml']:
-                    # This is likely a valid comment, not a markdown heading
-                    continue
-
-                # If it's ## or more, always flag it
-                if len(hashes) >= 2:
-                    nested_headings.append((i, line.strip()))
-
-    return nested_headings
+    # Single '#' lines in python/shell/yaml-style blocks are treated as
+    # comments; '##' or deeper inside any code block is always flagged.
+    structure = get_structure(content)
+    return [(idx + 1, heading) for idx, heading in structure.nested_headings]
 
 
 def validate_no_nested_markdown(content: str) -> Tuple[bool, List[str]]:
@@ -185,38 +146,10 @@ def detect_duplicate_frontmatter(content: str) -> List[int]:
     Returns:
         List of line numbers where duplicate frontmatter starts
     """
-    lines = content.split('\n')
-    frontmatter_starts = []
-    seen_first = False
-    i = 0
-
-    # Skip leading whitespace/empty lines
-    while i < len(lines) and not lines[i].strip():
-        i += 1
-
-    # Check if first non-empty line starts valid frontmatter
-    if i < len(lines) and lines[i].strip() == '---':
-        seen_first = True
-        i += 1
-        # Skip to end of first frontmatter
-        while i < len(lines) and lines[i].strip() != '---':
-            i += 1
-        if i < len(lines):
-            i += 1  # Skip closing ---
-
-    # Look for duplicate frontmatter blocks after the first
-    while i < len(lines):
-        line = lines[i].strip()
-        if line == '---':
-            # Check if this starts a YAML-like block (next line has key:value)
-            if i + 1 < len(lines):
-                next_line = lines[i + 1].strip()
-                # Simple heuristic: looks like YAML if has "key:" pattern
-                if re.match(r'^[a-zA-Z_][a-zA-Z0-9_-]*:', next_line):
-                    frontmatter_starts.append(i + 1)  # 1-indexed
-                    logger.debug(f"  Found duplicate frontmatter at line {i + 1}")
-        i += 1
-
+    # A later '---' counts as a duplicate if the next line looks like "key:"
+    frontmatter_starts = get_structure(content).duplicate_frontmatter_starts()
+    for line_num in frontmatter_starts:
+        logger.debug(f"  Found duplicate frontmatter at line {line_num}")
     return frontmatter_starts
 
 
@@ -288,6 +221,34 @@ def validate_markdown_syntax(content: str, skip_nested_check: bool = False) -> T
     return is_valid, all_errors
 
 
+def _collapse_blank_runs(structure: MarkdownStructure) -> MarkdownStructure:
+    """Collapse 3+ consecutive newlines to two, like re.sub(r'\\n\\n\\n+', '\\n\\n', text).
+
+    Works on the line list so that only the affected runs are edited.
+    """
+    lines = structure.lines
+    total = len(lines)
+    result = structure
+    idx = total - 1
+    # Walk backwards so earlier indices stay valid after each edit
+    while idx >= 0:
+        if lines[idx] != '':
+            idx -= 1
+            continue
+        run_end = idx + 1
+        while idx >= 0 and lines[idx] == '':
+            idx -= 1
+        run_start = idx + 1
+        empty = run_end - run_start
+        # A run of empty lines between two content lines spans empty + 1 newlines;
+        # each document edge it touches removes one of them
+        newlines = empty + 1 - (run_start == 0) - (run_end == total)
+        if newlines >= 3:
+            keep = empty - (newlines - 2)
+            result = result.replace_lines(run_start + keep, run_end, [])
+    return result
+
+
 def auto_fix_markdown_syntax(content: str, errors: List[str]) -> Tuple[str, bool]:
     """Attempt to auto-fix markdown syntax errors.
 
@@ -313,34 +274,33 @@ def auto_fix_markdown_syntax(content: str, errors: List[str]) -> Tuple[str, bool
         ValueError: If errors cannot be safely fixed
     """
     logger.info("Attempting auto-fix for markdown syntax errors")
-    fixed = content
+    structure = get_structure(content)
     applied_fixes = []
 
     # Fix 1: Check for entire-document code block wrapping
     # Pattern: Frontmatter, then ```, then content, then ``` at very end
-    lines = fixed.split('\n')
+    lines = structure.lines
 
     # Find frontmatter end
     frontmatter_end_idx = -1
-    if lines and lines[0].strip() == '---':
-        for i in range(1, len(lines)):
-            if lines[i].strip() == '---':
-                frontmatter_end_idx = i
-                break
+    if lines and structure.info[0].delimiter and len(structure.delimiters) > 1:
+        frontmatter_end_idx = structure.delimiters[1]
 
     # Check if code block wraps entire content after frontmatter
     if frontmatter_end_idx >= 0 and frontmatter_end_idx + 1 < len(lines):
         next_line_idx = frontmatter_end_idx + 1
         # Skip empty lines
-        while next_line_idx < len(lines) and not lines[next_line_idx].strip():
+        while next_line_idx < len(lines) and structure.info[next_line_idx].blank:
             next_line_idx += 1
 
-        if next_line_idx < len(lines) and re.match(r'^\s*```', lines[next_line_idx]):
+        if structure.is_fence(next_line_idx):
             # Find closing fence at or near end
             last_fence_idx = -1
-            for i in range(len(lines) - 1, next_line_idx, -1):
-                if re.match(r'^\s*```\s*$', lines[i]):
-                    last_fence_idx = i
+            for idx in reversed(structure.fences):
+                if idx <= next_line_idx:
+                    break
+                if structure.info[idx].bare_fence:
+                    last_fence_idx = idx
                     break
 
             # If found opening and closing that wrap everything
@@ -350,96 +310,75 @@ def auto_fix_markdown_syntax(content: str, errors: List[str]) -> Tuple[str, bool
                 if not after_closing or len(after_closing) < 50:  # Allow short trailing content
                     logger.info(f"  Detected entire-document code block wrap (lines {next_line_idx + 1} to {last_fence_idx + 1})")
                     # Remove the wrapping fences
-                    lines.pop(last_fence_idx)
-                    lines.pop(next_line_idx)
-                    fixed = '\n'.join(lines)
+                    structure = structure.replace_lines(last_fence_idx, last_fence_idx + 1, [])
+                    structure = structure.replace_lines(next_line_idx, next_line_idx + 1, [])
                     applied_fixes.append("Unwrapped entire-document code block")
 
     # Fix 2: Missing opening fences before language specifiers
     # This can happen even when total count is even (compensating errors)
-    lines = fixed.split('\n')
-    for i, line in enumerate(lines):
-        line_stripped = line.strip()
-        # Check if line looks like language specifier (common: python, javascript, etc.)
-        if line_stripped in ['python', 'javascript', 'java', 'bash', 'sh', 'yaml', 'json', 'xml', 'sql', 'typescript', 'cpp', 'c', 'ruby', 'go', 'rust']:
-            # Check if previous line is NOT a fence
-            if i == 0 or not re.match(r'^\s*```', lines[i-1]):
-                # This is likely a missing opening fence
-                logger.info(f"  Detected missing opening fence before language specifier at line {i + 1}")
-                lines[i] = f'```{line_stripped}'
-                fixed = '\n'.join(lines)
-                applied_fixes.append(f"Added opening ``` before language specifier at line {i + 1}")
-                break  # Only fix one at a time, then re-validate
+    for idx in structure.language_specifiers:
+        # Check if previous line is NOT a fence
+        if not structure.is_fence(idx - 1):
+            # This is likely a missing opening fence
+            language = structure.info[idx].language_specifier
+            logger.info(f"  Detected missing opening fence before language specifier at line {idx + 1}")
+            structure = structure.replace_lines(idx, idx + 1, [f'```{language}'])
+            applied_fixes.append(f"Added opening ``` before language specifier at line {idx + 1}")
+            break  # Only fix one at a time, then re-validate
 
     # Fix 3: Unbalanced code fences (after fixing missing openings)
-    fence_count, fence_lines = count_code_fences(fixed)
+    fence_count, fence_lines = structure.fence_count, structure.fence_line_numbers()
     if fence_count % 2 != 0:
-        # After fixing missing opening fences, re-check balance
-        if fence_count % 2 != 0:
-            # Check if last fence is orphaned (no closing)
-            last_fence_line = fence_lines[-1] - 1  # Convert to 0-indexed
-
-            # Count fences before the last one
-            fences_before_last = fence_count - 1
-
-            if fences_before_last % 2 == 0:
-                # All fences before last are balanced, so last is orphaned opening
-                logger.info(f"  Detected orphaned opening fence at line {fence_lines[-1]}")
-                # Add closing fence at end
-                fixed = fixed.rstrip() + '\n```\n'
-                applied_fixes.append(f"Added closing ``` for orphaned fence at line {fence_lines[-1]}")
+        # Count fences before the last one
+        fences_before_last = fence_count - 1
+
+        if fences_before_last % 2 == 0:
+            # All fences before last are balanced, so last is orphaned opening
+            logger.info(f"  Detected orphaned opening fence at line {fence_lines[-1]}")
+            # Add closing fence at end (equivalent to rstrip() + '\n```\n')
+            end = len(structure.lines)
+            while end > 0 and not structure.lines[end - 1].strip():
+                end -= 1
+            tail = structure.lines[end - 1].rstrip() if end > 0 else ''
+            structure = structure.replace_lines(max(end - 1, 0), len(structure.lines), [tail, '```', ''])
+            applied_fixes.append(f"Added closing ``` for orphaned fence at line {fence_lines[-1]}")
+        else:
+            # More complex case - could be orphaned closing or middle fence
+            # Check if first fence is orphaned (missing opening)
+            if fence_lines[0] > 1:
+                # Content exists before first fence
+                # Assume first fence is an orphaned closing
+                logger.info(f"  Detected orphaned closing fence at line {fence_lines[0]}")
+                idx = fence_lines[0] - 1
+                structure = _collapse_blank_runs(structure.replace_lines(idx, idx + 1, ['']))
+                applied_fixes.append(f"Removed orphaned closing fence at line {fence_lines[0]}")
             else:
-                # More complex case - could be orphaned closing or middle fence
-                # Check if first fence is orphaned (missing opening)
-                if fence_lines[0] > 1:
-                    # Content exists before first fence
-                    # Assume first fence is an orphaned closing
-                    logger.info(f"  Detected orphaned closing fence at line {fence_lines[0]}")
-                    lines = fixed.split('\n')
-                    # Find the line and remove the fence
-                    for i, line in enumerate(lines):
-                        if i + 1 == fence_lines[0] and re.match(r'^\s*```', line):
-                            # Remove this line
-                            lines[i] = ''
-                            fixed = '\n'.join(lines)
-                            # Clean up multiple consecutive empty lines
-                            fixed = re.sub(r'\n\n\n+', '\n\n', fixed)
-                            applied_fixes.append(f"Removed orphaned closing fence at line {fence_lines[0]}")
-                            break
-                else:
-                    # Ambiguous case - cannot safely fix
-                    raise ValueError(
-                        f"Cannot safely fix unbalanced code fences: {fence_count} fences found. "
-                        f"Ambiguous orphaned fence - manual review required. Fence locations: {fence_lines}"
-                    )
-
-    # Re-check fence count after potential fixes
-    fence_count, fence_lines = count_code_fences(fixed)
+                # Ambiguous case - cannot safely fix
+                raise ValueError(
+                    f"Cannot safely fix unbalanced code fences: {fence_count} fences found. "
+                    f"Ambiguous orphaned fence - manual review required. Fence locations: {fence_lines}"
+                )
 
     # Fix 4: Remove duplicate frontmatter
-    duplicate_fm_lines = detect_duplicate_frontmatter(fixed)
+    duplicate_fm_lines = structure.duplicate_frontmatter_starts()
     if duplicate_fm_lines:
         logger.info(f"  Removing {len(duplicate_fm_lines)} duplicate frontmatter block(s)")
-        lines = fixed.split('\n')
 
         for dup_line in sorted(duplicate_fm_lines, reverse=True):  # Remove from end first
             # Find the block: --- at dup_line-1, content, then closing ---
             start_idx = dup_line - 1  # Convert 1-indexed to 0-indexed (--- line)
-            if start_idx >= 0 and start_idx < len(lines):
-                end_idx = start_idx + 1
-                # Find closing ---
-                while end_idx < len(lines) and lines[end_idx].strip() != '---':
-                    end_idx += 1
-
-                if end_idx < len(lines):
+            if 0 <= start_idx < len(structure.lines):
+                pos = bisect_right(structure.delimiters, start_idx)
+                if pos < len(structure.delimiters):
+                    end_idx = structure.delimiters[pos]
                     # Remove the entire block
                     logger.info(f"    Removing duplicate frontmatter block: lines {start_idx + 1} to {end_idx + 1}")
-                    del lines[start_idx:end_idx + 1]
+                    structure = structure.replace_lines(start_idx, end_idx + 1, [])
                     applied_fixes.append(f"Removed duplicate frontmatter at line {dup_line}")
 
-        fixed = '\n'.join(lines)
-        # Clean up multiple consecutive empty lines
-        fixed = re.sub(r'\n\n\n+', '\n\n', fixed)
+        structure = _collapse_blank_runs(structure)
+
+    fixed = remember_structure(structure).text
 
     # Verify fixes worked
     if applied_fixes:
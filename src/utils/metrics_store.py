@@ -0,0 +1,526 @@
+"""Metrics Store - columnar time-series storage for agent performance analytics.
+
+Monitors used to keep metrics as deques of ``(iso_string, value)`` tuples or
+dicts and re-parse every timestamp on each query. ``MetricsStore`` keeps each
+named series in NumPy ring buffers (epoch-float timestamps, float values) so
+window queries are a binary search plus a slice, and aggregates are vectorized.
+
+Key Features:
+- Ring buffers that grow on demand up to a fixed capacity per series
+- Vectorized window queries, summaries and linear trends
+- Streaming all-time percentiles from a log-bucketed (HDR-style) histogram
+- Downsampled rollups (count/sum/min/max per bucket) for long time ranges
+- One process-wide store shared by the agent monitors and dashboards
+
+Example:
+    >>> store = get_metrics_store()
+    >>> store.record("agent.writer.duration_ms", 812.0)
+    >>> store.summary("agent.writer.duration_ms", window_seconds=3600)["p95"]
+"""
+
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+Timestamp = Union[float, int, datetime, None]
+
+DEFAULT_CAPACITY = 10000
+DEFAULT_ROLLUPS: Dict[int, int] = {60: 1440, 3600: 720}  # resolution seconds -> buckets kept
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+_INITIAL_ROWS = 64
+
+
+def series_name(*parts: Any) -> str:
+    """Build a dotted series name, e.g. ``series_name("agent", "writer", "duration_ms")``."""
+    return ".".join(str(part) for part in parts)
+
+
+def to_epoch(timestamp: Timestamp) -> float:
+    """Convert a datetime or epoch value to epoch seconds (now if None)."""
+    if timestamp is None:
+        return time.time()
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+class _ColumnRing:
+    """Fixed-capacity ring of float64 columns that grows geometrically up to capacity."""
+
+    def __init__(self, columns: int, capacity: int):
+        self.capacity = capacity
+        self.data = np.empty((columns, min(_INITIAL_ROWS, capacity)), dtype=np.float64)
+        self.size = 0
+        self.head = 0  # Next write position once the ring is full
+
+    def append(self, row: Sequence[float]) -> None:
+        allocated = self.data.shape[1]
+        if self.size < allocated:
+            self.data[:, self.size] = row
+            self.size += 1
+            return
+        if allocated < self.capacity:
+            grown = np.empty((self.data.shape[0], min(allocated * 2, self.capacity)), dtype=np.float64)
+            grown[:, :allocated] = self.data
+            self.data = grown
+            self.data[:, self.size] = row
+            self.size += 1
+            return
+        self.data[:, self.head] = row
+        self.head = (self.head + 1) % self.capacity
+
+    def last_index(self) -> int:
+        if self.size < self.capacity:
+            return self.size - 1
+        return (self.head - 1) % self.capacity
+
+    def ordered(self) -> np.ndarray:
+        """Columns in insertion order (a copy once the ring has wrapped)."""
+        if self.size < self.capacity or self.head == 0:
+            return self.data[:, :self.size]
+        return np.concatenate((self.data[:, self.head:], self.data[:, :self.head]), axis=1)
+
+    def physical_index(self, ordered_index: int) -> int:
+        if self.size < self.capacity:
+            return ordered_index
+        return (self.head + ordered_index) % self.capacity
+
+    def clear(self) -> None:
+        self.size = 0
+        self.head = 0
+
+
+class LogHistogram:
+    """Mergeable histogram with log-spaced buckets and bounded relative error.
+
+    Values in ``(min_value, max_value]`` land in buckets whose bounds grow by a
+    constant factor, so any quantile is reported within ``relative_accuracy`` of
+    a true sample value. Values at or below ``min_value`` (including zero) share
+    an underflow bucket reported as 0.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-3, max_value: float = 1e9):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._log_min = math.log(min_value)
+        bins = int(math.ceil((math.log(max_value) - self._log_min) / self._log_gamma)) + 2
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        index = int((math.log(value) - self._log_min) / self._log_gamma) + 1
+        return min(index, len(self.counts) - 1)
+
+    def add(self, value: float) -> None:
+        if value != value:  # NaN
+            return
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'LogHistogram') -> None:
+        if len(other.counts) != len(self.counts):
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        self.counts += other.counts
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """Estimate quantiles (each in [0, 1]); empty histogram yields 0.0."""
+        qs = list(qs)
+        if self.count == 0:
+            return [0.0 for _ in qs]
+        cumulative = np.cumsum(self.counts)
+        ranks = np.clip(np.asarray(qs, dtype=np.float64), 0.0, 1.0) * (self.count - 1)
+        indexes = np.searchsorted(cumulative, ranks, side="right")
+        estimates = np.where(
+            indexes == 0,
+            0.0,
+            np.exp(self._log_min + (indexes - 1) * self._log_gamma) * 2 * self._gamma / (self._gamma + 1)
+        )
+        return [float(v) for v in np.clip(estimates, self.min, self.max)]
+
+    def clear(self) -> None:
+        self.counts[:] = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+
+class MetricSeries:
+    """One named series: raw ring buffer, all-time histogram and rollups."""
+
+    def __init__(self, name: str, capacity: int = DEFAULT_CAPACITY, rollups: Optional[Dict[int, int]] = None):
+        self.name = name
+        self._lock = threading.Lock()
+        self._raw = _ColumnRing(2, capacity)  # rows: timestamp, value
+        self._sorted = True
+        self._last_ts = -math.inf
+        self.histogram = LogHistogram()
+        self.total = 0
+        self.sum = 0.0
+        self._rollups: Dict[int, _ColumnRing] = {
+            int(resolution): _ColumnRing(5, buckets)  # rows: start, count, sum, min, max
+            for resolution, buckets in (DEFAULT_ROLLUPS if rollups is None else rollups).items()
+        }
+
+    def append(self, value: float, timestamp: float) -> None:
+        with self._lock:
+            self._raw.append((timestamp, value))
+            if timestamp < self._last_ts:
+                self._sorted = False
+            else:
+                self._last_ts = timestamp
+            self.histogram.add(value)
+            self.total += 1
+            self.sum += value
+            for resolution, ring in self._rollups.items():
+                self._roll(ring, resolution, timestamp, value)
+
+    @staticmethod
+    def _roll(ring: _ColumnRing, resolution: int, timestamp: float, value: float) -> None:
+        start = math.floor(timestamp / resolution) * resolution
+        if ring.size:
+            last = ring.last_index()
+            last_start = ring.data[0, last]
+            if start < last_start:
+                # Late sample: fold into its bucket if still retained
+                starts = ring.ordered()[0]
+                pos = int(np.searchsorted(starts, start))
+                if pos >= len(starts) or starts[pos] != start:
+                    return
+                last = ring.physical_index(pos)
+                last_start = start
+            if start == last_start:
+                column = ring.data[:, last]
+                column[1] += 1
+                column[2] += value
+                column[3] = min(column[3], value)
+                column[4] = max(column[4], value)
+                return
+        ring.append((start, 1, value, value, value))
+
+    def window(self, since: Optional[float] = None, until: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps and values in ``[since, until]`` (copies, oldest first when sorted)."""
+        with self._lock:
+            ts, values = self._raw.ordered()
+            if self._sorted:
+                lo = 0 if since is None else int(np.searchsorted(ts, since, side="left"))
+                hi = len(ts) if until is None else int(np.searchsorted(ts, until, side="right"))
+                return ts[lo:hi].copy(), values[lo:hi].copy()
+            mask = np.ones(len(ts), dtype=bool)
+            if since is not None:
+                mask &= ts >= since
+            if until is not None:
+                mask &= ts <= until
+            return ts[mask], values[mask]
+
+    def rollup(self, resolution: int, since: Optional[float] = None) -> np.ndarray:
+        """Rollup rows ``[start, count, sum, min, max]`` as a (5, n) array."""
+        ring = self._rollups.get(int(resolution))
+        if ring is None:
+            raise ValueError(
+                f"No rollup at {resolution}s for {self.name}; available: {sorted(self._rollups)}"
+            )
+        with self._lock:
+            rows = ring.ordered()
+            if since is not None:
+                rows = rows[:, rows[0] + resolution > since]
+            return rows.copy()
+
+    @property
+    def resolutions(self) -> List[int]:
+        return sorted(self._rollups)
+
+    def __len__(self) -> int:
+        return self._raw.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._raw.clear()
+            self._sorted = True
+            self._last_ts = -math.inf
+            self.histogram.clear()
+            self.total = 0
+            self.sum = 0.0
+            for ring in self._rollups.values():
+                ring.clear()
+
+
+class MetricsStore:
+    """Thread-safe collection of named metric series."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, rollups: Optional[Dict[int, int]] = None):
+        """Initialize store.
+
+        Args:
+            capacity: Raw samples retained per series (oldest overwritten)
+            rollups: Rollup resolution in seconds -> number of buckets retained
+        """
+        self.capacity = capacity
+        self.rollups = dict(DEFAULT_ROLLUPS if rollups is None else rollups)
+        self._series: Dict[str, MetricSeries] = {}
+        self._lock = threading.Lock()
+
+    def series(self, name: str) -> MetricSeries:
+        """Get or create the series with this name."""
+        series = self._series.get(name)
+        if series is None:
+            with self._lock:
+                series = self._series.get(name)
+                if series is None:
+                    series = MetricSeries(name, self.capacity, self.rollups)
+                    self._series[name] = series
+        return series
+
+    def record(self, name: str, value: float, timestamp: Timestamp = None) -> None:
+        """Record a sample.
+
+        Args:
+            name: Series name (see ``series_name``)
+            value: Sample value
+            timestamp: Epoch seconds or datetime; now if omitted
+        """
+        self.series(name).append(float(value), to_epoch(timestamp))
+
+    def names(self, prefix: str = "") -> List[str]:
+        """Names of all series starting with prefix."""
+        return sorted(name for name in list(self._series) if name.startswith(prefix))
+
+    def has(self, name: str) -> bool:
+        return name in self._series
+
+    def window(
+        self,
+        name: str,
+        window_seconds: Optional[float] = None,
+        since: Timestamp = None,
+        until: Timestamp = None,
+        now: Timestamp = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Samples of a series within a time window.
+
+        Args:
+            name: Series name
+            window_seconds: Only samples newer than ``now - window_seconds``
+            since: Explicit lower bound (overrides window_seconds)
+            until: Upper bound
+            now: Reference time for window_seconds (default: current time)
+
+        Returns:
+            (timestamps, values) float64 arrays; empty if the series does not exist
+        """
+        series = self._series.get(name)
+        if series is None:
+            return np.empty(0), np.empty(0)
+        lower = self._lower_bound(window_seconds, since, now)
+        return series.window(lower, None if until is None else to_epoch(until))
+
+    @staticmethod
+    def _lower_bound(window_seconds: Optional[float], since: Timestamp, now: Timestamp) -> Optional[float]:
+        if since is not None:
+            return to_epoch(since)
+        if window_seconds is not None:
+            return to_epoch(now) - window_seconds
+        return None
+
+    def values(self, names: Iterable[str], window_seconds: Optional[float] = None, now: Timestamp = None) -> np.ndarray:
+        """Concatenated values of several series within a window."""
+        chunks = [self.window(name, window_seconds, now=now)[1] for name in names]
+        return np.concatenate(chunks) if chunks else np.empty(0)
+
+    def summary(
+        self,
+        name: str,
+        window_seconds: Optional[float] = None,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        now: Timestamp = None
+    ) -> Dict[str, Any]:
+        """Count, mean, min, max and percentiles of a series.
+
+        Windowed summaries are exact over the retained raw samples; without a
+        window, percentiles come from the all-time streaming histogram.
+
+        Args:
+            name: Series name
+            window_seconds: Trailing window; None for all data
+            quantiles: Quantiles in [0, 1], reported as ``p50``, ``p95``, ...
+            now: Reference time for the window
+
+        Returns:
+            Summary dict (zeros when there are no samples)
+        """
+        if window_seconds is None and name in self._series:
+            return self._histogram_summary(self._series[name], quantiles)
+        _, values = self.window(name, window_seconds, now=now)
+        return summarize(values, quantiles)
+
+    @staticmethod
+    def _histogram_summary(series: MetricSeries, quantiles: Sequence[float]) -> Dict[str, Any]:
+        with series._lock:
+            histogram = series.histogram
+            count, total = series.total, series.sum
+            minimum, maximum = histogram.min, histogram.max
+            estimates = histogram.quantiles(quantiles)
+        if count == 0:
+            return summarize(np.empty(0), quantiles)
+        result: Dict[str, Any] = {
+            "count": count,
+            "mean": total / count,
+            "min": float(minimum),
+            "max": float(maximum),
+        }
+        result.update({_quantile_key(q): v for q, v in zip(quantiles, estimates)})
+        return result
+
+    def percentiles(
+        self,
+        name: str,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        window_seconds: Optional[float] = None
+    ) -> Dict[str, float]:
+        """Percentiles of a series, e.g. ``{"p50": ..., "p95": ..., "p99": ...}``."""
+        summary = self.summary(name, window_seconds, quantiles)
+        return {_quantile_key(q): summary[_quantile_key(q)] for q in quantiles}
+
+    def trend(self, name: str, window_seconds: Optional[float] = None, now: Timestamp = None) -> Optional[Dict[str, float]]:
+        """Least-squares linear trend of a series within a window.
+
+        Returns:
+            Dict with ``slope_per_hour``, ``mean``, ``span_hours`` and ``count``,
+            or None with fewer than two samples
+        """
+        ts, values = self.window(name, window_seconds, now=now)
+        return linear_trend(ts, values)
+
+    def rollup(self, name: str, resolution: int, window_seconds: Optional[float] = None, now: Timestamp = None) -> List[Dict[str, float]]:
+        """Downsampled buckets of a series.
+
+        Args:
+            name: Series name
+            resolution: Bucket width in seconds (one of the configured rollups)
+            window_seconds: Only buckets overlapping the trailing window
+            now: Reference time for the window
+
+        Returns:
+            List of ``{"start", "count", "sum", "mean", "min", "max"}`` dicts, oldest first
+        """
+        series = self._series.get(name)
+        if series is None:
+            if int(resolution) not in self.rollups:
+                raise ValueError(f"No rollup at {resolution}s; available: {sorted(self.rollups)}")
+            return []
+        rows = series.rollup(resolution, self._lower_bound(window_seconds, None, now))
+        starts, counts, sums, minimums, maximums = rows
+        means = sums / np.maximum(counts, 1)
+        return [
+            {"start": s, "count": int(c), "sum": t, "mean": m, "min": lo, "max": hi}
+            for s, c, t, m, lo, hi in zip(
+                starts.tolist(), counts.tolist(), sums.tolist(), means.tolist(),
+                minimums.tolist(), maximums.tolist()
+            )
+        ]
+
+    def clear(self, prefix: str = "") -> None:
+        """Drop all series starting with prefix."""
+        with self._lock:
+            for name in [n for n in self._series if n.startswith(prefix)]:
+                del self._series[name]
+
+    def get_stats(self) -> Dict[str, Any]:
+        series = list(self._series.values())
+        return {
+            "series": len(series),
+            "samples_retained": sum(len(s) for s in series),
+            "samples_recorded": sum(s.total for s in series),
+            "capacity_per_series": self.capacity,
+            "rollup_resolutions": sorted(self.rollups),
+        }
+
+
+def _quantile_key(q: float) -> str:
+    return f"p{q * 100:g}"
+
+
+def summarize(values: np.ndarray, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+    """Exact count/mean/min/max/percentiles of an array of values."""
+    if len(values) == 0:
+        result: Dict[str, Any] = {"count": 0, "mean": 0.0, "min": 0.0, "max": 0.0}
+        result.update({_quantile_key(q): 0.0 for q in quantiles})
+        return result
+    result = {
+        "count": int(len(values)),
+        "mean": float(values.mean()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+    }
+    estimates = np.percentile(values, [q * 100 for q in quantiles])
+    result.update({_quantile_key(q): float(v) for q, v in zip(quantiles, estimates)})
+    return result
+
+
+def linear_trend(timestamps: np.ndarray, values: np.ndarray) -> Optional[Dict[str, float]]:
+    """Least-squares slope (per hour) of values over epoch-second timestamps."""
+    if len(values) < 2:
+        return None
+    hours = (timestamps - timestamps.min()) / 3600.0
+    mean_time = hours.mean()
+    mean_value = values.mean()
+    centered = hours - mean_time
+    denominator = float(np.dot(centered, centered))
+    slope = float(np.dot(centered, values - mean_value)) / denominator if denominator else 0.0
+    return {
+        "slope_per_hour": slope,
+        "mean": float(mean_value),
+        "span_hours": float(hours.max()),
+        "count": int(len(values)),
+    }
+
+
+# Global instance
+_metrics_store: Optional[MetricsStore] = None
+_metrics_store_lock = threading.Lock()
+
+
+def get_metrics_store() -> MetricsStore:
+    """Get the process-wide MetricsStore."""
+    global _metrics_store
+    if _metrics_store is None:
+        with _metrics_store_lock:
+            if _metrics_store is None:
+                _metrics_store = MetricsStore()
+    return _metrics_store
+
+
+def set_metrics_store(store: Optional[MetricsStore]) -> None:
+    """Replace the process-wide MetricsStore (tests, custom retention)."""
+    global _metrics_store
+    _metrics_store = store
+
+
+__all__ = [
+    "LogHistogram",
+    "MetricSeries",
+    "MetricsStore",
+    "get_metrics_store",
+    "linear_trend",
+    "series_name",
+    "set_metrics_store",
+    "summarize",
+    "to_epoch",
+]
@@ -0,0 +1,411 @@
+"""Adaptive rate limiting and concurrency control for provider calls.
+
+One ``RateLimiter`` enforces up to three limits for a provider (or a single
+model of a provider) over a sliding window:
+
+- requests per minute
+- tokens per minute (estimated up front, corrected when the call finishes)
+- concurrent in-flight calls (only for callers holding a ``RateLease``)
+
+Waiters block on a condition variable until the earliest moment a limit can
+be satisfied, or until a lease is released. They do not poll. When that
+moment is later than the caller's timeout, ``acquire`` fails immediately
+instead of sleeping until the timeout.
+
+Limits adapt AIMD-style:
+- A throttled response (HTTP 429) multiplies the current request, token and
+  concurrency limits by ``decrease_factor`` and pauses new grants for the
+  provider's Retry-After.
+- A latency spike (a call much slower than the running average) shrinks
+  only concurrency.
+- Sustained success outside the cooldown after a decrease adds
+  ``increase_fraction`` of the configured ceiling back.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of text (about four characters per token)."""
+    return max(1, len(text) // 4) if text else 0
+
+
+class RateLimiter:
+    """Sliding-window requests/tokens per minute plus concurrency, with AIMD adaptation."""
+
+    def __init__(
+        self,
+        requests_per_minute: int = 60,
+        tokens_per_minute: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        name: str = "default",
+        adaptive: bool = True,
+        decrease_factor: float = 0.5,
+        increase_fraction: float = 0.05,
+        min_fraction: float = 0.1,
+        cooldown_seconds: float = 10.0,
+        latency_spike_factor: float = 3.0,
+        window_seconds: float = 60.0
+    ):
+        """Initialize rate limiter.
+
+        Args:
+            requests_per_minute: Maximum requests per window (the ceiling when adapting)
+            tokens_per_minute: Maximum tokens per window, or None for no token limit
+            max_concurrency: Maximum leased calls in flight, or None for no limit
+            name: Name used in logs and stats (e.g. ``"GEMINI"`` or ``"GEMINI/gemini-2.0-flash"``)
+            adaptive: Adjust limits from throttling and latency feedback
+            decrease_factor: Multiplier applied to current limits on throttling
+            increase_fraction: Fraction of the ceiling added back per successful call
+            min_fraction: Lowest fraction of the ceiling limits may drop to
+            cooldown_seconds: No increases for this long after a decrease
+            latency_spike_factor: Latency above this multiple of the average counts as a spike
+            window_seconds: Length of the sliding window
+        """
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.adaptive = adaptive
+        self.decrease_factor = decrease_factor
+        self.increase_fraction = increase_fraction
+        self.min_fraction = min_fraction
+        self.cooldown_seconds = cooldown_seconds
+        self.latency_spike_factor = latency_spike_factor
+        self.window_seconds = window_seconds
+
+        # Current (adaptive) limits
+        self._rpm = float(requests_per_minute)
+        self._tpm = float(tokens_per_minute) if tokens_per_minute else None
+        self._concurrency = float(max_concurrency) if max_concurrency else None
+
+        # Grant times within the window; ``requests`` is kept public for callers
+        # that inspect or reset the window directly
+        self.requests: Deque[float] = deque()
+        # [grant time, tokens] entries; a lease corrects its own entry on release
+        self._token_log: Deque[List[float]] = deque()
+        self._tokens_in_window = 0
+        self._inflight = 0
+        self._blocked_until = 0.0
+        self._last_decrease = float('-inf')
+        self._latency_avg: Optional[float] = None
+        self._latency_samples = 0
+
+        self._cond = threading.Condition()
+        self._stats = {"granted": 0, "rejected": 0, "throttled": 0, "latency_spikes": 0, "wait_seconds": 0.0}
+        logger.debug(f"RateLimiter {name} initialized: {requests_per_minute} req/min")
+
+    def _clock(self) -> float:
+        return time.monotonic()
+
+    # ------------------------------------------------------------------ window
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self.requests and self.requests[0] <= cutoff:
+            self.requests.popleft()
+        while self._token_log and self._token_log[0][0] <= cutoff:
+            self._tokens_in_window -= self._token_log.popleft()[1]
+
+    def _delay(self, now: float, tokens: int, hold: bool, count: int = 1) -> Optional[float]:
+        """Seconds until a grant is possible (0 if now), or None if waiting on a release."""
+        delay = max(0.0, self._blocked_until - now)
+
+        limit = max(1, int(self._rpm))
+        count = min(count, limit)
+        if len(self.requests) + count > limit:
+            # The request that must expire before ``count`` more fit under the limit
+            index = len(self.requests) + count - limit - 1
+            delay = max(delay, self.requests[index] + self.window_seconds - now)
+
+        if self._tpm is not None and tokens:
+            budget = max(1.0, self._tpm)
+            excess = self._tokens_in_window + min(tokens, budget) - budget
+            if excess > 0:
+                freed = 0
+                expires = now
+                for stamp, logged in self._token_log:
+                    freed += logged
+                    expires = stamp + self.window_seconds
+                    if freed >= excess:
+                        break
+                delay = max(delay, expires - now)
+
+        if hold and self._concurrency is not None and self._inflight >= max(1, int(self._concurrency)):
+            return None
+        return delay
+
+    def _grant(self, now: float, tokens: int, hold: bool, count: int = 1) -> Optional[List[float]]:
+        self.requests.extend([now] * count)
+        entry = None
+        if tokens:
+            entry = [now, tokens]
+            self._token_log.append(entry)
+            self._tokens_in_window += tokens
+        if hold:
+            self._inflight += 1
+        self._stats["granted"] += 1
+        return entry
+
+    def _acquire(
+        self, tokens: int, timeout: Optional[float], hold: bool, count: int = 1
+    ) -> Tuple[bool, Optional[List[float]]]:
+        """Wait for a grant; returns whether it was granted and its token log entry."""
+        start = self._clock()
+        deadline = start + timeout if timeout is not None else None
+        with self._cond:
+            while True:
+                now = self._clock()
+                self._prune(now)
+                delay = self._delay(now, tokens, hold, count)
+                if delay is not None and delay <= 0:
+                    entry = self._grant(now, tokens, hold, count)
+                    self._stats["wait_seconds"] += now - start
+                    return True, entry
+
+                remaining = deadline - now if deadline is not None else None
+                if remaining is not None and (remaining <= 0 or (delay is not None and delay > remaining)):
+                    self._stats["rejected"] += 1
+                    logger.warning(f"Rate limit {self.name}: no capacity within {timeout}s")
+                    return False, None
+
+                if delay is None:
+                    wait = remaining
+                else:
+                    wait = delay if remaining is None else min(delay, remaining)
+                self._cond.wait(wait)
+
+    # ------------------------------------------------------------------ public API
+
+    def acquire(self, timeout: Optional[float] = 30.0, tokens: int = 0, count: int = 1) -> bool:
+        """Acquire permission to make a request (rate limits only, no concurrency slot).
+
+        Args:
+            timeout: Maximum time to wait in seconds (None waits indefinitely)
+            tokens: Estimated tokens the request will consume
+            count: Number of requests to reserve at once
+
+        Returns:
+            True if permission granted, False if it could not be granted within timeout
+        """
+        return self._acquire(tokens, timeout, hold=False, count=count)[0]
+
+    def lease(self, tokens: int = 0, timeout: Optional[float] = 30.0) -> Optional['RateLease']:
+        """Acquire permission plus a concurrency slot for one call.
+
+        Args:
+            tokens: Estimated tokens the call will consume
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            A lease to release when the call finishes, or None on timeout
+        """
+        granted, entry = self._acquire(tokens, timeout, hold=True)
+        if not granted:
+            return None
+        return RateLease(self, tokens, entry)
+
+    def _release(self, lease: 'RateLease', outcome: str, latency: float, actual_tokens: Optional[int],
+                 retry_after: Optional[float]) -> None:
+        with self._cond:
+            now = self._clock()
+            self._inflight = max(0, self._inflight - 1)
+            if actual_tokens is not None and actual_tokens != lease.tokens:
+                self._correct_tokens(now, lease, actual_tokens)
+            if outcome == "throttled":
+                self._on_throttled(now, retry_after)
+            elif outcome == "success":
+                self._on_success(now, latency)
+            self._cond.notify_all()
+
+    def _correct_tokens(self, now: float, lease: 'RateLease', actual_tokens: int) -> None:
+        """Replace the estimate made at grant time with the actual count.
+
+        The grant's own entry is adjusted so the correction expires with it;
+        a separate negative entry could outlive the estimate and undercount.
+        Entries that already left the window no longer count and are skipped.
+        """
+        self._prune(now)
+        entry = lease._entry
+        if entry is None:
+            if actual_tokens > 0:
+                entry = [now, 0]
+                self._token_log.append(entry)
+            else:
+                return
+        elif entry[0] <= now - self.window_seconds:
+            return
+        delta = actual_tokens - entry[1]
+        entry[1] = actual_tokens
+        self._tokens_in_window += delta
+
+    def record_throttled(self, retry_after: Optional[float] = None) -> None:
+        """Report a throttled (HTTP 429) response for a call made without a lease."""
+        with self._cond:
+            self._on_throttled(self._clock(), retry_after)
+            self._cond.notify_all()
+
+    def record_success(self, latency: Optional[float] = None) -> None:
+        """Report a successful call made without a lease."""
+        with self._cond:
+            self._on_success(self._clock(), latency)
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------ adaptation
+
+    def _floor(self, ceiling: float) -> float:
+        return max(1.0, ceiling * self.min_fraction)
+
+    def _on_throttled(self, now: float, retry_after: Optional[float]) -> None:
+        self._stats["throttled"] += 1
+        self._blocked_until = max(self._blocked_until, now + (retry_after if retry_after else 1.0))
+        if not self.adaptive:
+            return
+        self._rpm = max(self._floor(self.requests_per_minute), self._rpm * self.decrease_factor)
+        if self._tpm is not None:
+            self._tpm = max(self._floor(self.tokens_per_minute), self._tpm * self.decrease_factor)
+        if self._concurrency is not None:
+            self._concurrency = max(1.0, self._concurrency * self.decrease_factor)
+        self._last_decrease = now
+        logger.warning(
+            f"Rate limit {self.name}: throttled by provider, limit now {self._rpm:.1f} req/min"
+            + (f", retry after {retry_after:.1f}s" if retry_after else "")
+        )
+
+    def _on_success(self, now: float, latency: Optional[float]) -> None:
+        if not self.adaptive:
+            return
+        if latency is not None and latency >= 0:
+            spike = (
+                self._latency_avg is not None and self._latency_samples >= 5
+                and latency > self._latency_avg * self.latency_spike_factor
+            )
+            self._latency_avg = latency if self._latency_avg is None else 0.8 * self._latency_avg + 0.2 * latency
+            self._latency_samples += 1
+            if spike and self._concurrency is not None:
+                self._stats["latency_spikes"] += 1
+                self._concurrency = max(1.0, self._concurrency * self.decrease_factor)
+                self._last_decrease = now
+                logger.info(f"Rate limit {self.name}: latency spike, concurrency now {int(self._concurrency)}")
+                return
+        if now - self._last_decrease < self.cooldown_seconds:
+            return
+        self._rpm = min(float(self.requests_per_minute), self._rpm + self.requests_per_minute * self.increase_fraction)
+        if self._tpm is not None:
+            self._tpm = min(float(self.tokens_per_minute), self._tpm + self.tokens_per_minute * self.increase_fraction)
+        if self._concurrency is not None:
+            self._concurrency = min(float(self.max_concurrency), self._concurrency + 1)
+
+    # ------------------------------------------------------------------ stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            self._prune(self._clock())
+            return {
+                "name": self.name,
+                "requests_per_minute": self.requests_per_minute,
+                "current_requests_per_minute": round(self._rpm, 2),
+                "tokens_per_minute": self.tokens_per_minute,
+                "current_tokens_per_minute": round(self._tpm, 2) if self._tpm is not None else None,
+                "max_concurrency": self.max_concurrency,
+                "current_concurrency": int(self._concurrency) if self._concurrency is not None else None,
+                "inflight": self._inflight,
+                "requests_in_window": len(self.requests),
+                "tokens_in_window": self._tokens_in_window,
+                "avg_latency_s": self._latency_avg,
+                **self._stats,
+            }
+
+
+class RateLease:
+    """A granted call slot; release it exactly once when the call finishes."""
+
+    def __init__(self, limiter: RateLimiter, tokens: int, entry: Optional[List[float]] = None):
+        self.limiter = limiter
+        self.tokens = tokens
+        self._entry = entry
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(
+        self,
+        outcome: str = "success",
+        actual_tokens: Optional[int] = None,
+        retry_after: Optional[float] = None
+    ) -> None:
+        """Release the slot and report how the call went.
+
+        Args:
+            outcome: ``"success"``, ``"throttled"`` (HTTP 429) or ``"error"``
+            actual_tokens: Tokens the call actually consumed, if known
+            retry_after: Provider-supplied Retry-After seconds for throttled calls
+        """
+        if self._released:
+            return
+        self._released = True
+        self.limiter._release(self, outcome, time.monotonic() - self._started, actual_tokens, retry_after)
+
+    def __enter__(self) -> 'RateLease':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release("error" if exc_type else "success")
+
+
+class WindowRateLimiter(RateLimiter):
+    """Two-step (``wait_if_needed`` then ``mark_request``) interface over the sliding window.
+
+    Kept for callers that record the request only once it has been sent. Uses
+    wall-clock timestamps so ``request_times`` can be compared with ``time.time()``.
+    """
+
+    MAX_WAIT_SECONDS = 120
+
+    def __init__(self, requests_per_minute: int, name: str = "default"):
+        super().__init__(requests_per_minute=max(1, int(requests_per_minute)), name=name, adaptive=False)
+
+    def _clock(self) -> float:
+        return time.time()
+
+    @property
+    def request_times(self) -> list:
+        with self._cond:
+            return list(self.requests)
+
+    @request_times.setter
+    def request_times(self, values) -> None:
+        with self._cond:
+            self.requests = deque(sorted(values))
+
+    def wait_if_needed(self) -> None:
+        """Block until a request fits in the window (gives up and resets after 2 minutes)."""
+        wait_start = self._clock()
+        while True:
+            with self._cond:
+                now = self._clock()
+                if now - wait_start > self.MAX_WAIT_SECONDS:
+                    logger.error(f"Rate limiter {self.name} wait timeout, clearing state")
+                    self.requests.clear()
+                    return
+                self._prune(now)
+                delay = self._delay(now, 0, hold=False)
+                if not delay or delay <= 0:
+                    return
+            # Sleep outside the lock, in bounded steps so the overall cap is honoured
+            time.sleep(min(delay + 0.1, 10.0))
+
+    def mark_request(self) -> None:
+        """Record that a request was made."""
+        with self._cond:
+            self.requests.append(self._clock())
+            self._stats["granted"] += 1
+            self._cond.notify_all()
+
+
+__all__ = ["RateLimiter", "RateLease", "WindowRateLimiter", "estimate_tokens"]
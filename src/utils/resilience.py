@@ -12,6 +12,7 @@ import threading
 import time
 from dataclasses import dataclass, field
 from src.core.config import Config
+from src.utils.rate_limiter import RateLimiter as AdaptiveRateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +63,22 @@ class CircuitBreaker:
 
         Raises:
             Exception: If circuit is open or function fails"""
+        if not self.allow_request():
+            raise Exception(f"Circuit {self.name} is OPEN")
+
+        try:
+            result = func(*args, **kwargs)
+            self._on_success()
+            return result
+        except Exception as e:
+            self._on_failure()
+            raise
+
+    def allow_request(self) -> bool:
+        """Check whether a call may go through, moving OPEN to HALF_OPEN once the timeout passed.
+
+        Returns:
+            False if the circuit is open"""
         with self._lock:
             if self.state == CircuitState.OPEN:
                 if (self.last_failure_time and
@@ -70,15 +87,16 @@ class CircuitBreaker:
                     self.state = CircuitState.HALF_OPEN
                     self.success_count = 0
                 else:
-                    raise Exception(f"Circuit {self.name} is OPEN")
+                    return False
+            return True
 
-        try:
-            result = func(*args, **kwargs)
-            self._on_success()
-            return result
-        except Exception as e:
-            self._on_failure()
-            raise
+    def record_success(self):
+        """Record a successful call made outside ``call``."""
+        self._on_success()
+
+    def record_failure(self):
+        """Record a failed call made outside ``call``."""
+        self._on_failure()
 
     def _on_success(self):
         """Handle successful execution."""
@@ -335,53 +353,31 @@ class Saga:
                         f"Saga {self.name}: Compensation failed for step {step.name}: {e}"
                     )
 
-class RateLimiter:
-    """Token bucket rate limiter."""
+class RateLimiter(AdaptiveRateLimiter):
+    """Per-minute rate limiter for resilience-managed services.
 
-    def __init__(self, rate_per_minute: int):
+    Shares the sliding-window implementation in ``src.utils.rate_limiter``;
+    ``acquire`` keeps the token-bucket calling convention used here."""
+
+    def __init__(self, rate_per_minute: int, name: str = "default"):
         """Initialize rate limiter.
 
         Args:
-            rate_per_minute: Maximum requests per minute"""
+            rate_per_minute: Maximum requests per minute
+            name: Name used in logs and stats"""
+        super().__init__(requests_per_minute=rate_per_minute, name=name)
         self.rate_per_minute = rate_per_minute
-        self.tokens = rate_per_minute
-        self.last_update = time.time()
-        self._lock = threading.Lock()
 
     def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
-        """Acquire tokens from bucket.
+        """Acquire request slots.
 
         Args:
-            tokens: Number of tokens to acquire
-            timeout: Maximum time to wait for tokens
+            tokens: Number of requests to reserve
+            timeout: Maximum time to wait for them
 
         Returns:
-            True if tokens acquired"""
-        start_time = time.time()
-
-        while True:
-            with self._lock:
-                self._refill()
-
-                if self.tokens >= tokens:
-                    self.tokens -= tokens
-                    return True
-
-            if timeout is not None:
-                elapsed = time.time() - start_time
-                if elapsed >= timeout:
-                    return False
-
-            time.sleep(0.1)
-
-    def _refill(self):
-        """Refill token bucket based on elapsed time."""
-        now = time.time()
-        elapsed = now - self.last_update
-
-        tokens_to_add = (elapsed / 60.0) * self.rate_per_minute
-        self.tokens = min(self.rate_per_minute, self.tokens + tokens_to_add)
-        self.last_update = now
+            True if acquired"""
+        return super().acquire(timeout=timeout, count=tokens)
 
 class ResilienceManager:
     """Manager for all resilience patterns."""
@@ -440,8 +436,8 @@ class ResilienceManager:
         }
 
         self.rate_limiters = {
-            "gemini": RateLimiter(config.gemini_rpm_limit),
-            "trends": RateLimiter(config.trends_rpm_limit),
+            "gemini": RateLimiter(config.gemini_rpm_limit, name="gemini"),
+            "trends": RateLimiter(config.trends_rpm_limit, name="trends"),
         }
 
         self.retry_policy = RetryPolicy(
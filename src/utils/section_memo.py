@@ -0,0 +1,239 @@
+"""Section Memo - fingerprinted store of generated sections for incremental reruns.
+
+Re-running a job after a small outline or KB change used to regenerate
+every section. The writer agents now fingerprint the inputs of each
+generated part:
+
+- the outline entry
+- the ids of the retrieved context
+- the prompt template version
+- the provider-qualified model that wrote it
+- the final prompt
+
+They store the cleaned output under that fingerprint. On a rerun, only
+parts whose fingerprint changed go to the LLM. The rest are reused from
+the memo, and ContentAssembly splices them back in by fingerprint.
+
+The memo is a SQLite file under ``cache_dir``, shared across processes
+and jobs. It is enabled with ``Config.section_memoization`` and bounded by
+``Config.section_memo_max_age_days`` and ``Config.section_memo_max_entries``.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from src.utils.sqlite_store import connect, ensure_schema
+
+logger = logging.getLogger(__name__)
+
+MEMO_FILENAME = "section_memo.db"
+SCHEMA_VERSION = 1
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def context_ids(context: Iterable[Any]) -> List[str]:
+    """Stable ids for retrieved context: a chunk's own ``id``, else a hash of its text."""
+    ids = []
+    for chunk in context or []:
+        if isinstance(chunk, dict) and chunk.get("id"):
+            ids.append(str(chunk["id"]))
+        else:
+            if isinstance(chunk, tuple):  # (text, score) pairs
+                chunk = chunk[0]
+            text = chunk.get("content", "") if isinstance(chunk, dict) else str(chunk)
+            ids.append(hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()[:16])
+    return ids
+
+
+def template_version(*parts: Any) -> str:
+    """Short hash of the prompt template(s) a part was generated with."""
+    return _digest(parts)[:12]
+
+
+def fingerprint(
+    kind: str,
+    outline_entry: Any = None,
+    context: Iterable[Any] = (),
+    template: str = "",
+    model: Optional[str] = None,
+    prompt: str = ""
+) -> str:
+    """Fingerprint of everything that determines a generated part.
+
+    Args:
+        kind: Part kind (``section``, ``introduction``, ``conclusion``)
+        outline_entry: Outline entry (or whole outline) the part is written from
+        context: Retrieved context used in the prompt (chunks or their ids)
+        template: Template version, see ``template_version``
+        model: Model the part is generated with
+        prompt: Final prompt text
+    """
+    return _digest({
+        "kind": kind,
+        "outline": outline_entry,
+        "context": context_ids(context),
+        "template": template,
+        "model": model,
+        "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+    })
+
+
+class SectionMemo:
+    """Persistent fingerprint -> generated content store.
+
+    The memo is bounded: entries unused for ``max_age_days`` and the least
+    recently used entries beyond ``max_entries`` are pruned when the memo is
+    opened and every ``PRUNE_EVERY`` puts. Database errors are logged and
+    treated as misses, so a locked or corrupt memo only costs regeneration.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, db_path: Union[str, Path], max_age_days: float = 30, max_entries: int = 5000):
+        """Initialize memo, creating the database if needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_age_days: Drop entries not used for this many days
+            max_entries: Keep at most this many entries
+        """
+        self.db_path = Path(db_path)
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._puts = 0
+        self._init_db()
+        self.prune()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, connect(self.db_path) as conn:
+            ensure_schema(conn, SCHEMA_VERSION, ["sections"], [
+                '''
+                CREATE TABLE IF NOT EXISTS sections (
+                    fingerprint TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    title TEXT,
+                    content TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    used_at REAL NOT NULL,
+                    uses INTEGER NOT NULL DEFAULT 0
+                )
+                ''',
+                'CREATE INDEX IF NOT EXISTS idx_sections_used ON sections(used_at)',
+            ])
+
+    def get(self, fp: str) -> Optional[str]:
+        """Stored content for a fingerprint, or None (also when the memo is unreadable)."""
+        try:
+            with self._lock, connect(self.db_path) as conn:
+                row = conn.execute("SELECT content FROM sections WHERE fingerprint = ?", (fp,)).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE sections SET used_at = ?, uses = uses + 1 WHERE fingerprint = ?",
+                                 (time.time(), fp))
+        except sqlite3.Error as e:
+            self.errors += 1
+            row = None
+            logger.warning(f"Section memo read failed, regenerating: {e}")
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, fp: str, content: str, kind: str = "section", title: Optional[str] = None) -> None:
+        """Store generated content under its fingerprint; failures are logged, not raised."""
+        now = time.time()
+        try:
+            with self._lock, connect(self.db_path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sections (fingerprint, kind, title, content, created_at, used_at, uses) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                    (fp, kind, title, content, now, now)
+                )
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"Section memo write failed, not memoizing: {e}")
+            return
+        self._puts += 1
+        if self._puts % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self, max_age_days: Optional[float] = None, max_entries: Optional[int] = None) -> int:
+        """Drop stale and least recently used entries; returns how many were removed.
+
+        Args:
+            max_age_days: Drop entries not used for this many days (default: the memo's limit)
+            max_entries: Keep at most this many entries (default: the memo's limit)
+        """
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        max_entries = self.max_entries if max_entries is None else max_entries
+        cutoff = time.time() - max_age_days * 86400
+        try:
+            with self._lock, connect(self.db_path) as conn:
+                removed = conn.execute("DELETE FROM sections WHERE used_at < ?", (cutoff,)).rowcount
+                removed += conn.execute(
+                    "DELETE FROM sections WHERE fingerprint IN "
+                    "(SELECT fingerprint FROM sections ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                    (max(0, int(max_entries)),)
+                ).rowcount
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"Section memo prune failed: {e}")
+            return 0
+        if removed:
+            logger.info(f"Section memo pruned {removed} entries")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock, connect(self.db_path) as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM sections").fetchone()[0]
+        return {"entries": entries, "hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+_memos: Dict[Path, SectionMemo] = {}
+_memos_lock = threading.Lock()
+
+
+def get_section_memo(config: Any) -> Optional[SectionMemo]:
+    """Shared memo for ``config.cache_dir``, or None when memoization is off."""
+    if getattr(config, "section_memoization", False) is not True:
+        return None
+    cache_dir = getattr(config, "cache_dir", None)
+    if not isinstance(cache_dir, (str, Path)):
+        return None
+    path = (Path(cache_dir) / MEMO_FILENAME).resolve()
+    with _memos_lock:
+        if path not in _memos:
+            try:
+                _memos[path] = SectionMemo(
+                    path,
+                    max_age_days=getattr(config, "section_memo_max_age_days", 30),
+                    max_entries=getattr(config, "section_memo_max_entries", 5000)
+                )
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Section memo unavailable at {path}: {e}")
+                return None
+        return _memos[path]
+
+
+__all__ = [
+    "MEMO_FILENAME",
+    "SectionMemo",
+    "context_ids",
+    "template_version",
+    "fingerprint",
+    "get_section_memo",
+]
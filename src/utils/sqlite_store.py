@@ -0,0 +1,125 @@
+"""SQLite Store - connection and schema helpers for SQLite side indexes.
+
+Side indexes such as the job catalog keep a small SQLite file next to the
+data they index. They share the same conventions:
+
+- one short-lived connection per operation, committed on success
+- ``BEGIN IMMEDIATE`` for writes that must serialize across processes
+- a ``PRAGMA user_version`` schema version; tables written by another
+  version are dropped and rebuilt, since every index can be rebuilt from
+  its source of truth
+- WAL journaling, so readers never wait for a writer
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Union
+
+DEFAULT_TIMEOUT = 30
+
+
+@contextmanager
+def connect(
+    db_path: Union[str, Path],
+    row_factory: Optional[Any] = None,
+    timeout: float = DEFAULT_TIMEOUT
+) -> Iterator[sqlite3.Connection]:
+    """Connection that commits when the block succeeds and is always closed.
+
+    Args:
+        db_path: Path to the SQLite database file
+        row_factory: Optional row factory, e.g. ``sqlite3.Row``
+        timeout: Seconds to wait for a lock; 0 fails at once with
+            ``sqlite3.OperationalError`` (for best-effort writes)
+    """
+    conn = sqlite3.connect(str(db_path), timeout=timeout, check_same_thread=False)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@contextmanager
+def immediate_transaction(
+    db_path: Union[str, Path],
+    row_factory: Optional[Any] = None,
+    synchronous: Optional[str] = None
+) -> Iterator[sqlite3.Connection]:
+    """Write transaction that takes the database write lock up front.
+
+    Rolled back if the block raises.
+
+    Args:
+        db_path: Path to the SQLite database file
+        row_factory: Optional row factory, e.g. ``sqlite3.Row``
+        synchronous: Optional ``PRAGMA synchronous`` level for this connection,
+            e.g. ``NORMAL`` for caches that may lose their last commits on power loss
+    """
+    conn = sqlite3.connect(str(db_path), timeout=DEFAULT_TIMEOUT, isolation_level=None, check_same_thread=False)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    try:
+        if synchronous is not None:
+            conn.execute(f"PRAGMA synchronous={synchronous}")
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+def ensure_schema(
+    conn: sqlite3.Connection,
+    version: int,
+    tables: Iterable[str],
+    statements: Iterable[str]
+) -> bool:
+    """Create the schema, dropping tables written by another schema version.
+
+    WAL is switched on here unless ``conn`` is inside an explicit
+    transaction; such callers use ``enable_wal`` once it has committed.
+
+    Args:
+        conn: Open connection
+        version: Current schema version, stored in ``PRAGMA user_version``
+        tables: Tables to drop when the stored version differs
+        statements: ``CREATE ... IF NOT EXISTS`` statements for the schema
+
+    Returns:
+        True if the database was empty or rebuilt from an older version
+    """
+    rebuilt = conn.execute("PRAGMA user_version").fetchone()[0] != version
+    if rebuilt:
+        for table in tables:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+    if not conn.in_transaction:
+        conn.execute("PRAGMA journal_mode=WAL")
+    for statement in statements:
+        conn.execute(statement)
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+    return rebuilt
+
+
+def enable_wal(db_path: Union[str, Path]) -> None:
+    """Switch a database to WAL; this cannot happen inside a transaction."""
+    conn = sqlite3.connect(str(db_path), timeout=DEFAULT_TIMEOUT)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+    finally:
+        conn.close()
+
+
+__all__ = [
+    "connect",
+    "immediate_transaction",
+    "ensure_schema",
+    "enable_wal",
+]
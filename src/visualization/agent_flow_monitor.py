@@ -9,7 +9,6 @@ import json
 import logging
 import time
 import uuid
-import statistics
 from typing import Dict, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone, timedelta
@@ -17,6 +16,12 @@ from collections import deque, defaultdict
 import threading
 from pathlib import Path
 
+import numpy as np
+
+from ..utils.metrics_store import (
+    MetricsStore, get_metrics_store, linear_trend, series_name, summarize, to_epoch
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -110,31 +115,42 @@ class BottleneckAnalysis:
 
 
 class PerformanceAnalytics:
-    """Advanced performance analytics with historical trend analysis."""
-    
-    def __init__(self, max_history_hours: int = 24):
+    """Advanced performance analytics with historical trend analysis.
+
+    Samples are kept in the columnar ``MetricsStore`` (shared process-wide by
+    default), so trend and summary queries are vectorized window scans rather
+    than re-parsing stored ISO timestamps.
+    """
+
+    # Encoding of flow status in the "<agent>.status" series
+    STATUS_CODES = {'completed': 1.0, 'failed': 0.0}
+    OTHER_STATUS = -1.0
+
+    def __init__(self, max_history_hours: int = 24, store: Optional[MetricsStore] = None):
         self.max_history_hours = max_history_hours
-        
-        # Time-series data storage
-        self.metric_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
-        self.agent_performance_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=500))
-        
+        self.store = store if store is not None else get_metrics_store()
+
         # Trend analysis
         self.current_trends: Dict[str, PerformanceTrend] = {}
         
         # Bottleneck tracking
         self.bottleneck_history: deque = deque(maxlen=100)
         self.recurring_bottlenecks: Dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def _metric_series(metric_name: str) -> str:
+        return series_name("metric", metric_name)
+
+    @staticmethod
+    def _agent_series(agent_id: str, field_name: str) -> str:
+        return series_name("flow", agent_id, field_name)
+
+    def _window_seconds(self, window_hours: float) -> float:
+        return min(window_hours, self.max_history_hours) * 3600
     
     def record_metric(self, metric_name: str, value: float, timestamp: Optional[datetime] = None):
         """Record a metric value with timestamp."""
-        if timestamp is None:
-            timestamp = datetime.now(timezone.utc)
-        
-        self.metric_history[metric_name].append((timestamp.isoformat(), value))
-        
-        # Prune old data
-        self._prune_old_metrics(metric_name)
+        self.store.record(self._metric_series(metric_name), value, timestamp)
     
     def record_agent_performance(
         self,
@@ -145,56 +161,26 @@ class PerformanceAnalytics:
         timestamp: Optional[datetime] = None
     ):
         """Record agent performance data point."""
-        if timestamp is None:
-            timestamp = datetime.now(timezone.utc)
-        
-        data_point = {
-            'timestamp': timestamp.isoformat(),
-            'latency_ms': latency_ms,
-            'data_size_bytes': data_size_bytes,
-            'status': status
-        }
-        
-        self.agent_performance_history[agent_id].append(data_point)
+        ts = to_epoch(timestamp)
+        self.store.record(self._agent_series(agent_id, 'latency_ms'), latency_ms or 0.0, ts)
+        self.store.record(self._agent_series(agent_id, 'data_size_bytes'), data_size_bytes or 0, ts)
+        self.store.record(
+            self._agent_series(agent_id, 'status'),
+            self.STATUS_CODES.get(status, self.OTHER_STATUS),
+            ts
+        )
     
     def analyze_trends(self, metric_name: str, window_hours: int = 1) -> Optional[PerformanceTrend]:
         """Analyze trend for a specific metric."""
-        if metric_name not in self.metric_history:
-            return None
-        
-        history = list(self.metric_history[metric_name])
-        if len(history) < 3:
+        name = self._metric_series(metric_name)
+        if not self.store.has(name) or len(self.store.series(name)) < 3:
             return None
         
-        # Filter to window
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=window_hours)
-        windowed_history = [
-            (ts, val) for ts, val in history
-            if datetime.fromisoformat(ts.replace('Z', '+00:00')) >= cutoff_time
-        ]
-        
-        if len(windowed_history) < 2:
+        timestamps, values = self.store.window(name, self._window_seconds(window_hours))
+        trend_fit = linear_trend(timestamps, values)
+        if trend_fit is None:
             return None
-        
-        # Calculate trend
-        values = [val for _, val in windowed_history]
-        timestamps = [datetime.fromisoformat(ts.replace('Z', '+00:00')) for ts, _ in windowed_history]
-        
-        # Simple linear regression for trend
-        n = len(values)
-        if n < 2:
-            return None
-        
-        time_deltas = [(timestamps[i] - timestamps[0]).total_seconds() / 3600 for i in range(n)]  # Hours
-        
-        # Calculate slope (change per hour)
-        mean_time = sum(time_deltas) / n
-        mean_value = sum(values) / n
-        
-        numerator = sum((time_deltas[i] - mean_time) * (values[i] - mean_value) for i in range(n))
-        denominator = sum((time_deltas[i] - mean_time) ** 2 for i in range(n))
-        
-        slope = numerator / denominator if denominator != 0 else 0
+        slope = trend_fit['slope_per_hour']
         
         # Determine trend direction
         if abs(slope) < 0.01:
@@ -204,13 +190,15 @@ class PerformanceAnalytics:
         else:
             trend_direction = 'improving' if 'latency' in metric_name or 'error' in metric_name else 'degrading'
         
-        # Simple prediction (linear extrapolation)
-        last_time = time_deltas[-1]
-        prediction = mean_value + slope * (last_time + 1)  # Predict 1 hour ahead
+        # Simple prediction (linear extrapolation, 1 hour past the last sample)
+        prediction = trend_fit['mean'] + slope * (trend_fit['span_hours'] + 1)
         
         trend = PerformanceTrend(
             metric_name=metric_name,
-            time_series=windowed_history,
+            time_series=[
+                (datetime.fromtimestamp(ts, timezone.utc).isoformat(), val)
+                for ts, val in zip(timestamps.tolist(), values.tolist())
+            ],
             trend_direction=trend_direction,
             change_rate=slope * 100,  # Percentage change per hour
             prediction=max(0, prediction)  # Don't predict negative values
@@ -225,36 +213,31 @@ class PerformanceAnalytics:
         window_hours: int = 1
     ) -> Dict[str, Any]:
         """Get performance summary for an agent."""
-        if agent_id not in self.agent_performance_history:
+        status_series = self._agent_series(agent_id, 'status')
+        if not self.store.has(status_series):
             return {}
         
-        history = list(self.agent_performance_history[agent_id])
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=window_hours)
-        
-        # Filter to window
-        windowed = [
-            dp for dp in history
-            if datetime.fromisoformat(dp['timestamp'].replace('Z', '+00:00')) >= cutoff_time
-        ]
-        
-        if not windowed:
+        window = self._window_seconds(window_hours)
+        _, statuses = self.store.window(status_series, window)
+        if len(statuses) == 0:
             return {}
         
-        latencies = [dp['latency_ms'] for dp in windowed if dp.get('latency_ms')]
-        successes = sum(1 for dp in windowed if dp['status'] == 'completed')
-        failures = sum(1 for dp in windowed if dp['status'] == 'failed')
+        _, latencies = self.store.window(self._agent_series(agent_id, 'latency_ms'), window)
+        latency = summarize(latencies[latencies != 0], (0.5, 0.95))
+        successes = int(np.count_nonzero(statuses == self.STATUS_CODES['completed']))
+        failures = int(np.count_nonzero(statuses == self.STATUS_CODES['failed']))
         
         return {
             'agent_id': agent_id,
-            'sample_count': len(windowed),
-            'avg_latency_ms': sum(latencies) / len(latencies) if latencies else 0,
-            'min_latency_ms': min(latencies) if latencies else 0,
-            'max_latency_ms': max(latencies) if latencies else 0,
-            'p50_latency_ms': statistics.median(latencies) if latencies else 0,
-            'p95_latency_ms': (sorted(latencies)[int(len(latencies) * 0.95)] if latencies else 0),
+            'sample_count': len(statuses),
+            'avg_latency_ms': latency['mean'],
+            'min_latency_ms': latency['min'],
+            'max_latency_ms': latency['max'],
+            'p50_latency_ms': latency['p50'],
+            'p95_latency_ms': latency['p95'],
             'success_count': successes,
             'failure_count': failures,
-            'success_rate': successes / len(windowed) if len(windowed) > 0 else 0.0
+            'success_rate': successes / len(statuses)
         }
 
 
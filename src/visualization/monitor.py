@@ -17,6 +17,7 @@ from ..mcp.protocol import (
     FlowEvent, FlowResource, ResourceStatus,
     create_resource_uri, ResourceType
 )
+from ..utils.metrics_store import MetricsStore, get_metrics_store, series_name
 
 logger = logging.getLogger(__name__)
 
@@ -81,9 +82,12 @@ class VisualOrchestrationMonitor:
     - Bottleneck detection
     """
     
-    def __init__(self):
+    def __init__(self, metrics_store: Optional[MetricsStore] = None):
         self._lock = threading.RLock()
         
+        # Time-series samples for dashboards (shared process-wide by default)
+        self.metrics_store = metrics_store if metrics_store is not None else get_metrics_store()
+        
         # Agent tracking
         self.agent_metrics: Dict[str, AgentMetrics] = {}
         self.registered_agents: Dict[str, Dict[str, Any]] = {}
@@ -316,10 +320,18 @@ class VisualOrchestrationMonitor:
         """Track job completion."""
         with self._lock:
             if job_id in self.active_jobs:
+                completed_at = datetime.now(timezone.utc)
                 self.active_jobs[job_id]["status"] = status.value
-                self.active_jobs[job_id]["completed_at"] = datetime.now(timezone.utc).isoformat()
+                self.active_jobs[job_id]["completed_at"] = completed_at.isoformat()
                 self.active_jobs[job_id]["result"] = result
                 
+                started_at = datetime.fromisoformat(self.active_jobs[job_id]["started_at"])
+                self.metrics_store.record(
+                    series_name("job", "duration_ms"),
+                    (completed_at - started_at).total_seconds() * 1000,
+                    completed_at
+                )
+                
                 self._emit_event("job_completed", {
                     "job_id": job_id,
                     "status": status.value
@@ -336,6 +348,8 @@ class VisualOrchestrationMonitor:
         with self._lock:
             if agent_id in self.agent_metrics:
                 self.agent_metrics[agent_id].update_execution(duration_ms, success)
+                self.metrics_store.record(series_name("agent", agent_id, "duration_ms"), duration_ms)
+                self.metrics_store.record(series_name("agent", agent_id, "success"), 1.0 if success else 0.0)
                 
                 self._emit_event("agent_executed", {
                     "job_id": job_id,
@@ -13,11 +13,24 @@ logger = logging.getLogger(__name__)
 class WorkflowVisualizer:
     """Converts YAML workflow definitions into visual graphs for React Flow."""
     
-    def __init__(self, workflow_dir: str = './templates'):
+    def __init__(self, workflow_dir: str = './templates', workflows: Optional[Dict[str, Any]] = None):
+        """Initialize visualizer.
+        
+        Args:
+            workflow_dir: Directory containing workflows.yaml
+            workflows: Already-parsed workflows document; skips reading workflow_dir
+        """
         self.workflow_dir = Path(workflow_dir)
         self.workflows = {}
         self.execution_state = {}
-        self.load_workflows()
+        if workflows is not None:
+            self.set_workflows(workflows)
+        else:
+            self.load_workflows()
+    
+    def set_workflows(self, workflows: Dict[str, Any]):
+        """Use an already-parsed workflows document (sample workflow if empty)."""
+        self.workflows = workflows or self._create_sample_workflow()
     
     def load_workflows(self):
         """Load workflow definitions from YAML files."""
@@ -85,7 +85,25 @@ def create_app(executor=None, config_snapshot=None) -> FastAPI:
         live_handler = LiveFlowHandler(event_bus=executor.event_bus)
         set_live_flow_handler(live_handler)
         logger.info("✓ Live flow handler initialized with event bus")
+
+        from .job_stream import set_job_stream_hub, JobStreamHub
+        set_job_stream_hub(JobStreamHub(event_bus=executor.event_bus))
+        logger.info("✓ Job event streams initialized with event bus")
+        
+        # Refresh parsed templates/config when HotReloadMonitor reports a change
+        from src.core.snapshot_cache import get_snapshot_cache
+        get_snapshot_cache().attach(executor.event_bus)
     
+    # Load the embedding model in the background so the first ingestion finds it warm
+    executor_config = getattr(executor, 'config', None)
+    if executor_config is not None:
+        from src.services.embedding_runtime import preload_embedding_runtime
+        preload_embedding_runtime(executor_config)
+
+        # Open the cache tier shared with the other workers before the first request
+        from src.optimization.shared_cache import get_shared_cache
+        get_shared_cache(executor_config)
+
     # Inject dependencies into route modules
     if executor:
         deps.set_executor(executor)
@@ -301,10 +319,18 @@ def create_app(executor=None, config_snapshot=None) -> FastAPI:
     # Register WebSocket endpoint
     @app.websocket("/ws/live-flow/{job_id}")
     async def live_flow_websocket(websocket: WebSocket, job_id: str):
-        """WebSocket endpoint for live flow monitoring."""
+        """WebSocket endpoint for live flow monitoring.
+
+        Clients that handle ``{"type": "batch"}`` frames may opt in with
+        ``?batch=<max messages per frame>``.
+        """
         from .websocket_handlers import get_live_flow_handler
         handler = get_live_flow_handler()
-        await handler.handle_connection(websocket, job_id)
+        try:
+            max_batch = int(websocket.query_params.get("batch", 0)) or None
+        except ValueError:
+            max_batch = None
+        await handler.handle_connection(websocket, job_id, max_batch=max_batch)
 
     return app
 
@@ -0,0 +1,64 @@
+"""Conditional GET helpers for read endpoints served from the content snapshot.
+
+Response bodies are serialized once per snapshot version and reused; a request
+carrying a matching ``If-None-Match`` gets ``304 Not Modified`` without a body.
+"""
+
+import json
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from src.core.snapshot_cache import ContentSnapshot
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches etag.
+
+    Args:
+        request: Incoming request
+        etag: Quoted ETag value
+
+    Returns:
+        True if the client already holds this representation
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [value.strip() for value in header.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def snapshot_response(
+    request: Request,
+    snapshot: ContentSnapshot,
+    key: Optional[Hashable],
+    etag: str,
+    build: Callable[[], Any]
+) -> Response:
+    """Serve a snapshot-derived JSON payload with ETag/304 support.
+
+    Args:
+        request: Incoming request
+        snapshot: Snapshot the payload is derived from
+        key: Memo key identifying the payload within the snapshot, or None
+            to build the body on every request (for keys taken from client
+            input that the snapshot does not know about)
+        etag: ETag covering the sections the payload depends on
+        build: Builds the payload (pydantic model or JSON-compatible data)
+
+    Returns:
+        304 response if the client's copy is current, else a JSON response
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    def render() -> bytes:
+        return json.dumps(jsonable_encoder(build()), separators=(",", ":")).encode("utf-8")
+
+    body = render() if key is None else snapshot.memo(("response", key), render)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,415 @@
+"""Server-Sent Events streams for job and batch progress.
+
+Clients used to poll ``GET /api/jobs/{id}`` every few seconds. Instead,
+they can open ``GET /api/jobs/{id}/events`` or ``GET /api/batch/{id}/events``.
+They then receive step start/finish, progress and the final result as
+they are published on the executor's event bus.
+
+Delivery follows the same rules as the live-flow websockets:
+
+- Bus callbacks only hand the event to the event loop.
+- Each stream has its own bounded ``StreamSubscriber``.
+- Superseded progress events are coalesced.
+- A stream whose queue overflows is closed instead of slowing the publisher.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Set
+
+from src.core import EventBus, AgentEvent
+
+logger = logging.getLogger(__name__)
+
+# Engine event type -> SSE event name
+JOB_EVENTS = {
+    "JobStarted": "job_started",
+    "StepStarted": "step_started",
+    "StepCompleted": "step_completed",
+    "StepFailed": "step_failed",
+    "JobCompleted": "job_completed",
+    "JobFailed": "job_failed",
+    "JobCancelled": "job_cancelled",
+    "progress_update": "progress",
+}
+
+TERMINAL_EVENTS = frozenset(["job_completed", "job_failed", "job_cancelled"])
+TERMINAL_STATUSES = frozenset(["completed", "failed", "cancelled"])
+
+# Engine job status -> web job status, where they differ
+ENGINE_STATUSES = {"pending": "queued"}
+
+# Event names where only the latest undelivered event per job matters
+COALESCED_EVENTS = frozenset(["progress"])
+
+
+def format_sse(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Encode one SSE message."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    payload = json.dumps(data, default=str)
+    lines.extend(f"data: {line}" for line in payload.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+def _job_id_of(event: AgentEvent) -> Optional[str]:
+    data = event.data if isinstance(event.data, dict) else {}
+    return data.get("job_id") or (event.metadata or {}).get("job_id")
+
+
+def engine_job_id(store: Dict[str, Any], job_id: str) -> str:
+    """The executor's ID for a web job.
+
+    Jobs created through the API are submitted with the web ID as
+    ``correlation_id``; the executor assigns its own job ID, which the
+    routes keep in the job's ``engine_job_id``.
+    """
+    job = store.get(job_id) if store is not None else None
+    return (job or {}).get("engine_job_id") or job_id
+
+
+def remember_engine_job_id(job_data: Dict[str, Any], submitted: Any) -> None:
+    """Keep the job ID returned by ``executor.submit_job`` on the web job."""
+    if isinstance(submitted, str) and submitted != job_data.get("job_id"):
+        job_data["engine_job_id"] = submitted
+
+
+def refresh_job_from_executor(job: Dict[str, Any], executor: Any) -> Dict[str, Any]:
+    """Copy the executor's status and progress onto an unfinished web job.
+
+    The store only records the submission of async jobs; the executor
+    tracks them from then on under ``engine_job_id``.
+    """
+    engine_id = job.get("engine_job_id")
+    if not engine_id or job.get("status") in TERMINAL_STATUSES or executor is None:
+        return job
+    try:
+        metadata = executor.get_job_status(engine_id)
+    except Exception as e:
+        logger.debug(f"Executor status unavailable for {engine_id}: {e}")
+        return job
+    status = getattr(getattr(metadata, "status", None), "value", None)
+    if not isinstance(status, str):
+        return job
+
+    job["status"] = ENGINE_STATUSES.get(status, status)
+    job["progress"] = metadata.progress
+    job["current_stage"] = metadata.current_step
+    job["updated_at"] = datetime.now(timezone.utc)
+    if metadata.error_message:
+        job["error"] = metadata.error_message
+    if job["status"] in TERMINAL_STATUSES:
+        job["completed_at"] = metadata.completed_at or job["updated_at"]
+    return job
+
+
+def job_snapshot(store: Dict[str, Any], executor: Any, job_id: str) -> Optional[Dict[str, Any]]:
+    """Current state of a job, from the executor if it tracks it, else the jobs store."""
+    metadata = None
+    if executor is not None and hasattr(executor, "get_job_status"):
+        try:
+            metadata = executor.get_job_status(engine_job_id(store, job_id))
+        except Exception as e:
+            logger.debug(f"Executor status unavailable for {job_id}: {e}")
+    if metadata is not None and hasattr(metadata, "to_dict"):
+        state = metadata.to_dict()
+        return {
+            "status": state.get("status"),
+            "progress": state.get("progress"),
+            "current_step": state.get("current_step"),
+            "error": state.get("error_message"),
+        }
+
+    job = store.get(job_id) if store is not None else None
+    if job is None:
+        return None
+    return {
+        "status": job.get("status"),
+        "progress": job.get("progress"),
+        "current_step": job.get("current_stage"),
+        "error": job.get("error"),
+        "output_path": job.get("output_path"),
+    }
+
+
+def job_result(store: Dict[str, Any], executor: Any, job_id: str) -> Any:
+    """Final result of a job: the stored result, else the executor's step outputs."""
+    job = (store.get(job_id) if store is not None else None) or {}
+    if job.get("result") is not None:
+        return job["result"]
+    if executor is not None and hasattr(executor, "get_job_state"):
+        try:
+            state = executor.get_job_state(engine_job_id(store, job_id))
+        except Exception as e:
+            logger.debug(f"Executor state unavailable for {job_id}: {e}")
+            state = None
+        if state is not None:
+            return getattr(state, "outputs", None)
+    return None
+
+
+class StreamSubscriber:
+    """Bounded, coalescing queue of events for one SSE stream.
+
+    Filled on the event loop thread by ``JobStreamHub`` and drained by the
+    response generator.
+    """
+
+    def __init__(self, job_ids: Iterable[str], max_pending: int = 256):
+        self.job_ids: Set[str] = set(job_ids)
+        self.max_pending = max_pending
+        self._pending: deque = deque()            # [(event, data)] slots, mutable for coalescing
+        self._coalesce: Dict[tuple, list] = {}
+        self._wakeup = asyncio.Event()
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        self.coalesced = 0
+
+    def put(self, event: str, data: Dict[str, Any]) -> bool:
+        """Queue an event; returns False if the stream is closed or just overflowed."""
+        if self.closed:
+            return False
+
+        key = (event, data.get("job_id"))
+        if event in COALESCED_EVENTS:
+            slot = self._coalesce.get(key)
+            if slot is not None:
+                slot[0] = (event, data)
+                self.coalesced += 1
+                return True
+
+        if len(self._pending) >= self.max_pending:
+            self.close("slow consumer: event queue full")
+            return False
+
+        slot = [(event, data)]
+        self._pending.append(slot)
+        if event in COALESCED_EVENTS:
+            self._coalesce[key] = slot
+        self._wakeup.set()
+        return True
+
+    async def get(self, timeout: float) -> Optional[tuple]:
+        """Next ``(event, data)``, or None after ``timeout`` idle seconds or on close."""
+        if not self._pending and not self.closed:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+        if not self._pending:
+            return None
+        slot = self._pending.popleft()
+        event, data = slot[0]
+        key = (event, data.get("job_id"))
+        if self._coalesce.get(key) is slot:
+            del self._coalesce[key]
+        return event, data
+
+    def close(self, reason: str = "closed"):
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        self._wakeup.set()
+        if reason.startswith("slow consumer"):
+            self._pending.clear()
+            self._coalesce.clear()
+            logger.warning(f"Dropping job event stream: {reason}")
+
+
+class JobStreamHub:
+    """Fans job events from the event bus out to SSE subscribers."""
+
+    def __init__(
+        self,
+        event_bus: EventBus = None,
+        max_pending: int = 256,
+        keepalive: float = 15.0
+    ):
+        """Initialize hub.
+
+        Args:
+            event_bus: Event bus to subscribe to (a private one if omitted)
+            max_pending: Per-stream queue bound; overflowing closes the stream
+            keepalive: Idle seconds between SSE keepalive comments
+        """
+        self.event_bus = event_bus or EventBus()
+        self.max_pending = max_pending
+        self.keepalive = keepalive
+        # job_id -> subscribers interested in it
+        self.subscribers: Dict[str, Set[StreamSubscriber]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.dropped_streams = 0
+
+        for event_type in JOB_EVENTS:
+            self.event_bus.subscribe(event_type, self._on_event)
+
+        logger.info("JobStreamHub initialized")
+
+    def _on_event(self, event: AgentEvent):
+        """Bus callback; may run on any thread.
+
+        Streams follow web job IDs, which reach the engine as the
+        ``correlation_id``; events are matched on it before the engine's
+        own ``job_id``.
+        """
+        loop = self._loop
+        if loop is None:
+            return
+        engine_id = _job_id_of(event)
+        job_id = event.correlation_id if event.correlation_id in self.subscribers else engine_id
+        if not job_id or job_id not in self.subscribers:
+            return
+
+        data = dict(event.data) if isinstance(event.data, dict) else {}
+        data["job_id"] = job_id
+        if engine_id and engine_id != job_id:
+            data["engine_job_id"] = engine_id
+        data.setdefault("agent_id", event.source_agent)
+        data["timestamp"] = event.timestamp
+        try:
+            loop.call_soon_threadsafe(self._broadcast, JOB_EVENTS[event.event_type], data)
+        except RuntimeError:
+            # Loop already closed (server shutting down)
+            pass
+
+    def _broadcast(self, event: str, data: Dict[str, Any]):
+        """Queue an event on every stream following its job (event loop thread only)."""
+        for subscriber in list(self.subscribers.get(data["job_id"], ())):
+            subscriber.put(event, data)
+
+    def subscribe(self, job_ids: Iterable[str]) -> StreamSubscriber:
+        """Register a stream for the given jobs (event loop thread only)."""
+        self._loop = asyncio.get_running_loop()
+        subscriber = StreamSubscriber(job_ids, max_pending=self.max_pending)
+        for job_id in subscriber.job_ids:
+            self.subscribers.setdefault(job_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: StreamSubscriber):
+        subscriber.close()
+        for job_id in subscriber.job_ids:
+            followers = self.subscribers.get(job_id)
+            if followers is not None:
+                followers.discard(subscriber)
+                if not followers:
+                    del self.subscribers[job_id]
+
+    async def stream(
+        self,
+        job_ids: List[str],
+        snapshot: Callable[[str], Optional[Dict[str, Any]]],
+        result: Optional[Callable[[str], Any]] = None,
+        batch_id: Optional[str] = None,
+        is_disconnected: Optional[Callable[[], Any]] = None
+    ) -> AsyncIterator[str]:
+        """Yield SSE messages for jobs until each has reached a terminal state.
+
+        The stream subscribes before reading ``snapshot`` so no event between
+        the two is lost. It starts with one ``snapshot`` event per job; jobs
+        already finished count as done immediately.
+
+        Args:
+            job_ids: Jobs to follow
+            snapshot: Current state of a job (status, progress, ...) or None
+            result: Final result of a job, attached to its terminal event
+            batch_id: Set for batch streams; ends with a ``batch_completed`` summary
+            is_disconnected: Awaitable check, polled when the stream is idle
+        """
+        subscriber = self.subscribe(job_ids)
+        event_id = 0
+        outcome: Dict[str, str] = {}
+        started = time.monotonic()
+        try:
+            for job_id in job_ids:
+                state = dict(snapshot(job_id) or {"status": "unknown"})
+                state["job_id"] = job_id
+                event_id += 1
+                yield format_sse("snapshot", state, event_id)
+                if state.get("status") in TERMINAL_STATUSES:
+                    outcome[job_id] = state["status"]
+
+            while len(outcome) < len(subscriber.job_ids) and not subscriber.closed:
+                item = await subscriber.get(self.keepalive)
+                if item is None:
+                    if subscriber.closed:
+                        break
+                    if is_disconnected is not None and await is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+
+                event, data = item
+                job_id = data["job_id"]
+                if job_id in outcome:
+                    continue
+                if event in TERMINAL_EVENTS:
+                    outcome[job_id] = event[len("job_"):]
+                    if result is not None and event == "job_completed":
+                        data = dict(data, result=result(job_id))
+                event_id += 1
+                yield format_sse(event, data, event_id)
+
+            if subscriber.close_reason and subscriber.close_reason.startswith("slow consumer"):
+                self.dropped_streams += 1
+                yield format_sse("error", {"error": subscriber.close_reason})
+                return
+
+            if batch_id is not None:
+                statuses = list(outcome.values())
+                event_id += 1
+                yield format_sse("batch_completed", {
+                    "batch_id": batch_id,
+                    "total_jobs": len(job_ids),
+                    "completed_jobs": statuses.count("completed"),
+                    "failed_jobs": statuses.count("failed"),
+                    "cancelled_jobs": statuses.count("cancelled"),
+                    "elapsed": time.monotonic() - started,
+                }, event_id)
+        finally:
+            self.unsubscribe(subscriber)
+
+    def get_stream_count(self) -> int:
+        """Number of open streams."""
+        return len({id(sub) for subs in self.subscribers.values() for sub in subs})
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "streams": self.get_stream_count(),
+            "followed_jobs": len(self.subscribers),
+            "dropped_streams": self.dropped_streams,
+        }
+
+
+# Global hub instance
+_job_stream_hub: Optional[JobStreamHub] = None
+
+
+def get_job_stream_hub() -> JobStreamHub:
+    """Get or create the global job stream hub.
+
+    Returns:
+        JobStreamHub instance
+    """
+    global _job_stream_hub
+    if _job_stream_hub is None:
+        _job_stream_hub = JobStreamHub()
+    return _job_stream_hub
+
+
+def set_job_stream_hub(hub: Optional[JobStreamHub]):
+    """Set the global job stream hub.
+
+    Args:
+        hub: JobStreamHub instance
+    """
+    global _job_stream_hub
+    _job_stream_hub = hub
+
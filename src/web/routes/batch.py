@@ -4,9 +4,18 @@ import logging
 import uuid
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from ..job_stream import (
+    get_job_stream_hub,
+    job_result,
+    job_snapshot,
+    refresh_job_from_executor,
+    remember_engine_job_id,
+)
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/batch", tags=["batch"])
@@ -128,11 +137,14 @@ async def submit_batch_job(
             if executor is not None:
                 try:
                     if hasattr(executor, 'submit_job'):
-                        executor.submit_job(
+                        submitted = executor.submit_job(
                             manifest.workflow_id,
                             job_input,
-                            job_id
+                            job_id,
+                            priority="batch",
+                            tenant=batch_id
                         )
+                        remember_engine_job_id(job_data, submitted)
                         job_data["status"] = "queued"
                         store[job_id] = job_data
                 except Exception as e:
@@ -190,7 +202,7 @@ async def get_batch_status(
     try:
         # Find all jobs in this batch
         batch_jobs = [
-            job for job in store.values()
+            refresh_job_from_executor(job, _executor) for job in list(store.values())
             if job.get("batch_id") == batch_id
         ]
         
@@ -248,6 +260,45 @@ async def get_batch_status(
         raise HTTPException(status_code=500, detail=f"Failed to get batch status: {str(e)}")
 
 
+@router.get("/{batch_id}/events")
+async def stream_batch_events(
+    batch_id: str,
+    request: Request,
+    executor=Depends(get_executor),
+    store=Depends(get_jobs_store)
+):
+    """Stream progress of every job in a batch as Server-Sent Events.
+
+    Events carry the ``job_id`` they belong to; the stream ends with a
+    ``batch_completed`` summary once all jobs have finished.
+
+    Args:
+        batch_id: Batch identifier
+
+    Returns:
+        text/event-stream response
+    """
+    job_ids = [
+        job["job_id"] for job in list(store.values())
+        if job.get("batch_id") == batch_id
+    ]
+    if not job_ids:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+
+    events = get_job_stream_hub().stream(
+        job_ids,
+        snapshot=lambda jid: job_snapshot(store, executor, jid),
+        result=lambda jid: job_result(store, executor, jid),
+        batch_id=batch_id,
+        is_disconnected=request.is_disconnected,
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{batch_id}/results", response_model=BatchResultsResponse)
 async def get_batch_results(
     batch_id: str,
@@ -111,24 +111,9 @@ async def get_checkpoint(
         CheckpointResponse with full checkpoint metadata
     """
     try:
-        # Parse checkpoint_id to extract job_id
-        # Format is typically: step_name_timestamp
-        # We need to search through jobs to find this checkpoint
-        
-        # Try to load checkpoint data from all job directories
-        checkpoint_dir = manager.storage_path
-        checkpoint_data = None
-        job_id_found = None
-        
-        for job_dir in checkpoint_dir.iterdir():
-            if job_dir.is_dir():
-                checkpoint_file = job_dir / f"{checkpoint_id}.json"
-                if checkpoint_file.exists():
-                    import json
-                    with open(checkpoint_file, 'r', encoding='utf-8') as f:
-                        checkpoint_data = json.load(f)
-                    job_id_found = job_dir.name
-                    break
+        # Checkpoint IDs are unique across jobs; the index resolves the job
+        checkpoint_data = manager.load(checkpoint_id)
+        job_id_found = checkpoint_data.get("job_id") if checkpoint_data else None
         
         if not checkpoint_data:
             raise HTTPException(status_code=404, detail=f"Checkpoint {checkpoint_id} not found")
@@ -169,15 +154,7 @@ async def restore_checkpoint(
     """
     try:
         # Find the job_id for this checkpoint
-        checkpoint_dir = manager.storage_path
-        job_id_found = None
-        
-        for job_dir in checkpoint_dir.iterdir():
-            if job_dir.is_dir():
-                checkpoint_file = job_dir / f"{checkpoint_id}.json"
-                if checkpoint_file.exists():
-                    job_id_found = job_dir.name
-                    break
+        job_id_found = manager.find_job(checkpoint_id)
         
         if not job_id_found:
             raise HTTPException(status_code=404, detail=f"Checkpoint {checkpoint_id} not found")
@@ -239,15 +216,7 @@ async def delete_checkpoint(
     """
     try:
         # Find the job_id for this checkpoint
-        checkpoint_dir = manager.storage_path
-        job_id_found = None
-        
-        for job_dir in checkpoint_dir.iterdir():
-            if job_dir.is_dir():
-                checkpoint_file = job_dir / f"{checkpoint_id}.json"
-                if checkpoint_file.exists():
-                    job_id_found = job_dir.name
-                    break
+        job_id_found = manager.find_job(checkpoint_id)
         
         if not job_id_found:
             raise HTTPException(status_code=404, detail=f"Checkpoint {checkpoint_id} not found")
@@ -6,8 +6,8 @@ import os
 from typing import Optional
 from datetime import datetime, timezone
 from pathlib import Path
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from ..models import (
     JobCreate,
@@ -24,6 +24,13 @@ from src.utils.content_expansion import ensure_minimum_size, TARGET_BYTES
 from src.utils.grounding_enforcer import enforce_minimum_references
 from src.utils.completeness_enforcer import enforce_minimum_sections
 from src.utils.markdown_validator import enforce_valid_markdown
+from ..job_stream import (
+    get_job_stream_hub,
+    job_result,
+    job_snapshot,
+    refresh_job_from_executor,
+    remember_engine_job_id,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -313,8 +320,9 @@ async def create_job(
         # Note: Sync mode has already returned above
         if executor is not None and hasattr(executor, 'submit_job'):
             try:
-                # Use executor to start the job
-                executor.submit_job(job.workflow_id, job.inputs, job_id)
+                # Use executor to start the job; UI/API single jobs jump ahead of batches
+                submitted = executor.submit_job(job.workflow_id, job.inputs, job_id, priority="interactive")
+                remember_engine_job_id(job_data, submitted)
                 job_data["status"] = "queued"
                 store[job_id] = job_data
             except Exception as e:
@@ -389,7 +397,8 @@ async def generate_content(
         # Submit to executor
         try:
             if hasattr(executor, 'submit_job'):
-                executor.submit_job(workflow_id, inputs, job_id)
+                submitted = executor.submit_job(workflow_id, inputs, job_id, priority="interactive")
+                remember_engine_job_id(job_data, submitted)
                 job_data["status"] = "queued"
                 store[job_id] = job_data
         except Exception as e:
@@ -451,7 +460,10 @@ async def create_batch_jobs(
             # Submit to executor
             try:
                 if hasattr(executor, 'submit_job'):
-                    executor.submit_job(batch.workflow_id, job_input, job_id)
+                    submitted = executor.submit_job(
+                        batch.workflow_id, job_input, job_id, priority="batch", tenant=batch_id
+                    )
+                    remember_engine_job_id(job_data, submitted)
                     job_data["status"] = "queued"
                     store[job_id] = job_data
             except Exception as e:
@@ -490,8 +502,8 @@ async def list_jobs(
         JobList with jobs and total count
     """
     try:
-        # Get all jobs
-        all_jobs = list(store.values())
+        # Get all jobs, with async ones brought up to date from the executor
+        all_jobs = [refresh_job_from_executor(j, _executor) for j in list(store.values())]
         
         # Filter by status if provided
         if status:
@@ -545,7 +557,7 @@ async def get_job(
         if job_id not in store:
             raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
 
-        job = store[job_id]
+        job = refresh_job_from_executor(store[job_id], _executor)
 
         return JobStatus(
             job_id=job["job_id"],
@@ -568,6 +580,42 @@ async def get_job(
         raise HTTPException(status_code=500, detail=f"Failed to get job: {str(e)}")
 
 
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    request: Request,
+    store=Depends(get_jobs_store)
+):
+    """Stream job progress as Server-Sent Events.
+
+    Sends a ``snapshot`` of the current state, then ``step_started``,
+    ``step_completed``, ``step_failed`` and ``progress`` events as they
+    happen, and closes after the terminal ``job_completed`` (with the
+    result), ``job_failed`` or ``job_cancelled`` event.
+
+    Args:
+        job_id: Job identifier
+
+    Returns:
+        text/event-stream response
+    """
+    executor = _executor
+    if job_id not in store and job_snapshot(None, executor, job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+
+    events = get_job_stream_hub().stream(
+        [job_id],
+        snapshot=lambda jid: job_snapshot(store, executor, jid),
+        result=lambda jid: job_result(store, executor, jid),
+        is_disconnected=request.is_disconnected,
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/jobs/{job_id}/pause", response_model=JobControl)
 async def pause_job(
     job_id: str,
@@ -931,7 +979,13 @@ async def retry_job(
                 workflow_id = job.get("workflow_id")
                 inputs = job.get("inputs", {})
                 config_overrides = job.get("config_overrides")
-                executor.submit_job(workflow_id, inputs, job_id)
+                # Keep the scheduling class the job was created with
+                batch_id = job.get("batch_id")
+                if batch_id:
+                    submitted = executor.submit_job(workflow_id, inputs, job_id, priority="batch", tenant=batch_id)
+                else:
+                    submitted = executor.submit_job(workflow_id, inputs, job_id, priority="interactive")
+                remember_engine_job_id(job, submitted)
             
             job["status"] = "retrying"
             job["retry_count"] = retry_count + 1
@@ -7,10 +7,12 @@ JSON-RPC style method routing.
 """
 
 import logging
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import Optional
 
+from src.core.snapshot_cache import get_content_snapshot
 from src.mcp.protocol import MCPRequest, MCPResponse, MCPProtocol
+from ..etag import snapshot_response
 
 logger = logging.getLogger(__name__)
 
@@ -223,26 +225,20 @@ async def mcp_status():
 
 
 @router.get("/config/agents")
-async def get_agents_config():
+async def get_agents_config(request: Request):
     """Get agents configuration.
     
+    Served from the shared content snapshot; supports If-None-Match.
+    
     Returns:
         Agents configuration
     """
     try:
-        import yaml
-        from pathlib import Path
-        
-        agents_file = Path("config/agents.yaml")
-        if not agents_file.exists():
-            return {"agents": {}}
-        
-        with open(agents_file, 'r') as f:
-            config = yaml.safe_load(f)
-        
-        return {
-            "agents": config.get("agents", {})
-        }
+        snapshot = get_content_snapshot()
+        return snapshot_response(
+            request, snapshot, ("mcp", "config_agents"), snapshot.etag("agents"),
+            lambda: {"agents": snapshot.agents}
+        )
     except Exception as e:
         logger.error(f"Error getting agents config: {e}", exc_info=True)
         raise HTTPException(
@@ -252,26 +248,20 @@ async def get_agents_config():
 
 
 @router.get("/config/workflows")
-async def get_workflows_config():
+async def get_workflows_config(request: Request):
     """Get workflows configuration.
     
+    Served from the shared content snapshot; supports If-None-Match.
+    
     Returns:
         Workflows configuration
     """
     try:
-        import yaml
-        from pathlib import Path
-        
-        workflows_file = Path("templates/workflows.yaml")
-        if not workflows_file.exists():
-            return {"workflows": {}}
-        
-        with open(workflows_file, 'r') as f:
-            config = yaml.safe_load(f)
-        
-        return {
-            "workflows": config.get("workflows", {})
-        }
+        snapshot = get_content_snapshot()
+        return snapshot_response(
+            request, snapshot, ("mcp", "config_workflows"), snapshot.etag("workflows"),
+            lambda: {"workflows": snapshot.workflows}
+        )
     except Exception as e:
         logger.error(f"Error getting workflows config: {e}", exc_info=True)
         raise HTTPException(
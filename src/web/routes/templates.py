@@ -3,9 +3,12 @@
 import logging
 from typing import List, Optional, Dict, Any
 from pathlib import Path
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 
+from src.core.snapshot_cache import get_content_snapshot
+from ..etag import snapshot_response
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/templates", tags=["templates"])
@@ -41,42 +44,55 @@ class TemplateDetailResponse(BaseModel):
     metadata: Dict[str, Any]
 
 
+def _template_info(template) -> TemplateInfo:
+    return TemplateInfo(
+        name=template.name,
+        type=template.type.value,
+        description=template.metadata.get("description"),
+        version=template.version,
+        required_placeholders=template.schema.required_placeholders,
+        optional_placeholders=template.schema.optional_placeholders,
+        metadata=template.metadata
+    )
+
+
+def _template_list(registry, category: Optional[str] = None) -> TemplateListResponse:
+    templates = []
+    categories = set()
+
+    for template_name, template in registry.templates.items():
+        # Get category from metadata or type
+        template_category = template.metadata.get("category", template.type.value)
+        categories.add(template_category)
+
+        if category is None or template_category.lower() == category.lower():
+            templates.append(_template_info(template))
+
+    return TemplateListResponse(
+        templates=templates,
+        total=len(templates),
+        categories=sorted(list(categories))
+    )
+
+
 @router.get("", response_model=TemplateListResponse)
-async def list_all_templates():
+async def list_all_templates(request: Request):
     """List all available templates (mirrors cmd_list_templates).
     
+    Served from the shared content snapshot; supports If-None-Match.
+    
     Returns:
         TemplateListResponse with all templates
     """
     try:
-        from src.core.template_registry import TemplateRegistry
-
-        # Initialize template registry (auto-loads templates from ./templates)
-        registry = TemplateRegistry()
-
-        # Get all templates
-        templates = []
-        categories = set()
-
-        for template_name, template in registry.templates.items():
-            # Get category from metadata or type
-            category = template.metadata.get("category", template.type.value)
-            categories.add(category)
-
-            templates.append(TemplateInfo(
-                name=template.name,
-                type=template.type.value,
-                description=template.metadata.get("description"),
-                version=template.version,
-                required_placeholders=template.schema.required_placeholders,
-                optional_placeholders=template.schema.optional_placeholders,
-                metadata=template.metadata
-            ))
-
-        return TemplateListResponse(
-            templates=templates,
-            total=len(templates),
-            categories=sorted(list(categories))
+        snapshot = get_content_snapshot()
+        registry = snapshot.template_registry
+        if registry is None:
+            raise RuntimeError("Templates not loaded")
+
+        return snapshot_response(
+            request, snapshot, ("templates", "list"), snapshot.etag("templates"),
+            lambda: _template_list(registry)
         )
 
     except Exception as e:
@@ -86,7 +102,7 @@ async def list_all_templates():
 
 
 @router.get("/{template_id}", response_model=TemplateDetailResponse)
-async def get_template_details(template_id: str):
+async def get_template_details(template_id: str, request: Request):
     """Get template details.
     
     Args:
@@ -96,29 +112,31 @@ async def get_template_details(template_id: str):
         TemplateDetailResponse with full template information
     """
     try:
-        from src.core.template_registry import TemplateRegistry
+        snapshot = get_content_snapshot()
+        registry = snapshot.template_registry
+        if registry is None:
+            raise RuntimeError("Templates not loaded")
 
-        # Initialize template registry (auto-loads templates)
-        registry = TemplateRegistry()
-
-        # Get specific template using get_template method
         template = registry.get_template(template_id)
 
         if not template:
             raise HTTPException(status_code=404, detail=f"Template '{template_id}' not found")
 
-        return TemplateDetailResponse(
-            name=template.name,
-            type=template.type.value,
-            content=template.template_content,
-            description=template.metadata.get("description"),
-            version=template.version,
-            schema={
-                "required_placeholders": template.schema.required_placeholders,
-                "optional_placeholders": template.schema.optional_placeholders,
-                "required_sections": template.schema.required_sections
-            },
-            metadata=template.metadata
+        return snapshot_response(
+            request, snapshot, ("templates", "detail", template_id), snapshot.etag("templates"),
+            lambda: TemplateDetailResponse(
+                name=template.name,
+                type=template.type.value,
+                content=template.template_content,
+                description=template.metadata.get("description"),
+                version=template.version,
+                schema={
+                    "required_placeholders": template.schema.required_placeholders,
+                    "optional_placeholders": template.schema.optional_placeholders,
+                    "required_sections": template.schema.required_sections
+                },
+                metadata=template.metadata
+            )
         )
 
     except HTTPException:
@@ -129,7 +147,7 @@ async def get_template_details(template_id: str):
 
 
 @router.get("/categories/{category}", response_model=TemplateListResponse)
-async def list_templates_by_category(category: str):
+async def list_templates_by_category(category: str, request: Request):
     """List templates by category.
     
     Args:
@@ -139,34 +157,21 @@ async def list_templates_by_category(category: str):
         TemplateListResponse filtered by category
     """
     try:
-        from src.core.template_registry import TemplateRegistry
-
-        # Initialize template registry (auto-loads templates)
-        registry = TemplateRegistry()
-
-        # Filter templates by category
-        templates = []
-        categories = set()
-
-        for template_name, template in registry.templates.items():
-            template_category = template.metadata.get("category", template.type.value)
-            categories.add(template_category)
-
-            if template_category.lower() == category.lower():
-                templates.append(TemplateInfo(
-                    name=template.name,
-                    type=template.type.value,
-                    description=template.metadata.get("description"),
-                    version=template.version,
-                    required_placeholders=template.schema.required_placeholders,
-                    optional_placeholders=template.schema.optional_placeholders,
-                    metadata=template.metadata
-                ))
-
-        return TemplateListResponse(
-            templates=templates,
-            total=len(templates),
-            categories=sorted(list(categories))
+        snapshot = get_content_snapshot()
+        registry = snapshot.template_registry
+        if registry is None:
+            raise RuntimeError("Templates not loaded")
+
+        # The path segment is client input: only memoize categories the
+        # registry actually has, so unknown ones cannot grow the memo
+        known = snapshot.memo(("templates", "category_names"), lambda: frozenset(
+            template.metadata.get("category", template.type.value).lower()
+            for template in registry.templates.values()
+        ))
+        key = ("templates", "category", category.lower()) if category.lower() in known else None
+        return snapshot_response(
+            request, snapshot, key, snapshot.etag("templates"),
+            lambda: _template_list(registry, category)
         )
 
     except Exception as e:
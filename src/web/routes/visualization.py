@@ -19,6 +19,7 @@ from ...visualization.workflow_visualizer import WorkflowVisualizer
 from ...visualization.agent_flow_monitor import get_flow_monitor
 from ...visualization.monitor import VisualOrchestrationMonitor
 from ...visualization.workflow_debugger import get_workflow_debugger
+from ...utils.metrics_store import get_metrics_store, series_name
 from ..connection_manager import get_connection_manager
 
 logger = logging.getLogger(__name__)
@@ -31,6 +32,46 @@ _flow_monitor = None
 _orchestration_monitor = None
 
 
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def _parse_duration(value: str) -> int:
+    """Parse '30m', '24h', '7d' style durations into seconds."""
+    try:
+        return int(float(value[:-1]) * _DURATION_UNITS[value[-1].lower()])
+    except (KeyError, ValueError, IndexError):
+        raise HTTPException(status_code=400, detail=f"Invalid duration: {value}")
+
+
+def _metrics_timeseries(window_seconds: int, granularity_seconds: int) -> dict:
+    """Throughput/duration aggregates and rollups from the shared metrics store."""
+    store = get_metrics_store()
+    resolution = max(
+        [r for r in store.rollups if r <= granularity_seconds] or [min(store.rollups)]
+    )
+    hours = window_seconds / 3600
+    job_series = series_name("job", "duration_ms")
+    agent_series = [n for n in store.names("agent.") if n.endswith(".duration_ms")]
+    jobs = store.summary(job_series, window_seconds)
+    agent_durations = store.values(agent_series, window_seconds)
+
+    return {
+        "throughput": {
+            "jobs_per_hour": jobs["count"] / hours if hours else 0,
+            "agents_per_hour": len(agent_durations) / hours if hours else 0
+        },
+        "performance": {
+            "avg_job_duration": jobs["mean"],
+            "p95_job_duration": jobs["p95"],
+            "avg_agent_duration": float(agent_durations.mean()) if len(agent_durations) else 0.0
+        },
+        "series": {
+            "resolution_seconds": resolution,
+            "job_duration_ms": store.rollup(job_series, resolution, window_seconds)
+        }
+    }
+
+
 def get_workflow_visualizer():
     """Get or create workflow visualizer instance."""
     global _workflow_visualizer
@@ -175,14 +216,7 @@ async def viz_metrics(
                     "total_agents": len(getattr(monitor, 'registered_agents', [])),
                     "active_flows": len(getattr(monitor, 'active_flows', {}))
                 },
-                "throughput": {
-                    "jobs_per_hour": 0,  # Would be calculated from historical data
-                    "agents_per_hour": 0
-                },
-                "performance": {
-                    "avg_job_duration": 0.0,
-                    "avg_agent_duration": 0.0
-                }
+                **_metrics_timeseries(_parse_duration(time_range), _parse_duration(granularity))
             }
         
         return JSONResponse(content=metrics)
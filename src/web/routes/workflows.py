@@ -2,11 +2,11 @@
 
 import logging
 import os
-from pathlib import Path
 from typing import List, Optional, Dict, Any
-import yaml
 from fastapi import APIRouter, HTTPException, Depends
 
+from src.core.snapshot_cache import get_content_snapshot
+
 from ..models import WorkflowInfo, WorkflowList
 
 logger = logging.getLogger(__name__)
@@ -22,22 +22,23 @@ def _is_mock_mode() -> bool:
 def _load_workflows_from_yaml() -> Optional[Dict[str, Any]]:
     """Load workflows from YAML file (fallback for mock mode).
 
+    Served from the shared content snapshot, so templates/workflows.yaml is
+    parsed once per content version rather than on every request.
+
     Returns:
         Dictionary of workflows or None if file not found
     """
-    yaml_path = Path("templates/workflows.yaml")
-    if not yaml_path.exists():
-        logger.warning(f"Workflows YAML not found at {yaml_path}")
-        return None
-
     try:
-        with open(yaml_path, 'r') as f:
-            data = yaml.safe_load(f)
-            return data.get("workflows", {})
+        snapshot = get_content_snapshot()
     except Exception as e:
         logger.error(f"Error loading workflows from YAML: {e}")
         return None
 
+    if not snapshot.workflows_document:
+        logger.warning("Workflows YAML not found or empty at templates/workflows.yaml")
+        return None
+    return snapshot.workflows
+
 
 def normalize_agents(raw_agents):
     """Normalize agents to List[str].
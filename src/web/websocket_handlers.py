@@ -2,12 +2,20 @@
 
 This module provides WebSocket connection management for real-time workflow monitoring.
 Clients can connect to view live agent execution, data flow, and progress updates.
+
+Event delivery never blocks the publisher: bus callbacks only hand the message
+to the event loop, where each connection has its own bounded ``ConnectionOutbox``
+drained by a dedicated sender task. Superseded progress updates are coalesced,
+queued messages can be batched into one frame, and a connection whose queue
+overflows or whose send times out is dropped instead of slowing other viewers.
 """
 
 import logging
 import json
 import asyncio
-from typing import Dict, List, Set
+import inspect
+from collections import deque
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
 from fastapi import WebSocket, WebSocketDisconnect
 
@@ -15,14 +23,171 @@ from src.core import EventBus, AgentEvent
 
 logger = logging.getLogger(__name__)
 
+# Message types where only the latest unsent message matters
+COALESCED_TYPES = frozenset(["progress_update"])
+
+# Close code sent to consumers that cannot keep up (RFC 6455 "Try Again Later")
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class ConnectionOutbox:
+    """Bounded, coalescing send queue for a single websocket.
+
+    Messages are enqueued synchronously on the event loop thread and sent by
+    ``run()``. A message whose type is in ``COALESCED_TYPES`` replaces the
+    pending message of the same type in place instead of queuing behind it.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_pending: int = 256,
+        max_batch: int = 1,
+        send_timeout: float = 5.0
+    ):
+        self.websocket = websocket
+        self.max_pending = max_pending
+        self.max_batch = max(1, max_batch)
+        self.send_timeout = send_timeout
+
+        self._pending: deque = deque()            # [message] slots, mutable for coalescing
+        self._coalesce: Dict[str, List[dict]] = {}
+        self._wakeup = asyncio.Event()
+
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        self.sent = 0
+        self.frames = 0
+        self.coalesced = 0
+
+    def enqueue(self, message: dict) -> bool:
+        """Queue a message for delivery.
+
+        Args:
+            message: JSON-serializable message
+
+        Returns:
+            False if the connection is closed or was just dropped for overflow
+        """
+        if self.closed:
+            return False
+
+        message_type = message.get("type")
+        if message_type in COALESCED_TYPES:
+            slot = self._coalesce.get(message_type)
+            if slot is not None:
+                slot[0] = message
+                self.coalesced += 1
+                return True
+
+        if len(self._pending) >= self.max_pending:
+            self.close("slow consumer: send queue full")
+            return False
+
+        slot = [message]
+        self._pending.append(slot)
+        if message_type in COALESCED_TYPES:
+            self._coalesce[message_type] = slot
+        self._wakeup.set()
+        return True
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _next_frame(self) -> dict:
+        batch = []
+        while self._pending and len(batch) < self.max_batch:
+            slot = self._pending.popleft()
+            message = slot[0]
+            if self._coalesce.get(message.get("type")) is slot:
+                del self._coalesce[message["type"]]
+            batch.append(message)
+        if len(batch) == 1:
+            return batch[0]
+        return {"type": "batch", "messages": batch}
+
+    async def run(self):
+        """Send queued messages until the outbox is closed."""
+        while not self.closed:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            frame = self._next_frame()
+            try:
+                await asyncio.wait_for(self.websocket.send_json(frame), timeout=self.send_timeout)
+            except asyncio.TimeoutError:
+                self.close(f"slow consumer: send exceeded {self.send_timeout}s")
+                break
+            except Exception as e:
+                logger.warning(f"Failed to send message to websocket: {e}")
+                self.close("send failed")
+                break
+            self.frames += 1
+            self.sent += len(frame["messages"]) if frame.get("type") == "batch" else 1
+
+        if self.close_reason and self.close_reason.startswith("slow consumer"):
+            await self._close_socket()
+
+    def close(self, reason: str = "closed"):
+        """Stop delivery; pending messages are discarded."""
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        self._pending.clear()
+        self._coalesce.clear()
+        self._wakeup.set()
+        if reason.startswith("slow consumer"):
+            logger.warning(f"Dropping websocket connection: {reason}")
+
+    async def _close_socket(self):
+        try:
+            result = self.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE)
+            if inspect.isawaitable(result):
+                await asyncio.wait_for(result, timeout=self.send_timeout)
+        except Exception as e:
+            logger.debug(f"Error closing slow websocket: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": self.pending,
+            "sent": self.sent,
+            "frames": self.frames,
+            "coalesced": self.coalesced,
+            "closed": self.closed,
+            "close_reason": self.close_reason,
+        }
+
 
 class LiveFlowHandler:
     """Handles WebSocket connections for live flow monitoring."""
     
-    def __init__(self, event_bus: EventBus = None):
-        self.connections: Dict[str, Set[WebSocket]] = {}
+    def __init__(
+        self,
+        event_bus: EventBus = None,
+        max_pending: int = 256,
+        max_batch: int = 1,
+        send_timeout: float = 5.0
+    ):
+        """Initialize handler.
+
+        Args:
+            event_bus: Event bus to subscribe to (a private one if omitted)
+            max_pending: Per-connection send queue bound; overflowing drops the connection
+            max_batch: Default maximum messages per frame (1 sends each message as its own frame)
+            send_timeout: Seconds a single send may take before the connection is dropped
+        """
+        # job_id -> {websocket: outbox}
+        self.connections: Dict[str, Dict[WebSocket, ConnectionOutbox]] = {}
         self.event_bus = event_bus or EventBus()
-        self._lock = asyncio.Lock()
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.send_timeout = send_timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.dropped_connections = 0
         
         # Subscribe to execution events
         self.event_bus.subscribe("agent_started", self._on_agent_started)
@@ -33,52 +198,74 @@ class LiveFlowHandler:
         
         logger.info("LiveFlowHandler initialized")
     
-    async def handle_connection(self, websocket: WebSocket, job_id: str):
+    async def handle_connection(self, websocket: WebSocket, job_id: str, max_batch: Optional[int] = None):
         """Handle WebSocket connection for job monitoring.
         
         Args:
             websocket: WebSocket connection
             job_id: Job identifier to monitor
+            max_batch: Messages per frame for this connection; values above 1
+                let queued messages arrive as ``{"type": "batch", "messages": [...]}``
         """
         await websocket.accept()
         logger.info(f"WebSocket connection accepted for job {job_id}")
+        self._loop = asyncio.get_running_loop()
         
-        async with self._lock:
-            if job_id not in self.connections:
-                self.connections[job_id] = set()
-            self.connections[job_id].add(websocket)
+        outbox = ConnectionOutbox(
+            websocket,
+            max_pending=self.max_pending,
+            max_batch=self.max_batch if max_batch is None else max_batch,
+            send_timeout=self.send_timeout
+        )
+        sender = None
+        receiver = None
         
         try:
-            # Send initial connection acknowledgment
-            await websocket.send_json({
+            # Initial connection acknowledgment goes first through the outbox,
+            # so it is subject to the same send timeout as events
+            outbox.enqueue({
                 "type": "connected",
                 "job_id": job_id,
                 "timestamp": datetime.now(timezone.utc).isoformat()
             })
+            self.connections.setdefault(job_id, {})[websocket] = outbox
             
-            # Keep connection alive with ping/pong
-            while True:
-                try:
-                    message = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
-                    
-                    if message == "ping":
-                        await websocket.send_text("pong")
-                    
-                except asyncio.TimeoutError:
-                    # Send ping to client
-                    await websocket.send_text("ping")
+            sender = asyncio.create_task(outbox.run())
+            receiver = asyncio.create_task(self._keepalive(websocket, outbox))
+            done, _ = await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver in done and not receiver.cancelled():
+                receiver.result()
+            if outbox.close_reason and outbox.close_reason.startswith("slow consumer"):
+                self.dropped_connections += 1
         
         except WebSocketDisconnect:
             logger.info(f"WebSocket disconnected for job {job_id}")
         except Exception as e:
             logger.error(f"WebSocket error for job {job_id}: {e}")
         finally:
+            outbox.close()
+            for task in (sender, receiver):
+                if task is not None and not task.done():
+                    task.cancel()
             # Remove connection
-            async with self._lock:
-                if job_id in self.connections:
-                    self.connections[job_id].discard(websocket)
-                    if not self.connections[job_id]:
-                        del self.connections[job_id]
+            job_connections = self.connections.get(job_id)
+            if job_connections is not None:
+                job_connections.pop(websocket, None)
+                if not job_connections:
+                    del self.connections[job_id]
+    
+    async def _keepalive(self, websocket: WebSocket, outbox: ConnectionOutbox):
+        """Answer client pings and ping idle clients until the outbox closes."""
+        while not outbox.closed:
+            try:
+                message = await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
+                
+                if message == "ping":
+                    await websocket.send_text("pong")
+                
+            except asyncio.TimeoutError:
+                # Send ping to client
+                await websocket.send_text("ping")
     
     def _on_agent_started(self, event: AgentEvent):
         """Handle agent started event."""
@@ -92,7 +279,7 @@ class LiveFlowHandler:
             "timestamp": event.timestamp,
             "correlation_id": event.correlation_id
         }
-        asyncio.create_task(self._broadcast(job_id, message))
+        self._dispatch(job_id, message)
     
     def _on_agent_completed(self, event: AgentEvent):
         """Handle agent completed event."""
@@ -108,7 +295,7 @@ class LiveFlowHandler:
             "timestamp": event.timestamp,
             "correlation_id": event.correlation_id
         }
-        asyncio.create_task(self._broadcast(job_id, message))
+        self._dispatch(job_id, message)
     
     def _on_agent_failed(self, event: AgentEvent):
         """Handle agent failed event."""
@@ -123,7 +310,7 @@ class LiveFlowHandler:
             "timestamp": event.timestamp,
             "correlation_id": event.correlation_id
         }
-        asyncio.create_task(self._broadcast(job_id, message))
+        self._dispatch(job_id, message)
     
     def _on_data_flow(self, event: AgentEvent):
         """Handle data flow event."""
@@ -139,7 +326,7 @@ class LiveFlowHandler:
             "timestamp": event.timestamp,
             "correlation_id": event.correlation_id
         }
-        asyncio.create_task(self._broadcast(job_id, message))
+        self._dispatch(job_id, message)
     
     def _on_progress_update(self, event: AgentEvent):
         """Handle progress update event."""
@@ -154,37 +341,31 @@ class LiveFlowHandler:
             "timestamp": event.timestamp,
             "correlation_id": event.correlation_id
         }
-        asyncio.create_task(self._broadcast(job_id, message))
+        self._dispatch(job_id, message)
     
-    async def _broadcast(self, job_id: str, message: dict):
-        """Broadcast message to all connections for a job.
+    def _dispatch(self, job_id: str, message: dict):
+        """Hand a message to the event loop without waiting on delivery.
+
+        Called from event bus callbacks, which may run on any thread.
+        """
+        loop = self._loop
+        if loop is None or job_id not in self.connections:
+            return
+        try:
+            loop.call_soon_threadsafe(self._broadcast, job_id, message)
+        except RuntimeError:
+            # Loop already closed (server shutting down)
+            pass
+    
+    def _broadcast(self, job_id: str, message: dict):
+        """Queue message on every connection for a job (event loop thread only).
         
         Args:
             job_id: Job identifier
             message: Message to broadcast
         """
-        async with self._lock:
-            if job_id not in self.connections:
-                return
-            
-            connections = list(self.connections[job_id])
-        
-        disconnected = []
-        for websocket in connections:
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.warning(f"Failed to send message to websocket: {e}")
-                disconnected.append(websocket)
-        
-        # Remove disconnected sockets
-        if disconnected:
-            async with self._lock:
-                if job_id in self.connections:
-                    for ws in disconnected:
-                        self.connections[job_id].discard(ws)
-                    if not self.connections[job_id]:
-                        del self.connections[job_id]
+        for outbox in list(self.connections.get(job_id, {}).values()):
+            outbox.enqueue(message)
     
     def get_connection_count(self, job_id: str = None) -> int:
         """Get count of active connections.
@@ -196,8 +377,22 @@ class LiveFlowHandler:
             Connection count
         """
         if job_id:
-            return len(self.connections.get(job_id, set()))
+            return len(self.connections.get(job_id, {}))
         return sum(len(conns) for conns in self.connections.values())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-connection delivery statistics.
+        
+        Returns:
+            Dictionary with dropped connection count and outbox stats per job
+        """
+        return {
+            "dropped_connections": self.dropped_connections,
+            "jobs": {
+                job_id: [outbox.stats() for outbox in outboxes.values()]
+                for job_id, outboxes in list(self.connections.items())
+            },
+        }
 
 
 # Global handler instance
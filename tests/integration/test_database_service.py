@@ -19,18 +19,21 @@ from src.services.services import DatabaseService
 
 
 @pytest.fixture
-def mock_config():
+def mock_config(tmp_path):
     """Create mock configuration for testing.
     
+    Args:
+        tmp_path: Directory for the (lexical index) database files
+        
     Returns:
         Config object with test settings
     """
     config = Config()
     config.database = DatabaseConfig()
-    config.database.chroma_db_path = "./test_chroma_db"
+    config.database.chroma_db_path = str(tmp_path / "test_chroma_db")
     config.database.embedding_model = "all-MiniLM-L6-v2"
     config.database.collection_name = "test_collection"
-    config.chroma_persist_directory = "./test_chroma_db"
+    config.chroma_persist_directory = str(tmp_path / "test_chroma_db")
     config.embedding_model = "all-MiniLM-L6-v2"
     return config
 
@@ -40,7 +40,8 @@ def mock_executor():
 
     # Mock job engine with the test job
     executor.job_engine = Mock()
-    executor.job_engine._jobs = {"test_job_123": job_result}
+    executor.job_engine.list_jobs = Mock(return_value=[])
+    executor.job_engine.get_job_state = Mock(side_effect={"test_job_123": job_result}.get)
     executor.job_engine.pause_job = Mock()
     executor.job_engine.resume_job = Mock()
     executor.job_engine.cancel_job = Mock()
@@ -126,7 +126,7 @@ async def test_workflow_status_params_validation():
     # Mock dependencies
     executor = Mock()
     job_engine = Mock()
-    job_engine._jobs = {}
+    job_engine.get_job_state = Mock(return_value=None)
     set_dependencies(executor=executor, job_engine=job_engine)
     
     # Test missing job_id
@@ -226,21 +226,20 @@ async def test_workflow_status_success():
     # Setup mocks
     executor = Mock()
     
-    job = Mock()
-    job.to_dict = Mock(return_value={
-        "id": "test_job",
-        "status": "running",
-        "workflow_name": "fast-draft",
-        "progress": 50,
-        "current_step": "outline",
-        "pipeline": [],
-        "started_at": "2025-01-11T12:00:00",
-        "completed_at": None,
-        "error": None
-    })
+    from datetime import datetime
+    from src.orchestration.job_state import JobMetadata, JobState, JobStatus
+    job = JobState(metadata=JobMetadata(
+        job_id="test_job",
+        workflow_id="fast-draft",
+        status=JobStatus.RUNNING,
+        created_at=datetime(2025, 1, 11, 12, 0),
+        started_at=datetime(2025, 1, 11, 12, 0),
+        progress=0.5,
+        current_step="outline"
+    ))
     
     job_engine = Mock()
-    job_engine._jobs = {"test_job": job}
+    job_engine.get_job_state = Mock(side_effect={"test_job": job}.get)
     
     set_dependencies(executor=executor, job_engine=job_engine)
     
@@ -0,0 +1,114 @@
+"""Benchmark harness for the performance suite.
+
+Run through ``tools/perf_runner.py``, which sets ``PERF_RESULTS_PATH`` so
+the results are written where ``tools/perf_report.py`` and
+``tools/perf_gate.py`` read them. Each row keeps its raw samples so the gate
+can test regressions statistically. Settings
+come from environment variables:
+
+- ``PERF_ITERS``: measured iterations per case (default 3)
+- ``PERF_WARMUP``: unmeasured warm-up iterations (default 1)
+- ``PERF_CORPUS_SIZE``: size of the synthetic corpora (default 200)
+- ``PERF_SEED``: corpus seed (default 1234)
+- ``PERF_RESULTS_PATH``: JSON output file (results are only written when set)
+
+The defaults keep the suite fast enough to run with the rest of the tests.
+"""
+
+import json
+import math
+import os
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+
+PERF_ITERS = int(os.getenv("PERF_ITERS", "3"))
+PERF_WARMUP = int(os.getenv("PERF_WARMUP", "1"))
+PERF_CORPUS_SIZE = int(os.getenv("PERF_CORPUS_SIZE", "200"))
+PERF_SEED = int(os.getenv("PERF_SEED", "1234"))
+
+
+class BenchmarkRecorder:
+    """Times callables and collects rows in the perf_results.json format."""
+
+    def __init__(self, iters: int = PERF_ITERS, warmup: int = PERF_WARMUP):
+        self.iters = max(1, iters)
+        self.warmup = max(0, warmup)
+        self.results: List[Dict[str, Any]] = []
+
+    def measure(
+        self,
+        suite: str,
+        case: str,
+        func: Callable[[], Any],
+        setup: Optional[Callable[[], None]] = None,
+        iters: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Run func repeatedly and record timing statistics.
+
+        Args:
+            suite: Benchmark suite (report section)
+            case: Case name within the suite
+            func: Zero-argument callable timed once per iteration
+            setup: Untimed callable run before every iteration
+            iters: Override measured iterations for this case
+
+        Returns:
+            The recorded row
+        """
+        count = max(1, iters or self.iters)
+        for _ in range(self.warmup):
+            if setup:
+                setup()
+            func()
+
+        samples = []
+        for _ in range(count):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+
+        ordered = sorted(samples)
+        row = {
+            "suite": suite,
+            "case": case,
+            "iters": count,
+            "mean": statistics.fmean(samples),
+            "p95": ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)],
+            "max": ordered[-1],
+            "min": ordered[0],
+            "stdev": statistics.pstdev(samples),
+            "corpus_size": PERF_CORPUS_SIZE,
+            "seed": PERF_SEED,
+            "samples": samples,
+        }
+        self.results.append(row)
+        return row
+
+
+@pytest.fixture(scope="session")
+def bench():
+    recorder = BenchmarkRecorder()
+    yield recorder
+
+    results_path = os.getenv("PERF_RESULTS_PATH")
+    if results_path and recorder.results:
+        path = Path(results_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(recorder.results, indent=2), encoding="utf-8")
+
+
+@pytest.fixture
+def rng():
+    return random.Random(PERF_SEED)
+
+
+@pytest.fixture
+def corpus_size():
+    return PERF_CORPUS_SIZE
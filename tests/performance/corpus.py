@@ -0,0 +1,86 @@
+"""Seeded synthetic corpora for the benchmark suite.
+
+Every generator takes a ``random.Random`` so a given ``PERF_SEED`` and
+``PERF_CORPUS_SIZE`` always produce the same inputs, keeping runs
+comparable across commits.
+"""
+
+import random
+from typing import Any, Dict, List
+
+VOCABULARY = (
+    "async cache client config context document embedding endpoint error event "
+    "factory gateway handler index iterator json kernel latency layout markdown "
+    "metadata model network object outline parser pipeline pool prompt queue "
+    "render request response retry schema section serializer service session "
+    "storage stream template thread token topic validator vector worker workflow"
+).split()
+
+TOPICS = (
+    "PDF conversion", "Excel automation", "Word documents", "email parsing",
+    "image processing", "barcode generation", "OCR", "slide decks", "diagrams", "archives"
+)
+
+
+def sentence(rng: random.Random, words: int = 12) -> str:
+    text = " ".join(rng.choice(VOCABULARY) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def paragraph(rng: random.Random, sentences: int = 4) -> str:
+    return " ".join(sentence(rng, rng.randint(8, 16)) for _ in range(sentences))
+
+
+def code_block(rng: random.Random, lines: int = 6) -> str:
+    body = "\n".join(
+        f"    var {rng.choice(VOCABULARY)}{i} = {rng.choice(VOCABULARY).capitalize()}.Create();"
+        for i in range(lines)
+    )
+    return f"```csharp\npublic void Run()\n{{\n{body}\n}}\n```"
+
+
+def markdown_document(rng: random.Random, sections: int = 6) -> str:
+    """Blog-style markdown with frontmatter, headings, prose, lists and code."""
+    title = f"{rng.choice(TOPICS)} with {rng.choice(VOCABULARY)} {rng.choice(VOCABULARY)}"
+    parts = [f"---\ntitle: \"{title}\"\ndate: 2024-01-01\n---", f"# {title}", paragraph(rng)]
+    for i in range(sections):
+        parts.append(f"## Section {i + 1}: {rng.choice(VOCABULARY).capitalize()}")
+        parts.append(paragraph(rng, rng.randint(2, 5)))
+        if i % 2 == 0:
+            parts.append(code_block(rng))
+        if i % 3 == 0:
+            parts.append("\n".join(f"- {sentence(rng, 6)}" for _ in range(4)))
+    return "\n\n".join(parts) + "\n"
+
+
+def context_chunks(rng: random.Random, count: int, duplicate_rate: float = 0.2) -> List[str]:
+    """Retrieved-context chunks, some exact or near duplicates of earlier ones."""
+    chunks: List[str] = []
+    for _ in range(count):
+        if chunks and rng.random() < duplicate_rate:
+            original = rng.choice(chunks)
+            # Near duplicate: same text with one word swapped
+            words = original.split()
+            words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+            chunks.append(" ".join(words))
+        else:
+            chunks.append(paragraph(rng, rng.randint(3, 6)))
+    return chunks
+
+
+def blog_index(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    """Existing-post index in the format DuplicationDetector loads."""
+    posts = []
+    for i in range(count):
+        title = f"How to use {rng.choice(TOPICS)} with {rng.choice(VOCABULARY)} {rng.choice(VOCABULARY)}"
+        posts.append({
+            "slug": f"post-{i}",
+            "title": title,
+            "content": paragraph(rng, 6),
+            "url": f"https://blog.example.com/post-{i}",
+        })
+    return posts
+
+
+def prompts(rng: random.Random, count: int) -> List[str]:
+    return [f"Write a section about {rng.choice(TOPICS)}. {sentence(rng, 20)}" for _ in range(count)]
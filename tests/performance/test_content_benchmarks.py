@@ -0,0 +1,98 @@
+"""Benchmarks for content hot paths: templates, dedup, duplication checks, validators."""
+
+import json
+
+import pytest
+
+from src.core.template_registry import Template, TemplateSchema, TemplateType
+from src.utils import markdown_structure
+from src.utils.content_utils import dedupe_context
+from src.utils.duplication_detector import EnhancedDuplicationDetector
+from src.utils.llm_response_validator import validate_llm_response
+from src.utils.markdown_validator import enforce_valid_markdown, validate_markdown_syntax
+
+from tests.performance import corpus
+
+
+@pytest.fixture
+def documents(rng, corpus_size):
+    return [corpus.markdown_document(rng, sections=6) for _ in range(max(1, corpus_size // 10))]
+
+
+def test_template_render(bench, rng, corpus_size):
+    template = Template(
+        name="bench_section",
+        type=TemplateType.MARKDOWN,
+        template_content=(
+            "## {{title}}\n\n{{intro}}\n\nContext: {{context}}\n\n"
+            "{{code}}\n\nSee also: {{related}}\n\n{{body}}"
+        ),
+        schema=TemplateSchema(
+            required_placeholders=["title", "intro", "context", "body"],
+            optional_placeholders=["code", "related"]
+        )
+    )
+    data = [
+        {
+            "title": corpus.sentence(rng, 5),
+            "intro": corpus.paragraph(rng, 2),
+            "context": corpus.paragraph(rng, 4),
+            "body": corpus.paragraph(rng, 6),
+            "code": corpus.code_block(rng) if i % 2 else "",
+            "related": corpus.sentence(rng, 4) if i % 3 else "",
+        }
+        for i in range(corpus_size)
+    ]
+
+    rendered = []
+    bench.measure("templates", "Template.render",
+                  lambda: rendered.append([template.render(d) for d in data]))
+
+    assert rendered[-1][0].startswith("## ")
+    assert "{{" not in rendered[-1][1]
+
+
+def test_dedupe_context(bench, rng, corpus_size):
+    chunks = corpus.context_chunks(rng, corpus_size, duplicate_rate=0.2)
+
+    result = []
+    bench.measure("dedup", "dedupe_context", lambda: result.append(dedupe_context(chunks)))
+
+    assert 0 < len(result[-1]) < len(chunks)
+
+
+def test_duplication_detector(bench, rng, corpus_size, tmp_path):
+    index_path = tmp_path / "blog_index.json"
+    index_path.write_text(json.dumps(corpus.blog_index(rng, corpus_size)), encoding="utf-8")
+    detector = EnhancedDuplicationDetector(blog_index_path=index_path)
+    existing = detector.blog_index[0]
+
+    result = []
+    bench.measure(
+        "dedup", "DuplicationDetector.check_duplication",
+        lambda: result.append(detector.check_duplication(existing["title"], existing["content"]))
+    )
+
+    assert "error" not in result[-1]
+    assert not result[-1]["unique"]
+
+
+def test_markdown_validators(bench, documents):
+    # The documents fit in the parse cache; clear it so every iteration parses
+    results = []
+    bench.measure("validators", "validate_markdown_syntax",
+                  lambda: results.append([validate_markdown_syntax(doc) for doc in documents]),
+                  setup=markdown_structure._cache.clear)
+    bench.measure("validators", "enforce_valid_markdown",
+                  lambda: [enforce_valid_markdown(doc) for doc in documents],
+                  setup=markdown_structure._cache.clear)
+
+    assert all(valid for valid, _ in results[-1])
+
+
+def test_llm_response_validator(bench, documents):
+    results = []
+    bench.measure("validators", "validate_llm_response",
+                  lambda: results.append([validate_llm_response(doc, content_type="full_document") for doc in documents]))
+
+    assert len(results[-1]) == len(documents)
@@ -0,0 +1,88 @@
+"""Benchmarks for service hot paths: LLM cache lookups, job persistence, event publishing."""
+
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.core.config import Config
+from src.core.contracts import AgentEvent
+from src.core.event_bus import EventBus
+from src.orchestration.job_state import JobMetadata, JobState, JobStatus, StepExecution, StepStatus
+from src.orchestration.job_storage import JobStorage
+from src.services.services import LLMService
+
+from tests.performance import corpus
+
+
+@pytest.fixture
+def llm_service(tmp_path):
+    config = Config()
+    config.cache_dir = str(tmp_path / "cache")
+    config.gemini_api_key = "bench-key"
+    with patch('src.services.services.get_connection_pool') as mock_pool:
+        mock_pool.return_value.get.return_value = Mock(status_code=200)
+        yield LLMService(config)
+
+
+def test_llm_cache_lookup(bench, rng, corpus_size, llm_service):
+    prompts = corpus.prompts(rng, corpus_size)
+    now = datetime.now(timezone.utc)
+    for prompt in prompts:
+        key = llm_service._get_cache_key(prompt, None, temperature=None)
+        llm_service.cache[key] = (f"cached answer for {prompt[:20]}", now)
+
+    with patch.object(llm_service, '_call_provider', side_effect=AssertionError("cache miss")):
+        results = []
+        bench.measure("llm", "LLMService.generate cache hit",
+                      lambda: results.append([llm_service.generate(p) for p in prompts]))
+
+    assert results[-1][0].startswith("cached answer")
+
+
+def make_job(rng, index: int, steps: int = 8) -> JobState:
+    metadata = JobMetadata(
+        job_id=f"bench-{index}",
+        workflow_id="blog_generation",
+        status=JobStatus.RUNNING,
+        created_at=datetime.now(),
+        total_steps=steps
+    )
+    return JobState(
+        metadata=metadata,
+        inputs={"topic": corpus.sentence(rng, 6)},
+        outputs={"draft": corpus.markdown_document(rng, sections=3)},
+        steps={
+            f"step_{i}": StepExecution(agent_id=f"agent_{i}", status=StepStatus.COMPLETED,
+                                       output={"text": corpus.paragraph(rng, 3)})
+            for i in range(steps)
+        }
+    )
+
+
+def test_job_storage_save(bench, rng, corpus_size, tmp_path):
+    storage = JobStorage(base_dir=tmp_path / "jobs")
+    jobs = [make_job(rng, i) for i in range(max(1, corpus_size // 10))]
+
+    bench.measure("storage", "JobStorage.save_job",
+                  lambda: [storage.save_job(job) for job in jobs])
+
+    assert storage.load_job(jobs[0].metadata.job_id) is not None
+
+
+def test_event_bus_publish(bench, rng, corpus_size):
+    bus = EventBus()
+    received = []
+    for i in range(5):
+        bus.subscribe("section_written", lambda event: received.append(event.correlation_id))
+        bus.subscribe(f"other_{i}", lambda event: None)
+    events = [
+        AgentEvent(event_type="section_written", data={"content": corpus.paragraph(rng, 2)},
+                   source_agent="bench", correlation_id=f"cid-{i}")
+        for i in range(corpus_size)
+    ]
+
+    bench.measure("events", "EventBus.publish",
+                  lambda: [bus.publish(event) for event in events])
+
+    assert received[-1] == f"cid-{corpus_size - 1}"
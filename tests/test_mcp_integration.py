@@ -2,6 +2,7 @@
 
 import pytest
 import json
+from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
 from fastapi.testclient import TestClient
 
@@ -149,20 +150,15 @@ class TestMCPWebAdapter:
     
     def test_job_list_request(self, client, mock_executor):
         """Test job listing through MCP."""
-        # The actual code accesses executor.job_engine._jobs as a dict
-        mock_job1 = Mock()
-        mock_job1.to_dict = Mock(return_value={
-            "job_id": "job_1", "workflow_name": "test", "status": "running", "progress": 50, "started_at": ""
-        })
-        mock_job2 = Mock()
-        mock_job2.to_dict = Mock(return_value={
-            "job_id": "job_2", "workflow_name": "test", "status": "completed", "progress": 100, "started_at": ""
-        })
+        # Jobs are listed from the engine's job catalog
+        from src.orchestration.job_state import JobMetadata, JobStatus
         mock_executor.job_engine = Mock()
-        mock_executor.job_engine._jobs = {
-            "job_1": mock_job1,
-            "job_2": mock_job2
-        }
+        mock_executor.job_engine.list_jobs = Mock(return_value=[
+            JobMetadata(job_id="job_1", workflow_id="test", status=JobStatus.RUNNING,
+                        created_at=datetime.now(), progress=0.5),
+            JobMetadata(job_id="job_2", workflow_id="test", status=JobStatus.COMPLETED,
+                        created_at=datetime.now(), progress=1.0),
+        ])
 
         request_data = {
             "method": "jobs/list",
@@ -180,7 +176,7 @@ class TestMCPWebAdapter:
     
     def test_job_get_request(self, client, mock_executor):
         """Test getting job details through MCP."""
-        # The actual code accesses executor.job_engine._jobs.get()
+        # The actual code calls executor.job_engine.get_job_state()
         mock_job = Mock()
         mock_job.to_dict = Mock(return_value={
             "job_id": "job_123",
@@ -188,7 +184,7 @@ class TestMCPWebAdapter:
             "topic": "Test"
         })
         mock_executor.job_engine = Mock()
-        mock_executor.job_engine._jobs = {"job_123": mock_job}
+        mock_executor.job_engine.get_job_state = Mock(side_effect={"job_123": mock_job}.get)
 
         request_data = {
             "method": "jobs/get",
@@ -208,7 +204,7 @@ class TestMCPWebAdapter:
         mock_job = Mock()
         mock_job.to_dict = Mock(return_value={"job_id": "job_123", "status": "running"})
         mock_executor.job_engine = Mock()
-        mock_executor.job_engine._jobs = {"job_123": mock_job}
+        mock_executor.job_engine.get_job_state = Mock(side_effect={"job_123": mock_job}.get)
         mock_executor.job_engine.cancel_job = Mock()
 
         request_data = {
@@ -326,7 +322,8 @@ class TestMCPIntegration:
                 }
                 # Add job_engine mock for job operations
                 engine.job_engine = Mock()
-                engine.job_engine._jobs = {}
+                engine.job_engine.list_jobs = Mock(return_value=[])
+                engine.job_engine.get_job_state = Mock(return_value=None)
 
                 # Mock run_job at engine level (used by handle_job_create)
                 mock_job_result = Mock()
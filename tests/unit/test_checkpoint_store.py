@@ -0,0 +1,134 @@
+"""Unit tests for the indexed, content-addressed checkpoint store."""
+
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.orchestration.checkpoint_manager import CheckpointManager
+from src.orchestration.checkpoint_store import CheckpointStore
+
+
+def make_state(step, outputs):
+    return {
+        "step": step,
+        "outputs": {
+            name: {"content": " ".join(f"{text}-{i}" for i in range(200))} for name, text in outputs.items()
+        },
+        "config": {"topic": "python"},
+    }
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return CheckpointManager(storage_dir=tmp_path / "checkpoints")
+
+
+class TestCheckpointStore:
+    """Checkpoint storage, dedup and garbage collection."""
+
+    def test_restore_round_trip_preserves_order(self, manager):
+        state = {"zeta": 1, "alpha": {"b": [1, 2], "a": "x" * 1000}, "mid": None}
+        checkpoint_id = manager.save("job-1", "draft", state)
+
+        restored = manager.restore("job-1", checkpoint_id)
+        assert restored == state
+        assert list(restored) == ["zeta", "alpha", "mid"]
+        assert list(restored["alpha"]) == ["b", "a"]
+
+    def test_unchanged_subtrees_are_shared(self, tmp_path):
+        store = CheckpointStore(tmp_path)
+        first = store.put("cp-1", "job", "s1", make_state(1, {"outline": "o", "draft": "d"}), "t1")
+        second = store.put("cp-2", "job", "s2", make_state(2, {"outline": "o", "draft": "e"}), "t2")
+
+        assert first > 0
+        # Only the changed output, its parent dicts and the root are new
+        assert 0 < second < first
+        assert store.put("cp-3", "job", "s3", make_state(2, {"outline": "o", "draft": "e"}), "t3") == 0
+
+    def test_list_and_latest_do_not_read_payloads(self, manager):
+        ids = [manager.save("job-1", f"step{i}", make_state(i, {"a": str(i)})) for i in range(3)]
+        manager.save("job-2", "other", {"x": 1})
+
+        with patch("builtins.open", side_effect=AssertionError("payload opened")):
+            listed = manager.list("job-1")
+            latest = manager.get_latest_checkpoint("job-1")
+
+        assert [c.checkpoint_id for c in listed] == ids
+        assert [c.step_name for c in listed] == ["step0", "step1", "step2"]
+        assert latest == ids[-1]
+        assert manager.find_job(ids[0]) == "job-1"
+
+    def test_cleanup_removes_orphaned_blobs(self, manager):
+        for i in range(5):
+            manager.save("job-1", f"step{i}", make_state(i, {"shared": "s", f"own{i}": str(i)}))
+        store = manager.checkpoint_store
+        blobs_before = store.get_stats()["blobs"]
+
+        assert manager.cleanup("job-1", keep_last=2) == 3
+        remaining = manager.list("job-1")
+        assert [c.step_name for c in remaining] == ["step3", "step4"]
+        restored = manager.restore("job-1", remaining[0].checkpoint_id)
+        assert restored["outputs"]["shared"]["content"].startswith("s-0 s-1")
+
+        stats = store.get_stats()
+        assert stats["blobs"] < blobs_before
+        assert len(list(store.blob_dir.rglob("*.z"))) == stats["blobs"]
+
+        assert manager.cleanup_job("job-1") == 2
+        assert store.get_stats()["blobs"] == 0
+        assert not list(store.blob_dir.rglob("*.z"))
+
+    def test_concurrent_delete_keeps_blobs_a_put_reuses(self, tmp_path):
+        # Two handles on one directory stand in for two worker processes
+        writer, cleaner = CheckpointStore(tmp_path), CheckpointStore(tmp_path)
+        state = make_state(1, {"draft": "d"})
+        cleaner.put("cp-old", "job", "s1", state, "t1")
+        put_blob = CheckpointStore._put_blob
+        racers = []
+
+        def put_blob_then_delete(store, node, written):
+            blob_hash = put_blob(store, node, written)
+            if not racers:
+                # The blob already exists on disk; delete its only checkpoint
+                # (unlinking the blob) before the put takes the write lock
+                racers.append(threading.Thread(target=cleaner.delete, args=(["cp-old"],)))
+                racers[0].start()
+                racers[0].join(5)
+            return blob_hash
+
+        with patch.object(CheckpointStore, "_put_blob", put_blob_then_delete):
+            writer.put("cp-new", "job", "s1", state, "t1")
+        assert not racers[0].is_alive()
+
+        assert writer.get("cp-new")["state"] == state
+        assert [c["checkpoint_id"] for c in writer.list("job")] == ["cp-new"]
+
+    def test_restore_and_delete_check_job(self, manager):
+        checkpoint_id = manager.save("job-1", "draft", {"a": 1})
+
+        with pytest.raises(FileNotFoundError):
+            manager.restore("job-2", checkpoint_id)
+        assert manager.delete("job-2", checkpoint_id) is False
+        assert manager.delete("job-1", checkpoint_id) is True
+        assert manager.load(checkpoint_id) is None
+
+    def test_legacy_checkpoint_files_are_imported(self, tmp_path):
+        root = tmp_path / "checkpoints"
+        job_dir = root / "old-job"
+        job_dir.mkdir(parents=True)
+        with open(job_dir / "draft_1.json", "w") as f:
+            json.dump({
+                "checkpoint_id": "draft_1",
+                "job_id": "old-job",
+                "step_name": "draft",
+                "state": {"content": "hello"},
+                "timestamp": "2025-01-01T00:00:00+00:00",
+                "workflow_version": "1.0"
+            }, f)
+
+        manager = CheckpointManager(storage_dir=root)
+        assert [c.checkpoint_id for c in manager.list("old-job")] == ["draft_1"]
+        assert manager.restore("old-job", "draft_1") == {"content": "hello"}
+        assert not (job_dir / "draft_1.json").exists()
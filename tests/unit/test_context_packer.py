@@ -0,0 +1,69 @@
+"""Unit tests for token-budgeted context packing."""
+
+from src.utils.context_packer import ContextPacker, count_tokens, normalize_whitespace, trim_to_tokens
+
+
+def paragraph(topic, sentences=6):
+    """Distinct prose about topic (vocabulary varies per topic so chunks are not near-duplicates)."""
+    return " ".join(f"{topic.capitalize()} note {topic}{i} covers {topic} detail {i * 7}." for i in range(sentences))
+
+
+class TestTokenHelpers:
+    """Token estimate, whitespace compression and trimming."""
+
+    def test_count_tokens_estimate(self):
+        assert count_tokens("") == 0
+        assert count_tokens("hello world") == 4
+        assert count_tokens("a, b.") == 4
+
+    def test_normalize_keeps_code_indentation(self):
+        text = "Intro   text\n\n\n\nmore    text\n    indented    code\n"
+        assert normalize_whitespace(text) == "Intro text\n\nmore text\n    indented    code"
+
+    def test_trim_prefers_sentence_boundary(self):
+        text = "First sentence here. Second sentence is longer than the first one. Third."
+        trimmed = trim_to_tokens(text, 20)
+        assert trimmed == "First sentence here. Second sentence is longer than the first one."
+        assert count_tokens(trim_to_tokens(text, 3)) <= 3
+
+
+class TestContextPacker:
+    """Relevance ranking, dedup and budget enforcement."""
+
+    def test_budget_is_never_exceeded(self):
+        chunks = [paragraph(f"topic{i}", sentences=20) for i in range(10)]
+        packed = ContextPacker(budget_tokens=300).pack(chunks, query="topic3")
+
+        assert packed.tokens <= 300
+        assert count_tokens(packed.text) <= 300
+        assert packed.usage["over_budget"] > 0
+
+    def test_relevant_chunks_win_and_keep_original_order(self):
+        chunks = [paragraph("caching"), paragraph("logging"), paragraph("serialization"), paragraph("cache eviction")]
+        budget = count_tokens(chunks[0]) + count_tokens(chunks[3]) + 5
+        packed = ContextPacker(budget_tokens=budget).pack(chunks, query="caching cache eviction")
+
+        assert [chunk.index for chunk in packed.chunks] == [0, 3]
+        assert packed.text.startswith(chunks[0])
+
+    def test_near_duplicates_are_dropped(self):
+        base = paragraph("connection pooling")
+        chunks = [base, base, base.replace("detail 35", "detail thirty-five"), paragraph("retries")]
+        packed = ContextPacker(budget_tokens=2000).pack(chunks)
+
+        assert packed.usage["duplicates"] == 2
+        assert len(packed.chunks) == 2
+
+    def test_oversized_chunk_is_trimmed(self):
+        packed = ContextPacker(budget_tokens=1000, max_chunk_tokens=50).pack([paragraph("threads", sentences=30)])
+
+        chunk = packed.chunks[0]
+        assert chunk.trimmed
+        assert chunk.tokens <= 50
+        assert chunk.text.endswith(".")
+
+    def test_budget_from_perf_limits(self):
+        limits = {"max_tokens_per_agent": 4000, "max_context_size": 16000, "context_budgets": {"Writer": 1200}}
+        assert ContextPacker.for_limits(limits, "Writer", reserved_tokens=200).budget_tokens == 1000
+        assert ContextPacker.for_limits(limits, "Other", reserved_tokens=500).budget_tokens == 3500
+        assert ContextPacker.for_limits({"max_context_size": 100}, "Other").budget_tokens == 100
@@ -0,0 +1,123 @@
+"""Unit tests for the warm, length-batched embedding runtime."""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.core.config import Config
+from src.services import embedding_runtime
+from src.services.embedding_runtime import (
+    EmbeddingRuntime,
+    check_compatibility,
+    get_embedding_runtime,
+    plan_batches,
+    preload_embedding_runtime,
+)
+
+
+class FakeModel:
+    """Deterministic stand-in for SentenceTransformer; ``noise`` mimics a quantized export."""
+
+    instances = []
+
+    def __init__(self, model_name=None, device=None, backend="torch", noise=0.0, **kwargs):
+        self.backend = backend
+        self.noise = noise
+        self.batch_sizes = []
+        self.max_seq_length = 256
+        FakeModel.instances.append(self)
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=False, **kwargs):
+        self.batch_sizes.append(len(texts))
+        vectors = []
+        for text in texts:
+            rng = np.random.default_rng(sum(map(ord, text)))
+            vector = rng.standard_normal(16) + self.noise * np.random.default_rng(len(text)).standard_normal(16)
+            vectors.append(vector / np.linalg.norm(vector))
+        return np.array(vectors, dtype=np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return 16
+
+
+@pytest.fixture(autouse=True)
+def fresh_runtimes():
+    FakeModel.instances = []
+    embedding_runtime.reset_embedding_runtimes()
+    yield
+    embedding_runtime.reset_embedding_runtimes()
+
+
+def fake_factory(onnx_noise):
+    def create(model_name, device=None, backend="torch", **kwargs):
+        return FakeModel(model_name, device, backend, noise=onnx_noise if backend == "onnx" else 0.0)
+    return create
+
+
+class TestBatchPlanning:
+    """Batch sizes follow text length under the token budget."""
+
+    def test_short_texts_share_batches_long_texts_split(self):
+        texts = ["short"] * 40 + ["x" * 2000] * 6
+
+        batches = plan_batches(texts, token_budget=1024, max_batch=64, max_seq_length=256)
+
+        assert sorted(i for batch in batches for i in batch) == list(range(len(texts)))
+        assert len(batches[0]) == 40
+        assert all(len(batch) <= 4 for batch in batches[1:])
+
+    def test_encode_keeps_input_order_and_reports_throughput(self):
+        texts = ["a much longer text about saving documents " * 20, "short", "medium length text"]
+        with patch.object(embedding_runtime, "SentenceTransformer", fake_factory(0.0)), \
+                patch.object(embedding_runtime, "SENTENCE_TRANSFORMERS_AVAILABLE", True):
+            runtime = EmbeddingRuntime("m", token_budget=64)
+            vectors = runtime.encode(texts)
+            expected = FakeModel().encode(texts)
+
+        np.testing.assert_allclose(vectors, expected)
+        stats = runtime.get_stats()
+        assert stats["texts"] == 3
+        assert stats["batches"] > 1
+        assert stats["embeddings_per_sec"] > 0
+
+
+class TestCompatibility:
+    """Optimized backends are only used when their vectors match the full model."""
+
+    def test_tolerance(self):
+        reference = np.eye(3, dtype=np.float32)
+        close = reference + 0.01
+        assert check_compatibility(reference, close)["compatible"]
+        assert not check_compatibility(reference, np.roll(reference, 1, axis=0))["compatible"]
+        assert not check_compatibility(reference, reference[:, :2])["compatible"]
+
+    @pytest.mark.parametrize("noise, expected_backend", [(0.01, "onnx"), (5.0, "torch")])
+    def test_drifting_backend_falls_back_to_torch(self, noise, expected_backend):
+        with patch.object(embedding_runtime, "SentenceTransformer", fake_factory(noise)), \
+                patch.object(embedding_runtime, "SENTENCE_TRANSFORMERS_AVAILABLE", True):
+            runtime = EmbeddingRuntime("m", backend="onnx").load()
+
+        assert runtime.active_backend == expected_backend
+        assert runtime.model.backend == expected_backend
+        assert runtime.get_stats()["compatibility"]["min_cosine"] <= 1.0
+
+
+class TestSharedRuntime:
+    """One runtime per model/device/backend, preloaded at startup."""
+
+    def test_runtime_is_shared_and_preloaded(self):
+        config = Config()
+        config.device = "cpu"
+        with patch.object(embedding_runtime, "SentenceTransformer", fake_factory(0.0)), \
+                patch.object(embedding_runtime, "SENTENCE_TRANSFORMERS_AVAILABLE", True):
+            runtime = get_embedding_runtime(config)
+            assert get_embedding_runtime(config, "all-MiniLM-L6-v2") is runtime
+
+            preload_embedding_runtime(config).join(timeout=5)
+            assert runtime.loaded
+            assert len(FakeModel.instances) == 1
+
+            config.embedding_preload = False
+            embedding_runtime.reset_embedding_runtimes()
+            assert preload_embedding_runtime(config) is None
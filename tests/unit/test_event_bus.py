@@ -298,4 +298,133 @@ class TestEventBus:
 
         assert self.bus._capability_registry == mock_registry
         assert self.bus._mesh_observer == mock_observer
-        assert self.bus.enable_mesh == True
\ No newline at end of file
+        assert self.bus.enable_mesh == True
+
+class TestEventBusDispatch:
+    """Test queued dispatch, drop policies and metrics."""
+
+    def setup_method(self):
+        self.bus = EventBus()
+
+    def teardown_method(self):
+        self.bus.close()
+
+    def _event(self, i=0):
+        return AgentEvent(event_type="test_event", source_agent="agent", correlation_id=f"corr-{i}", data={"i": i})
+
+    def test_history_is_bounded_ring_buffer(self):
+        bus = EventBus(max_history=3)
+        for i in range(10):
+            bus.publish(self._event(i))
+
+        history = bus.get_history()
+        assert [e.data["i"] for e in history] == [9, 8, 7]
+
+    def test_queued_subscriber_does_not_block_publisher(self):
+        import threading
+        import time
+
+        release = threading.Event()
+        received = []
+
+        def slow_handler(event):
+            release.wait(timeout=5)
+            received.append(event.data["i"])
+
+        self.bus.subscribe("test_event", slow_handler, dispatch="queued")
+
+        start = time.perf_counter()
+        for i in range(5):
+            self.bus.publish(self._event(i))
+        assert time.perf_counter() - start < 1.0
+
+        release.set()
+        deadline = time.time() + 5
+        while len(received) < 5 and time.time() < deadline:
+            time.sleep(0.01)
+        assert received == [0, 1, 2, 3, 4]
+
+    def test_drop_oldest_keeps_latest_events(self):
+        import threading
+        import time
+
+        gate = threading.Event()
+        received = []
+
+        def handler(event):
+            gate.wait(timeout=5)
+            received.append(event.data["i"])
+
+        self.bus.subscribe("test_event", handler, dispatch="queued", queue_size=2, drop_policy="drop_oldest")
+        self.bus.publish(self._event(0))
+        time.sleep(0.05)  # worker picks up event 0 and blocks on the gate
+        for i in range(1, 6):
+            self.bus.publish(self._event(i))
+
+        gate.set()
+        deadline = time.time() + 5
+        while len(received) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert received == [0, 4, 5]
+        stats = self.bus.get_metrics()["subscribers"][0]
+        assert stats["dropped"] == 3
+
+    def test_drop_newest_rejects_incoming_events(self):
+        import threading
+        import time
+
+        gate = threading.Event()
+        received = []
+
+        def handler(event):
+            gate.wait(timeout=5)
+            received.append(event.data["i"])
+
+        self.bus.subscribe("test_event", handler, dispatch="queued", queue_size=2, drop_policy="drop_newest")
+        self.bus.publish(self._event(0))
+        time.sleep(0.05)
+        for i in range(1, 6):
+            self.bus.publish(self._event(i))
+
+        gate.set()
+        deadline = time.time() + 5
+        while len(received) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert received == [0, 1, 2]
+        assert self.bus.get_metrics()["dropped"] == 3
+
+    def test_invalid_dispatch_options_rejected(self):
+        with pytest.raises(ValueError):
+            self.bus.subscribe("test_event", MagicMock(), dispatch="parallel")
+        with pytest.raises(ValueError):
+            self.bus.subscribe("test_event", MagicMock(), dispatch="queued", drop_policy="maybe")
+        assert self.bus.get_subscriber_count("test_event") == 0
+
+    def test_publish_metrics(self):
+        handler = MagicMock(side_effect=[None, RuntimeError("boom"), None])
+        self.bus.subscribe("test_event", handler)
+        for i in range(3):
+            self.bus.publish(self._event(i))
+
+        metrics = self.bus.get_metrics()
+        assert metrics["published"] == 3
+        assert metrics["history_size"] == 3
+        assert metrics["publish_latency_ms"]["max"] >= metrics["publish_latency_ms"]["p50"] >= 0
+        assert metrics["throughput_per_sec"] > 0
+        assert metrics["subscribers"][0]["delivered"] == 2
+        assert metrics["subscribers"][0]["errors"] == 1
+
+    def test_subscribe_during_publish_does_not_affect_snapshot(self):
+        late = MagicMock()
+
+        def handler(event):
+            self.bus.subscribe("test_event", late)
+
+        self.bus.subscribe("test_event", handler)
+        self.bus.publish(self._event(0))
+        late.assert_not_called()
+
+        self.bus.publish(self._event(1))
+        late.assert_called_once()
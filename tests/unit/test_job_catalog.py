@@ -0,0 +1,113 @@
+"""Unit tests for the job catalog index behind JobStorage listing."""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from src.orchestration.job_state import JobMetadata, JobState, JobStatus
+from src.orchestration.job_storage import JobStorage
+
+
+def make_job(job_id, status=JobStatus.COMPLETED, created_at=None, workflow_id="blog"):
+    return JobState(
+        metadata=JobMetadata(
+            job_id=job_id,
+            workflow_id=workflow_id,
+            status=status,
+            created_at=created_at or datetime.now()
+        ),
+        outputs={"content": "x" * 1000}
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return JobStorage(base_dir=tmp_path / "jobs")
+
+
+@pytest.fixture
+def populated(storage):
+    base = datetime(2025, 1, 1)
+    for i in range(30):
+        status = JobStatus.FAILED if i % 3 == 0 else JobStatus.COMPLETED
+        storage.save_job(make_job(f"job-{i:02d}", status, base + timedelta(hours=i)))
+    return storage
+
+
+class TestJobCatalog:
+    """Listing, filtering and counts come from the catalog."""
+
+    def test_list_does_not_open_state_files(self, populated):
+        with patch("builtins.open", side_effect=AssertionError("state file opened")):
+            jobs = populated.list_jobs(limit=5)
+            count = populated.count_jobs(status=JobStatus.FAILED)
+
+        assert [j.job_id for j in jobs] == ["job-29", "job-28", "job-27", "job-26", "job-25"]
+        assert count == 10
+
+    def test_filters_and_pagination(self, populated):
+        page = populated.list_jobs(status=JobStatus.FAILED, limit=3, offset=3)
+        assert [j.job_id for j in page] == ["job-18", "job-15", "job-12"]
+
+        window = populated.list_jobs(
+            created_after=datetime(2025, 1, 1, 10),
+            created_before=datetime(2025, 1, 1, 13)
+        )
+        assert [j.job_id for j in window] == ["job-12", "job-11", "job-10"]
+        assert populated.count_jobs(workflow_id="other") == 0
+
+    def test_save_updates_entry(self, populated):
+        job = populated.load_job("job-01")
+        job.metadata.status = JobStatus.FAILED
+        populated.save_job(job)
+
+        assert populated.count_jobs(status=JobStatus.FAILED) == 11
+        assert populated.count_jobs() == 30
+
+    def test_archive_delete_and_stats(self, populated):
+        assert populated.archive_job("job-05")
+        assert populated.count_jobs() == 29
+        assert populated.count_jobs(include_archived=True) == 30
+        assert populated.list_jobs(status=JobStatus.ARCHIVED, include_archived=True)[0].job_id == "job-05"
+        assert populated.get_storage_stats()["status_counts"]["archived"] == 1
+
+        assert populated.delete_job("job-07")
+        assert populated.count_jobs(include_archived=True) == 29
+
+    def test_cleanup_old_archives(self, populated):
+        populated.archive_job("job-05")
+        job = populated.load_job("job-05")
+        job.metadata.archived_at = datetime.now() - timedelta(days=60)
+        populated.save_job(job)
+
+        assert populated.cleanup_old_archives(days=30) == 1
+        assert populated.load_job("job-05") is None
+        assert populated.count_jobs(include_archived=True) == 29
+
+    def test_existing_state_files_are_indexed_on_first_open(self, tmp_path):
+        base = tmp_path / "legacy"
+        job_dir = base / "old-job"
+        job_dir.mkdir(parents=True)
+        with open(job_dir / "state.json", "w") as f:
+            json.dump(make_job("old-job").to_dict(), f)
+
+        storage = JobStorage(base_dir=base)
+        assert [j.job_id for j in storage.list_jobs()] == ["old-job"]
+
+        # Reopening an existing catalog does not rescan
+        with patch.object(JobStorage, "rebuild_catalog") as rebuild:
+            JobStorage(base_dir=base)
+        rebuild.assert_not_called()
+
+    def test_failed_catalog_write_keeps_save_and_rebuilds(self, populated):
+        job = populated.load_job("job-01")
+        job.metadata.status = JobStatus.FAILED
+        with patch.object(populated.catalog, "upsert", side_effect=sqlite3.OperationalError("locked")):
+            populated.save_job(job)
+
+        assert populated.load_job("job-01").metadata.status == JobStatus.FAILED
+        assert populated.count_jobs(status=JobStatus.FAILED) == 11
+        assert not populated._catalog_stale
@@ -0,0 +1,196 @@
+"""Unit tests for the SQLite-backed shared job queue with worker leases."""
+
+import queue
+import sqlite3
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.core.config import Config
+from src.orchestration.execution_plan import ExecutionPlan, ExecutionStep
+from src.orchestration.job_execution_engine import JobExecutionEngine
+from src.orchestration.job_lease_queue import SharedJobQueue
+from src.orchestration.job_state import JobPriority, JobStatus
+from src.utils.metrics_store import MetricsStore
+
+
+def make_queue(tmp_path, name, **kwargs):
+    kwargs.setdefault("reserved_workers", 0)
+    kwargs.setdefault("poll_interval", 0.02)
+    return SharedJobQueue(tmp_path / "queue.db", worker_id=name, metrics_store=MetricsStore(), **kwargs)
+
+
+@pytest.fixture
+def queues(tmp_path):
+    created = [make_queue(tmp_path, "node-a", max_workers=4), make_queue(tmp_path, "node-b", max_workers=4)]
+    yield created
+    for q in created:
+        q.close()
+
+
+class TestSharedJobQueue:
+    """Leased dispatch across processes sharing one queue file."""
+
+    def test_workers_on_two_nodes_never_share_a_job(self, queues):
+        for i in range(30):
+            queues[0].put(f"job-{i}", "blog")
+        queues[1].put("job-0", "blog")  # duplicate submit is ignored
+
+        taken, lock = [], threading.Lock()
+
+        def worker(q):
+            while True:
+                try:
+                    job_id = q.get(timeout=0.2)
+                except queue.Empty:
+                    return
+                with lock:
+                    taken.append(job_id)
+                q.task_done(job_id)
+
+        threads = [threading.Thread(target=worker, args=(q,)) for q in queues for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        assert sorted(taken) == sorted(f"job-{i}" for i in range(30))
+        assert queues[0].qsize() == 0
+
+    def test_priority_and_tenant_fairness(self, tmp_path):
+        q = make_queue(tmp_path, "node-a", max_workers=1)
+        for i in range(2):
+            q.put(f"a-{i}", "blog", JobPriority.BATCH, tenant="a")
+            q.put(f"b-{i}", "blog", JobPriority.BATCH, tenant="b")
+        q.put("ui", "blog", JobPriority.INTERACTIVE)
+
+        order = []
+        for _ in range(5):
+            job_id = q.get(timeout=0.5)
+            order.append(job_id)
+            q.task_done(job_id)
+        q.close()
+
+        assert order == ["ui", "a-0", "b-0", "a-1", "b-1"]
+
+    def test_dead_worker_lease_is_reclaimed(self, tmp_path):
+        dead = make_queue(tmp_path, "dead", lease_seconds=0.2)
+        alive = make_queue(tmp_path, "alive", lease_seconds=0.2)
+        lost = []
+        dead.on_lease_lost = lost.append
+        dead.put("job-1", "blog")
+
+        assert dead.get(timeout=0.5) == "job-1"
+        dead.close()  # stops heartbeats, as if the process died
+        with pytest.raises(queue.Empty):
+            alive.get(timeout=0.05)
+
+        time.sleep(0.3)
+        assert alive.get(timeout=0.5) == "job-1"
+        assert alive.get_stats()["reclaimed"] == 1
+
+        # The old owner learns it lost the job and cannot release the new lease
+        assert dead.heartbeat() == ["job-1"]
+        assert lost == ["job-1"]
+        dead.task_done("job-1")
+        assert alive.get_stats()["inflight"]["normal"] == 1
+        alive.close()
+
+    def test_job_failed_after_max_attempts(self, tmp_path):
+        q = make_queue(tmp_path, "node-a", lease_seconds=0.05, max_attempts=2)
+        failed = []
+        q.on_attempts_exhausted = lambda job_id, attempts: failed.append((job_id, attempts))
+        q.put("poison", "blog")
+
+        for _ in range(2):
+            assert q.get(timeout=0.5) == "poison"
+            q._held.clear()  # the worker died without releasing the lease
+            time.sleep(0.1)
+        with pytest.raises(queue.Empty):
+            q.get(timeout=0.1)
+
+        assert failed == [("poison", 2)]
+        assert q.get_stats()["failed"] == 1
+        q.put("poison", "blog")  # an explicit resubmit runs again
+        assert q.get(timeout=0.5) == "poison"
+        q.close()
+
+    def test_idle_poll_and_stats_do_not_take_write_lock(self, tmp_path):
+        q = make_queue(tmp_path, "node-a")
+        q.start()
+        q._heartbeat_stop.set()
+        writer = sqlite3.connect(str(tmp_path / "queue.db"), isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")  # another process holds the write lock
+        try:
+            started = time.monotonic()
+            with pytest.raises(queue.Empty):
+                q.get(timeout=0.1)
+            assert q.qsize() == 0
+            assert q.get_stats()["queue_depth"] == 0
+            assert time.monotonic() - started < 2
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+        q.close()
+
+    def test_workflow_limit_applies_across_nodes(self, tmp_path):
+        a = make_queue(tmp_path, "a", max_inflight_per_workflow=1)
+        b = make_queue(tmp_path, "b", max_inflight_per_workflow=1)
+        a.put("slow-1", "slow")
+        a.put("slow-2", "slow")
+
+        assert a.get(timeout=0.5) == "slow-1"
+        with pytest.raises(queue.Empty):
+            b.get(timeout=0.1)
+        a.task_done("slow-1")
+        assert b.get(timeout=0.5) == "slow-2"
+        a.close()
+        b.close()
+
+
+def make_engine(tmp_path):
+    config = Config()
+    config.job_queue = "shared"
+    engine = JobExecutionEngine(
+        compiler=Mock(),
+        registry=Mock(),
+        config=config,
+        storage_dir=tmp_path / "jobs",
+        checkpoint_config={"storage_path": str(tmp_path / "checkpoints")}
+    )
+    agent = Mock(spec=["run"])
+    agent.run.return_value = {"content": "done"}
+    engine.registry.get_agent.return_value = agent
+    engine.compiler.compile.return_value = ExecutionPlan(
+        workflow_id="wf", steps=[ExecutionStep(agent_id="writer", retry=0)]
+    )
+    return engine
+
+
+class TestEngineSharedQueue:
+    """Engines sharing a jobs directory run each job once."""
+
+    def test_job_submitted_on_one_node_runs_on_another(self, tmp_path):
+        node_a, node_b = make_engine(tmp_path), make_engine(tmp_path)
+        assert isinstance(node_a.scheduler, SharedJobQueue)
+        job_id = node_a.submit_job("wf", {"topic": "t"})
+
+        assert node_b.scheduler.get(timeout=1) == job_id
+        node_b._execute_job(job_id)
+        node_b.scheduler.task_done(job_id)
+
+        assert node_a.storage.load_job(job_id).metadata.status == JobStatus.COMPLETED
+        # The submitting node reports the other node's progress, not its stale copy
+        assert node_a.get_job_status(job_id).status == JobStatus.COMPLETED
+        assert node_a.get_job_state(job_id).outputs == node_b.get_job_state(job_id).outputs
+        assert job_id not in node_a._pending_jobs
+        with pytest.raises(queue.Empty):
+            node_a.scheduler.get(timeout=0.1)
+
+        # A stale re-queue of a finished job is skipped, not re-run
+        node_a._execute_job(job_id)
+        assert node_a.registry.get_agent.return_value.run.call_count == 0
+        node_a.scheduler.close()
+        node_b.scheduler.close()
@@ -0,0 +1,103 @@
+"""Unit tests for the priority / fair-share job scheduler."""
+
+import queue
+from datetime import datetime
+
+import pytest
+
+from src.orchestration.job_scheduler import JobScheduler
+from src.orchestration.job_state import JobMetadata, JobPriority, JobStatus
+from src.utils.metrics_store import MetricsStore
+
+
+@pytest.fixture
+def scheduler():
+    return JobScheduler(max_workers=3, max_inflight_per_workflow=None, metrics_store=MetricsStore())
+
+
+def drain(scheduler, n):
+    return [scheduler.get(timeout=0.05) for _ in range(n)]
+
+
+class TestJobScheduler:
+    """Priority classes, reserved capacity, tenant fairness and workflow limits."""
+
+    def test_interactive_jumps_queued_batch(self, scheduler):
+        for i in range(10):
+            scheduler.put(f"batch-{i}", "blog", JobPriority.BATCH, tenant="b1")
+        scheduler.put("ui", "blog", JobPriority.INTERACTIVE)
+
+        assert scheduler.get(timeout=0.05) == "ui"
+
+    def test_batch_leaves_reserved_worker_free(self, scheduler):
+        for i in range(10):
+            scheduler.put(f"batch-{i}", "blog", JobPriority.BATCH, tenant="b1")
+
+        assert drain(scheduler, 2) == ["batch-0", "batch-1"]
+        with pytest.raises(queue.Empty):
+            scheduler.get(timeout=0.05)
+
+        # An interactive job starts on the reserved worker immediately
+        scheduler.put("ui", "blog", JobPriority.INTERACTIVE)
+        assert scheduler.get(timeout=0.05) == "ui"
+
+        scheduler.task_done("batch-0")
+        assert scheduler.get(timeout=0.05) == "batch-2"
+
+    def test_tenants_share_a_class_fairly(self):
+        scheduler = JobScheduler(max_workers=1, reserved_workers=0, metrics_store=MetricsStore())
+        for i in range(3):
+            scheduler.put(f"a-{i}", "blog", JobPriority.BATCH, tenant="a")
+        for i in range(3):
+            scheduler.put(f"b-{i}", "blog", JobPriority.BATCH, tenant="b")
+
+        order = []
+        for _ in range(6):
+            job_id = scheduler.get(timeout=0.05)
+            order.append(job_id)
+            scheduler.task_done(job_id)
+
+        assert order == ["a-0", "b-0", "a-1", "b-1", "a-2", "b-2"]
+
+    def test_workflow_inflight_limit(self):
+        scheduler = JobScheduler(
+            max_workers=4, reserved_workers=0, max_inflight_per_workflow=1, metrics_store=MetricsStore()
+        )
+        scheduler.put("slow-1", "slow", tenant="t")
+        scheduler.put("slow-2", "slow", tenant="t")
+        scheduler.put("fast-1", "fast", tenant="t")
+
+        assert drain(scheduler, 2) == ["slow-1", "fast-1"]
+        with pytest.raises(queue.Empty):
+            scheduler.get(timeout=0.05)
+        scheduler.task_done("slow-1")
+        assert scheduler.get(timeout=0.05) == "slow-2"
+
+    def test_discard_duplicates_and_stats(self, scheduler):
+        scheduler.put("a", "blog")
+        scheduler.put("a", "blog")
+        scheduler.put("b", "blog", JobPriority.BATCH)
+        assert scheduler.qsize() == 2
+        assert scheduler.discard("b")
+        assert not scheduler.discard("b")
+
+        assert scheduler.get(timeout=0.05) == "a"
+        stats = scheduler.get_stats()
+        assert stats["queue_depth"] == 0
+        assert stats["inflight"]["normal"] == 1
+        assert stats["dispatched"]["normal"] == 1
+        assert stats["wait_ms"]["normal"]["count"] == 1
+
+    def test_priority_and_tenant_persist_with_metadata(self):
+        metadata = JobMetadata(
+            job_id="j", workflow_id="blog", status=JobStatus.PENDING,
+            created_at=datetime.now(),
+            priority=JobPriority.BATCH, tenant="batch-1"
+        )
+        restored = JobMetadata.from_dict(metadata.to_dict())
+        assert restored.priority == JobPriority.BATCH
+        assert restored.tenant == "batch-1"
+
+        legacy = metadata.to_dict()
+        del legacy["priority"], legacy["tenant"]
+        assert JobMetadata.from_dict(legacy).priority == JobPriority.NORMAL
@@ -0,0 +1,100 @@
+"""Unit tests for the BM25 lexical index and hybrid search."""
+
+from unittest.mock import Mock
+
+from src.core.config import Config, DatabaseConfig
+from src.services.lexical_index import LexicalIndex, hybrid_search, is_confident, tokenize
+from src.services.services import DatabaseService
+
+DOCS = {
+    "save": "Call Document.Save with PdfSaveOptions to write the PDF to a stream.",
+    "load": "Use Document constructor to load an existing file from disk or a stream.",
+    "error": "The error ERR_FONT_NOT_FOUND means the font folder is not configured.",
+    "prose": "Converting documents is easy, just pick an output format and go.",
+}
+
+
+def make_index(tmp_path):
+    index = LexicalIndex(tmp_path / "lexical_index.db")
+    index.add("kb", list(DOCS), list(DOCS.values()), [{"source": "docs"}] * len(DOCS))
+    return index
+
+
+class TestLexicalIndex:
+    """Tokenizing, BM25 ranking, incremental updates and persistence."""
+
+    def test_tokenize_splits_identifiers(self):
+        assert tokenize("Document.Save(PdfSaveOptions)") == [
+            "document.save", "document", "save", "pdfsaveoptions", "pdf", "save", "options"
+        ]
+        assert tokenize("ERR_FONT_NOT_FOUND")[:2] == ["err_font_not_found", "err"]
+
+    def test_exact_api_names_and_error_strings_rank_first(self, tmp_path):
+        index = make_index(tmp_path)
+
+        assert index.search("kb", "PdfSaveOptions", k=2)[0].id == "save"
+        hits = index.search("kb", "ERR_FONT_NOT_FOUND", k=2)
+        assert hits[0].id == "error"
+        assert hits[0].coverage == 1.0
+        assert index.search("kb", "PdfSaveOptions", k=2, where={"source": "web"}) == []
+
+    def test_incremental_updates_persist(self, tmp_path):
+        index = make_index(tmp_path)
+        index.delete("kb", ["save"])
+        index.add("kb", ["load"], ["Open files with PdfSaveOptions-free loaders."])
+
+        reopened = LexicalIndex(tmp_path / "lexical_index.db")
+        assert reopened.count("kb") == 3
+        assert [hit.id for hit in reopened.search("kb", "PdfSaveOptions")] == ["load"]
+        reopened.clear("kb")
+        assert reopened.count("kb") == 0
+
+
+class TestHybridSearch:
+    """Confident lexical hits skip the embedding pass; otherwise rankings are fused."""
+
+    def test_confident_lexical_hits_skip_vector_search(self, tmp_path):
+        index = make_index(tmp_path)
+        vector_search = Mock(return_value=[])
+
+        results = hybrid_search(index, "kb", "ERR_FONT_NOT_FOUND", 1, vector_search)
+
+        vector_search.assert_not_called()
+        assert results[0]["id"] == "error"
+        assert results[0]["source"] == "lexical"
+
+    def test_weak_lexical_hits_are_fused_with_vector_results(self, tmp_path):
+        index = make_index(tmp_path)
+        vector_search = Mock(return_value=[
+            {"id": "prose", "content": DOCS["prose"], "metadata": {}, "score": 0.1},
+            {"id": "save", "content": DOCS["save"], "metadata": {}, "score": 0.3},
+        ])
+
+        results = hybrid_search(index, "kb", "how do I export a pdf file", 3, vector_search)
+
+        vector_search.assert_called_once()
+        by_id = {result["id"]: result for result in results}
+        assert results[0]["id"] == "save"
+        assert by_id["save"]["source"] == "hybrid"
+        assert by_id["prose"]["distance"] == 0.1
+
+    def test_is_confident_needs_k_covering_hits(self, tmp_path):
+        hits = make_index(tmp_path).search("kb", "stream", k=5)
+        assert is_confident(hits, 2)
+        assert not is_confident(hits, 3)
+
+
+class TestDatabaseServiceSearch:
+    """DatabaseService indexes on ingestion and backfills older collections."""
+
+    def test_ingested_documents_are_searchable(self, tmp_path):
+        config = Config()
+        config.database = DatabaseConfig(chroma_db_path=str(tmp_path / "chroma"), collection_name="kb")
+        service = DatabaseService(config)
+        service.add_documents(list(DOCS.values()), [{"source": "docs"}] * len(DOCS), ids=list(DOCS))
+
+        assert service.search("PdfSaveOptions", k=1)[0]["id"] == "save"
+
+        service.vectorstore.drop_lexical("kb")
+        assert service.search("ERR_FONT_NOT_FOUND", k=1)[0]["id"] == "error"
+        assert service.vectorstore.lexical_index.count("kb") == len(DOCS)
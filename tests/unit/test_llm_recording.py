@@ -0,0 +1,116 @@
+"""Unit tests for LLM call recording and offline replay."""
+
+import json
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.core.config import Config
+from src.services.llm_recording import LLMRecorder, ReplayMissError, ReplayProvider, request_key
+from src.services.services import LLMService
+
+
+def answer(topic):
+    """Response long and prose-like enough to pass LLM response validation."""
+    lines = [f"This paragraph explains {topic} in practical terms, with enough detail to be useful, line {i}." for i in range(20)]
+    return "\n\n".join(lines)
+
+
+def make_config(tmp_path, name, **settings):
+    config = Config()
+    config.cache_dir = str(tmp_path / name)
+    config.gemini_api_key = "test-key"
+    for key, value in settings.items():
+        setattr(config, key, value)
+    return config
+
+
+def write_recording(path, entries):
+    recorder = LLMRecorder(path)
+    for prompt, response, latency in entries:
+        recorder.record("GEMINI", prompt, response, latency, model=None, temperature=0.7, content_type="section")
+    return path
+
+
+class TestReplayProvider:
+    """Matching, cycling, stand-ins and latency modes."""
+
+    def test_repeated_prompt_replays_responses_in_turn(self, tmp_path):
+        path = write_recording(tmp_path / "rec.jsonl", [("p1", "first", 0.1), ("p1", "second", 0.2), ("p2", "other", 0.3)])
+        replay = ReplayProvider(path, latency_mode="none")
+
+        assert [replay.generate("p1", None, 0.7) for _ in range(3)] == ["first", "second", "first"]
+        assert replay.get_stats()["hits"] == 3
+
+    def test_unrecorded_prompt_gets_deterministic_standin(self, tmp_path):
+        path = write_recording(tmp_path / "rec.jsonl", [("p1", "first", 0.1), ("p2", "other", 0.3)])
+        replay = ReplayProvider(path, latency_mode="none")
+
+        standin = replay.generate("never recorded", None, 0.7, content_type="section")
+        assert standin in ("first", "other")
+        assert replay.generate("never recorded", None, 0.7, content_type="section") == standin
+        assert replay.misses == 2
+
+        with pytest.raises(ReplayMissError):
+            ReplayProvider(path, latency_mode="none", strict=True).generate("never recorded", None, 0.7)
+
+    def test_latency_modes(self, tmp_path):
+        path = write_recording(tmp_path / "rec.jsonl", [("p1", "first", 2.0), ("p2", "other", 4.0)])
+        entry = {"latency_s": 2.0}
+
+        assert ReplayProvider(path, latency_mode="none").latency_for(entry) == 0.0
+        assert ReplayProvider(path, latency_mode="recorded", speed=4).latency_for(entry) == 0.5
+        sampled = ReplayProvider(path, latency_mode="sampled", seed=7)
+        assert {sampled.latency_for(entry) for _ in range(50)} == {2.0, 4.0}
+
+        with pytest.raises(ValueError):
+            ReplayProvider(path, latency_mode="bogus")
+
+
+class TestLLMServiceRecordReplay:
+    """A recorded run replays offline through LLMService."""
+
+    def test_record_then_replay(self, tmp_path):
+        recording = tmp_path / "calls.jsonl"
+        config = make_config(tmp_path, "live", llm_record_path=str(recording))
+        with patch('src.services.services.get_connection_pool') as mock_pool:
+            mock_pool.return_value.get.return_value = Mock(status_code=200)
+            live = LLMService(config)
+        with patch.object(live, '_call_provider', return_value=answer("caching")):
+            assert live.generate("Explain caching", content_type="section") == answer("caching")
+
+        entry = json.loads(recording.read_text(encoding="utf-8").splitlines()[0])
+        assert entry["key"] == request_key("Explain caching", None, config.llm_temperature)
+        assert entry["latency_s"] >= 0
+
+        replay_config = make_config(tmp_path, "offline", llm_replay_path=str(recording),
+                                    llm_replay_latency="none", llm_replay_strict=True)
+        with patch('src.services.services.get_connection_pool') as mock_pool:
+            offline = LLMService(replay_config)
+            mock_pool.assert_not_called()
+
+        assert offline.providers == ["REPLAY"]
+        assert offline.generate("Explain caching", content_type="section") == answer("caching")
+        with pytest.raises(RuntimeError, match="No recorded response"):
+            offline.generate("Explain logging", content_type="section")
+
+    def test_replay_reproduces_recorded_latency(self, tmp_path):
+        recording = write_recording(tmp_path / "rec.jsonl", [("Explain caching", answer("caching"), 0.2)])
+        config = make_config(tmp_path, "offline", llm_replay_path=str(recording),
+                             llm_replay_latency="recorded", llm_replay_speed=2.0)
+        service = LLMService(config)
+
+        started = time.monotonic()
+        service.generate("Explain caching", temperature=0.7)
+        assert time.monotonic() - started >= 0.1
+
+    def test_replay_applies_model_rate_limits(self, tmp_path):
+        recording = write_recording(tmp_path / "rec.jsonl", [("Explain caching", answer("caching"), 0.0)])
+        config = make_config(tmp_path, "offline", llm_replay_path=str(recording), llm_replay_latency="none",
+                             model_rate_limits={"gpt-4o": {"tpm": 100000}})
+        service = LLMService(config)
+
+        assert service.generate("Explain caching", model="gpt-4o") == answer("caching")
+        assert service.rate_limiters["REPLAY"].requests_per_minute == 300
+        assert service.model_rate_limiters["REPLAY/gpt-4o"].tokens_per_minute == 100000
@@ -18,3 +18,37 @@ def test_set_executor():
     set_executor(mock_executor)
     # Basic smoke test - executor can be set without errors
     assert True
+
+
+def test_finished_jobs_are_served_after_restart(tmp_path):
+    """Jobs finished before a restart are listed and fetched from the catalog."""
+    import asyncio
+    from datetime import datetime
+    from unittest.mock import Mock
+    from fastapi import HTTPException
+    from src.mcp import web_adapter
+    from src.orchestration.job_execution_engine import JobExecutionEngine
+    from src.orchestration.job_state import JobMetadata, JobState, JobStatus
+
+    def make_engine():
+        return JobExecutionEngine(
+            compiler=Mock(),
+            registry=Mock(),
+            storage_dir=tmp_path / "jobs",
+            checkpoint_config={"storage_path": str(tmp_path / "checkpoints")}
+        )
+
+    make_engine().storage.save_job(JobState(metadata=JobMetadata(
+        job_id="done-1", workflow_id="blog", status=JobStatus.COMPLETED, created_at=datetime.now()
+    )))
+    executor = Mock()
+    executor.job_engine = make_engine()
+    web_adapter.set_executor(executor)
+
+    listed = asyncio.run(web_adapter.handle_jobs_list({"status": "completed"}))
+    job = asyncio.run(web_adapter.handle_job_get({"job_id": "done-1"}))
+
+    assert [j["job_id"] for j in listed["jobs"]] == ["done-1"]
+    assert job["metadata"]["status"] == "completed"
+    with pytest.raises(HTTPException):
+        asyncio.run(web_adapter.handle_job_cancel({"job_id": "missing"}))
@@ -0,0 +1,131 @@
+"""Unit tests for the columnar metrics store and the monitors that record into it."""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from src.orchestration.agent_health_monitor import AgentHealthMonitor
+from src.utils.learning import PerformanceTracker
+from src.utils.metrics_store import LogHistogram, MetricsStore
+from src.visualization.agent_flow_monitor import PerformanceAnalytics
+
+
+NOW = 1_800_000_000.0
+
+
+class TestMetricsStore:
+    """Ring buffer, window, percentile and rollup behaviour."""
+
+    def test_ring_buffer_keeps_most_recent_samples(self):
+        store = MetricsStore(capacity=100)
+        for i in range(250):
+            store.record("s", i, NOW + i)
+
+        ts, values = store.window("s")
+        assert len(values) == 100
+        assert values[0] == 150 and values[-1] == 249
+        assert np.all(np.diff(ts) > 0)
+        assert store.get_stats()["samples_recorded"] == 250
+
+    def test_window_query(self):
+        store = MetricsStore()
+        for i in range(120):
+            store.record("s", i, NOW - 119 + i)
+
+        _, values = store.window("s", window_seconds=10, now=NOW)
+        assert values.tolist() == list(range(109, 120))
+        assert store.window("missing", 10)[1].size == 0
+
+    def test_out_of_order_samples_are_still_windowed(self):
+        store = MetricsStore()
+        store.record("s", 1.0, NOW)
+        store.record("s", 2.0, NOW - 100)
+        store.record("s", 3.0, NOW + 1)
+
+        _, values = store.window("s", since=NOW - 5)
+        assert sorted(values.tolist()) == [1.0, 3.0]
+
+    def test_all_time_percentiles_within_relative_accuracy(self):
+        rng = np.random.default_rng(7)
+        samples = rng.lognormal(5, 1, 20000)
+        store = MetricsStore(capacity=500)
+        for i, value in enumerate(samples):
+            store.record("latency", value, NOW + i)
+
+        estimated = store.percentiles("latency")
+        exact = np.percentile(samples, [50, 95, 99])
+        for key, expected in zip(("p50", "p95", "p99"), exact):
+            assert estimated[key] == pytest.approx(expected, rel=0.03)
+        assert store.summary("latency")["mean"] == pytest.approx(samples.mean())
+
+    def test_histogram_merge(self):
+        a, b = LogHistogram(), LogHistogram()
+        for v in range(1, 101):
+            (a if v % 2 else b).add(float(v))
+        a.merge(b)
+        assert a.count == 100
+        assert a.quantiles([0.5])[0] == pytest.approx(50.5, rel=0.03)
+
+    def test_rollups_aggregate_per_bucket(self):
+        store = MetricsStore()
+        start = 1_800_000_000.0 - (1_800_000_000.0 % 3600)
+        for i in range(180):
+            store.record("s", i % 60, start + i)
+
+        buckets = store.rollup("s", 60)
+        assert [b["count"] for b in buckets] == [60, 60, 60]
+        assert buckets[0]["min"] == 0 and buckets[0]["max"] == 59
+        assert buckets[0]["mean"] == pytest.approx(29.5)
+        assert store.rollup("s", 3600)[0]["count"] == 180
+
+        with pytest.raises(ValueError):
+            store.rollup("s", 17)
+
+    def test_trend(self):
+        store = MetricsStore()
+        for i in range(10):
+            store.record("s", 100 + 20 * i, NOW + i * 360)  # +200 per hour
+
+        trend = store.trend("s")
+        assert trend["slope_per_hour"] == pytest.approx(200)
+        assert trend["count"] == 10
+
+
+class TestMonitorsRecordIntoStore:
+    """Monitors share the store so dashboards see all sources."""
+
+    def test_performance_analytics_summary_and_trend(self):
+        store = MetricsStore()
+        analytics = PerformanceAnalytics(store=store)
+        now = datetime.now(timezone.utc)
+        for i, latency in enumerate([100, 200, 300, 400]):
+            analytics.record_agent_performance(
+                "writer", latency, 10, "completed" if i < 3 else "failed",
+                timestamp=now - timedelta(minutes=4 - i)
+            )
+        analytics.record_agent_performance("writer", 999, 10, "completed", timestamp=now - timedelta(hours=3))
+
+        summary = analytics.get_agent_performance_summary("writer", window_hours=1)
+        assert summary["sample_count"] == 4
+        assert summary["avg_latency_ms"] == 250
+        assert summary["max_latency_ms"] == 400
+        assert summary["success_count"] == 3 and summary["failure_count"] == 1
+        assert analytics.get_agent_performance_summary("unknown") == {}
+
+        for minutes, value in ((30, 100.0), (20, 150.0), (10, 200.0)):
+            analytics.record_metric("avg_latency", value, now - timedelta(minutes=minutes))
+        trend = analytics.analyze_trends("avg_latency")
+        assert trend.trend_direction == "degrading"
+        assert len(trend.time_series) == 3
+        assert trend.time_series[0][1] == 100.0
+
+    def test_health_monitor_and_tracker_record(self):
+        store = MetricsStore()
+        AgentHealthMonitor(metrics_store=store).record_execution("a1", False, 42.0, "job-1", error="boom")
+        PerformanceTracker(metrics_store=store).record_execution("a1", "write", True, latency_ms=12.0)
+
+        assert store.window("health.a1.duration_ms")[1].tolist() == [42.0]
+        assert store.window("health.a1.success")[1].tolist() == [0.0]
+        assert store.window("learning.a1.write.latency_ms", window_seconds=60, now=time.time())[1].tolist() == [12.0]
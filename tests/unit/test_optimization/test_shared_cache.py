@@ -0,0 +1,190 @@
+"""Unit tests for the cross-process shared cache tier."""
+
+import sqlite3
+import time
+from unittest.mock import ANY, Mock, patch
+
+import numpy as np
+import pytest
+
+from src.core.config import Config
+from src.optimization import shared_cache
+from src.optimization.cache import cached
+from src.optimization.shared_cache import SQLiteCacheBackend, SharedCache, get_shared_cache, set_shared_cache
+from src.services import embedding_runtime
+from src.services.services import EmbeddingService, LLMService
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    shared_cache.reset_shared_caches()
+    embedding_runtime.reset_embedding_runtimes()
+    yield
+    shared_cache.reset_shared_caches()
+    embedding_runtime.reset_embedding_runtimes()
+
+
+def make_config(tmp_path, **settings):
+    config = Config()
+    config.cache_dir = str(tmp_path / "cache")
+    config.gemini_api_key = "test-key"
+    config.shared_cache = "sqlite"
+    for key, value in settings.items():
+        setattr(config, key, value)
+    return config
+
+
+class TestSQLiteCacheBackend:
+    """Redis-style byte store shared through one SQLite file."""
+
+    def test_two_handles_on_one_file_share_entries(self, tmp_path):
+        a = SQLiteCacheBackend(tmp_path / "shared.db")
+        b = SQLiteCacheBackend(tmp_path / "shared.db")
+
+        assert a.set("k", b"v", ex=60)
+        assert b.get("k") == b"v"
+        assert b.mget(["k", "missing"]) == [b"v", None]
+        assert 0 < b.ttl("k") <= 60
+        assert b.ttl("missing") == -2
+        assert b.delete("k", "missing") == 1
+        assert a.exists("k") == 0
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        backend = SQLiteCacheBackend(tmp_path / "shared.db")
+        backend.set("short", b"v", ex=0.05)
+        backend.set("forever", b"v")
+        time.sleep(0.1)
+
+        assert backend.get("short") is None
+        assert backend.ttl("forever") == -1
+
+    def test_size_limits_evict_least_recently_used(self, tmp_path):
+        backend = SQLiteCacheBackend(tmp_path / "shared.db", max_entries=3, max_bytes=1000, touch_interval=0)
+        for key in "abc":
+            backend.set(key, b"x" * 100)
+            time.sleep(0.01)
+        backend.get("a")
+        backend.set("d", b"x" * 100)
+
+        assert backend.mget(["a", "b", "c", "d"]) == [b"x" * 100, None, b"x" * 100, b"x" * 100]
+        assert not backend.set("huge", b"x" * 2000)
+        backend.set("big", b"x" * 900)
+        assert backend.get_stats()["memory_mb"] * 1024 * 1024 <= 1000
+        assert backend.get_stats()["evictions"] >= 3
+
+    def test_hits_do_not_wait_for_the_write_lock(self, tmp_path):
+        backend = SQLiteCacheBackend(tmp_path / "shared.db", touch_interval=0)
+        backend.set("k", b"v")
+        with sqlite3.connect(tmp_path / "shared.db", isolation_level=None) as writer:
+            writer.execute("BEGIN IMMEDIATE")
+            start = time.monotonic()
+            assert backend.get("k") == b"v"
+            assert time.monotonic() - start < 1.0
+            writer.execute("ROLLBACK")
+
+    def test_recent_hits_are_not_touched_again(self, tmp_path):
+        backend = SQLiteCacheBackend(tmp_path / "shared.db")
+        backend.set("k", b"v")
+        with patch.object(backend, "_touch") as touch:
+            assert backend.get("k") == b"v"
+        touch.assert_not_called()
+
+    def test_usage_totals_track_every_write(self, tmp_path):
+        backend = SQLiteCacheBackend(tmp_path / "shared.db")
+        assert backend.mset({"a": b"x" * 10, "b": b"x" * 20}, ex=60) == 2
+        backend.set("a", b"x" * 5)
+        backend.delete("b")
+        backend.mset({"c": b"x" * 7, "d": b"x" * 3})
+
+        with sqlite3.connect(tmp_path / "shared.db") as conn:
+            actual = conn.execute("SELECT COUNT(*), SUM(size) FROM entries").fetchone()
+        assert (backend.dbsize(), backend.get_stats()["memory_mb"] * 1024 * 1024) == actual == (3, 15)
+        backend.flushdb()
+        assert backend.dbsize() == 0
+
+
+class TestSharedCache:
+    """Pickled values, metrics and error isolation."""
+
+    def test_metrics_and_backend_errors(self, tmp_path):
+        cache = SharedCache(SQLiteCacheBackend(tmp_path / "shared.db"))
+        cache.set("k", {"answer": [1, 2]})
+
+        assert cache.get("k") == {"answer": [1, 2]}
+        assert cache.get("missing") is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+        assert stats["backend"]["entries"] == 1
+
+        broken = SharedCache(Mock(mget=Mock(side_effect=ConnectionError("down"))))
+        assert broken.get("k") is None
+        assert broken.stats()["errors"] == 1
+
+    def test_set_many_batches_writes(self, tmp_path):
+        cache = SharedCache(SQLiteCacheBackend(tmp_path / "shared.db"))
+        with patch.object(cache.backend, "set", side_effect=AssertionError("one write per value")):
+            assert cache.set_many({"a": 1, "b": [2]}) == 2
+        assert cache.get_many(["a", "b"]) == [1, [2]]
+        assert cache.stats()["sets"] == 2
+
+        redis_client = Mock()
+        redis_client.pipeline.return_value.execute.return_value = [True, True]
+        assert SharedCache(redis_client, default_ttl=30).set_many({"a": 1, "b": 2}) == 2
+        redis_client.pipeline.return_value.set.assert_any_call("blogcache:a", ANY, ex=30)
+
+    def test_disabled_by_default(self, tmp_path):
+        assert get_shared_cache(make_config(tmp_path, shared_cache="none")) is None
+        config = make_config(tmp_path)
+        assert get_shared_cache(config) is get_shared_cache(config) is get_shared_cache()
+
+    def test_decorator_consults_shared_tier_after_local_miss(self, tmp_path):
+        set_shared_cache(SharedCache(SQLiteCacheBackend(tmp_path / "shared.db")))
+        calls = []
+
+        def square(x):
+            calls.append(x)
+            return x * x
+
+        worker_a = cached(ttl=60, shared=True)(square)
+        worker_b = cached(ttl=60, shared=True)(square)
+
+        assert worker_a(4) == 16
+        assert worker_b(4) == 16
+        assert worker_b(4) == 16
+        assert calls == [4]
+        assert worker_b.cache.stats()["hits"] == 1
+        assert get_shared_cache().stats()["hits"] == 1
+
+
+class TestServicesUseSharedTier:
+    """Workers sharing a cache directory reuse each other's results."""
+
+    def test_llm_response_computed_once_across_workers(self, tmp_path):
+        config = make_config(tmp_path)
+        with patch('src.services.services.get_connection_pool') as mock_pool:
+            mock_pool.return_value.get.return_value = Mock(status_code=200)
+            worker_a, worker_b = LLMService(config), LLMService(config)
+        text = "\n\n".join(f"Shared caching paragraph {i} with enough prose to pass validation checks." for i in range(20))
+
+        with patch.object(worker_a, '_call_provider', return_value=text):
+            assert worker_a.generate("Explain caching") == text
+        with patch.object(worker_b, '_call_provider', side_effect=AssertionError("provider called")):
+            assert worker_b.generate("Explain caching") == text
+
+        assert worker_b.shared_cache.stats()["hits"] == 1
+
+    def test_embeddings_computed_once_across_workers(self, tmp_path):
+        config = make_config(tmp_path, device="cpu")
+        model = Mock()
+        model.encode.side_effect = lambda texts, **kwargs: np.ones((len(texts), 4), dtype=np.float32)
+        with patch.object(embedding_runtime, "SentenceTransformer", Mock(return_value=model)), \
+                patch.object(embedding_runtime, "SENTENCE_TRANSFORMERS_AVAILABLE", True):
+            worker_a, worker_b = EmbeddingService(config), EmbeddingService(config)
+            with patch.object(worker_a.shared_cache.backend, "set", side_effect=AssertionError("unbatched")):
+                worker_a.encode(["alpha", "beta"])
+            encoded = model.encode.call_count
+            vectors = worker_b.encode(["alpha", "beta"])
+
+        assert model.encode.call_count == encoded
+        assert vectors == [[1.0] * 4, [1.0] * 4]
+        assert worker_b.get_stats()["shared_cache"]["hits"] == 2
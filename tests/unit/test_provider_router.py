@@ -0,0 +1,145 @@
+"""Unit tests for latency- and health-aware LLM provider routing."""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from src.core.config import Config
+from src.services.provider_router import ProviderRouter
+from src.services.services import LLMService
+
+
+def answer(name):
+    """A response long enough to pass LLM response validation."""
+    return f"# {name}\n\n" + "\n\n".join(f"This is paragraph {i} of the {name} answer." for i in range(20))
+
+
+def warm(router, provider, latency, n=5, request_class=None):
+    for _ in range(n):
+        router.record(provider, request_class, latency, success=True)
+
+
+class TestProviderRouter:
+    """Ranking, circuits and hedge deadlines."""
+
+    def test_unmeasured_providers_keep_configured_order(self):
+        router = ProviderRouter()
+        assert router.rank(["OLLAMA", "GEMINI", "OPENAI"]) == ["OLLAMA", "GEMINI", "OPENAI"]
+
+    def test_fastest_measured_provider_first(self):
+        router = ProviderRouter()
+        warm(router, "OLLAMA", 4.0)
+        warm(router, "GEMINI", 1.0)
+
+        assert router.rank(["OLLAMA", "GEMINI", "OPENAI"]) == ["GEMINI", "OLLAMA", "OPENAI"]
+
+    def test_ranking_is_per_request_class(self):
+        router = ProviderRouter()
+        warm(router, "OLLAMA", 0.5, request_class="code")
+        warm(router, "GEMINI", 2.0, request_class="code")
+        warm(router, "OLLAMA", 6.0, request_class="blog")
+        warm(router, "GEMINI", 1.0, request_class="blog")
+
+        assert router.rank(["OLLAMA", "GEMINI"], "code") == ["OLLAMA", "GEMINI"]
+        assert router.rank(["OLLAMA", "GEMINI"], "blog") == ["GEMINI", "OLLAMA"]
+
+    def test_failures_open_circuit(self):
+        router = ProviderRouter(failure_threshold=2, recovery_timeout=60)
+        router.record("OLLAMA", None, None, success=False)
+        assert router.rank(["OLLAMA", "GEMINI"]) == ["OLLAMA", "GEMINI"]
+        router.record("OLLAMA", None, None, success=False)
+
+        assert router.rank(["OLLAMA", "GEMINI"]) == ["GEMINI"]
+        assert router.get_stats()["circuits"]["OLLAMA"] == "open"
+        # Every circuit open: fall back to the configured order, even if GEMINI was faster
+        warm(router, "GEMINI", 0.1)
+        router.record("GEMINI", None, None, success=False)
+        router.record("GEMINI", None, None, success=False)
+        assert router.get_stats()["circuits"]["GEMINI"] == "open"
+        assert router.rank(["OLLAMA", "GEMINI"]) == ["OLLAMA", "GEMINI"]
+
+    def test_hedge_delay_is_p95(self):
+        router = ProviderRouter()
+        assert router.hedge_delay("OLLAMA") is None
+        for latency in [0.1] * 18 + [0.3, 2.0]:
+            router.record("OLLAMA", None, latency, success=True)
+        assert router.hedge_delay("OLLAMA") == pytest.approx(0.3)
+        assert ProviderRouter(hedging=False).hedge_delay("OLLAMA") is None
+
+    def test_hedges_are_capped_to_a_fraction_of_requests(self):
+        router = ProviderRouter(max_hedge_fraction=0.1)
+        warm(router, "OLLAMA", 0.1)
+        hedged = 0
+        for _ in range(100):
+            router.hedge_delay("OLLAMA")
+            hedged += router.start_hedge()
+        assert hedged == 10
+        assert router.get_stats()["hedges"]["started"] == 10
+
+
+@pytest.fixture
+def service(tmp_path):
+    config = Config()
+    config.cache_dir = str(tmp_path / "cache")
+    config.gemini_api_key = "test-gemini-key"
+    config.openai_api_key = None
+    with patch('src.services.services.get_connection_pool') as mock_pool:
+        mock_pool.return_value.get.return_value = Mock(status_code=200)
+        service = LLMService(config)
+    assert service.providers == ["OLLAMA", "GEMINI"]
+    return service
+
+
+class TestLLMServiceRouting:
+    """generate() uses the router for ordering, failover and hedging."""
+
+    def test_failing_provider_falls_through_without_backoff(self, service):
+        calls = []
+
+        def call_provider(provider, **kwargs):
+            calls.append(provider)
+            if provider == "OLLAMA":
+                raise requests.ConnectionError("connection refused")
+            return answer("Gemini")
+
+        with patch.object(service, '_call_provider', side_effect=call_provider):
+            start = time.monotonic()
+            assert "Gemini answer" in service.generate("prompt one")
+            assert time.monotonic() - start < 1.0
+        assert calls == ["OLLAMA", "GEMINI"]
+        assert service.served_model() == f"GEMINI:{service.config.gemini_model}"
+        assert service.resolve_model().startswith("OLLAMA:")
+
+    def test_slow_provider_is_hedged(self, service):
+        warm(service.router, "OLLAMA", 0.05, request_class="default")
+        release = threading.Event()
+
+        def call_provider(provider, **kwargs):
+            if provider == "OLLAMA":
+                release.wait(5)
+                return answer("Ollama")
+            return answer("Gemini")
+
+        with patch.object(service, '_call_provider', side_effect=call_provider):
+            start = time.monotonic()
+            assert "Gemini answer" in service.generate("prompt two")
+            assert time.monotonic() - start < 2.0
+        release.set()
+        assert service.router.get_stats()["hedges"] == {"started": 1, "won": 1}
+
+    def test_waiting_for_a_rate_limit_does_not_trigger_a_hedge(self, service):
+        warm(service.router, "OLLAMA", 0.05, request_class="default")
+        limiter = service.rate_limiters["OLLAMA"]
+        lease = limiter.lease
+
+        def slow_lease(*args, **kwargs):
+            time.sleep(0.3)
+            return lease(*args, **kwargs)
+
+        with patch.object(limiter, 'lease', side_effect=slow_lease), \
+                patch.object(service, '_call_provider', side_effect=lambda provider, **kw: answer(provider)):
+            assert "OLLAMA answer" in service.generate("prompt three")
+        assert service.router.get_stats()["hedges"]["started"] == 0
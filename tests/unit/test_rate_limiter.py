@@ -0,0 +1,124 @@
+"""Unit tests for the adaptive provider rate limiter."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.services.services import ProviderRateLimitError, _raise_if_throttled
+from src.utils.rate_limiter import RateLimiter
+
+
+class FakeClock(RateLimiter):
+    """Limiter driven by a manual clock so window arithmetic is deterministic."""
+
+    def __init__(self, *args, **kwargs):
+        self.now = 1000.0
+        super().__init__(*args, **kwargs)
+
+    def _clock(self) -> float:
+        return self.now
+
+
+class TestLimits:
+    """Requests, tokens and concurrency limits."""
+
+    def test_fails_fast_when_wait_exceeds_timeout(self):
+        limiter = RateLimiter(requests_per_minute=2)
+        assert limiter.acquire(timeout=0.1)
+        assert limiter.acquire(timeout=0.1)
+
+        start = time.monotonic()
+        assert limiter.acquire(timeout=5.0) is False
+        assert time.monotonic() - start < 0.5
+
+    def test_window_slides(self):
+        limiter = FakeClock(requests_per_minute=2)
+        assert limiter.acquire(timeout=0)
+        limiter.now += 30
+        assert limiter.acquire(timeout=0)
+        assert not limiter.acquire(timeout=0)
+
+        limiter.now += 31
+        assert limiter.acquire(timeout=0)
+
+    def test_token_budget(self):
+        limiter = FakeClock(requests_per_minute=100, tokens_per_minute=1000)
+        assert limiter.acquire(timeout=0, tokens=700)
+        assert not limiter.acquire(timeout=0, tokens=400)
+
+        # Correcting an over-estimate gives tokens back
+        lease = limiter.lease(tokens=300, timeout=0)
+        assert not limiter.acquire(timeout=0, tokens=1)
+        lease.release(actual_tokens=100)
+        assert limiter.acquire(timeout=0, tokens=200)
+        assert limiter.get_stats()["tokens_in_window"] == 1000
+
+    def test_token_correction_expires_with_its_grant(self):
+        limiter = FakeClock(requests_per_minute=100, tokens_per_minute=1000)
+        lease = limiter.lease(tokens=900, timeout=0)
+        limiter.now += 50
+        lease.release(actual_tokens=100)
+
+        # Once the grant leaves the window its correction must not linger as credit
+        limiter.now += 11
+        assert limiter.acquire(timeout=0, tokens=1000)
+        assert not limiter.acquire(timeout=0, tokens=1)
+        assert limiter.get_stats()["tokens_in_window"] == 1000
+
+    def test_concurrency_waiter_wakes_on_release(self):
+        limiter = RateLimiter(requests_per_minute=100, max_concurrency=1)
+        held = limiter.lease(timeout=0)
+        assert limiter.lease(timeout=0) is None
+
+        threading.Timer(0.1, held.release).start()
+        start = time.monotonic()
+        lease = limiter.lease(timeout=5)
+        assert lease is not None
+        assert time.monotonic() - start < 1.0
+        lease.release()
+        assert limiter.get_stats()["inflight"] == 0
+
+
+class TestAdaptation:
+    """AIMD response to throttling and latency spikes."""
+
+    def test_throttle_halves_then_recovers(self):
+        limiter = FakeClock(requests_per_minute=60, max_concurrency=4, cooldown_seconds=10)
+        lease = limiter.lease(timeout=0)
+        lease.release("throttled", retry_after=2)
+
+        stats = limiter.get_stats()
+        assert stats["current_requests_per_minute"] == 30
+        assert stats["current_concurrency"] == 2
+        # Retry-After pauses new grants
+        assert not limiter.acquire(timeout=1)
+        limiter.now += 2
+        assert limiter.acquire(timeout=0)
+
+        limiter.record_success()
+        assert limiter.get_stats()["current_requests_per_minute"] == 30
+        limiter.now += 11
+        limiter.record_success()
+        assert limiter.get_stats()["current_requests_per_minute"] == 33
+
+    def test_latency_spike_reduces_concurrency(self):
+        limiter = FakeClock(requests_per_minute=600, max_concurrency=8)
+        for _ in range(5):
+            limiter.record_success(latency=0.2)
+        limiter.record_success(latency=2.0)
+
+        stats = limiter.get_stats()
+        assert stats["current_concurrency"] == 4
+        assert stats["latency_spikes"] == 1
+        assert stats["current_requests_per_minute"] == 600
+
+
+def test_429_response_carries_retry_after():
+    response = Mock(status_code=429, headers={"Retry-After": "7"})
+    with pytest.raises(ProviderRateLimitError) as exc:
+        _raise_if_throttled(response, "OpenAI")
+    assert exc.value.retry_after == 7.0
+
+    _raise_if_throttled(Mock(status_code=200), "OpenAI")
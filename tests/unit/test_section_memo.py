@@ -0,0 +1,140 @@
+"""Unit tests for section memoization across job reruns."""
+
+import sqlite3
+from unittest.mock import Mock
+
+import pytest
+
+from src.agents.content.content_assembly import ContentAssemblyAgent
+from src.agents.content.section_writer import SectionWriterAgent
+from src.core.config import Config
+from src.core.contracts import AgentEvent
+from src.core.event_bus import EventBus
+from src.utils.section_memo import SectionMemo, context_ids, fingerprint, get_section_memo
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = Config()
+    config.cache_dir = tmp_path / "cache"
+    config.tone_config = {}
+    return config
+
+
+def mock_llm(served="OLLAMA:llama3"):
+    llm = Mock()
+    llm.generate.side_effect = lambda prompt, **kwargs: f"Generated body {llm.generate.call_count}."
+    llm.resolve_model.return_value = "OLLAMA:llama3"
+    llm.served_model.return_value = served
+    return llm
+
+
+def sections_event(outline_sections, context=("Chunk about loading files.", "Chunk about saving files."), **extra):
+    data = {"outline": {"sections": outline_sections}, "intro": "Intro text.", "context": list(context)}
+    data.update(extra)
+    return AgentEvent(event_type="execute_write_sections", data=data, source_agent="test", correlation_id="cid")
+
+
+class TestFingerprint:
+    """Fingerprints change exactly when an input changes."""
+
+    def test_inputs_change_fingerprint(self):
+        base = dict(outline_entry={"title": "Load"}, context=["a", "b"], template="t1", model="m", prompt="p")
+        fp = fingerprint("section", **base)
+
+        assert fingerprint("section", **base) == fp
+        for key, value in [("outline_entry", {"title": "Save"}), ("context", ["a"]), ("template", "t2"),
+                           ("model", "m2"), ("prompt", "p2")]:
+            assert fingerprint("section", **dict(base, **{key: value})) != fp
+
+    def test_context_ids_prefer_document_ids(self):
+        assert context_ids([{"id": "doc-1", "content": "x"}])[0] == "doc-1"
+        assert context_ids(["some  text"]) == context_ids(["some text"])
+
+    def test_memo_persists_and_is_disabled_by_config(self, tmp_path, config):
+        SectionMemo(tmp_path / "memo.db").put("fp", "Stored content.", title="Load")
+        assert SectionMemo(tmp_path / "memo.db").get("fp") == "Stored content."
+
+        config.section_memoization = False
+        assert get_section_memo(config) is None
+
+
+class TestIncrementalRegeneration:
+    """A rerun only calls the LLM for sections whose inputs changed."""
+
+    def test_rerun_regenerates_only_changed_sections(self, config):
+        llm = mock_llm()
+        writer = SectionWriterAgent(config, EventBus(), llm)
+        outline = [{"title": "Loading files"}, {"title": "Saving files"}]
+
+        first = writer.execute(sections_event(outline)).data["sections"]
+        assert llm.generate.call_count == 2
+
+        changed = [outline[0], {"title": "Saving files", "points": ["new point"]}]
+        second = writer.execute(sections_event(changed)).data["sections"]
+
+        assert llm.generate.call_count == 3
+        assert second[0]["content"] == first[0]["content"]
+        assert [s["memoized"] for s in second] == [True, False]
+
+        writer.execute(sections_event(changed, force_regenerate=True))
+        assert llm.generate.call_count == 5
+
+    def test_sections_from_a_fallback_provider_are_keyed_on_its_model(self, config):
+        llm = mock_llm(served="GEMINI:models/gemini-1.5-flash")
+        writer = SectionWriterAgent(config, EventBus(), llm)
+        outline = [{"title": "Loading files"}]
+
+        writer.execute(sections_event(outline))
+        second = writer.execute(sections_event(outline)).data["sections"]
+        assert llm.generate.call_count == 2
+        assert second[0]["memoized"] is False
+
+        # Once the fallback ranks first, its output is reused
+        llm.resolve_model.return_value = "GEMINI:models/gemini-1.5-flash"
+        third = writer.execute(sections_event(outline)).data["sections"]
+        assert llm.generate.call_count == 2
+        assert third[0]["memoized"] is True
+
+    def test_assembly_splices_memoized_sections(self, config):
+        memo = get_section_memo(config)
+        memo.put("fp-saving", "Saving is covered here.", title="Saving files")
+        assembler = ContentAssemblyAgent(config, EventBus())
+
+        sections = assembler._splice_memoized([
+            {"title": "Loading files", "content": "Loading text.", "fingerprint": "fp-loading", "memoized": False},
+            {"title": "Saving files", "content": "", "fingerprint": "fp-saving"},
+            {"title": "Gone", "content": "", "fingerprint": "fp-unknown"},
+        ], "cid")
+
+        assert [s["title"] for s in sections] == ["Loading files", "Saving files"]
+        assert sections[1]["content"] == "Saving is covered here."
+
+
+class TestMemoMaintenance:
+    """The memo stays bounded and never fails a job."""
+
+    def test_prune_on_open_and_after_puts(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SectionMemo, "PRUNE_EVERY", 5)
+        memo = SectionMemo(tmp_path / "memo.db", max_entries=3)
+        for i in range(5):
+            memo.put(f"fp-{i}", f"Content {i}.")
+        assert memo.get_stats()["entries"] == 3
+        assert memo.get("fp-0") is None and memo.get("fp-4") == "Content 4."
+
+        with sqlite3.connect(tmp_path / "memo.db") as conn:
+            conn.execute("UPDATE sections SET used_at = 0 WHERE fingerprint = 'fp-4'")
+        assert SectionMemo(tmp_path / "memo.db", max_entries=3).get("fp-4") is None
+
+    def test_database_errors_are_cache_misses(self, config):
+        llm = Mock()
+        llm.generate.return_value = "Generated body."
+        writer = SectionWriterAgent(config, EventBus(), llm)
+        memo = get_section_memo(config)
+        for path in memo.db_path.parent.glob(memo.db_path.name + "*"):
+            path.write_bytes(b"not a database" * 100)
+
+        sections = writer.execute(sections_event([{"title": "Loading files"}])).data["sections"]
+
+        assert sections[0]["content"] == "Generated body."
+        assert memo.errors == 2
@@ -88,3 +88,64 @@ class TestTrendsServiceMockMode:
 
         # In live mode, TrendReq should be called
         mock_trendreq.assert_called_once_with(hl='en-US', tz=360)
+
+
+class TestLinkChecker:
+    """Tests for LinkChecker session reuse, dedup and status caching."""
+
+    @staticmethod
+    def _response(status):
+        response = Mock()
+        response.status_code = status
+        return response
+
+    def _checker(self, tmp_path):
+        from src.services.services import LinkChecker
+
+        config = Config()
+        config.cache_dir = tmp_path
+        return LinkChecker(config)
+
+    def test_batch_checks_each_unique_url_once(self, tmp_path):
+        checker = self._checker(tmp_path)
+        checker.session.head = Mock(return_value=self._response(200))
+
+        urls = ["https://a.example/x", " https://a.example/x", "https://b.example/y", "https://a.example/x"]
+        results = checker.check_urls(urls)
+
+        assert checker.session.head.call_count == 2
+        assert results["https://a.example/x"] == (True, 200, "OK")
+        assert results[" https://a.example/x"] == (True, 200, "OK")
+        assert results["https://b.example/y"] == (True, 200, "OK")
+        checker.close()
+
+    def test_results_are_cached_across_calls_and_instances(self, tmp_path):
+        checker = self._checker(tmp_path)
+        checker.session.head = Mock(return_value=self._response(200))
+        checker.check_urls(["https://a.example/x"])
+        checker.check_urls(["https://a.example/x"])
+        assert checker.session.head.call_count == 1
+
+        # A new checker reads the persisted status file
+        second = self._checker(tmp_path)
+        second.session.head = Mock(return_value=self._response(500))
+        assert second.validate_urls(["https://a.example/x"]) == {"https://a.example/x": (True, 200, "OK")}
+        second.session.head.assert_not_called()
+
+    def test_head_not_allowed_falls_back_to_get(self, tmp_path):
+        checker = self._checker(tmp_path)
+        checker.session.head = Mock(return_value=self._response(405))
+        checker.session.get = Mock(return_value=self._response(200))
+
+        assert checker.check_url("https://a.example/x") == (True, 200, "OK")
+        checker.session.get.assert_called_once()
+
+    def test_failures_use_negative_ttl(self, tmp_path):
+        from src.services.link_cache import LinkStatusCache
+
+        cache = LinkStatusCache(path=tmp_path / "links.jsonl", ttl=3600, negative_ttl=0)
+        cache.set("https://ok.example", (True, 200, "OK"))
+        cache.set("https://bad.example", (False, 404, "Error"))
+
+        assert cache.get("https://ok.example") == (True, 200, "OK")
+        assert cache.get("https://bad.example") is None
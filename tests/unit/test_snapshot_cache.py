@@ -0,0 +1,164 @@
+"""Unit tests for src/core/snapshot_cache.py and snapshot-backed read routes."""
+
+import json
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core import snapshot_cache
+from src.core.snapshot_cache import SnapshotCache, set_snapshot_cache
+
+TEMPLATES_YAML = """templates:
+  - name: default_blog
+    type: blog
+    template: "# {{title}}"
+    schema:
+      required_placeholders: [title]
+    metadata:
+      category: blog
+"""
+
+
+@pytest.fixture
+def content_dirs(tmp_path):
+    templates_dir = tmp_path / "templates"
+    config_dir = tmp_path / "config"
+    templates_dir.mkdir()
+    config_dir.mkdir()
+    (templates_dir / "blog_templates.yaml").write_text(TEMPLATES_YAML)
+    (templates_dir / "workflows.yaml").write_text("workflows:\n  fast:\n    steps: [a, b]\n")
+    (config_dir / "agents.yaml").write_text("agents:\n  writer:\n    class: Writer\n")
+    (config_dir / "tone.json").write_text(json.dumps({"voice": "friendly"}))
+    return templates_dir, config_dir
+
+
+@pytest.fixture
+def cache(content_dirs):
+    templates_dir, config_dir = content_dirs
+    cache = SnapshotCache(templates_dir=templates_dir, config_dir=config_dir, check_interval=0)
+    set_snapshot_cache(cache)
+    yield cache
+    set_snapshot_cache(None)
+
+
+def _touch(path, content):
+    path.write_text(content)
+    # Make sure the stat signature changes even on coarse-mtime filesystems
+    stamp = time.time() + 5
+    os.utime(path, (stamp, stamp))
+
+
+class TestSnapshotCache:
+    """Test build-once, change detection and ETags."""
+
+    def test_parses_once_per_version(self, cache):
+        with patch.object(snapshot_cache, "_read_yaml", wraps=snapshot_cache._read_yaml) as read_yaml:
+            first = cache.get()
+            second = cache.get()
+
+        assert first is second
+        assert read_yaml.call_count == 2  # workflows.yaml + agents.yaml
+        assert first.workflows == {"fast": {"steps": ["a", "b"]}}
+        assert first.agents == {"writer": {"class": "Writer"}}
+        assert first.tone == {"voice": "friendly"}
+        assert "default_blog" in first.templates
+
+    def test_change_swaps_snapshot_and_reuses_unchanged_sections(self, cache, content_dirs):
+        _, config_dir = content_dirs
+        before = cache.get()
+
+        _touch(config_dir / "agents.yaml", "agents:\n  editor:\n    class: Editor\n")
+        after = cache.get()
+
+        assert after is not before
+        assert after.version != before.version
+        assert after.agents == {"editor": {"class": "Editor"}}
+        assert after.template_registry is before.template_registry
+        assert after.etag("templates") == before.etag("templates")
+        assert after.etag("agents") != before.etag("agents")
+
+    def test_rewrite_with_same_content_keeps_snapshot(self, cache, content_dirs):
+        _, config_dir = content_dirs
+        before = cache.get()
+        _touch(config_dir / "tone.json", json.dumps({"voice": "friendly"}))
+
+        assert cache.get() is before
+
+    def test_reload_event_refreshes_immediately(self, content_dirs):
+        templates_dir, config_dir = content_dirs
+        cache = SnapshotCache(templates_dir=templates_dir, config_dir=config_dir, check_interval=3600)
+        before = cache.get()
+
+        (templates_dir / "workflows.yaml").write_text("workflows:\n  slow:\n    steps: [c]\n")
+        assert cache.get() is before  # within check interval
+
+        cache.handle_reload()
+        assert cache.get().workflows == {"slow": {"steps": ["c"]}}
+
+    def test_memo_is_per_snapshot(self, cache, content_dirs):
+        _, config_dir = content_dirs
+        calls = []
+        snapshot = cache.get()
+        snapshot.memo("k", lambda: calls.append(1) or "v")
+        snapshot.memo("k", lambda: calls.append(1) or "v")
+        assert calls == [1]
+
+        _touch(config_dir / "agents.yaml", "agents: {}\n")
+        cache.get().memo("k", lambda: calls.append(1) or "v")
+        assert calls == [1, 1]
+
+
+class TestSnapshotRoutes:
+    """Test read endpoints served from the snapshot with ETag/304."""
+
+    @pytest.fixture
+    def client(self, cache):
+        from src.web.routes import templates, workflows
+
+        app = FastAPI()
+        app.include_router(templates.router)
+        app.include_router(workflows.router)
+        return TestClient(app)
+
+    def test_template_list_etag_and_304(self, client, cache, content_dirs):
+        response = client.get("/api/templates")
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+        etag = response.headers["etag"]
+
+        cached = client.get("/api/templates", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        templates_dir, _ = content_dirs
+        _touch(templates_dir / "blog_templates.yaml", TEMPLATES_YAML.replace("default_blog", "other_blog"))
+        changed = client.get("/api/templates", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.json()["templates"][0]["name"] == "other_blog"
+        assert changed.headers["etag"] != etag
+
+    def test_template_detail_and_missing(self, client):
+        response = client.get("/api/templates/default_blog")
+        assert response.status_code == 200
+        assert response.json()["content"] == "# {{title}}"
+        assert client.get("/api/templates/nope").status_code == 404
+
+    def test_category_memo_only_holds_known_categories(self, client, cache):
+        assert client.get("/api/templates/categories/Blog").json()["total"] == 1
+        for i in range(5):
+            response = client.get(f"/api/templates/categories/unknown-{i}")
+            assert response.status_code == 200
+            assert response.json()["total"] == 0
+
+        response_keys = [key for key in cache.get()._memo if key[0] == "response"]
+        assert response_keys == [("response", ("templates", "category", "blog"))]
+
+    def test_workflows_fallback_uses_snapshot(self, client):
+        with patch("src.web.routes.workflows._executor", None):
+            response = client.get("/api/workflows")
+        assert response.status_code == 200
+        assert [w["workflow_id"] for w in response.json()["workflows"]] == ["fast"]
@@ -0,0 +1,178 @@
+"""Unit tests for supervised agent execution: deadlines, cancellation and capacity."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.orchestration.execution_plan import ExecutionPlan, ExecutionStep
+from src.orchestration.job_execution_engine import JobExecutionEngine
+from src.orchestration.job_state import JobStatus, StepStatus
+from src.orchestration.step_supervisor import StepSupervisor
+from src.utils.cancellation import (
+    CancellationToken, DeadlineExceededError, OperationCancelledError,
+    check_cancelled, clamp_timeout, current_token, sleep
+)
+
+
+def cooperative_loop(seconds=10.0):
+    """Agent-style loop that checks its token between units of work."""
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        check_cancelled()
+        time.sleep(0.01)
+    return "finished"
+
+
+class TestCancellationToken:
+    """Token semantics outside the supervisor."""
+
+    def test_child_inherits_deadline_and_cancellation(self):
+        parent = CancellationToken.with_timeout(5)
+        child = parent.child(timeout=60)
+        assert child.deadline == parent.deadline
+
+        parent.cancel("paused")
+        assert child.is_cancelled
+        with pytest.raises(OperationCancelledError) as exc:
+            child.raise_if_cancelled()
+        assert exc.value.reason == "paused"
+
+    def test_clamp_timeout_uses_remaining_time(self):
+        assert clamp_timeout(30) == 30
+        token = CancellationToken.with_timeout(0.5)
+        supervisor = StepSupervisor()
+        clamped = supervisor.run(lambda: clamp_timeout(30), token=token)
+        assert 0 < clamped <= 0.5
+
+    def test_sleep_wakes_on_cancel(self):
+        token = CancellationToken()
+        threading.Timer(0.05, token.cancel).start()
+        start = time.monotonic()
+        with pytest.raises(OperationCancelledError):
+            StepSupervisor().run(lambda: sleep(10), token=token)
+        assert time.monotonic() - start < 2
+
+
+class TestStepSupervisor:
+    """Preemptive deadlines and bounded worker capacity."""
+
+    def test_result_and_errors_pass_through(self):
+        supervisor = StepSupervisor()
+        assert supervisor.run(lambda: current_token() is not None, token=CancellationToken()) is True
+
+        def boom():
+            raise ValueError("bad input")
+
+        with pytest.raises(ValueError, match="bad input"):
+            supervisor.run(boom, token=CancellationToken())
+        assert supervisor.get_stats()["active"] == 0
+
+    def test_hung_call_returns_at_deadline(self):
+        supervisor = StepSupervisor()
+        release = threading.Event()
+
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceededError):
+            supervisor.run(lambda: release.wait(10), token=CancellationToken.with_timeout(0.2))
+        assert time.monotonic() - start < 1.0
+        assert supervisor.get_stats()["abandoned"] == 1
+
+        release.set()
+        for _ in range(100):
+            if supervisor.get_stats()["active"] == 0:
+                break
+            time.sleep(0.01)
+        assert supervisor.get_stats()["abandoned"] == 0
+
+    def test_abandoned_cooperative_call_exits(self):
+        supervisor = StepSupervisor()
+        token = CancellationToken.with_timeout(0.1)
+        with pytest.raises(TimeoutError):
+            supervisor.run(cooperative_loop, token=token)
+
+        for _ in range(100):
+            if supervisor.get_stats()["active"] == 0:
+                break
+            time.sleep(0.01)
+        assert supervisor.get_stats()["active"] == 0
+
+    def test_capacity_is_bounded(self):
+        supervisor = StepSupervisor(max_workers=1)
+        release = threading.Event()
+        with pytest.raises(DeadlineExceededError):
+            supervisor.run(lambda: release.wait(10), token=CancellationToken.with_timeout(0.1))
+
+        # The abandoned call still holds the only slot
+        with pytest.raises(DeadlineExceededError):
+            supervisor.run(lambda: "never", token=CancellationToken.with_timeout(0.3))
+        assert threading.active_count() < 50
+
+        release.set()
+        assert supervisor.run(lambda: "ok", token=CancellationToken.with_timeout(2)) == "ok"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return JobExecutionEngine(
+        compiler=Mock(),
+        registry=Mock(),
+        storage_dir=tmp_path / "jobs",
+        checkpoint_config={"storage_path": str(tmp_path / "checkpoints")}
+    )
+
+
+def submit(engine, run, timeout=30):
+    agent = Mock(spec=["run"])
+    agent.run.side_effect = lambda **kwargs: run()
+    engine.registry.get_agent.return_value = agent
+    engine.compiler.compile.return_value = ExecutionPlan(
+        workflow_id="wf",
+        steps=[ExecutionStep(agent_id="writer", timeout=timeout, retry=0)]
+    )
+    return engine.submit_job("wf", {})
+
+
+class TestEngineSupervision:
+    """Engine enforces step timeouts and interrupts steps on cancel/pause."""
+
+    def test_step_timeout_is_preemptive(self, engine):
+        job_id = submit(engine, lambda: time.sleep(5), timeout=0.2)
+
+        start = time.monotonic()
+        engine._execute_job(job_id)
+        assert time.monotonic() - start < 2
+
+        state = engine.get_job_state(job_id)
+        assert state.steps["writer"].status == StepStatus.FAILED
+        assert "timeout" in state.steps["writer"].error
+
+    def test_cancel_interrupts_running_step(self, engine):
+        job_id = submit(engine, cooperative_loop)
+        runner = threading.Thread(target=engine._execute_job, args=(job_id,))
+        runner.start()
+        for _ in range(100):
+            if engine.get_job_status(job_id).status == JobStatus.RUNNING:
+                break
+            time.sleep(0.01)
+
+        assert engine.cancel_job(job_id)
+        runner.join(timeout=2)
+        assert not runner.is_alive()
+        assert engine.get_job_status(job_id).status == JobStatus.CANCELLED
+
+    def test_pause_interrupts_and_resets_step(self, engine):
+        job_id = submit(engine, cooperative_loop)
+        runner = threading.Thread(target=engine._execute_job, args=(job_id,))
+        runner.start()
+        for _ in range(100):
+            if engine.get_job_status(job_id).status == JobStatus.RUNNING:
+                break
+            time.sleep(0.01)
+
+        assert engine.pause_job(job_id)
+        runner.join(timeout=2)
+        state = engine.get_job_state(job_id)
+        assert state.metadata.status == JobStatus.PAUSED
+        assert state.steps["writer"].status == StepStatus.PENDING
@@ -0,0 +1,65 @@
+"""Unit tests for compiled template rendering in src/core/template_registry.py."""
+
+import pytest
+
+from src.core.template_registry import CompiledTemplate, Template, TemplateSchema, TemplateType
+
+
+def _template(content, required=(), optional=()):
+    return Template(
+        name="t",
+        type=TemplateType.BLOG,
+        template_content=content,
+        schema=TemplateSchema(required_placeholders=list(required), optional_placeholders=list(optional))
+    )
+
+
+class TestCompiledTemplate:
+    """Test segment compilation and single-pass rendering."""
+
+    def test_static_runs_are_merged(self):
+        compiled = CompiledTemplate("a\nb\n{{x}}\nc\nd", ["x"], [])
+        assert [entry[1] for entry in compiled.entries] == [("a\nb",), ("", ""), ("c\nd",)]
+
+    def test_renders_required_and_optional(self):
+        template = _template("# {{title}}\nBy {{author}}\n\n{{body}}", ["title", "body"], ["author"])
+        assert template.render({"title": "T", "body": "B", "author": "A"}) == "# T\nBy A\n\nB"
+        assert template.render({"title": "T", "body": "B"}) == "# T\n\nB"
+
+    def test_missing_optional_drops_whole_line(self):
+        template = _template("{{a}}\nkeep {{b}} and {{c}}\nend", ["a"], ["b", "c"])
+        assert template.render({"a": "1", "b": "2"}) == "1\nend"
+        assert template.render({"a": "1", "b": "2", "c": "3"}) == "1\nkeep 2 and 3\nend"
+
+    def test_falsy_optional_counts_as_missing(self):
+        template = _template("x\n{{n}}", [], ["n"])
+        assert template.render({"n": 0}) == "x"
+
+    def test_unknown_placeholders_kept_literally(self):
+        template = _template("{{a}} {{other}}", ["a"])
+        assert template.render({"a": "1"}, strict=False) == "1 {{other}}"
+
+    def test_values_are_not_rescanned(self):
+        template = _template("{{a}} {{b}}", ["a", "b"])
+        assert template.render({"a": "{{b}}", "b": "x"}) == "{{b}} x"
+
+    def test_recompiles_after_content_change(self):
+        template = _template("{{a}}", ["a"])
+        assert template.render({"a": "1"}) == "1"
+        template.template_content = "[{{a}}]"
+        assert template.render({"a": "1"}) == "[1]"
+
+
+class TestRenderMany:
+    """Test batch rendering."""
+
+    def test_render_many_matches_render(self):
+        template = _template("{{title}}\n{{tag}}", ["title"], ["tag"])
+        data = [{"title": "A", "tag": "x"}, {"title": "B"}]
+        assert template.render_many(data) == [template.render(d) for d in data]
+
+    def test_render_many_strict_reports_item(self):
+        template = _template("{{title}}", ["title"])
+        with pytest.raises(ValueError, match="item 1"):
+            template.render_many([{"title": "A"}, {}])
+        assert template.render_many([{"title": "A"}, {}], strict=False) == ["A", ""]
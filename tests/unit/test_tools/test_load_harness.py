@@ -0,0 +1,80 @@
+"""Unit tests for the fake LLM server and load-test harness."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "tools"))
+
+from tools.fake_llm_server import FakeLLMServer, FakeLLMSettings
+from tools.load_harness import find_saturation, percentile, summarize_stage
+from src.utils.llm_response_validator import validate_llm_response
+
+
+class TestFakeLLMServer:
+    """Ollama-compatible endpoints, injected latency and failures."""
+
+    def test_generate_returns_valid_markdown(self):
+        settings = FakeLLMSettings(latency_ms=0, jitter_ms=0, response_tokens=300, seed=1)
+        with FakeLLMServer(settings=settings) as server:
+            assert requests.get(f"{server.url}/api/tags", timeout=5).status_code == 200
+            response = requests.post(f"{server.url}/api/generate",
+                                     json={"model": "fake", "prompt": "Explain PDF rendering"}, timeout=5)
+
+        assert response.status_code == 200
+        text = response.json()["response"]
+        assert validate_llm_response(text, content_type="section").is_valid
+        assert server.stats["requests"] == 1
+
+    def test_error_and_throttle_rates(self):
+        settings = FakeLLMSettings(latency_ms=0, jitter_ms=0, error_rate=0.3, throttle_rate=0.2, seed=3)
+        with FakeLLMServer(settings=settings) as server:
+            codes = [requests.post(f"{server.url}/api/generate", json={"prompt": "x"}, timeout=5).status_code
+                     for _ in range(60)]
+
+        assert {200, 429, 500} == set(codes)
+        assert server.stats["throttled"] == codes.count(429)
+        assert server.stats["errors"] == codes.count(500)
+
+    def test_concurrent_requests_overlap(self):
+        settings = FakeLLMSettings(latency_ms=200, jitter_ms=0, response_tokens=50)
+        with FakeLLMServer(settings=settings) as server:
+            started = time.monotonic()
+            threads = [threading.Thread(target=requests.post, args=(f"{server.url}/api/generate",),
+                                        kwargs={"json": {"prompt": "x"}, "timeout": 5}) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert time.monotonic() - started < 0.9
+
+
+class TestLoadReport:
+    """Stage aggregation and saturation detection."""
+
+    def test_summarize_stage(self):
+        jobs = ([{"status": "completed", "latency": float(i)} for i in range(1, 11)]
+                + [{"status": "failed", "latency": 1.0}, {"status": "timeout", "latency": 240.0}])
+        samples = [{"queued": 3, "running": 2}, {"queued": 7, "running": 4}]
+        stage = summarize_stage(4, 11.0, jobs, samples)
+
+        assert stage["completed"] == 10 and stage["failed"] == 1 and stage["timeouts"] == 1
+        assert stage["throughput_per_s"] == 1.0
+        assert stage["latency_p50_s"] == 5.0
+        assert stage["max_queued"] == 7 and stage["max_running"] == 4
+        assert percentile([], 0.5) is None
+
+    def test_find_saturation(self):
+        def stage(concurrency, throughput, p95, error_rate=0.0):
+            return {"concurrency": concurrency, "throughput_per_s": throughput,
+                    "latency_p95_s": p95, "error_rate": error_rate}
+
+        scaling = [stage(1, 1.0, 2.0), stage(2, 1.9, 2.1), stage(4, 3.7, 2.3)]
+        assert find_saturation(scaling) is None
+        assert find_saturation(scaling + [stage(8, 3.8, 4.5)]) == 4
+        assert find_saturation(scaling + [stage(8, 6.0, 2.4, error_rate=0.2)]) == 4
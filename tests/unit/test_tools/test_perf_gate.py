@@ -0,0 +1,79 @@
+"""Unit tests for the benchmark regression gate."""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools import perf_gate
+
+
+def row(case, samples, suite="dedup"):
+    mean = sum(samples) / len(samples)
+    stdev = (sum((s - mean) ** 2 for s in samples) / len(samples)) ** 0.5
+    return {"suite": suite, "case": case, "iters": len(samples), "mean": mean, "p95": max(samples),
+            "max": max(samples), "stdev": stdev, "samples": samples}
+
+
+def noisy(rng, center, n=10, spread=0.05):
+    return [center * (1 + rng.uniform(-spread, spread)) for _ in range(n)]
+
+
+class TestCompare:
+    """Threshold plus significance decide the status of each case."""
+
+    def test_consistent_slowdown_regresses(self):
+        rng = random.Random(1)
+        baseline = [{"commit": "a", "recorded_at": "1", "results": [row("dedupe_context", noisy(rng, 0.10))]}]
+        diffs = perf_gate.compare_runs([row("dedupe_context", noisy(rng, 0.13))], baseline)
+
+        assert diffs[0]["status"] == perf_gate.REGRESSED
+        assert diffs[0]["change"] > 0.2
+
+    def test_single_outlier_is_not_a_regression(self):
+        rng = random.Random(2)
+        baseline = [{"commit": "a", "recorded_at": "1", "results": [row("dedupe_context", noisy(rng, 0.10))]}]
+        current = noisy(rng, 0.10)
+        current[3] = 0.5
+        diffs = perf_gate.compare_runs([row("dedupe_context", current)], baseline)
+
+        assert diffs[0]["status"] == perf_gate.UNCHANGED
+
+    def test_case_threshold_new_and_missing(self):
+        rng = random.Random(3)
+        baseline = [{"commit": "a", "recorded_at": "1",
+                     "results": [row("dedupe_context", noisy(rng, 0.10)), row("gone", noisy(rng, 0.1))]}]
+        current = [row("dedupe_context", noisy(rng, 0.13)), row("added", noisy(rng, 0.1))]
+        diffs = perf_gate.compare_runs(current, baseline, case_thresholds={"dedup/dedupe_context": 0.5})
+
+        assert [d["status"] for d in diffs] == [perf_gate.UNCHANGED, perf_gate.NEW, perf_gate.MISSING]
+
+    def test_rows_without_samples_use_summary_stats(self):
+        base = {"suite": "s", "case": "c", "iters": 10, "mean": 0.10, "stdev": 0.002}
+        slow = dict(base, mean=0.15)
+        diffs = perf_gate.compare_runs([slow], [{"commit": "a", "recorded_at": "1", "results": [base]}])
+
+        assert diffs[0]["status"] == perf_gate.REGRESSED
+        assert diffs[0]["test"] == "welch"
+
+
+class TestCli:
+    """record / compare round trip through the baseline store."""
+
+    def test_record_then_compare_exit_codes(self, tmp_path):
+        rng = random.Random(4)
+        results = tmp_path / "perf_results.json"
+        baselines = tmp_path / "baselines.json"
+        results.write_text(json.dumps([row("dedupe_context", noisy(rng, 0.10))]))
+        common = ["--results", str(results), "--baselines", str(baselines)]
+
+        assert perf_gate.main(common + ["compare"]) == 2
+        assert perf_gate.main(common + ["record", "--commit", "base123"]) == 0
+        assert "base123" in json.loads(baselines.read_text())["runs"]
+
+        assert perf_gate.main(common + ["compare", "--baseline", "base"]) == 0
+        results.write_text(json.dumps([row("dedupe_context", noisy(rng, 0.2))]))
+        assert perf_gate.main(common + ["compare", "--baseline", "base"]) == 1
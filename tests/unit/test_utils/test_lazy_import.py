@@ -0,0 +1,117 @@
+"""Tests for lazy heavy-dependency imports and cold-start import time."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.utils.lazy_import import LazyAttribute, LazyModule, module_available
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+HEAVY_MODULES = ["torch", "sentence_transformers", "chromadb", "pytrends", "aiohttp"]
+
+# Wall-clock budget for importing the agent base module in a fresh interpreter,
+# on top of bare interpreter startup. Override on slow CI hosts.
+IMPORT_BUDGET_S = float(os.getenv("UCOP_IMPORT_BUDGET_S", "1.0"))
+
+
+def _run_python(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+
+
+class TestLazyModule:
+    """Tests for LazyModule / LazyAttribute proxies."""
+
+    def test_module_not_imported_until_attribute_access(self):
+        sys.modules.pop("colorsys", None)
+        proxy = LazyModule("colorsys")
+
+        assert not proxy.is_loaded
+        assert "colorsys" not in sys.modules
+
+        assert proxy.rgb_to_hsv(1.0, 0.0, 0.0)[0] == 0.0
+        assert proxy.is_loaded
+        assert "colorsys" in sys.modules
+
+    def test_lazy_attribute_is_callable(self):
+        proxy = LazyAttribute("fractions", "Fraction")
+        assert proxy(1, 2) == proxy.resolve()(2, 4)
+
+    def test_module_available(self):
+        assert module_available("json")
+        assert not module_available("definitely_not_a_real_module_xyz")
+
+    def test_installed_module_that_fails_to_import_is_unavailable(self, tmp_path, monkeypatch):
+        (tmp_path / "broken_native_dep_xyz").mkdir()
+        (tmp_path / "broken_native_dep_xyz" / "__init__.py").write_text("raise OSError('libfoo.so: cannot open')\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        flag = module_available("broken_native_dep_xyz")
+        assert flag.installed
+        assert "broken_native_dep_xyz" not in sys.modules
+        assert not flag
+        assert not module_available("broken_native_dep_xyz")
+
+    def test_missing_module_raises_on_use(self):
+        proxy = LazyModule("definitely_not_a_real_module_xyz")
+        with pytest.raises(ImportError):
+            proxy.anything
+
+
+class TestColdStart:
+    """Importing the agent layer must not pull in heavy dependencies."""
+
+    def test_agent_base_does_not_import_heavy_modules(self):
+        result = _run_python(
+            "import sys, json\n"
+            "import src.agents.base\n"
+            "import src.core.config\n"
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+        )
+        assert result.returncode == 0, result.stderr
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+        assert loaded == [], f"Heavy modules imported eagerly: {loaded}"
+
+    @pytest.mark.skipif(
+        os.path.exists("/proc/driver/nvidia/version") or shutil.which("nvidia-smi") is not None,
+        reason="CUDA auto-detection legitimately imports torch when a driver is present"
+    )
+    def test_config_construction_does_not_import_torch(self):
+        result = _run_python(
+            "import sys\n"
+            "from src.core.config import Config\n"
+            "Config()\n"
+            "print('torch' in sys.modules)"
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "False"
+
+    def test_agent_base_import_time_within_budget(self):
+        def best_of(code: str, runs: int = 3) -> float:
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                result = _run_python(code)
+                timings.append(time.perf_counter() - start)
+                assert result.returncode == 0, result.stderr
+            return min(timings)
+
+        baseline = best_of("pass")
+        cold_start = best_of("import src.agents.base")
+
+        assert cold_start - baseline < IMPORT_BUDGET_S, (
+            f"Importing src.agents.base took {cold_start - baseline:.2f}s "
+            f"(budget {IMPORT_BUDGET_S:.2f}s)"
+        )
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Unit tests for the shared markdown tokenizer used by the validators."""
+
+import unittest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.markdown_structure import MarkdownStructure, get_structure
+from src.utils.markdown_validator import auto_fix_markdown_syntax, validate_markdown_syntax
+
+
+DOCUMENT = """---
+title: Test
+---
+
+# Intro
+
+```python
+# a comment
+## Not a heading
+```
+
+python
+print("x")
+
+---
+author: someone
+---
+"""
+
+
+class TestMarkdownStructure(unittest.TestCase):
+    """Test single-pass document classification."""
+
+    def test_collects_all_facts_in_one_pass(self):
+        structure = MarkdownStructure.parse(DOCUMENT)
+
+        self.assertEqual(structure.fence_line_numbers(), [7, 10])
+        self.assertEqual(structure.leading_frontmatter, (0, 2))
+        self.assertEqual(structure.nested_headings, [(8, "## Not a heading")])
+        self.assertEqual(structure.language_specifiers, [11])
+        self.assertEqual(structure.duplicate_frontmatter_starts(), [15])
+        self.assertEqual(structure.frontmatter_blocks(), [0, 14])
+
+    def test_replace_lines_matches_fresh_parse(self):
+        structure = MarkdownStructure.parse(DOCUMENT)
+        edited = structure.replace_lines(11, 12, ["```python"])
+        fresh = MarkdownStructure.parse(edited.text)
+
+        self.assertEqual(edited.text, DOCUMENT.replace("\npython\n", "\n```python\n"))
+        self.assertEqual(edited.fences, fresh.fences)
+        self.assertEqual(edited.delimiters, fresh.delimiters)
+        self.assertEqual(edited.nested_headings, fresh.nested_headings)
+        self.assertEqual(edited.duplicate_frontmatter_starts(), fresh.duplicate_frontmatter_starts())
+
+    def test_get_structure_parses_each_text_once(self):
+        content = DOCUMENT + "\nunique tail for cache test\n"
+        with patch.object(MarkdownStructure, "parse", wraps=MarkdownStructure.parse) as parse:
+            first = get_structure(content)
+            second = get_structure(content)
+            validate_markdown_syntax(content)
+
+        self.assertIs(first, second)
+        self.assertEqual(parse.call_count, 1)
+
+    def test_auto_fix_revalidates_without_reparsing(self):
+        content = "---\ntitle: T\n---\n\n# Heading\n\n```python\nprint('x')\n"
+        _, errors = validate_markdown_syntax(content)
+
+        with patch.object(MarkdownStructure, "parse", wraps=MarkdownStructure.parse) as parse:
+            fixed, was_fixed = auto_fix_markdown_syntax(content, errors)
+
+        self.assertTrue(was_fixed)
+        self.assertTrue(fixed.endswith("print('x')\n```\n"))
+        self.assertEqual(parse.call_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
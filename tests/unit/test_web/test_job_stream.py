@@ -0,0 +1,217 @@
+"""Unit tests for SSE job and batch event streams."""
+
+import asyncio
+import json
+import threading
+import time
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core import EventBus, AgentEvent
+from src.web.job_stream import JobStreamHub, StreamSubscriber, format_sse, set_job_stream_hub
+from src.web.routes import batch, jobs
+
+
+def _event(event_type, job_id, engine_id=None, **data):
+    """Engine event for a web job; the engine's own ID defaults to the web ID."""
+    return AgentEvent(
+        event_type=event_type,
+        source_agent="engine",
+        correlation_id=job_id,
+        data=dict(data, job_id=engine_id or job_id)
+    )
+
+
+def parse_sse(body):
+    messages = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            messages.append((fields["event"], json.loads(fields["data"])))
+    return messages
+
+
+def publish_when_subscribed(hub, bus, events):
+    """Publish events from another thread once a stream is open."""
+    def run():
+        deadline = time.time() + 5
+        while hub.get_stream_count() == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        for event in events:
+            bus.publish(event)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.fixture
+def bus():
+    return EventBus()
+
+
+@pytest.fixture
+def hub(bus):
+    hub = JobStreamHub(event_bus=bus, keepalive=0.05)
+    set_job_stream_hub(hub)
+    yield hub
+    set_job_stream_hub(None)
+
+
+@pytest.fixture
+def store():
+    store = {}
+    jobs.set_jobs_store(store)
+    batch.set_jobs_store(store)
+    jobs.set_executor(None)
+    batch.set_executor(None)
+    yield store
+    jobs.set_jobs_store(None)
+    jobs.set_executor(None)
+    batch.set_jobs_store(None)
+
+
+@pytest.fixture
+def client(store):
+    app = FastAPI()
+    app.include_router(jobs.router)
+    app.include_router(batch.router)
+    return TestClient(app)
+
+
+class TestStreamSubscriber:
+    """Progress coalescing and slow-consumer protection."""
+
+    def test_progress_is_coalesced_per_job(self):
+        async def scenario():
+            subscriber = StreamSubscriber(["a", "b"])
+            subscriber.put("progress", {"job_id": "a", "progress": 0.1})
+            subscriber.put("progress", {"job_id": "b", "progress": 0.5})
+            subscriber.put("progress", {"job_id": "a", "progress": 0.2})
+            return [await subscriber.get(0.01) for _ in range(3)], subscriber.coalesced
+
+        items, coalesced = asyncio.run(scenario())
+        assert items[0] == ("progress", {"job_id": "a", "progress": 0.2})
+        assert items[2] is None
+        assert coalesced == 1
+
+    def test_overflow_closes_stream(self):
+        async def scenario():
+            subscriber = StreamSubscriber(["a"], max_pending=2)
+            results = [subscriber.put("step_started", {"job_id": "a"}) for _ in range(3)]
+            return results, subscriber
+
+        results, subscriber = asyncio.run(scenario())
+        assert results == [True, True, False]
+        assert subscriber.closed
+        assert subscriber.close_reason.startswith("slow consumer")
+
+    def test_format_sse(self):
+        assert format_sse("progress", {"progress": 0.5}, 3) == 'id: 3\nevent: progress\ndata: {"progress": 0.5}\n\n'
+
+
+class TestJobEventsRoute:
+    """GET /api/jobs/{id}/events pushes engine events until the job finishes."""
+
+    def test_streams_steps_and_result(self, client, store, hub, bus):
+        store["job-1"] = {"job_id": "job-1", "status": "running", "result": {"output_path": "out.md"}}
+        publish_when_subscribed(hub, bus, [
+            _event("StepStarted", "job-1", agent_id="writer"),
+            _event("progress_update", "job-2", progress=0.9),
+            _event("StepCompleted", "job-1", agent_id="writer", duration=0.1, progress=1.0),
+            _event("JobCompleted", "job-1"),
+        ])
+
+        response = client.get("/api/jobs/job-1/events")
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        messages = parse_sse(response.text)
+        assert [name for name, _ in messages] == ["snapshot", "step_started", "step_completed", "job_completed"]
+        assert messages[2][1]["progress"] == 1.0
+        assert messages[3][1]["result"] == {"output_path": "out.md"}
+        assert hub.get_stream_count() == 0
+
+    def test_finished_job_closes_after_snapshot(self, client, store, hub):
+        store["job-1"] = {"job_id": "job-1", "status": "failed", "error": "boom"}
+
+        messages = parse_sse(client.get("/api/jobs/job-1/events").text)
+
+        assert messages == [("snapshot", {"status": "failed", "progress": None, "current_step": None,
+                                          "error": "boom", "output_path": None, "job_id": "job-1"})]
+        assert client.get("/api/jobs/missing/events").status_code == 404
+
+
+    def test_engine_job_id_differs_from_web_id(self, client, store, hub, bus):
+        class Engine:
+            def get_job_status(self, job_id):
+                if job_id == "eng-1":
+                    return SimpleNamespace(to_dict=lambda: {"status": "running", "progress": 0.5})
+                return None
+
+            def get_job_state(self, job_id):
+                return SimpleNamespace(outputs={"writer": "text"}) if job_id == "eng-1" else None
+
+        jobs.set_executor(Engine())
+        store["web-1"] = {"job_id": "web-1", "status": "queued", "engine_job_id": "eng-1"}
+        publish_when_subscribed(hub, bus, [
+            _event("StepStarted", "web-1", engine_id="eng-1", agent_id="writer"),
+            _event("JobCompleted", "web-1", engine_id="eng-1"),
+        ])
+
+        messages = parse_sse(client.get("/api/jobs/web-1/events").text)
+
+        assert [name for name, _ in messages] == ["snapshot", "step_started", "job_completed"]
+        assert messages[0][1]["status"] == "running"
+        assert messages[1][1]["job_id"] == "web-1"
+        assert messages[1][1]["engine_job_id"] == "eng-1"
+        assert messages[2][1]["result"] == {"writer": "text"}
+
+
+class TestAsyncJobStatus:
+    """GET /api/jobs reports the executor's progress for async jobs."""
+
+    def test_status_follows_engine_job(self, client, store):
+        statuses = {"eng-1": "pending"}
+
+        class Engine:
+            def submit_job(self, workflow_id, inputs, correlation_id=None, **kwargs):
+                return "eng-1"
+
+            def get_job_status(self, job_id):
+                return SimpleNamespace(status=SimpleNamespace(value=statuses[job_id]), progress=1.0,
+                                       current_step=None, error_message=None, completed_at=None)
+
+        jobs.set_executor(Engine())
+        job_id = client.post("/api/jobs", json={"workflow_id": "blog", "inputs": {}}).json()["job_id"]
+        assert store[job_id]["engine_job_id"] == "eng-1"
+        assert client.get(f"/api/jobs/{job_id}").json()["status"] == "queued"
+
+        statuses["eng-1"] = "completed"
+        assert client.get(f"/api/jobs/{job_id}").json()["status"] == "completed"
+        assert client.get("/api/jobs?status=completed").json()["total"] == 1
+        assert store[job_id]["completed_at"] is not None
+
+
+class TestBatchEventsRoute:
+    """GET /api/batch/{id}/events follows every job of the batch."""
+
+    def test_batch_stream_ends_with_summary(self, client, store, hub, bus):
+        for job_id, status in [("a", "queued"), ("b", "queued"), ("c", "completed")]:
+            store[job_id] = {"job_id": job_id, "status": status, "batch_id": "batch-1"}
+        publish_when_subscribed(hub, bus, [
+            _event("JobStarted", "a"),
+            _event("JobCompleted", "a"),
+            _event("JobFailed", "b", error="boom"),
+        ])
+
+        messages = parse_sse(client.get("/api/batch/batch-1/events").text)
+
+        names = [name for name, _ in messages]
+        assert names.count("snapshot") == 3
+        assert names[-1] == "batch_completed"
+        summary = messages[-1][1]
+        assert (summary["completed_jobs"], summary["failed_jobs"], summary["total_jobs"]) == (2, 1, 3)
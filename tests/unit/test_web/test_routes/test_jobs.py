@@ -0,0 +1,29 @@
+"""Unit tests for jobs routes."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.web.routes.jobs import retry_job
+
+
+def _failed_job(**extra):
+    job = {"job_id": "job-1", "workflow_id": "blog", "inputs": {"topic": "t"}, "status": "failed"}
+    job.update(extra)
+    return job
+
+
+@pytest.mark.parametrize("job, expected", [
+    (_failed_job(), {"priority": "interactive"}),
+    (_failed_job(batch_id="batch-1"), {"priority": "batch", "tenant": "batch-1"}),
+])
+def test_retry_keeps_scheduling_class(job, expected):
+    executor = MagicMock(spec=["submit_job"])
+    executor.submit_job.return_value = "engine-1"
+    store = {"job-1": job}
+
+    asyncio.run(retry_job("job-1", store=store, executor=executor))
+
+    executor.submit_job.assert_called_once_with("blog", {"topic": "t"}, "job-1", **expected)
+    assert store["job-1"]["status"] == "retrying"
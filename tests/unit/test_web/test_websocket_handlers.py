@@ -0,0 +1,194 @@
+"""Unit tests for live flow websocket fan-out."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.core import EventBus, AgentEvent
+from src.web.websocket_handlers import ConnectionOutbox, LiveFlowHandler
+
+
+class FakeWebSocket:
+    """Websocket double whose sends can be held open."""
+
+    def __init__(self, send_delay: float = 0.0):
+        self.frames = []
+        self.send_delay = send_delay
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, data):
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        self.frames.append(data)
+
+    async def send_text(self, text):
+        pass
+
+    async def receive_text(self):
+        await asyncio.sleep(3600)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+    def messages(self, message_type):
+        found = []
+        for frame in self.frames:
+            batch = frame["messages"] if frame.get("type") == "batch" else [frame]
+            found.extend(m for m in batch if m.get("type") == message_type)
+        return found
+
+
+def _progress(job_id, progress):
+    return AgentEvent(
+        event_type="progress_update",
+        source_agent="agent",
+        correlation_id=job_id,
+        data={"progress": progress},
+        metadata={"job_id": job_id}
+    )
+
+
+def _started(job_id, agent_id):
+    return AgentEvent(
+        event_type="agent_started",
+        source_agent=agent_id,
+        correlation_id=job_id,
+        data={},
+        metadata={"job_id": job_id}
+    )
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+class TestConnectionOutbox:
+    """Tests for the per-connection send queue."""
+
+    @pytest.mark.asyncio
+    async def test_progress_updates_are_coalesced(self):
+        outbox = ConnectionOutbox(FakeWebSocket())
+        outbox.enqueue({"type": "agent_started", "agent_id": "a"})
+        for progress in range(10):
+            outbox.enqueue({"type": "progress_update", "progress": progress})
+        outbox.enqueue({"type": "agent_completed", "agent_id": "a"})
+
+        assert outbox.pending == 3
+        assert outbox.coalesced == 9
+
+        sender = asyncio.create_task(outbox.run())
+        await _wait_for(lambda: outbox.sent == 3)
+        outbox.close()
+        await sender
+
+        frames = outbox.websocket.frames
+        assert [f["type"] for f in frames] == ["agent_started", "progress_update", "agent_completed"]
+        assert frames[1]["progress"] == 9
+
+    @pytest.mark.asyncio
+    async def test_batches_pending_messages_into_one_frame(self):
+        websocket = FakeWebSocket()
+        outbox = ConnectionOutbox(websocket, max_batch=10)
+        for i in range(4):
+            outbox.enqueue({"type": "data_flow", "i": i})
+
+        sender = asyncio.create_task(outbox.run())
+        await _wait_for(lambda: outbox.sent == 4)
+        outbox.close()
+        await sender
+
+        assert outbox.frames == 1
+        assert websocket.frames[0]["type"] == "batch"
+        assert [m["i"] for m in websocket.frames[0]["messages"]] == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_overflow_drops_connection(self):
+        websocket = FakeWebSocket()
+        outbox = ConnectionOutbox(websocket, max_pending=3)
+        for i in range(3):
+            assert outbox.enqueue({"type": "data_flow", "i": i})
+
+        assert not outbox.enqueue({"type": "data_flow", "i": 3})
+        assert outbox.closed
+        assert outbox.close_reason.startswith("slow consumer")
+
+        await outbox.run()
+        assert websocket.closed_with == 1013
+
+    @pytest.mark.asyncio
+    async def test_send_timeout_drops_connection(self):
+        websocket = FakeWebSocket(send_delay=1.0)
+        outbox = ConnectionOutbox(websocket, send_timeout=0.05)
+        outbox.enqueue({"type": "agent_started"})
+
+        await asyncio.wait_for(outbox.run(), timeout=2.0)
+        assert outbox.closed
+        assert websocket.closed_with == 1013
+
+
+class TestLiveFlowHandler:
+    """Tests for job-scoped fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_slow_viewer_does_not_delay_others(self):
+        bus = EventBus()
+        handler = LiveFlowHandler(event_bus=bus, send_timeout=0.2)
+        fast, slow = FakeWebSocket(), FakeWebSocket(send_delay=10.0)
+
+        tasks = [
+            asyncio.create_task(handler.handle_connection(fast, "job-1")),
+            asyncio.create_task(handler.handle_connection(slow, "job-1")),
+        ]
+        await _wait_for(lambda: handler.get_connection_count("job-1") == 2)
+
+        bus.publish(_started("job-1", "agent_a"))
+        await _wait_for(lambda: fast.messages("agent_started"))
+
+        await _wait_for(lambda: handler.get_connection_count("job-1") == 1)
+        assert slow.closed_with == 1013
+        assert handler.get_stats()["dropped_connections"] == 1
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        assert handler.get_connection_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_publish_from_worker_thread_does_not_wait_on_delivery(self):
+        bus = EventBus()
+        handler = LiveFlowHandler(event_bus=bus)
+        websocket = FakeWebSocket(send_delay=0.05)
+        task = asyncio.create_task(handler.handle_connection(websocket, "job-2"))
+        await _wait_for(lambda: handler.get_connection_count("job-2") == 1)
+
+        def publish_many():
+            for progress in range(200):
+                bus.publish(_progress("job-2", progress))
+            bus.publish(_started("job-2", "agent_b"))
+
+        worker = threading.Thread(target=publish_many)
+        worker.start()
+        worker.join(timeout=1.0)
+        assert not worker.is_alive()
+
+        await _wait_for(lambda: websocket.messages("agent_started"))
+        progress = websocket.messages("progress_update")
+        assert progress[-1]["progress"] == 199
+        assert len(progress) < 200
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    def test_events_without_connections_are_ignored(self):
+        bus = EventBus()
+        LiveFlowHandler(event_bus=bus)
+        # No event loop captured yet: must be a no-op rather than create_task()
+        bus.publish(_started("job-3", "agent_c"))
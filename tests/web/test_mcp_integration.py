@@ -6,7 +6,9 @@ and that the data flow between components works correctly.
 
 import pytest
 from fastapi.testclient import TestClient
+from datetime import datetime
 from unittest.mock import Mock, patch, AsyncMock
+from src.orchestration.job_state import JobMetadata, JobStatus
 from src.web.app import create_app
 
 
@@ -15,7 +17,8 @@ def mock_executor():
     """Create a mock executor with job engine."""
     executor = Mock()
     executor.job_engine = Mock()
-    executor.job_engine._jobs = {}
+    executor.job_engine.list_jobs = Mock(return_value=[])
+    executor.job_engine.get_job_state = Mock(return_value=None)
     
     # Mock methods
     executor.job_engine.pause_job = Mock()
@@ -156,20 +159,18 @@ def test_ui_can_load_workflow_list(test_client):
 def test_ui_can_load_job_list(test_client, mock_executor):
     """Test that UI can successfully load job list."""
     # Setup mock jobs with complete data
-    mock_jobs = {}
-    for i in range(3):
-        job = Mock()
-        job.to_dict.return_value = {
-            "job_id": f"job_{i}",
-            "workflow_name": "blog_generation",
-            "status": "running" if i == 0 else "completed",
-            "progress": 50 if i == 0 else 100,
-            "started_at": "2025-01-15T10:00:00Z",
-            "completed_at": None if i == 0 else "2025-01-15T11:00:00Z"
-        }
-        mock_jobs[f"job_{i}"] = job
-    
-    mock_executor.job_engine._jobs = mock_jobs
+    mock_executor.job_engine.list_jobs.return_value = [
+        JobMetadata(
+            job_id=f"job_{i}",
+            workflow_id="blog_generation",
+            status=JobStatus.RUNNING if i == 0 else JobStatus.COMPLETED,
+            created_at=datetime(2025, 1, 15, 10, 0),
+            started_at=datetime(2025, 1, 15, 10, 0),
+            completed_at=None if i == 0 else datetime(2025, 1, 15, 11, 0),
+            progress=0.5 if i == 0 else 1.0
+        )
+        for i in range(3)
+    ]
     
     response = test_client.get("/mcp/jobs")
     
@@ -281,7 +282,11 @@ def test_ui_jobs_page_workflow(test_client, mock_executor):
         "progress": 75,
         "started_at": "2025-01-15T10:00:00Z"
     }
-    mock_executor.job_engine._jobs = {"test_job": job}
+    mock_executor.job_engine.list_jobs.return_value = [
+        JobMetadata(job_id="test_job", workflow_id="blog_generation", status=JobStatus.RUNNING,
+                    created_at=datetime(2025, 1, 15, 10, 0), progress=0.75)
+    ]
+    mock_executor.job_engine.get_job_state.side_effect = {"test_job": job}.get
     
     # Step 1: Load jobs list
     response1 = test_client.get("/mcp/jobs")
@@ -371,7 +376,7 @@ def test_no_console_errors_on_workflow_load(test_client):
 
 def test_no_console_errors_on_job_load(test_client, mock_executor):
     """Test that loading jobs doesn't cause 404 or 500 errors."""
-    mock_executor.job_engine._jobs = {}
+    mock_executor.job_engine.list_jobs.return_value = []
     
     response = test_client.get("/mcp/jobs")
     
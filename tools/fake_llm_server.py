@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Fake Ollama-compatible LLM server for load testing.
+
+Serves ``GET /api/tags``, ``POST /api/generate`` and ``POST /api/chat`` with
+synthetic markdown, so the app can run end to end with
+``OLLAMA_BASE_URL`` pointing here and no model behind it. Timing and
+failures are configurable:
+
+- ``latency_ms`` / ``jitter_ms``: time to first token (uniform jitter)
+- ``tokens_per_second``: generation throughput; a response of N tokens
+  takes N / tokens_per_second on top of the latency
+- ``error_rate``: fraction of requests answered with HTTP 500
+- ``throttle_rate``: fraction of requests answered with HTTP 429
+
+Usage:
+    python tools/fake_llm_server.py --port 11500 --latency-ms 400 --tokens-per-second 80
+    OLLAMA_BASE_URL=http://localhost:11500 python start_web.py
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+WORDS = (
+    "document conversion pipeline format library output page render table image "
+    "section layout font style export import stream metadata option result file"
+).split()
+
+
+@dataclass
+class FakeLLMSettings:
+    """Behaviour of the fake server."""
+    latency_ms: float = 200.0
+    jitter_ms: float = 50.0
+    tokens_per_second: float = 0.0  # 0 = unlimited
+    response_tokens: int = 400
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    seed: Optional[int] = None
+
+
+def fake_markdown(rng: random.Random, tokens: int, prompt: str = "") -> str:
+    """Markdown of roughly ``tokens`` tokens that passes LLM response validation."""
+    topic = " ".join(prompt.split()[:6]) or "the topic"
+    lines = [f"## Working with {topic}", ""]
+    words = 0
+    while words * 4 // 3 < tokens:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(14))
+        lines.append(f"{sentence.capitalize()}, which keeps the example easy to follow.")
+        lines.append("")
+        words += 19
+    return "\n".join(lines).strip()
+
+
+class FakeLLMServer:
+    """Threaded fake Ollama server; usable as a context manager."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, settings: Optional[FakeLLMSettings] = None):
+        self.settings = settings or FakeLLMSettings()
+        self._rng = random.Random(self.settings.seed)
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"requests": 0, "errors": 0, "throttled": 0, "tokens": 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _outcome(self) -> str:
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._rng.random()
+            if roll < self.settings.throttle_rate:
+                self.stats["throttled"] += 1
+                return "throttled"
+            if roll < self.settings.throttle_rate + self.settings.error_rate:
+                self.stats["errors"] += 1
+                return "error"
+            return "ok"
+
+    def _generate(self, prompt: str) -> str:
+        settings = self.settings
+        with self._lock:
+            delay = settings.latency_ms + self._rng.uniform(-settings.jitter_ms, settings.jitter_ms)
+            text = fake_markdown(self._rng, settings.response_tokens, prompt)
+            self.stats["tokens"] += settings.response_tokens
+        if settings.tokens_per_second > 0:
+            delay += 1000.0 * settings.response_tokens / settings.tokens_per_second
+        time.sleep(max(0.0, delay) / 1000.0)
+        return text
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):  # Keep load runs quiet
+                pass
+
+            def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/api/tags":
+                    self._send(200, {"models": [{"name": "fake:latest", "model": "fake:latest"}]})
+                elif self.path.rstrip("/") == "/stats":
+                    self._send(200, dict(server.stats))
+                else:
+                    self._send(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._send(400, {"error": "invalid json"})
+                    return
+                path = self.path.rstrip("/")
+                if path not in ("/api/generate", "/api/chat"):
+                    self._send(404, {"error": "not found"})
+                    return
+
+                outcome = server._outcome()
+                if outcome == "throttled":
+                    self._send(429, {"error": "rate limited"}, {"Retry-After": "1"})
+                    return
+                if outcome == "error":
+                    self._send(500, {"error": "injected failure"})
+                    return
+
+                if path == "/api/chat":
+                    messages = request.get("messages") or [{}]
+                    text = server._generate(str(messages[-1].get("content", "")))
+                    body = {"message": {"role": "assistant", "content": text}}
+                else:
+                    text = server._generate(str(request.get("prompt", "")))
+                    body = {"response": text}
+                body.update({
+                    "model": request.get("model", "fake:latest"),
+                    "done": True,
+                    "eval_count": server.settings.response_tokens,
+                })
+                self._send(200, body)
+
+        return Handler
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fake Ollama-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--response-tokens", type=int, default=400)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    settings = FakeLLMSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        tokens_per_second=args.tokens_per_second,
+        response_tokens=args.response_tokens,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed,
+    )
+    server = FakeLLMServer(args.host, args.port, settings).start()
+    print(f"Fake LLM server on {server.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""Load-test harness - ramp concurrent job traffic against the web app.
+
+Starts the fake Ollama server (tools/fake_llm_server.py) and, optionally, the
+app itself pointed at it. It then runs stages of increasing concurrency.
+Each worker submits a job through ``POST /api/jobs`` or
+``POST /api/generate`` and polls it until it finishes. A sampler records
+queue depth (queued and running jobs) over time.
+
+Reported per stage:
+- throughput (finished jobs per second)
+- p50/p95/p99 job latency
+- failures and timeouts
+- peak queue depth
+
+The saturation point is the first stage where added concurrency stops
+raising throughput and only raises latency, or where errors climb.
+
+Usage:
+    python tools/load_harness.py --start-app --ramp 1,2,4,8,16 --stage-seconds 60
+    python tools/load_harness.py --base-url http://localhost:8103 --no-fake-llm
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from fake_llm_server import FakeLLMServer, FakeLLMSettings
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TERMINAL_STATUSES = {"completed", "failed", "error", "cancelled"}
+TOPICS = (
+    "Convert PDF to DOCX", "Merge Excel workbooks", "Render slides to images",
+    "Extract text with OCR", "Generate barcodes", "Compress archives",
+)
+
+
+def http_json(method: str, url: str, data: Optional[Dict[str, Any]] = None, timeout: float = 30) -> Tuple[int, Any]:
+    """Send a JSON request; returns (status, body), status 0 on connection errors."""
+    body = json.dumps(data).encode("utf-8") if data is not None else None
+    req = urllib.request.Request(url, data=body, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return response.status, json.loads(response.read().decode("utf-8") or "null")
+    except urllib.error.HTTPError as e:
+        return e.code, None
+    except (urllib.error.URLError, OSError, ValueError):
+        return 0, None
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def summarize_stage(concurrency: int, duration: float, jobs: List[Dict[str, Any]],
+                    samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate one stage's job results and queue samples."""
+    finished = [j for j in jobs if j["status"] in TERMINAL_STATUSES]
+    completed = [j for j in finished if j["status"] == "completed"]
+    latencies = [j["latency"] for j in finished]
+    errors = len(jobs) - len(completed)
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(duration, 2),
+        "submitted": len(jobs),
+        "completed": len(completed),
+        "failed": len([j for j in jobs if j["status"] in ("failed", "error", "cancelled")]),
+        "timeouts": len([j for j in jobs if j["status"] == "timeout"]),
+        "error_rate": round(errors / len(jobs), 4) if jobs else 0.0,
+        "throughput_per_s": round(len(finished) / duration, 4) if duration > 0 else 0.0,
+        "latency_p50_s": percentile(latencies, 0.50),
+        "latency_p95_s": percentile(latencies, 0.95),
+        "latency_p99_s": percentile(latencies, 0.99),
+        "max_queued": max((s["queued"] for s in samples), default=0),
+        "max_running": max((s["running"] for s in samples), default=0),
+    }
+
+
+def find_saturation(stages: List[Dict[str, Any]], min_gain: float = 0.10,
+                    latency_growth: float = 1.5, max_error_rate: float = 0.05) -> Optional[int]:
+    """Concurrency after which the server saturates, or None if it never did.
+
+    A stage saturates when throughput rises less than ``min_gain`` over the
+    previous stage while p95 latency grows by ``latency_growth`` or more, or
+    when its error rate exceeds ``max_error_rate``. The last stage before
+    that is returned.
+    """
+    for previous, stage in zip(stages, stages[1:]):
+        if stage["error_rate"] > max_error_rate:
+            return previous["concurrency"]
+        prev_tp, tp = previous["throughput_per_s"], stage["throughput_per_s"]
+        prev_p95, p95 = previous["latency_p95_s"], stage["latency_p95_s"]
+        if prev_tp and prev_p95 and p95 and tp < prev_tp * (1 + min_gain) and p95 >= prev_p95 * latency_growth:
+            return previous["concurrency"]
+    return None
+
+
+class LoadHarness:
+    """Runs ramp stages against one app instance."""
+
+    def __init__(self, base_url: str, workflow_id: str = "blog_generation", generate_ratio: float = 0.5,
+                 poll_interval: float = 0.5, job_timeout: float = 240, sample_interval: float = 1.0,
+                 seed: int = 1234):
+        self.base_url = base_url.rstrip("/")
+        self.workflow_id = workflow_id
+        self.generate_ratio = generate_ratio
+        self.poll_interval = poll_interval
+        self.job_timeout = job_timeout
+        self.sample_interval = sample_interval
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.timeline: List[Dict[str, Any]] = []
+        self._started = time.monotonic()
+
+    def _topic(self) -> Tuple[str, bool]:
+        with self._rng_lock:
+            return f"{self._rng.choice(TOPICS)} #{self._rng.randrange(10**6)}", self._rng.random() < self.generate_ratio
+
+    def run_job(self) -> Dict[str, Any]:
+        """Submit one job and wait for it to finish."""
+        topic, use_generate = self._topic()
+        started = time.monotonic()
+        if use_generate:
+            status, body = http_json("POST", f"{self.base_url}/api/generate",
+                                     {"topic": topic, "workflow": self.workflow_id})
+        else:
+            status, body = http_json("POST", f"{self.base_url}/api/jobs",
+                                     {"workflow_id": self.workflow_id, "inputs": {"topic": topic}})
+        endpoint = "/api/generate" if use_generate else "/api/jobs"
+        if status not in (200, 201) or not body or "job_id" not in body:
+            return {"endpoint": endpoint, "status": "error", "http_status": status,
+                    "latency": time.monotonic() - started}
+
+        job_id, job_status = body["job_id"], body.get("status", "created")
+        while job_status not in TERMINAL_STATUSES:
+            if time.monotonic() - started > self.job_timeout:
+                job_status = "timeout"
+                break
+            time.sleep(self.poll_interval)
+            code, job = http_json("GET", f"{self.base_url}/api/jobs/{job_id}")
+            if code == 200 and job:
+                job_status = job.get("status", job_status)
+        return {"endpoint": endpoint, "job_id": job_id, "status": job_status,
+                "latency": time.monotonic() - started}
+
+    def queue_depth(self) -> Dict[str, int]:
+        depth = {}
+        for status in ("queued", "running"):
+            code, body = http_json("GET", f"{self.base_url}/api/jobs?status={status}&limit=1", timeout=10)
+            depth[status] = body.get("total", 0) if code == 200 and body else 0
+        return depth
+
+    def run_stage(self, concurrency: int, seconds: float) -> Dict[str, Any]:
+        """Keep ``concurrency`` jobs in flight for ``seconds``, then drain."""
+        deadline = time.monotonic() + seconds
+        jobs: List[Dict[str, Any]] = []
+        samples: List[Dict[str, Any]] = []
+        lock = threading.Lock()
+        stop = threading.Event()
+
+        def worker():
+            while time.monotonic() < deadline:
+                result = self.run_job()
+                with lock:
+                    jobs.append(result)
+
+        def sampler():
+            while not stop.is_set():
+                sample = {"t": round(time.monotonic() - self._started, 2), "concurrency": concurrency}
+                sample.update(self.queue_depth())
+                with lock:
+                    sample["finished"] = len(jobs)
+                samples.append(sample)
+                stop.wait(self.sample_interval)
+
+        stage_started = time.monotonic()
+        sampler_thread = threading.Thread(target=sampler, daemon=True)
+        sampler_thread.start()
+        workers = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        stop.set()
+        sampler_thread.join()
+        self.timeline.extend(samples)
+        return summarize_stage(concurrency, time.monotonic() - stage_started, jobs, samples)
+
+    def ramp(self, levels: List[int], seconds: float) -> Dict[str, Any]:
+        stages = []
+        for concurrency in levels:
+            print(f"Stage: concurrency={concurrency} for {seconds:.0f}s")
+            stage = self.run_stage(concurrency, seconds)
+            print(format_stage(stage))
+            stages.append(stage)
+        return {"stages": stages, "timeline": self.timeline, "saturation_concurrency": find_saturation(stages)}
+
+
+def format_stage(stage: Dict[str, Any]) -> str:
+    def seconds(value):
+        return f"{value:.2f}s" if value is not None else "-"
+    return (f"  c={stage['concurrency']:<3} jobs={stage['submitted']:<4} ok={stage['completed']:<4} "
+            f"fail={stage['failed']:<3} timeout={stage['timeouts']:<3} tput={stage['throughput_per_s']:.2f}/s "
+            f"p50={seconds(stage['latency_p50_s'])} p95={seconds(stage['latency_p95_s'])} "
+            f"p99={seconds(stage['latency_p99_s'])} queued<={stage['max_queued']} running<={stage['max_running']}")
+
+
+def start_app(port: int, llm_url: Optional[str]) -> subprocess.Popen:
+    """Start start_web.py on port, using the fake LLM server when one is given."""
+    env = os.environ.copy()
+    env["PORT"] = str(port)
+    if llm_url:
+        env.update({"OLLAMA_BASE_URL": llm_url, "LLM_PROVIDER": "OLLAMA"})
+        env.pop("GEMINI_API_KEY", None)
+        env.pop("OPENAI_API_KEY", None)
+    return subprocess.Popen([sys.executable, "start_web.py"], cwd=REPO_ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_ready(base_url: str, timeout: float = 60) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if http_json("GET", f"{base_url}/api/jobs?limit=1", timeout=5)[0] == 200:
+            return True
+        time.sleep(1)
+    return False
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ramp concurrent job traffic and find the saturation point")
+    parser.add_argument("--base-url", default=None, help="App URL (default: http://localhost:<port>)")
+    parser.add_argument("--port", type=int, default=8103, help="App port when --start-app is used")
+    parser.add_argument("--start-app", action="store_true", help="Start start_web.py against the fake LLM")
+    parser.add_argument("--no-fake-llm", action="store_true", help="Do not start the fake LLM server")
+    parser.add_argument("--ramp", default="1,2,4,8,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--stage-seconds", type=float, default=60)
+    parser.add_argument("--workflow-id", default="blog_generation")
+    parser.add_argument("--generate-ratio", type=float, default=0.5, help="Share of jobs sent to /api/generate")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--job-timeout", type=float, default=240)
+    parser.add_argument("--llm-port", type=int, default=11500)
+    parser.add_argument("--llm-latency-ms", type=float, default=200)
+    parser.add_argument("--llm-jitter-ms", type=float, default=50)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", default=str(REPO_ROOT / "reports" / "load_results.json"))
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.ramp.split(",") if level.strip()]
+    base_url = args.base_url or f"http://localhost:{args.port}"
+
+    fake_llm = None
+    if not args.no_fake_llm:
+        fake_llm = FakeLLMServer(port=args.llm_port, settings=FakeLLMSettings(
+            latency_ms=args.llm_latency_ms,
+            jitter_ms=args.llm_jitter_ms,
+            tokens_per_second=args.llm_tokens_per_second,
+            error_rate=args.llm_error_rate,
+            seed=args.seed,
+        )).start()
+        print(f"Fake LLM server on {fake_llm.url}")
+
+    app = start_app(args.port, fake_llm.url if fake_llm else None) if args.start_app else None
+    try:
+        if not wait_ready(base_url):
+            print(f"ERROR: app not reachable at {base_url}")
+            return 1
+        harness = LoadHarness(base_url, workflow_id=args.workflow_id, generate_ratio=args.generate_ratio,
+                              poll_interval=args.poll_interval, job_timeout=args.job_timeout, seed=args.seed)
+        report = harness.ramp(levels, args.stage_seconds)
+        if fake_llm:
+            report["fake_llm"] = dict(fake_llm.stats)
+    finally:
+        if app:
+            app.terminate()
+            app.wait(timeout=10)
+        if fake_llm:
+            fake_llm.stop()
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    knee = report["saturation_concurrency"]
+    print(f"Saturation: {'concurrency ' + str(knee) if knee else 'not reached'}; report written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
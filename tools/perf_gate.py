@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Benchmark regression gate - stored baselines and statistical comparison.
+
+Stores runs of ``reports/perf_results.json`` keyed by git commit, and compares
+a new run against them. A case only fails the gate when it is both:
+
+- slower than the baseline median by more than its threshold
+  (default 10%, overridable per case), and
+- significantly slower: a one-sided Mann-Whitney U test on the raw samples
+  (Welch z-test on mean/stdev for rows without samples) has p < alpha.
+
+A noisy single slow sample therefore does not fail the gate, and a small
+but consistent slowdown below the threshold does not either. The baseline
+pools the samples of the last ``--window`` stored runs (other than the
+current commit), or of one ``--baseline`` commit.
+
+Usage:
+    python tools/perf_runner.py
+    python tools/perf_gate.py record                 # store run for HEAD
+    python tools/perf_gate.py compare                # exit 1 on regression
+    python tools/perf_gate.py compare --case-threshold "dedup/dedupe_context=0.25"
+    python tools/perf_gate.py list
+"""
+
+import argparse
+import json
+import math
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_RESULTS = REPO_ROOT / "reports" / "perf_results.json"
+DEFAULT_BASELINES = REPO_ROOT / "reports" / "perf_baselines.json"
+
+REGRESSED, IMPROVED, UNCHANGED, NEW, MISSING = "regressed", "improved", "unchanged", "new", "missing"
+
+
+def case_id(row: Dict[str, Any]) -> str:
+    return f"{row['suite']}/{row['case']}"
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_results(path: Path) -> List[Dict[str, Any]]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def load_baselines(path: Path) -> Dict[str, Any]:
+    path = Path(path)
+    if not path.exists():
+        return {"version": 1, "runs": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_baselines(path: Path, store: Dict[str, Any]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(store, indent=2), encoding="utf-8")
+
+
+def record_run(store: Dict[str, Any], commit: str, results: List[Dict[str, Any]]) -> None:
+    store.setdefault("runs", {})[commit] = {
+        "commit": commit,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "results": results,
+    }
+
+
+def select_baseline(store: Dict[str, Any], commit: Optional[str], exclude: Optional[str],
+                    window: int) -> List[Dict[str, Any]]:
+    """Runs to compare against: one commit, or the latest ``window`` runs."""
+    runs = store.get("runs", {})
+    if commit:
+        matches = [run for key, run in runs.items() if key.startswith(commit)]
+        return matches[:1]
+    ordered = sorted((run for key, run in runs.items() if key != exclude),
+                     key=lambda run: run["recorded_at"], reverse=True)
+    return ordered[:max(1, window)]
+
+
+def row_samples(row: Dict[str, Any]) -> List[float]:
+    return list(row.get("samples") or [])
+
+
+def mann_whitney_greater(current: List[float], baseline: List[float]) -> float:
+    """One-sided p-value that ``current`` tends to be larger than ``baseline``.
+
+    Normal approximation with tie and continuity correction.
+    """
+    n1, n2 = len(current), len(baseline)
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        average = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            ranks[k] = average
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 0.5
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 1 - statistics.NormalDist().cdf(z)
+
+
+def welch_greater(current: Dict[str, Any], baseline: Dict[str, Any]) -> float:
+    """One-sided p-value from summary statistics (rows recorded without samples)."""
+    se = math.sqrt(current["stdev"] ** 2 / max(1, current["iters"])
+                   + baseline["stdev"] ** 2 / max(1, baseline["iters"]))
+    diff = current["mean"] - baseline["mean"]
+    if se == 0:
+        return 0.0 if diff > 0 else 1.0
+    return 1 - statistics.NormalDist().cdf(diff / se)
+
+
+def compare_case(current: Dict[str, Any], baseline_rows: List[Dict[str, Any]], threshold: float,
+                 alpha: float, min_delta: float) -> Dict[str, Any]:
+    """Compare one case against its pooled baseline rows."""
+    current_samples = row_samples(current)
+    baseline_samples = [value for row in baseline_rows for value in row_samples(row)]
+    if len(current_samples) >= 3 and len(baseline_samples) >= 3:
+        current_center = statistics.median(current_samples)
+        baseline_center = statistics.median(baseline_samples)
+        p_slower = mann_whitney_greater(current_samples, baseline_samples)
+        p_faster = mann_whitney_greater(baseline_samples, current_samples)
+        test = "mann-whitney"
+    else:
+        pooled = {
+            "mean": statistics.fmean(row["mean"] for row in baseline_rows),
+            "stdev": max(row["stdev"] for row in baseline_rows),
+            "iters": sum(row["iters"] for row in baseline_rows),
+        }
+        current_center, baseline_center = current["mean"], pooled["mean"]
+        p_slower = welch_greater(current, pooled)
+        p_faster = welch_greater(pooled, current)
+        test = "welch"
+
+    change = (current_center / baseline_center - 1) if baseline_center > 0 else 0.0
+    delta = current_center - baseline_center
+    status = UNCHANGED
+    if change > threshold and p_slower < alpha and delta > min_delta:
+        status = REGRESSED
+    elif change < -threshold and p_faster < alpha and -delta > min_delta:
+        status = IMPROVED
+    return {
+        "case": case_id(current),
+        "status": status,
+        "baseline": baseline_center,
+        "current": current_center,
+        "change": change,
+        "p_value": p_slower if change >= 0 else p_faster,
+        "threshold": threshold,
+        "test": test,
+    }
+
+
+def compare_runs(current: List[Dict[str, Any]], baseline_runs: List[Dict[str, Any]], threshold: float = 0.10,
+                 alpha: float = 0.05, min_delta: float = 0.0005,
+                 case_thresholds: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """Per-case comparison of a run against baseline runs."""
+    case_thresholds = case_thresholds or {}
+    baseline: Dict[str, List[Dict[str, Any]]] = {}
+    for run in baseline_runs:
+        for row in run["results"]:
+            baseline.setdefault(case_id(row), []).append(row)
+
+    diffs = []
+    for row in current:
+        key = case_id(row)
+        if key not in baseline:
+            diffs.append({"case": key, "status": NEW, "current": row["mean"]})
+            continue
+        diffs.append(compare_case(row, baseline[key], case_thresholds.get(key, threshold), alpha, min_delta))
+    current_keys = {case_id(row) for row in current}
+    for key in sorted(set(baseline) - current_keys):
+        diffs.append({"case": key, "status": MISSING})
+    return diffs
+
+
+def format_diff(diffs: List[Dict[str, Any]]) -> str:
+    lines = ["| case | baseline (s) | current (s) | change | p | threshold | status |",
+             "|---|---:|---:|---:|---:|---:|---|"]
+    for diff in diffs:
+        if diff["status"] in (NEW, MISSING):
+            current = f"{diff['current']:.4f}" if "current" in diff else "-"
+            lines.append(f"| {diff['case']} | - | {current} | - | - | - | {diff['status']} |")
+            continue
+        lines.append(
+            f"| {diff['case']} | {diff['baseline']:.4f} | {diff['current']:.4f} | {diff['change']:+.1%} "
+            f"| {diff['p_value']:.3f} | {diff['threshold']:.0%} | {diff['status']} |"
+        )
+    return "\n".join(lines)
+
+
+def parse_case_thresholds(values: List[str]) -> Dict[str, float]:
+    thresholds = {}
+    for value in values:
+        case, _, threshold = value.rpartition("=")
+        if not case:
+            raise ValueError(f"Expected suite/case=threshold, got {value!r}")
+        thresholds[case] = float(threshold)
+    return thresholds
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark baselines and regression gate")
+    parser.add_argument("--results", default=str(DEFAULT_RESULTS), help="perf_results.json of the run")
+    parser.add_argument("--baselines", default=str(DEFAULT_BASELINES), help="Baseline store")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Store the run as the baseline for a commit")
+    record.add_argument("--commit", default=None, help="Commit to key the run by (default: HEAD)")
+
+    compare = commands.add_parser("compare", help="Compare the run with stored baselines")
+    compare.add_argument("--baseline", default=None, help="Baseline commit (default: latest runs)")
+    compare.add_argument("--window", type=int, default=3, help="Latest runs pooled into the baseline")
+    compare.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown")
+    compare.add_argument("--case-threshold", action="append", default=[], metavar="SUITE/CASE=FRACTION")
+    compare.add_argument("--alpha", type=float, default=0.05, help="Significance level")
+    compare.add_argument("--min-delta", type=float, default=0.0005, help="Ignore slowdowns below this (s)")
+    compare.add_argument("--markdown", default=None, help="Also write the diff table here")
+
+    commands.add_parser("list", help="List stored baselines")
+    args = parser.parse_args(argv)
+
+    store = load_baselines(Path(args.baselines))
+    if args.command == "list":
+        for run in sorted(store["runs"].values(), key=lambda run: run["recorded_at"]):
+            print(f"{run['commit'][:12]}  {run['recorded_at']}  {len(run['results'])} cases")
+        return 0
+
+    results_path = Path(args.results)
+    if not results_path.exists():
+        print(f"No results at {results_path}; run tools/perf_runner.py first.", file=sys.stderr)
+        return 2
+    results = load_results(results_path)
+
+    if args.command == "record":
+        commit = args.commit or git_commit()
+        record_run(store, commit, results)
+        save_baselines(Path(args.baselines), store)
+        print(f"Recorded {len(results)} cases as baseline for {commit[:12]}")
+        return 0
+
+    baseline_runs = select_baseline(store, args.baseline, exclude=git_commit(), window=args.window)
+    if not baseline_runs:
+        print("No stored baseline to compare against; run `perf_gate.py record` on a known-good commit.",
+              file=sys.stderr)
+        return 2
+    diffs = compare_runs(results, baseline_runs, threshold=args.threshold, alpha=args.alpha,
+                         min_delta=args.min_delta, case_thresholds=parse_case_thresholds(args.case_threshold))
+    table = format_diff(diffs)
+    print(f"Baseline: {', '.join(run['commit'][:12] for run in baseline_runs)}")
+    print(table)
+    if args.markdown:
+        Path(args.markdown).write_text("# Performance Gate\n\n" + table + "\n", encoding="utf-8")
+
+    regressions = [diff for diff in diffs if diff["status"] == REGRESSED]
+    if regressions:
+        print(f"\nFAIL: {len(regressions)} case(s) regressed: {', '.join(d['case'] for d in regressions)}")
+        return 1
+    print("\nPASS: no significant regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
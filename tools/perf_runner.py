@@ -8,6 +8,8 @@ def main():
     env.setdefault("PERF_RESULTS_PATH", str(repo / "reports" / "perf_results.json"))
     env.setdefault("PERF_ITERS", "10")
     env.setdefault("PERF_WARMUP", "3")
+    env.setdefault("PERF_CORPUS_SIZE", "1000")
+    env.setdefault("PERF_SEED", "1234")
     cmd = [sys.executable, "-m", "pytest", "-q", "tests/performance"]
     print("+", " ".join(cmd))
     code = subprocess.call(cmd, cwd=repo, env=env)
@@ -286,6 +286,38 @@ def http_get_json(url):
         return None, {"error": str(e)}
 
 
+def wait_for_job_events(job_id, timeout=JOB_TIMEOUT):
+    """Wait for a job to finish via its SSE stream instead of polling.
+
+    Returns:
+        Terminal status ('completed', 'failed', 'cancelled'), "timeout", or None
+        if the server has no event stream (caller falls back to polling)
+    """
+    deadline = time.time() + timeout
+    event = None
+    try:
+        with urllib.request.urlopen(f"{BASE_URL}/api/jobs/{job_id}/events", timeout=min(timeout, 60)) as response:
+            for raw in response:
+                line = raw.decode('utf-8').rstrip("\r\n")
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: ") and event:
+                    data = json.loads(line[len("data: "):])
+                    if event == "snapshot" and data.get("status") in ('completed', 'failed', 'cancelled'):
+                        return data["status"]
+                    if event in ('job_completed', 'job_failed', 'job_cancelled'):
+                        return event[len("job_"):]
+                if time.time() > deadline:
+                    return "timeout"
+    except urllib.error.HTTPError:
+        return None
+    except Exception as e:
+        if time.time() > deadline:
+            return "timeout"
+        print(f"  Event stream for {job_id} unavailable ({e}), polling instead")
+    return None
+
+
 def execute_single_job(job_spec: Dict) -> Dict:
     """Execute a single job and wait for completion.
 
@@ -368,8 +400,10 @@ def execute_single_job(job_spec: Dict) -> Dict:
 
     print(f"[Job {job_index}] Submitted as {job_id}")
 
-    # Poll for completion
-    elapsed = 0
+    # Wait for the stream's terminal event, then read the final status once;
+    # servers without the event stream are polled
+    streamed = wait_for_job_events(job_id, JOB_TIMEOUT)
+    elapsed = JOB_TIMEOUT if streamed == "timeout" else 0
     final_status = "unknown"
     final_status_data = {}
 